@@ -0,0 +1,101 @@
+"""Benchmark the post-state diff of Engine X fixtures against large synthetic groups."""
+
+import time
+from typing import Callable, Dict, Tuple
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from ethereum_test_base_types import Account, Address, Alloc
+from pytest_plugins.filler.filler import calculate_post_state_diff
+
+from .benchmark_state_root import synthetic_alloc
+
+
+def compare_all_accounts(post_state: Alloc, genesis_state: Alloc) -> Alloc:
+    """Return the diff by comparing the account models of every address of both states."""
+    diff: Dict[Address, Account | None] = {}
+    for address in set(post_state.root.keys()) | set(genesis_state.root.keys()):
+        post_account = post_state.root.get(address)
+        if genesis_state.root.get(address) != post_account:
+            diff[address] = post_account
+    return Alloc(diff)
+
+
+def synthetic_post_state(accounts: int, slots_per_account: int, changed_accounts: int) -> Alloc:
+    """
+    Return the post-state of a test that modified, created and deleted a few accounts of the
+    synthetic allocation, built from new account objects as when parsed from the transition tool
+    output.
+    """
+    post_state = synthetic_alloc(accounts, slots_per_account)
+    for i in range(1, changed_accounts + 1):
+        account = post_state[Address(i)]
+        assert account is not None
+        account.storage[0] = 0
+        post_state[Address(accounts + i)] = Account(balance=i)
+    post_state[Address(accounts)] = None
+    return post_state
+
+
+def timed_diff(
+    diff_function: Callable[[Alloc, Alloc], Alloc], post_state: Alloc, genesis_state: Alloc
+) -> Tuple[Alloc, float]:
+    """Return the diff of the post-state computed by the function and the time it took."""
+    start = time.perf_counter()
+    diff = diff_function(post_state, genesis_state)
+    return diff, time.perf_counter() - start
+
+
+@click.command()
+@click.option(
+    "--accounts",
+    "account_counts",
+    type=int,
+    multiple=True,
+    default=[10_000, 100_000],
+    show_default=True,
+    help="Number of accounts of a synthetic group, can be given several times.",
+)
+@click.option(
+    "--slots-per-account",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of storage slots of every account.",
+)
+@click.option(
+    "--changed-accounts",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of accounts modified, and of accounts created, by the test.",
+)
+def main(account_counts: Tuple[int, ...], slots_per_account: int, changed_accounts: int):
+    """Compare the post-state diff with the comparison of every account of synthetic groups."""
+    console = Console()
+    table = Table(title=f"Post-state diff ({slots_per_account} slots per account)")
+    table.add_column("Accounts", justify="right")
+    table.add_column("Diff size", justify="right")
+    table.add_column("All accounts compared (s)", justify="right")
+    table.add_column("Post-state diff (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    for accounts in account_counts:
+        genesis_state = synthetic_alloc(accounts, slots_per_account)
+        post_state = synthetic_post_state(accounts, slots_per_account, changed_accounts)
+        expected_diff, full_time = timed_diff(compare_all_accounts, post_state, genesis_state)
+        diff, diff_time = timed_diff(calculate_post_state_diff, post_state, genesis_state)
+        assert diff == expected_diff, "the post-state diffs differ"
+        table.add_row(
+            f"{accounts:,}",
+            f"{len(diff.root):,}",
+            f"{full_time:.3f}",
+            f"{diff_time:.3f}",
+            f"{full_time / diff_time:.1f}x",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
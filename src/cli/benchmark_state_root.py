@@ -0,0 +1,129 @@
+"""Benchmark the state root computation of large synthetic pre-allocations."""
+
+import os
+import time
+from typing import Tuple
+
+import click
+from ethereum_rlp import rlp
+from ethereum_types.numeric import U256, Bytes32
+from rich.console import Console
+from rich.table import Table
+
+from ethereum_test_base_types import Account, Address, Hash
+from ethereum_test_types import Alloc
+from ethereum_test_types.trie import Trie, build_root, root, trie_set
+
+
+def synthetic_alloc(accounts: int, slots_per_account: int) -> Alloc:
+    """Return an allocation of contracts with distinct code and storage."""
+    return Alloc(
+        {
+            Address(i + 1): Account(
+                nonce=1,
+                balance=i,
+                code=i.to_bytes(8, "big"),
+                storage={slot: i + slot + 1 for slot in range(slots_per_account)},
+            )
+            for i in range(accounts)
+        }
+    )
+
+
+def timed_state_root(alloc: Alloc, max_workers: int) -> Tuple[Hash, float]:
+    """Return the state root of a fresh copy of the allocation and the time it took."""
+    alloc = Alloc(alloc.root)
+    start = time.perf_counter()
+    state_root = alloc.state_root(max_workers=max_workers)
+    return state_root, time.perf_counter() - start
+
+
+def compare_trie_builders(console: Console, slots: int) -> None:
+    """Compare `patricialize` and `build_root` on a single storage map."""
+    trie: Trie[Bytes32, U256] = Trie(secured=True, default=U256(0))
+    items = {}
+    for slot in range(slots):
+        trie_set(trie, Bytes32(Hash(slot)), U256(slot + 1))
+        items[Bytes32(Hash(slot))] = rlp.encode(U256(slot + 1))
+    start = time.perf_counter()
+    patricialize_root = root(trie)
+    patricialize_time = time.perf_counter() - start
+    start = time.perf_counter()
+    built_root = build_root(items)
+    build_time = time.perf_counter() - start
+    assert patricialize_root == built_root, "patricialize and build_root roots differ"
+    console.print(
+        f"Storage map of {slots:,} slots: patricialize {patricialize_time:.2f}s, "
+        f"build_root {build_time:.2f}s ({patricialize_time / build_time:.1f}x)"
+    )
+
+
+@click.command()
+@click.option(
+    "--accounts",
+    "account_counts",
+    type=int,
+    multiple=True,
+    default=[10_000, 100_000],
+    show_default=True,
+    help="Number of accounts of a synthetic allocation, can be given several times.",
+)
+@click.option(
+    "--slots-per-account",
+    type=int,
+    default=10,
+    show_default=True,
+    help="Number of storage slots of every account.",
+)
+@click.option(
+    "--max-workers",
+    type=int,
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Number of processes computing the storage roots in the parallel run.",
+)
+@click.option(
+    "--storage-slots",
+    type=int,
+    default=100_000,
+    show_default=True,
+    help="Number of slots of the storage map used to compare the trie builders (0 to skip).",
+)
+def main(
+    account_counts: Tuple[int, ...], slots_per_account: int, max_workers: int, storage_slots: int
+):
+    """Compare the serial and parallel state root computations of synthetic allocations."""
+    console = Console()
+    if storage_slots:
+        compare_trie_builders(console, storage_slots)
+    table = Table(title=f"State root ({slots_per_account} slots per account)")
+    table.add_column("Accounts", justify="right")
+    table.add_column("Serial (s)", justify="right")
+    table.add_column(f"{max_workers} processes (s)", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Update of 1 account (s)", justify="right")
+    for accounts in account_counts:
+        alloc = synthetic_alloc(accounts, slots_per_account)
+        serial_root, serial_time = timed_state_root(alloc, 1)
+        parallel_root, parallel_time = timed_state_root(alloc, max_workers)
+        assert serial_root == parallel_root, "serial and parallel state roots differ"
+        # The persistent tries are built by the first update after the first computation.
+        alloc.state_root()
+        alloc[Address(1)] = Account(balance=1, storage={1: 1})
+        alloc.state_root()
+        alloc[Address(2)] = Account(balance=2, storage={2: 2})
+        start = time.perf_counter()
+        alloc.state_root()
+        update_time = time.perf_counter() - start
+        table.add_row(
+            f"{accounts:,}",
+            f"{serial_time:.2f}",
+            f"{parallel_time:.2f}",
+            f"{serial_time / parallel_time:.1f}x",
+            f"{update_time:.4f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Summarize consume timing databases and detect latency regressions between runs."""
+
+import sys
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from pytest_plugins.consume.simulators.helpers.timing_database import (
+    NEW_PAYLOAD_PHASE_PATTERN,
+    TimingDatabase,
+)
+
+database_argument = click.argument(
+    "database_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+phase_option = click.option(
+    "--phase",
+    "phase_pattern",
+    default=NEW_PAYLOAD_PHASE_PATTERN,
+    show_default=True,
+    help="SQL LIKE pattern of the timing phase names to consider.",
+)
+
+
+def resolve_run_id(database: TimingDatabase, label: str | None, offset: int = 0) -> int:
+    """Return the ID of the labelled run, or of the `offset`-th most recent run."""
+    if label is not None:
+        return database.run_id(label)
+    run_ids = database.latest_run_ids(offset + 1)
+    if len(run_ids) <= offset:
+        raise click.UsageError(f"The database contains fewer than {offset + 1} runs.")
+    return run_ids[offset]
+
+
+def format_ms(seconds: float) -> str:
+    """Format a duration in seconds as milliseconds."""
+    return f"{seconds * 1000:.2f}"
+
+
+@click.group(
+    context_settings={"help_option_names": ["-h", "--help"]},
+    help="Query the timing database recorded by `consume` with `--timing-database`.",
+)
+def consume_timing():
+    """Query the timing database recorded by `consume`."""
+    pass
+
+
+@consume_timing.command(help="List the recorded runs.")
+@database_argument
+def runs(database_path: Path):
+    """List the recorded runs."""
+    database = TimingDatabase(database_path)
+    table = Table(title="Recorded runs")
+    table.add_column("ID", justify="right")
+    table.add_column("Label")
+    table.add_column("Created at")
+    table.add_column("Tests", justify="right")
+    for run in database.runs():
+        table.add_row(str(run.id), run.label, run.created_at, str(run.test_count))
+    Console().print(table)
+
+
+@consume_timing.command(help="Print p50/p95/p99 latencies per client and per EIP for a run.")
+@database_argument
+@click.option("--run", "run_label", default=None, help="Run label (default: the latest run).")
+@phase_option
+def summary(database_path: Path, run_label: str | None, phase_pattern: str):
+    """Print latency percentiles of a run per client and per EIP."""
+    database = TimingDatabase(database_path)
+    run_id = resolve_run_id(database, run_label)
+    console = Console()
+    for group_by in ("client", "eip"):
+        table = Table(title=f"'{phase_pattern}' latency per {group_by} (ms)")
+        table.add_column(group_by.capitalize())
+        table.add_column("Count", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p95", justify="right")
+        table.add_column("p99", justify="right")
+        for row in database.summary(run_id, group_by=group_by, phase_pattern=phase_pattern):
+            table.add_row(
+                row.group,
+                str(row.count),
+                format_ms(row.p50),
+                format_ms(row.p95),
+                format_ms(row.p99),
+            )
+        console.print(table)
+
+
+@consume_timing.command(
+    help=(
+        "Compare a candidate run against a baseline run and list the tests whose mean latency "
+        "worsened beyond the threshold. Exits with a non-zero code if any regression is found."
+    )
+)
+@database_argument
+@click.option(
+    "--baseline", "baseline_label", default=None, help="Baseline run label (default: 2nd latest)."
+)
+@click.option(
+    "--candidate", "candidate_label", default=None, help="Candidate run label (default: latest)."
+)
+@click.option(
+    "--threshold",
+    default=0.2,
+    show_default=True,
+    type=float,
+    help="Relative latency increase that is flagged as a regression (0.2 = 20%).",
+)
+@click.option(
+    "--min-delta-ms",
+    default=1.0,
+    show_default=True,
+    type=float,
+    help="Minimum absolute latency increase that is flagged as a regression.",
+)
+@phase_option
+def regressions(
+    database_path: Path,
+    baseline_label: str | None,
+    candidate_label: str | None,
+    threshold: float,
+    min_delta_ms: float,
+    phase_pattern: str,
+):
+    """List the tests whose latency regressed between two runs."""
+    database = TimingDatabase(database_path)
+    baseline_run_id = resolve_run_id(database, baseline_label, offset=1)
+    candidate_run_id = resolve_run_id(database, candidate_label)
+    found = database.regressions(
+        baseline_run_id=baseline_run_id,
+        candidate_run_id=candidate_run_id,
+        threshold=threshold,
+        min_delta=min_delta_ms / 1000,
+        phase_pattern=phase_pattern,
+    )
+    console = Console()
+    if not found:
+        console.print(f"No '{phase_pattern}' latency regressions above {threshold:.0%}.")
+        return
+    table = Table(title=f"'{phase_pattern}' latency regressions above {threshold:.0%} (ms)")
+    table.add_column("Client")
+    table.add_column("Test ID")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Candidate", justify="right")
+    table.add_column("Ratio", justify="right")
+    for regression in found:
+        table.add_row(
+            regression.client,
+            regression.test_id,
+            format_ms(regression.baseline),
+            format_ms(regression.candidate),
+            f"{regression.ratio:.2f}x",
+        )
+    console.print(table)
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    consume_timing()
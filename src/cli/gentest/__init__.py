@@ -27,11 +27,18 @@ Example Usage:
     fill --fork=Paris tests/paris/test_0xa41f.py
     ```
 
+3. Generate a test for each of several transactions, listed as arguments or in a file with
+    one hash per line, in a single run:
+
+    ```console
+    uv run gentest_batch --hashes-file hashes.txt --output-dir tests/paris/
+    ```
+
 Limitations:
 
 1. Only legacy transaction types (type 0) are currently supported.
 """
 
-from .cli import generate
+from .cli import generate, generate_batch
 
-__all__ = ["generate"]
+__all__ = ["generate", "generate_batch"]
@@ -6,21 +6,61 @@ blockchain network using the transaction hash and generates a Python
 test script based on that information.
 """
 
+from pathlib import Path
 from sys import stderr
-from typing import TextIO
+from typing import Callable, TextIO, Tuple
 
 import click
 
 from ethereum_test_base_types import Hash
+from ethereum_test_rpc import Cassette
 
-from .source_code_generator import get_test_source
-from .test_context_providers import StateTestProvider
+from .request_manager import RPCRequest
+from .source_code_generator import get_test_source, get_test_sources
+from .test_context_providers import StateTestProvider, timed_stage
+
+
+def cassette_options(command: Callable) -> Callable:
+    """Add the options to record or replay the RPC traffic with the node to a command."""
+    command = click.option(
+        "--replay-rpc",
+        type=click.Path(exists=True, dir_okay=False, path_type=Path),
+        default=None,
+        help="Replay the RPC traffic from a cassette file recorded with `--record-rpc`, offline.",
+    )(command)
+    return click.option(
+        "--record-rpc",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Record the RPC traffic with the node to the given cassette file.",
+    )(command)
+
+
+def cassette_rpc_request(
+    record_rpc: Path | None, replay_rpc: Path | None
+) -> Tuple[Cassette | None, RPCRequest | None]:
+    """Return the cassette and the RPC request manager that records or replays to it, if any."""
+    if record_rpc is not None and replay_rpc is not None:
+        raise click.UsageError("Only one of --record-rpc and --replay-rpc can be specified.")
+    if replay_rpc is not None:
+        cassette = Cassette.load(replay_rpc)
+        return cassette, RPCRequest(cassette, replay=True)
+    if record_rpc is not None:
+        cassette = Cassette()
+        return cassette, RPCRequest(cassette)
+    return None, None
 
 
 @click.command()
 @click.argument("transaction_hash")
 @click.argument("output_file", type=click.File("w", lazy=True))
-def generate(transaction_hash: str, output_file: TextIO):
+@cassette_options
+def generate(
+    transaction_hash: str,
+    output_file: TextIO,
+    record_rpc: Path | None,
+    replay_rpc: Path | None,
+):
     """
     Extract a transaction and required state from a network to make a
     blockchain test out of it.
@@ -29,9 +69,75 @@ def generate(transaction_hash: str, output_file: TextIO):
 
     OUTPUT_FILE is the path to the output python script.
     """
-    provider = StateTestProvider(transaction_hash=Hash(transaction_hash))
+    cassette, rpc_request = cassette_rpc_request(record_rpc, replay_rpc)
+    provider = StateTestProvider(transaction_hash=Hash(transaction_hash), rpc_request=rpc_request)
 
     source = get_test_source(provider=provider, template_path="blockchain_test/transaction.py.j2")
     output_file.write(source)
+    if record_rpc is not None:
+        assert cassette is not None
+        cassette.save(record_rpc)
 
     print("Finished", file=stderr)
+
+
+@click.command()
+@click.argument("transaction_hashes", nargs=-1)
+@click.option(
+    "--hashes-file",
+    type=click.File("r"),
+    default=None,
+    help="File with one transaction hash per line, in addition to the ones given as arguments.",
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory to write the test modules to, as `test_<hash prefix>.py`.",
+)
+@click.option(
+    "--max-concurrency",
+    type=int,
+    default=16,
+    show_default=True,
+    help="Maximum number of `debug_traceCall` requests in flight.",
+)
+@cassette_options
+def generate_batch(
+    transaction_hashes: Tuple[str, ...],
+    hashes_file: TextIO | None,
+    output_dir: Path,
+    max_concurrency: int,
+    record_rpc: Path | None,
+    replay_rpc: Path | None,
+):
+    """
+    Extract several transactions and their required state from a network to
+    make a blockchain test out of each of them, in a single run.
+
+    TRANSACTION_HASHES are the hashes of the transactions to be used.
+    """
+    hashes = list(transaction_hashes)
+    if hashes_file is not None:
+        hashes += [line.strip() for line in hashes_file if line.strip()]
+    unique_hashes = list(dict.fromkeys(Hash(transaction_hash) for transaction_hash in hashes))
+    if not unique_hashes:
+        raise click.UsageError("No transaction hashes given.")
+    cassette, rpc_request = cassette_rpc_request(record_rpc, replay_rpc)
+
+    with timed_stage("Total"):
+        providers = StateTestProvider.from_transaction_hashes(
+            unique_hashes, rpc_request, max_concurrency=max_concurrency
+        )
+        with timed_stage(f"Generate {len(providers)} tests"):
+            sources = get_test_sources(
+                providers=providers, template_path="blockchain_test/transaction.py.j2"
+            )
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for transaction_hash, source in zip(unique_hashes, sources, strict=True):
+            (output_dir / f"test_{str(transaction_hash)[:10]}.py").write_text(source)
+    if record_rpc is not None:
+        assert cassette is not None
+        cassette.save(record_rpc)
+
+    print(f"Finished, {len(sources)} tests written to {output_dir}", file=stderr)
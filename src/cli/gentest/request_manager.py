@@ -10,11 +10,14 @@ Classes:
 - RemoteBlock: A Pydantic model representing a block retrieved from the node.
 """
 
-from typing import Dict
+import asyncio
+import threading
+from typing import Dict, List, Sequence
 
 from config import EnvConfig
 from ethereum_test_base_types import Hash
-from ethereum_test_rpc import BlockNumberType, DebugRPC, EthRPC
+from ethereum_test_rpc import BlockNumberType, Cassette, DebugRPC, EthRPC
+from ethereum_test_rpc.async_rpc import AsyncBaseRPC
 from ethereum_test_rpc.types import TransactionByHashResponse
 from ethereum_test_types import Environment
 
@@ -25,13 +28,29 @@ class RPCRequest:
     node_url: str
     headers: dict[str, str]
 
-    def __init__(self):
-        """Initialize the RequestManager with specific client config."""
-        node_config = EnvConfig().remote_nodes[0]
-        self.node_url = node_config.node_url
-        headers = node_config.rpc_headers
-        self.rpc = EthRPC(node_config.node_url, extra_headers=headers)
-        self.debug_rpc = DebugRPC(node_config.node_url, extra_headers=headers)
+    def __init__(self, cassette: Cassette | None = None, *, replay: bool = False):
+        """
+        Initialize the RequestManager with specific client config.
+
+        If a cassette is given, the RPC traffic is recorded to it or, if `replay` is set,
+        answered from it without any node configuration.
+        """
+        if replay:
+            assert cassette is not None, "replaying requires a cassette"
+            self.node_url = "http://localhost"
+            headers: dict[str, str] = {}
+        else:
+            node_config = EnvConfig().remote_nodes[0]
+            self.node_url = str(node_config.node_url)
+            headers = node_config.rpc_headers
+        self.rpc = EthRPC(self.node_url, extra_headers=headers)
+        self.debug_rpc = DebugRPC(self.node_url, extra_headers=headers)
+        if cassette is not None:
+            cassette.use(self.rpc, replay=replay)
+            cassette.use(self.debug_rpc, replay=replay)
+        # Blocks are shared by the transactions they include, so they are only fetched once.
+        self.blocks: Dict[int, Environment] = {}
+        self.blocks_lock = threading.Lock()
 
     def eth_get_transaction_by_hash(self, transaction_hash: Hash) -> TransactionByHashResponse:
         """Get transaction data."""
@@ -42,10 +61,21 @@ class RPCRequest:
 
         return res
 
-    def eth_get_block_by_number(self, block_number: BlockNumberType) -> Environment:
-        """Get block by number."""
-        res = self.rpc.get_block_by_number(block_number)
+    def eth_get_transactions_by_hash(
+        self, transaction_hashes: Sequence[Hash]
+    ) -> List[TransactionByHashResponse]:
+        """Get the data of several transactions in a single batch."""
+        responses = self.rpc.get_transactions_by_hash(transaction_hashes)
+        for transaction_hash, res in zip(transaction_hashes, responses, strict=True):
+            assert res is not None, f"Transaction {transaction_hash} not found"
+            assert res.block_number is not None, (
+                f"Transaction {transaction_hash} does not seem to be included in any block"
+            )
+        return responses  # type: ignore[return-value]
 
+    @staticmethod
+    def block_environment(res: Dict) -> Environment:
+        """Return the environment of a block."""
         return Environment(
             fee_recipient=res["miner"],
             number=res["number"],
@@ -54,6 +84,32 @@ class RPCRequest:
             timestamp=res["timestamp"],
         )
 
+    def eth_get_block_by_number(self, block_number: BlockNumberType) -> Environment:
+        """Get block by number."""
+        if isinstance(block_number, int):
+            with self.blocks_lock:
+                if block_number in self.blocks:
+                    return self.blocks[block_number]
+        res = self.rpc.get_block_by_number(block_number)
+        environment = self.block_environment(res)
+        if isinstance(block_number, int):
+            with self.blocks_lock:
+                self.blocks[block_number] = environment
+        return environment
+
+    def eth_get_blocks_by_number(self, block_numbers: Sequence[int]) -> Dict[int, Environment]:
+        """Get several blocks, fetching the ones not fetched before in a single batch."""
+        with self.blocks_lock:
+            missing = sorted(set(block_numbers) - self.blocks.keys())
+        if missing:
+            responses = self.rpc.get_blocks_by_number(missing, full_txs=False)
+            with self.blocks_lock:
+                for block_number, res in zip(missing, responses, strict=True):
+                    assert res is not None, f"Block {block_number} not found"
+                    self.blocks[block_number] = self.block_environment(res)
+        with self.blocks_lock:
+            return {block_number: self.blocks[block_number] for block_number in block_numbers}
+
     def debug_trace_call(self, transaction: TransactionByHashResponse) -> Dict[str, dict]:
         """Get pre-state required for transaction."""
         assert transaction.sender is not None
@@ -67,3 +123,20 @@ class RPCRequest:
             },
             f"{transaction.block_number}",
         )
+
+    def debug_trace_calls(
+        self, transactions: Sequence[TransactionByHashResponse], *, max_concurrency: int = 16
+    ) -> List[Dict[str, dict]]:
+        """Get the pre-state required for several transactions, with concurrent requests."""
+        async_rpc = AsyncBaseRPC(self.debug_rpc, max_concurrency=max_concurrency)
+
+        async def trace_calls() -> List[Dict[str, dict]]:
+            return await asyncio.gather(
+                *[
+                    async_rpc.call(self.debug_trace_call, transaction)
+                    for transaction in transactions
+                ]
+            )
+
+        with async_rpc:
+            return async_rpc.run(trace_calls())
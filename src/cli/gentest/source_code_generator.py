@@ -8,6 +8,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from typing import List, Sequence
 
 import jinja2
 
@@ -45,6 +46,27 @@ def get_test_source(provider: Provider, template_path: str) -> str:
     return format_code(rendered_template)
 
 
+def get_test_sources(providers: Sequence[Provider], template_path: str) -> List[str]:
+    """
+    Generate the pytest source code of several providers, formatting them all at once.
+
+    Args:
+        providers: The providers of the context of each test.
+        template_path (str): The path to the Jinja2 template file used to generate tests.
+
+    Returns:
+        List[str]: The formatted pytest source code of each provider, in order.
+
+    """
+    template = template_env.get_template(template_path)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = [Path(temp_dir) / f"test_{i}.py" for i in range(len(providers))]
+        for path, provider in zip(paths, providers, strict=True):
+            path.write_text(template.render(provider.get_context()))
+        format_files(paths)
+        return [path.read_text() for path in paths]
+
+
 def format_code(code: str) -> str:
     """
     Format the provided Python code using the Black code formatter.
@@ -68,30 +90,39 @@ def format_code(code: str) -> str:
 
         # Create a Path object for the input file
         input_file_path = Path(temp_file.name)
-
-        # Get the path to the formatter executable in the virtual environment
-        if sys.platform.startswith("win"):
-            formatter_path = Path(sys.prefix) / "Scripts" / "ruff.exe"
-        else:
-            formatter_path = Path(sys.prefix) / "bin" / "ruff"
-
-        # Call ruff to format the file
-        config_path = AppConfig().ROOT_DIR / "pyproject.toml"
-
-        try:
-            subprocess.run(
-                [
-                    str(formatter_path),
-                    "format",
-                    str(input_file_path),
-                    "--quiet",
-                    "--config",
-                    str(config_path),
-                ],
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Error formatting code using formatter '{formatter_path}'") from e
+        format_files([input_file_path])
 
         # Return the formatted source code
         return input_file_path.read_text()
+
+
+def format_files(paths: List[Path]) -> None:
+    """
+    Format the provided Python files in place, using a single formatter run.
+
+    Args:
+        paths (List[Path]): The paths of the Python files to be formatted.
+
+    """
+    # Get the path to the formatter executable in the virtual environment
+    if sys.platform.startswith("win"):
+        formatter_path = Path(sys.prefix) / "Scripts" / "ruff.exe"
+    else:
+        formatter_path = Path(sys.prefix) / "bin" / "ruff"
+
+    # Call ruff to format the files
+    config_path = AppConfig().ROOT_DIR / "pyproject.toml"
+    try:
+        subprocess.run(
+            [
+                str(formatter_path),
+                "format",
+                *[str(path) for path in paths],
+                "--quiet",
+                "--config",
+                str(config_path),
+            ],
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"Error formatting code using formatter '{formatter_path}'") from e
@@ -12,11 +12,13 @@ Example:
 
 """
 
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from sys import stderr
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from ethereum_test_base_types import Account, Hash
 from ethereum_test_rpc.types import TransactionByHashResponse
@@ -25,6 +27,14 @@ from ethereum_test_tools import Environment, Transaction
 from .request_manager import RPCRequest
 
 
+@contextmanager
+def timed_stage(name: str) -> Iterator[None]:
+    """Print the time taken by a stage of the generation."""
+    start = time.perf_counter()
+    yield
+    print(f"{name}: {time.perf_counter() - start:.2f}s", file=stderr)
+
+
 class Provider(ABC, BaseModel):
     """An provider generates required context for creating a test."""
 
@@ -38,13 +48,52 @@ class Provider(ABC, BaseModel):
 class StateTestProvider(Provider):
     """Provides context required to generate a `state_test` using pytest."""
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     transaction_hash: Hash
+    rpc_request: Optional[RPCRequest] = None
     block: Optional[Environment] = None
     transaction_response: Optional[TransactionByHashResponse] = None
     state: Optional[Dict[str, Dict]] = None
 
+    @classmethod
+    def from_transaction_hashes(
+        cls,
+        transaction_hashes: Sequence[Hash],
+        rpc_request: RPCRequest | None = None,
+        *,
+        max_concurrency: int = 16,
+    ) -> List["StateTestProvider"]:
+        """
+        Return the providers of several transactions, fetching their data with batched and
+        concurrent requests, and each block only once.
+        """
+        if rpc_request is None:
+            rpc_request = RPCRequest()
+        with timed_stage(f"eth_getTransactionByHash ({len(transaction_hashes)} transactions)"):
+            transaction_responses = rpc_request.eth_get_transactions_by_hash(transaction_hashes)
+        block_numbers = [int(tx.block_number) for tx in transaction_responses]  # type: ignore
+        with timed_stage(f"eth_getBlockByNumber ({len(set(block_numbers))} blocks)"):
+            blocks = rpc_request.eth_get_blocks_by_number(block_numbers)
+        with timed_stage(f"debug_traceCall ({len(transaction_responses)} transactions)"):
+            states = rpc_request.debug_trace_calls(
+                transaction_responses, max_concurrency=max_concurrency
+            )
+        return [
+            cls(
+                transaction_hash=transaction_hash,
+                rpc_request=rpc_request,
+                block=blocks[block_number],
+                transaction_response=transaction_response,
+                state=state,
+            )
+            for transaction_hash, transaction_response, block_number, state in zip(
+                transaction_hashes, transaction_responses, block_numbers, states, strict=True
+            )
+        ]
+
     def _make_rpc_calls(self):
-        request = RPCRequest()
+        request = self.rpc_request if self.rpc_request is not None else RPCRequest()
         print(
             f"Perform tx request: eth_get_transaction_by_hash({self.transaction_hash})",
             file=stderr,
@@ -92,7 +141,8 @@ class StateTestProvider(Provider):
             pre-state, a transaction and its hash.
 
         """
-        self._make_rpc_calls()
+        if self.transaction_response is None:
+            self._make_rpc_calls()
         return {
             "environment": self._get_environment(),
             "pre_state": self._get_pre_state(),
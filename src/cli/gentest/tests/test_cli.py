@@ -1,14 +1,17 @@
 """Tests for the gentest CLI command."""
 
 from tempfile import TemporaryDirectory
+from typing import List
 
 import pytest
 from click.testing import CliRunner
 
-from cli.gentest.cli import generate
+from cli.gentest.cli import generate, generate_batch
+from cli.gentest.request_manager import RPCRequest
 from cli.gentest.test_context_providers import StateTestProvider
 from cli.pytest_commands.fill import fill
 from ethereum_test_base_types import Account
+from ethereum_test_rpc import Cassette
 from ethereum_test_tools import Environment, Storage, Transaction
 
 transactions_by_type = {
@@ -123,3 +126,63 @@ def test_tx_type(tmp_path, monkeypatch, tx_type, transaction_hash):
     ]
     fill_result = runner.invoke(fill, args)
     assert fill_result.exit_code == 0, f"Fill command failed:\n{fill_result.output}"
+
+
+def test_batch(tmp_path, monkeypatch):
+    """Generates a test module for each of several transactions in a single run."""
+    runner = CliRunner()
+    transaction_hashes = {
+        str(tx["transaction"].hash): tx  # type: ignore
+        for tx in transactions_by_type.values()
+    }
+    hashes_file = tmp_path / "hashes.txt"
+    hashes_file.write_text("\n".join(transaction_hashes) + "\n")
+
+    def from_transaction_hashes(cls, hashes, rpc_request, *, max_concurrency):
+        return [cls(transaction_hash=transaction_hash) for transaction_hash in hashes]
+
+    def get_mock_context(self: StateTestProvider) -> dict:
+        return transaction_hashes[str(self.transaction_hash)]
+
+    monkeypatch.setattr(
+        StateTestProvider, "from_transaction_hashes", classmethod(from_transaction_hashes)
+    )
+    monkeypatch.setattr(StateTestProvider, "get_context", get_mock_context)
+
+    output_dir = tmp_path / "tests"
+    first_hash = next(iter(transaction_hashes))
+    result = runner.invoke(
+        generate_batch,
+        [first_hash, "--hashes-file", str(hashes_file), "--output-dir", str(output_dir)],
+    )
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in output_dir.iterdir()) == sorted(
+        f"test_{transaction_hash[:10]}.py" for transaction_hash in transaction_hashes
+    )
+
+
+def test_blocks_are_fetched_once():
+    """Test that the blocks shared by several transactions are only fetched once."""
+    fetched: List[List[int]] = []
+
+    class FakeEthRPC:
+        def get_blocks_by_number(self, block_numbers, full_txs=True):
+            fetched.append(list(block_numbers))
+            return [
+                {
+                    "miner": "0x2adc25665018aa1fe0e6bc666dac8fc2697ff9ba",
+                    "number": hex(block_number),
+                    "difficulty": "0x0",
+                    "gasLimit": "0x1000000",
+                    "timestamp": "0x1",
+                }
+                for block_number in block_numbers
+            ]
+
+    rpc_request = RPCRequest(Cassette(), replay=True)
+    rpc_request.rpc = FakeEthRPC()  # type: ignore[assignment]
+    blocks = rpc_request.eth_get_blocks_by_number([5, 6, 5])
+    assert [int(block.number) for block in blocks.values()] == [5, 6]
+    rpc_request.eth_get_blocks_by_number([6, 7])
+    assert int(rpc_request.eth_get_block_by_number(7).number) == 7
+    assert fetched == [[5, 6], [7]]
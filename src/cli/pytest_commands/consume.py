@@ -7,7 +7,12 @@ from typing import Any, Callable, List
 import click
 
 from .base import ArgumentProcessor, PytestCommand, PytestExecution, common_pytest_options
-from .processors import ConsumeCommandProcessor, HelpFlagsProcessor, HiveEnvironmentProcessor
+from .processors import (
+    ConsumeCommandProcessor,
+    EngineStandInProcessor,
+    HelpFlagsProcessor,
+    HiveEnvironmentProcessor,
+)
 
 
 class ConsumeCommand(PytestCommand):
@@ -24,6 +29,8 @@ class ConsumeCommand(PytestCommand):
                     ConsumeCommandProcessor(is_hive=True),
                 ]
             )
+        elif command_name == "engine-stand-in":
+            processors.extend([EngineStandInProcessor(), ConsumeCommandProcessor(is_hive=True)])
         else:
             processors.append(ConsumeCommandProcessor(is_hive=False))
 
@@ -59,6 +66,8 @@ def get_command_paths(command_name: str, is_hive: bool) -> List[Path]:
         ]
     elif command_name in ["engine", "rlp"]:
         command_paths = [base_path / "simulators" / "hive_tests" / f"test_via_{command_name}.py"]
+    elif command_name == "engine-stand-in":
+        command_paths = [base_path / "simulators" / "hive_tests" / "test_via_engine.py"]
     elif command_name == "direct":
         command_paths = [base_path / "direct" / "test_via_direct.py"]
     else:
@@ -76,7 +85,7 @@ def consume_command(is_hive: bool = False) -> Callable[[Callable[..., Any]], cli
     """Generate a consume sub-command."""
 
     def decorator(func: Callable[..., Any]) -> click.Command:
-        command_name = func.__name__
+        command_name = func.__name__.replace("_", "-")
         command_help = func.__doc__
         command_paths = get_command_paths(command_name, is_hive)
 
@@ -114,6 +123,12 @@ def engine() -> None:
     pass
 
 
+@consume_command(is_hive=False)
+def engine_stand_in() -> None:
+    """Consume via the Engine API against a local stand-in server instead of hive clients."""
+    pass
+
+
 @consume_command(is_hive=True)
 def hive() -> None:
     """Client consumes via all available hive methods (rlp, engine)."""
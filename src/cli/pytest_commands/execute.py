@@ -62,3 +62,12 @@ recover = _create_execute_subcommand(
     "pytest-execute-recover.ini",
     "Recover funds from a failed test execution using a remote RPC endpoint.",
 )
+
+load = _create_execute_subcommand(
+    "load",
+    "pytest-execute-load.ini",
+    (
+        "Generate load on a remote RPC endpoint by replaying the transactions of the tests at a "
+        "target rate, and report the achieved throughput and inclusion latency."
+    ),
+)
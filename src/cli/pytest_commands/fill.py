@@ -86,6 +86,10 @@ class FillCommand(PytestCommand):
             "-qq",  # Quiet pytest output by default (user -v/-vv/-vvv can override)
         ] + filtered_args
 
+        # Record the inputs of the tests if phase 2 fills the fixtures from them
+        if "--replay-fill-inputs" in args:
+            phase1_args.append("--record-fill-inputs")
+
         return phase1_args
 
     def _create_phase2_args(self, args: List[str]) -> List[str]:
@@ -109,6 +113,7 @@ class FillCommand(PytestCommand):
             # Pre-allocation group flags (we'll add our own)
             "--generate-pre-alloc-groups",
             "--use-pre-alloc-groups",
+            "--replay-fill-inputs",
         }
 
         filtered_args = []
@@ -113,6 +113,14 @@ class HiveEnvironmentProcessor(ArgumentProcessor):
         return "-n" in args
 
 
+class EngineStandInProcessor(ArgumentProcessor):
+    """Processes arguments for the consume engine simulator that runs against a stand-in."""
+
+    def process_args(self, args: List[str]) -> List[str]:
+        """Load the stand-in engine simulator plugin instead of the hive based one."""
+        return args + ["-p", "pytest_plugins.consume.simulators.engine_stand_in.conftest"]
+
+
 class ConsumeCommandProcessor(ArgumentProcessor):
     """Processes consume-specific command arguments."""
 
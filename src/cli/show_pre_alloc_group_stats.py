@@ -11,6 +11,7 @@ from rich.table import Table
 
 from ethereum_test_base_types import CamelModel
 from ethereum_test_fixtures import PreAllocGroups
+from ethereum_test_types.compact_alloc import CompactAlloc, deep_sizeof
 
 
 def extract_test_module(test_id: str) -> str:
@@ -100,7 +101,49 @@ def calculate_size_distribution(
     return group_distribution, test_distribution
 
 
-def analyze_pre_alloc_folder(folder: Path, verbose: int = 0) -> Dict:
+def calculate_account_distribution(
+    group_sizes: List[Tuple[int, int]],
+) -> List[Tuple[str, int, int]]:
+    """
+    Calculate the distribution of the number of accounts of the groups, from the accounts and
+    file size in bytes of each group.
+
+    Returns: [(range_label, group_count, total_bytes), ...]
+    """
+    bins = [
+        (1, 10, "1-10"),
+        (11, 100, "11-100"),
+        (101, 1_000, "101-1k"),
+        (1_001, 10_000, "1k-10k"),
+        (10_001, 100_000, "10k-100k"),
+        (100_001, float("inf"), "100k+"),
+    ]
+    distribution = []
+    for min_val, max_val, label in bins:
+        sizes = [size for accounts, size in group_sizes if min_val <= accounts <= max_val]
+        if sizes:
+            distribution.append((label, len(sizes), sum(sizes)))
+    return distribution
+
+
+def analyze_memory(pre_alloc_groups: PreAllocGroups) -> Dict:
+    """Measure the memory taken by the pre-allocations as `Alloc` and as `CompactAlloc`."""
+    alloc_bytes = 0
+    compact_bytes = 0
+    slots = 0
+    for group in pre_alloc_groups.values():
+        compact = CompactAlloc.from_alloc(group.pre)
+        alloc_bytes += deep_sizeof(group.pre.root)
+        compact_bytes += deep_sizeof(compact)
+        slots += compact.slot_count()
+    return {
+        "slots": slots,
+        "alloc_bytes": alloc_bytes,
+        "compact_bytes": compact_bytes,
+    }
+
+
+def analyze_pre_alloc_folder(folder: Path, verbose: int = 0, memory: bool = False) -> Dict:
     """Analyze pre-allocation folder and return statistics."""
     pre_alloc_groups = PreAllocGroups.from_folder(folder)
 
@@ -141,10 +184,19 @@ def analyze_pre_alloc_folder(folder: Path, verbose: int = 0) -> Dict:
                 "hash": hash_key[:8] + "...",  # Shortened hash for display
                 "tests": group.test_count,
                 "accounts": group.pre_account_count,
+                "bytes": (folder / f"{hash_key}.json").stat().st_size,
                 "fork": group.fork.name(),
             }
         )
 
+    # Distribution of the size of the groups, which might have been split by size in phase 1
+    account_distribution = calculate_account_distribution(
+        [(g["accounts"], g["bytes"]) for g in group_details]
+    )
+    split_groups = len(
+        {hash_key.split("-")[0] for hash_key in pre_alloc_groups if "-" in hash_key}
+    )
+
     # Calculate frequency distribution of group sizes
     group_distribution, test_distribution = calculate_size_distribution(
         [g["tests"] for g in group_details]
@@ -183,7 +235,7 @@ def analyze_pre_alloc_folder(folder: Path, verbose: int = 0) -> Dict:
                 "groups_per_fork": groups_per_fork,
             }
 
-    return {
+    stats = {
         "total_groups": total_groups,
         "total_tests": total_tests,
         "total_accounts": total_accounts,
@@ -192,8 +244,13 @@ def analyze_pre_alloc_folder(folder: Path, verbose: int = 0) -> Dict:
         "group_details": group_details,
         "group_distribution": group_distribution,
         "test_distribution": test_distribution,
+        "account_distribution": account_distribution,
+        "split_groups": split_groups,
         "split_functions": split_functions,
     }
+    if memory:
+        stats["memory"] = analyze_memory(pre_alloc_groups)
+    return stats
 
 
 def display_stats(stats: Dict, console: Console, verbose: int = 0):
@@ -209,6 +266,22 @@ def display_stats(stats: Dict, console: Console, verbose: int = 0):
             "(use --verbose to see details)"
         )
 
+    if "memory" in stats:
+        memory = stats["memory"]
+        slots = max(1, memory["slots"])
+        console.print("\n[bold yellow]Memory of the Pre-Allocations[/bold yellow]")
+        memory_table = Table(show_header=True, header_style="bold magenta")
+        memory_table.add_column("Representation", style="cyan")
+        memory_table.add_column("Total (MiB)", justify="right")
+        memory_table.add_column("Bytes/Slot", justify="right")
+        for name, size in [
+            ("Alloc", memory["alloc_bytes"]),
+            ("CompactAlloc", memory["compact_bytes"]),
+        ]:
+            memory_table.add_row(name, f"{size / 2**20:.1f}", f"{size / slots:.1f}")
+        console.print(f"Total storage slots: [green]{memory['slots']}[/green]")
+        console.print(memory_table)
+
     # Per-group details table (only with -v or -vv)
     if verbose >= 1:
         console.print("\n[bold yellow]Tests and Accounts per Group[/bold yellow]")
@@ -283,6 +356,38 @@ def display_stats(stats: Dict, console: Console, verbose: int = 0):
 
     console.print(dist_table)
 
+    # Group account count distribution table
+    console.print("\n[bold yellow]Group Size Distribution by Accounts[/bold yellow]")
+    if stats.get("split_groups"):
+        console.print(
+            f"Groups split by size in phase 1: [green]{stats['split_groups']}[/green]",
+            highlight=False,
+        )
+    account_table = Table(show_header=True, header_style="bold magenta")
+    account_table.add_column("Account Count Range", style="cyan")
+    account_table.add_column("Number of Groups", justify="right")
+    account_table.add_column("Percentage", justify="right")
+    account_table.add_column("Total Size (MiB)", justify="right")
+
+    for size_range, count, size in stats.get("account_distribution", []):
+        percentage = (count / total_groups_in_dist * 100) if total_groups_in_dist > 0 else 0
+        account_table.add_row(
+            size_range,
+            str(count),
+            f"{percentage:.1f}%",
+            f"{size / 2**20:.1f}",
+        )
+
+    console.print(account_table)
+
+    if stats.get("group_details"):
+        largest = max(stats["group_details"], key=lambda x: x["bytes"])
+        console.print(
+            f"Largest group: [green]{largest['hash']}[/green] with {largest['accounts']} "
+            f"accounts ({largest['bytes'] / 2**20:.1f} MiB)",
+            highlight=False,
+        )
+
     # Test coverage distribution table
     console.print("\n[bold yellow]Test Coverage by Group Size[/bold yellow]")
     coverage_table = Table(show_header=True, header_style="bold magenta")
@@ -460,7 +565,12 @@ def display_stats(stats: Dict, console: Console, verbose: int = 0):
     count=True,
     help="Show verbose output (-v for warnings, -vv for all groups)",
 )
-def main(pre_alloc_folder: Path, verbose: int):
+@click.option(
+    "--memory",
+    is_flag=True,
+    help="Measure the memory per storage slot of the pre-allocations, as loaded and compacted.",
+)
+def main(pre_alloc_folder: Path, verbose: int, memory: bool):
     """
     Display statistics about pre-allocation groups.
 
@@ -471,6 +581,7 @@ def main(pre_alloc_folder: Path, verbose: int):
     - Number of tests and accounts per group (tabulated)
     - Number of groups and tests per fork (tabulated)
     - Number of groups and tests per test module (tabulated)
+    - Memory per storage slot of the pre-allocations, with --memory
 
     The pre_alloc file is generated when running tests with the
     --generate-pre-alloc-groups and --use-pre-alloc-groups flags to optimize
@@ -480,7 +591,7 @@ def main(pre_alloc_folder: Path, verbose: int):
     console = Console()
 
     try:
-        stats = analyze_pre_alloc_folder(pre_alloc_folder, verbose=verbose)
+        stats = analyze_pre_alloc_folder(pre_alloc_folder, verbose=verbose, memory=memory)
         display_stats(stats, console, verbose=verbose)
     except FileNotFoundError:
         console.print(f"[red]Error: Folder not found: {pre_alloc_folder}[/red]")
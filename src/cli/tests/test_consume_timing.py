@@ -0,0 +1,141 @@
+"""Tests for the consume timing database and the `consume_timing` click CLI."""
+
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from pytest_plugins.consume.simulators.helpers.timing import TimingData
+from pytest_plugins.consume.simulators.helpers.timing_database import (
+    TimingDatabase,
+    eip_from_test_id,
+    percentile,
+)
+
+from ..consume_timing import consume_timing
+
+TEST_IDS = [
+    "tests/prague/eip7702_set_code_tx/test_set_code_txs.py::test_a[fork_Prague]",
+    "tests/cancun/eip4844_blobs/test_blob_txs.py::test_b[fork_Cancun]",
+    "tests/frontier/opcodes/test_dup.py::test_c[fork_Frontier]",
+]
+
+
+def make_timing_data(new_payload_durations: List[float]) -> TimingData:
+    """Create the timing data of a test with the given newPayload durations (seconds)."""
+    total = TimingData("Total (seconds)")
+    total.start_time, total.end_time = 0.0, sum(new_payload_durations) + 1.0
+    payloads = total.time("Payloads execution")
+    payloads.start_time, payloads.end_time = 0.0, sum(new_payload_durations)
+    for i, duration in enumerate(new_payload_durations):
+        payload = payloads.time(f"Payload {i + 1}")
+        payload.start_time, payload.end_time = 0.0, duration
+        new_payload = payload.time("engine_newPayloadV4")
+        new_payload.start_time, new_payload.end_time = 0.0, duration
+    return total
+
+
+def record_run(
+    database: TimingDatabase, label: str, latencies: Dict[str, List[float]], client="geth"
+) -> int:
+    """Record a run with the given newPayload latencies per test ID."""
+    run_id = database.start_run(label)
+    for test_id, durations in latencies.items():
+        database.record(
+            run_id=run_id,
+            client=client,
+            client_version="v1.0.0",
+            test_id=test_id,
+            timing_data=make_timing_data(durations),
+        )
+    return run_id
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> TimingDatabase:
+    """Create a timing database with a baseline and a candidate run."""
+    database = TimingDatabase(tmp_path / "timings.db")
+    record_run(database, "baseline", {TEST_IDS[0]: [0.010, 0.012], TEST_IDS[1]: [0.020]})
+    record_run(database, "candidate", {TEST_IDS[0]: [0.030, 0.030], TEST_IDS[1]: [0.021]})
+    return database
+
+
+@pytest.mark.parametrize(
+    "test_id,expected_eip",
+    [(TEST_IDS[0], 7702), (TEST_IDS[1], 4844), (TEST_IDS[2], None)],
+)
+def test_eip_from_test_id(test_id: str, expected_eip: int | None):
+    """Test extracting the EIP number from a test ID."""
+    assert eip_from_test_id(test_id) == expected_eip
+
+
+def test_percentile():
+    """Test the linear interpolation of percentiles."""
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([7.0], 99) == 7.0
+
+
+def test_runs_are_persisted(database: TimingDatabase):
+    """Test that runs and timings are available after reopening the database."""
+    database.close()
+    reopened = TimingDatabase(database.path)
+    assert [(run.label, run.test_count) for run in reopened.runs()] == [
+        ("baseline", 2),
+        ("candidate", 2),
+    ]
+    assert reopened.start_run("baseline") == reopened.run_id("baseline")
+
+
+def test_summary(database: TimingDatabase):
+    """Test the per-client and per-EIP percentile summaries."""
+    run_id = database.run_id("baseline")
+    (client_summary,) = database.summary(run_id, group_by="client")
+    assert client_summary.group == "geth v1.0.0"
+    assert client_summary.count == 3
+    assert client_summary.p50 == pytest.approx(0.012)
+
+    eip_summaries = {s.group: s for s in database.summary(run_id, group_by="eip")}
+    assert set(eip_summaries) == {"EIP-7702", "EIP-4844"}
+    assert eip_summaries["EIP-7702"].count == 2
+
+
+def test_regressions(database: TimingDatabase):
+    """Test that only the tests exceeding the threshold are flagged."""
+    (regression,) = database.regressions(
+        baseline_run_id=database.run_id("baseline"),
+        candidate_run_id=database.run_id("candidate"),
+        threshold=0.2,
+    )
+    assert regression.test_id == TEST_IDS[0]
+    assert regression.ratio == pytest.approx(0.030 / 0.011)
+    assert not database.regressions(
+        baseline_run_id=database.run_id("baseline"),
+        candidate_run_id=database.run_id("candidate"),
+        threshold=0.2,
+        min_delta=0.1,
+    )
+
+
+def test_cli_regressions_exit_code(database: TimingDatabase):
+    """Test that the CLI fails when a regression is found, comparing the two latest runs."""
+    runner = CliRunner()
+    result = runner.invoke(consume_timing, ["regressions", str(database.path)])
+    assert result.exit_code == 1
+    assert "2.73x" in result.output
+
+    result = runner.invoke(consume_timing, ["regressions", str(database.path), "--threshold", "5"])
+    assert result.exit_code == 0
+    assert "No 'engine_newPayloadV%' latency regressions" in result.output
+
+
+def test_cli_summary(database: TimingDatabase):
+    """Test that the CLI summary prints a table per client and per EIP."""
+    result = CliRunner().invoke(
+        consume_timing, ["summary", str(database.path), "--run", "baseline"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "geth v1.0.0" in result.output
+    assert "EIP-7702" in result.output
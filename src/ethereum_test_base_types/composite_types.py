@@ -173,6 +173,10 @@ class Storage(EthereumTestRootModel[Dict[StorageKeyValueType, StorageKeyValueTyp
         """Return the keys of the storage."""
         return set(self.root.keys())
 
+    def non_zero_slots(self) -> Dict[StorageKeyValueType, StorageKeyValueType]:
+        """Return the slots of the storage with a non-zero value."""
+        return {key: value for key, value in self.root.items() if value}
+
     def set_next_slot(self, slot: int) -> "Storage":
         """Set the next slot to be used by `store_next`."""
         self._current_slot = slot
@@ -244,9 +248,17 @@ class Storage(EthereumTestRootModel[Dict[StorageKeyValueType, StorageKeyValueTyp
 
     def must_be_equal(self, address: Address, other: "Storage | None"):
         """Succeed only if "self" is equal to "other" storage."""
-        # Test keys contained in both storage objects
         if other is None:
             other = Storage({})
+        # Compare the whole storages at once, missing keys being equal to zero, and only look
+        # for the first mismatching key if they differ. Keys that can have any value are only
+        # compared key by key.
+        if self.root == other.root or (
+            not self._any_map and self.non_zero_slots() == other.non_zero_slots()
+        ):
+            return
+
+        # Test keys contained in both storage objects
         for key in self.keys() & other.keys():
             if self[key] != other[key]:
                 raise Storage.KeyValueMismatchError(
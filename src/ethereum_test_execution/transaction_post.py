@@ -1,10 +1,11 @@
 """Simple transaction-send then post-check execution format."""
 
-from typing import ClassVar, List
+import asyncio
+from typing import ClassVar, Dict, List, Tuple
 
 import pytest
 
-from ethereum_test_base_types import Alloc, Hash
+from ethereum_test_base_types import Address, Alloc, Bytes, Hash
 from ethereum_test_forks import Fork
 from ethereum_test_rpc import EngineRPC, EthRPC, SendTransactionExceptionError
 from ethereum_test_types import Transaction
@@ -23,6 +24,35 @@ class TransactionPost(BaseExecute):
         "Simple transaction sending, then post-check after all transactions are included"
     )
 
+    def get_post_state(
+        self, eth_rpc: EthRPC
+    ) -> Tuple[List[int], List[Bytes], List[int], Dict[Address, Dict[Hash, Hash]]]:
+        """
+        Fetch the balances, codes, nonces and checked storage values of the post accounts,
+        sending all the batches concurrently.
+        """
+        addresses = list(self.post.root.keys())
+        storage_keys = {
+            address: [Hash(key) for key in account.storage.keys()]
+            for address, account in self.post.root.items()
+            if account is not None and "storage" in account.model_fields_set
+        }
+        async_eth_rpc = eth_rpc.async_rpc
+
+        async def fetch():
+            return await asyncio.gather(
+                async_eth_rpc.get_balances(addresses),
+                async_eth_rpc.get_codes(addresses),
+                async_eth_rpc.get_transaction_counts(addresses),
+                *(
+                    async_eth_rpc.storage_at_keys(address, keys)
+                    for address, keys in storage_keys.items()
+                ),
+            )
+
+        balances, codes, nonces, *storages = async_eth_rpc.run(fetch())
+        return balances, codes, nonces, dict(zip(storage_keys, storages, strict=True))
+
     def execute(self, fork: Fork, eth_rpc: EthRPC, engine_rpc: EngineRPC | None):
         """Execute the format."""
         assert not any(tx.ty == 3 for block in self.blocks for tx in block), (
@@ -39,10 +69,10 @@ class TransactionPost(BaseExecute):
             else:
                 eth_rpc.send_wait_transactions([tx.with_signature_and_sender() for tx in block])
 
-        for address, account in self.post.root.items():
-            balance = eth_rpc.get_balance(address)
-            code = eth_rpc.get_code(address)
-            nonce = eth_rpc.get_transaction_count(address)
+        addresses = list(self.post.root.keys())
+        balances, codes, nonces, storages = self.get_post_state(eth_rpc)
+        for address, balance, code, nonce in zip(addresses, balances, codes, nonces, strict=True):
+            account = self.post.root[address]
             if account is None:
                 assert balance == 0, f"Balance of {address} is {balance}, expected 0."
                 assert code == b"", f"Code of {address} is {code}, expected 0x."
@@ -61,8 +91,9 @@ class TransactionPost(BaseExecute):
                         f"Nonce of {address} is {nonce}, expected {account.nonce}."
                     )
                 if "storage" in account.model_fields_set:
+                    storage_values = storages[address]
                     for key, value in account.storage.items():
-                        storage_value = eth_rpc.get_storage_at(address, Hash(key))
+                        storage_value = storage_values[Hash(key)]
                         assert storage_value == value, (
                             f"Storage value at {key} of {address} is {storage_value},"
                             f"expected {value}."
@@ -11,7 +11,7 @@ from .blockchain import (
 from .collector import FixtureCollector, TestInfo
 from .consume import FixtureConsumer
 from .eof import EOFFixture
-from .pre_alloc_groups import PreAllocGroup, PreAllocGroups
+from .pre_alloc_groups import LazyPreAllocGroups, PreAllocGroup, PreAllocGroups
 from .state import StateFixture
 from .transaction import TransactionFixture
 
@@ -27,6 +27,7 @@ __all__ = [
     "FixtureConsumer",
     "FixtureFormat",
     "LabeledFixtureFormat",
+    "LazyPreAllocGroups",
     "PreAllocGroups",
     "PreAllocGroup",
     "StateFixture",
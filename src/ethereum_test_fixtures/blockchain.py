@@ -574,6 +574,12 @@ class BlockchainEngineXFixture(BlockchainEngineFixtureCommon):
     pre_hash: str
     """Hash of the pre-allocation group this test belongs to."""
 
+    post_state: Alloc | None = Field(None, exclude=True)
+    """
+    Post-state after test execution, only kept to compute `post_state_diff` and not included in
+    the fixture.
+    """
+
     post_state_diff: Alloc | None = None
     """State difference from genesis after test execution (efficiency optimization)."""
 
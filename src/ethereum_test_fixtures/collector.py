@@ -117,6 +117,7 @@ class FixtureCollector:
     # Internal state
     all_fixtures: Dict[Path, Fixtures] = field(default_factory=dict)
     json_path_to_test_item: Dict[Path, TestInfo] = field(default_factory=dict)
+    stdout_fixture_count: int = 0
 
     def get_fixture_basename(self, info: TestInfo) -> Path:
         """Return basename of the fixture file for a given test case."""
@@ -145,6 +146,9 @@ class FixtureCollector:
             / fixture.output_base_dir_name()
             / fixture_basename.with_suffix(fixture.output_file_extension)
         )
+        if self.output_dir.name == "stdout":
+            self.write_fixture_to_stdout(info.get_id(), fixture)
+            return fixture_path
         if fixture_path not in self.all_fixtures.keys():  # relevant when we group by test function
             self.all_fixtures[fixture_path] = Fixtures(root={})
             self.json_path_to_test_item[fixture_path] = info
@@ -153,13 +157,24 @@ class FixtureCollector:
 
         return fixture_path
 
+    def write_fixture_to_stdout(self, fixture_name: str, fixture: BaseFixture) -> None:
+        """
+        Write a fixture to stdout as a member of the top-level JSON object as soon as it's
+        generated, so that a consumer reading the stream can start before filling finishes.
+
+        The combined output is identical to dumping all fixtures at once with `indent=4`.
+        """
+        member = json.dumps({fixture_name: to_json(fixture)}, indent=4)[2:-2]
+        sys.stdout.write(("{\n" if self.stdout_fixture_count == 0 else ",\n") + member)
+        sys.stdout.flush()
+        self.stdout_fixture_count += 1
+
     def dump_fixtures(self) -> None:
         """Dump all collected fixtures to their respective files."""
         if self.output_dir.name == "stdout":
-            combined_fixtures = {
-                k: to_json(v) for fixture in self.all_fixtures.values() for k, v in fixture.items()
-            }
-            json.dump(combined_fixtures, sys.stdout, indent=4)
+            # Fixtures have already been streamed by `add_fixture`; close the JSON object.
+            sys.stdout.write("\n}" if self.stdout_fixture_count else "{}")
+            sys.stdout.flush()
             return
         os.makedirs(self.output_dir, exist_ok=True)
         for fixture_path, fixtures in self.all_fixtures.items():
@@ -3,7 +3,7 @@
 import datetime
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Optional, TextIO
+from typing import Iterator, List, Optional, TextIO
 
 from pydantic import BaseModel, RootModel
 
@@ -11,7 +11,7 @@ from ethereum_test_base_types import HexNumber
 from ethereum_test_forks import Fork
 
 from .base import BaseFixture, FixtureFormat
-from .file import Fixtures
+from .stream import JSONObjectStreamReader
 
 
 class FixtureConsumer(ABC):
@@ -137,21 +137,26 @@ class TestCases(RootModel):
         """Return a string representation of the TestCases object."""
         return f"{self.__class__.__name__}(root={self.root})"
 
-    @classmethod
-    def from_stream(cls, fd: TextIO) -> "TestCases":
-        """Create a TestCases object from a stream."""
-        fixtures: Fixtures = Fixtures.model_validate_json(fd.read())
-        test_cases = [
-            TestCaseStream(
+    @staticmethod
+    def iter_stream(fd: TextIO) -> Iterator[TestCaseStream]:
+        """
+        Yield a test case for each fixture in a stream as soon as the fixture has been read,
+        validating fixtures one at a time instead of reading the whole stream first.
+        """
+        for fixture_name, fixture_json in JSONObjectStreamReader(fd):
+            fixture = BaseFixture.model_validate_json(fixture_json)
+            yield TestCaseStream(
                 id=fixture_name,
                 fixture_hash=fixture.hash,
                 fork=fixture.get_fork(),
                 format=fixture.__class__,
                 fixture=fixture,
             )
-            for fixture_name, fixture in fixtures.items()
-        ]
-        return cls(root=test_cases)
+
+    @classmethod
+    def from_stream(cls, fd: TextIO) -> "TestCases":
+        """Create a TestCases object from a stream."""
+        return cls(root=list(cls.iter_stream(fd)))
 
     @classmethod
     def from_index_file(cls, index_file: Path) -> "TestCases":
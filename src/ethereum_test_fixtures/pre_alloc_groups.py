@@ -1,17 +1,77 @@
 """Pre-allocation group models for test fixture generation."""
 
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict, defaultdict
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Mapping, Set, Tuple
 
 from filelock import FileLock
 from pydantic import Field, computed_field
 
-from ethereum_test_base_types import CamelModel, EthereumTestRootModel
+from ethereum_test_base_types import Address, CamelModel, EthereumTestRootModel
 from ethereum_test_forks import Fork
-from ethereum_test_types import Alloc, Environment
+from ethereum_test_types import Alloc, CompactAlloc, Environment
 
 from .blockchain import FixtureHeader
 
+SHARDS_FOLDER = "shards"
+SPLITS_FOLDER = "splits"
+
+
+def state_root_workers() -> int:
+    """
+    Return the number of processes that can compute the storage roots of a group, sharing the
+    CPUs with the other xdist workers.
+    """
+    xdist_workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    return max(1, (os.cpu_count() or 1) // xdist_workers)
+
+
+def split_tests(
+    test_accounts: Dict[str, List[str]],
+    account_sizes: Dict[str, int],
+    *,
+    max_accounts: int | None = None,
+    max_bytes: int | None = None,
+) -> List[List[str]]:
+    """
+    Split the tests of a group into sub-groups whose pre-allocations have at most
+    `max_accounts` accounts and `max_bytes` bytes of JSON.
+
+    The tests are packed in the order of their ids, a sub-group being closed when adding the
+    accounts of the next test would exceed a limit, so that the split only depends on the tests
+    of the group and their accounts. A test exceeding the limits on its own gets a sub-group of
+    its own.
+    """
+    parts: List[List[str]] = [[]]
+    accounts: Set[str] = set()
+    size = 0
+    for test_id in sorted(test_accounts):
+        new_accounts = {
+            address
+            for address in test_accounts[test_id]
+            if address in account_sizes and address not in accounts
+        }
+        new_size = sum(account_sizes[address] for address in new_accounts)
+        if parts[-1] and (
+            (max_accounts is not None and len(accounts) + len(new_accounts) > max_accounts)
+            or (max_bytes is not None and size + new_size > max_bytes)
+        ):
+            parts.append([])
+            accounts = set()
+            size = 0
+            new_accounts = {
+                address for address in test_accounts[test_id] if address in account_sizes
+            }
+            new_size = sum(account_sizes[address] for address in new_accounts)
+        parts[-1].append(test_id)
+        accounts |= new_accounts
+        size += new_size
+    return parts
+
 
 class PreAllocGroup(CamelModel):
     """
@@ -29,6 +89,13 @@ class PreAllocGroup(CamelModel):
     environment: Environment = Field(..., description="Grouping environment for this test group")
     fork: Fork = Field(..., alias="network")
     pre: Alloc
+    test_accounts: Dict[str, List[Address]] | None = Field(
+        None,
+        description=(
+            "Addresses of the pre-allocation of each test, kept in the partial groups of phase 1 "
+            "to split oversized groups"
+        ),
+    )
 
     def model_post_init(self, __context):
         """Post-init hook to ensure pre is not None."""
@@ -45,7 +112,7 @@ class PreAllocGroup(CamelModel):
         return FixtureHeader.genesis(
             self.fork,
             self.environment.set_fork_requirements(self.fork),
-            self.pre.state_root(),
+            self.pre.state_root(max_workers=state_root_workers()),
         )
 
     def to_file(self, file: Path) -> None:
@@ -63,7 +130,99 @@ class PreAllocGroup(CamelModel):
                     self.test_ids.extend(previous_pre_alloc_group.test_ids)
 
             with open(file, "w") as f:
-                f.write(self.model_dump_json(by_alias=True, exclude_none=True, indent=2))
+                f.write(
+                    self.model_dump_json(
+                        by_alias=True, exclude_none=True, exclude={"test_accounts"}, indent=2
+                    )
+                )
+
+    def to_shard(self, file: Path) -> None:
+        """Save the partial group of a worker, without its genesis, to be merged later."""
+        with open(file, "w") as f:
+            f.write(self.model_dump_json(by_alias=True, exclude_none=True, exclude={"genesis"}))
+
+    @classmethod
+    def merge_files(
+        cls,
+        file: Path,
+        shards: List[Path],
+        *,
+        max_accounts: int | None = None,
+        max_bytes: int | None = None,
+    ) -> Dict[str, str]:
+        """
+        Merge the partial groups of the workers, and the group already in `file` if any, into
+        `file`.
+
+        Accounts are deduplicated by address, keeping the first one found, and the test and
+        account counts of the partial groups are summed. The merge is done per group, not
+        streamed: all the accounts of the group are held in memory, since the state root of its
+        genesis is computed from all of them, but only one group is loaded at a time, and it is
+        validated once, after merging the JSON of its parts.
+
+        If the merged group exceeds `max_accounts` accounts or `max_bytes` bytes of JSON
+        accounts, it is split with `split_tests` into the sub-groups `<key>-<index>` instead,
+        and the key of the sub-group of each test is returned.
+        """
+        merged: Dict[str, Any] = {}
+        accounts: Dict[str, Any] = {}
+        test_accounts: Dict[str, List[str]] = {}
+        for part in ([file] if file.exists() else []) + shards:
+            with open(part) as f:
+                data = json.load(f)
+            data.pop("genesis", None)
+            pre = data.pop("pre")
+            for address, account in pre.items():
+                accounts.setdefault(address.lower(), account)
+            # Tests of a group saved without the accounts of each test share all its accounts.
+            part_test_accounts = data.pop("testAccounts", None) or {}
+            for test_id in data["testIds"]:
+                test_accounts[test_id] = [
+                    address.lower() for address in part_test_accounts.get(test_id, pre)
+                ]
+            if not merged:
+                merged = data
+                continue
+            merged["testCount"] += data["testCount"]
+            merged["preAccountCount"] += data["preAccountCount"]
+            merged["testIds"].extend(data["testIds"])
+
+        parts = [merged["testIds"]]
+        if max_accounts is not None or max_bytes is not None:
+            parts = split_tests(
+                test_accounts,
+                {address: len(json.dumps(account)) for address, account in accounts.items()},
+                max_accounts=max_accounts,
+                max_bytes=max_bytes,
+            )
+        if len(parts) == 1:
+            group = cls.model_validate({**merged, "pre": accounts})
+            with open(file, "w") as f:
+                f.write(group.model_dump_json(by_alias=True, exclude_none=True, indent=2))
+            return {}
+
+        file.unlink(missing_ok=True)
+        assignments: Dict[str, str] = {}
+        for index, test_ids in enumerate(parts):
+            key = f"{file.stem}-{index}"
+            group = cls.model_validate(
+                {
+                    **merged,
+                    "testCount": len(test_ids),
+                    "testIds": test_ids,
+                    "pre": {
+                        address: accounts[address]
+                        for test_id in test_ids
+                        for address in test_accounts[test_id]
+                        if address in accounts
+                    },
+                }
+            )
+            group.pre_account_count = len(group.pre.root)
+            with open(file.with_name(f"{key}.json"), "w") as f:
+                f.write(group.model_dump_json(by_alias=True, exclude_none=True, indent=2))
+            assignments.update(dict.fromkeys(test_ids, key))
+        return assignments
 
 
 class PreAllocGroups(EthereumTestRootModel):
@@ -89,6 +248,46 @@ class PreAllocGroups(EthereumTestRootModel):
         for key, value in self.root.items():
             value.to_file(folder / f"{key}.json")
 
+    def to_shards(self, folder: Path, worker_id: str) -> None:
+        """
+        Save the groups of an xdist worker as partial group files of the folder, without
+        locking, to be merged by `merge_shards` once all the workers are done.
+        """
+        shards_folder = folder / SHARDS_FOLDER
+        shards_folder.mkdir(parents=True, exist_ok=True)
+        for key, value in self.root.items():
+            value.to_shard(shards_folder / f"{key}.{worker_id}.json")
+
+    @staticmethod
+    def merge_shards(
+        folder: Path, *, max_accounts: int | None = None, max_bytes: int | None = None
+    ) -> None:
+        """
+        Merge the partial group files of the workers into the group files of the folder,
+        splitting the groups that exceed `max_accounts` accounts or `max_bytes` bytes.
+
+        The sub-group of each test of a split group is saved to `splits/<key>.json`, where
+        phase 2 looks up the group of the tests whose group hash has no group file.
+        """
+        shards_folder = folder / SHARDS_FOLDER
+        if not shards_folder.exists():
+            return
+        shards: Dict[str, List[Path]] = defaultdict(list)
+        for file in sorted(shards_folder.glob("*.json")):
+            shards[file.name.split(".")[0]].append(file)
+        for key, files in shards.items():
+            assignments = PreAllocGroup.merge_files(
+                folder / f"{key}.json", files, max_accounts=max_accounts, max_bytes=max_bytes
+            )
+            if assignments:
+                splits_file = folder / SPLITS_FOLDER / f"{key}.json"
+                splits_file.parent.mkdir(exist_ok=True)
+                with open(splits_file, "w") as f:
+                    json.dump(assignments, f, indent=2, sort_keys=True)
+            for file in files:
+                file.unlink()
+        shards_folder.rmdir()
+
     def __getitem__(self, item):
         """Get item from root dict."""
         return self.root[item]
@@ -116,3 +315,114 @@ class PreAllocGroups(EthereumTestRootModel):
     def items(self):
         """Get items from root dict."""
         return self.root.items()
+
+
+class LazyPreAllocGroups(Mapping[str, PreAllocGroup]):
+    """
+    Pre-allocation groups of a folder, each loaded on first access and kept in memory only
+    while it is among the `max_loaded` most recently used groups.
+
+    The groups are kept with their pre-allocation as a `CompactAlloc`, which takes several times
+    less memory than an `Alloc` for groups with large storages. Only the `max_materialized` most
+    recently used groups also keep it as an `Alloc`, the form used by the tests, and the others
+    are converted again when a test needs them.
+
+    If a `cache_folder` is given, the first process to load a group saves it there in a
+    pickled compact form, which the other processes, e.g. the other xdist workers, load faster
+    than its JSON file. Each process still builds its own copy of the groups it loads, so the
+    memory of a process is only bounded by `max_loaded` and `max_materialized`. The cached files
+    are named after the size and modification time of the group files, so that a group file
+    that changed is loaded again from its JSON file.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        *,
+        max_loaded: int = 16,
+        max_materialized: int = 2,
+        cache_folder: Path | None = None,
+    ):
+        """Initialize the groups from the files of the folder, without loading them."""
+        assert max_loaded > 0, "at least one group must be kept in memory"
+        assert 0 < max_materialized <= max_loaded, "materialized groups must be kept in memory"
+        self.folder = folder
+        self.files = {file.stem: file for file in sorted(folder.glob("*.json"))}
+        self.splits: Dict[str, Dict[str, str]] = {}
+        self.max_loaded = max_loaded
+        self.max_materialized = max_materialized
+        self.cache_folder = cache_folder
+        self.loaded: OrderedDict[str, Tuple[PreAllocGroup, CompactAlloc]] = OrderedDict()
+        self.materialized: OrderedDict[str, PreAllocGroup] = OrderedDict()
+
+    def group_key(self, key: str, test_id: str) -> str:
+        """Return the key of the group of a test, a sub-group of `key` if it was split."""
+        if key in self.files:
+            return key
+        if key not in self.splits:
+            splits_file = self.folder / SPLITS_FOLDER / f"{key}.json"
+            self.splits[key] = json.loads(splits_file.read_text()) if splits_file.exists() else {}
+        return self.splits[key].get(test_id, key)
+
+    def cache_file(self, key: str) -> Path | None:
+        """Return the file of the group in the shared cache, if enabled."""
+        if self.cache_folder is None:
+            return None
+        stat = self.files[key].stat()
+        return self.cache_folder / f"{key}-{stat.st_size}-{stat.st_mtime_ns}.pickle"
+
+    def load(self, key: str) -> Tuple[PreAllocGroup, CompactAlloc]:
+        """
+        Load a group from the shared cache, or from its file, and return it without its
+        pre-allocation, along with the compact form of its pre-allocation.
+        """
+        cache_file = self.cache_file(key)
+        if cache_file is not None and cache_file.exists():
+            with open(cache_file, "rb") as cached:
+                return pickle.load(cached)
+        with open(self.files[key]) as f:
+            group = PreAllocGroup.model_validate_json(f.read())
+        # The copy does not run `model_post_init`, which would add the pre-allocation of the fork.
+        loaded = group.model_copy(update={"pre": Alloc()}), CompactAlloc.from_alloc(group.pre)
+        if cache_file is not None:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so that no process reads a partial file.
+            with tempfile.NamedTemporaryFile(dir=cache_file.parent, delete=False) as temporary:
+                pickle.dump(loaded, temporary, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary.name, cache_file)
+        return loaded
+
+    def __getitem__(self, key: str) -> PreAllocGroup:
+        """Return a group, loading it if it is not in memory."""
+        group = self.materialized.get(key)
+        if group is not None:
+            self.materialized.move_to_end(key)
+            self.loaded.move_to_end(key)
+            return group
+        loaded = self.loaded.get(key)
+        if loaded is not None:
+            self.loaded.move_to_end(key)
+        elif key not in self.files:
+            raise KeyError(key)
+        else:
+            loaded = self.loaded[key] = self.load(key)
+            if len(self.loaded) > self.max_loaded:
+                evicted, _ = self.loaded.popitem(last=False)
+                self.materialized.pop(evicted, None)
+        group, compact = loaded
+        group = self.materialized[key] = group.model_copy(update={"pre": compact.to_alloc()})
+        if len(self.materialized) > self.max_materialized:
+            self.materialized.popitem(last=False)
+        return group
+
+    def __contains__(self, key: object) -> bool:
+        """Check if the folder has a group, without loading it."""
+        return key in self.files
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the hashes of the groups."""
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        """Return the number of groups."""
+        return len(self.files)
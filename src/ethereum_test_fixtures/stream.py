@@ -0,0 +1,135 @@
+"""Incremental reader for streams containing a single top-level JSON object."""
+
+import json
+import re
+from typing import Iterator, TextIO, Tuple
+
+# Characters relevant to finding the end of a JSON value: string delimiters, escapes and the
+# brackets of nested objects and arrays.
+_SPECIAL_CHARACTERS = re.compile(r'[\\"{}\[\]]')
+_SCALAR_END = re.compile(r"[\s,}\]]")
+_WHITESPACE = " \t\r\n"
+
+
+class JSONObjectStreamReader:
+    """
+    Read the members of a top-level JSON object from a text stream, one at a time.
+
+    Each member is yielded as a tuple of its decoded key and the raw JSON text of its value as
+    soon as the value has been fully read from the stream, without waiting for the end of the
+    stream. Only the current, incomplete member is kept in memory.
+    """
+
+    def __init__(self, fd: TextIO, chunk_size: int = 1 << 16):
+        """Initialize the reader for the given stream."""
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read_chunk(self) -> bool:
+        """Read the next chunk into the buffer, dropping consumed data; return False on EOF."""
+        if self._eof:
+            return False
+        # Grow the read size with the pending data so that large values are read in a linear
+        # number of copies.
+        chunk = self.fd.read(max(self.chunk_size, len(self._buffer) - self._pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        """Return an error describing malformed input at the current position."""
+        context = self._buffer[self._pos : self._pos + 32]
+        return ValueError(f"Invalid JSON object stream: {message} (near {context!r})")
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or an empty string on EOF."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_chunk():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        """Consume and return the next non-whitespace character, which must be in `characters`."""
+        character = self._peek()
+        if not character or character not in characters:
+            raise self._error(f"expected one of {characters!r}")
+        self._pos += 1
+        return character
+
+    def _read_value(self) -> str:
+        """Consume and return the raw JSON text of the next value."""
+        if not self._peek():
+            raise self._error("unexpected end of stream")
+        start = self._pos
+        if self._buffer[start] not in '{["':
+            return self._read_scalar(start)
+        depth = 0
+        in_string = False
+        scan = start
+        while True:
+            match = _SPECIAL_CHARACTERS.search(self._buffer, scan)
+            if match is None or (match.group() == "\\" and match.end() >= len(self._buffer)):
+                # The value (or an escape sequence) continues in the next chunk.
+                scan = len(self._buffer) if match is None else match.start()
+                offset = self._pos
+                if not self._read_chunk():
+                    raise self._error("unexpected end of stream")
+                start -= offset
+                scan -= offset
+                continue
+            character = match.group()
+            scan = match.end()
+            if in_string:
+                if character == "\\":
+                    scan += 1
+                elif character == '"':
+                    in_string = False
+                    if depth == 0:
+                        break
+            elif character == '"':
+                in_string = True
+            elif character in "{[":
+                depth += 1
+            elif character in "}]":
+                depth -= 1
+                if depth == 0:
+                    break
+        self._pos = scan
+        return self._buffer[start:scan]
+
+    def _read_scalar(self, start: int) -> str:
+        """Consume and return the raw JSON text of a number, boolean or null."""
+        while True:
+            match = _SCALAR_END.search(self._buffer, start)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[start : match.start()]
+            offset = self._pos
+            if not self._read_chunk():
+                self._pos = len(self._buffer)
+                return self._buffer[start:]
+            start -= offset
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Yield the key and raw JSON value of each member of the top-level object."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = json.loads(self._read_value())
+            if not isinstance(key, str):
+                raise self._error("expected a string key")
+            self._expect(":")
+            yield key, self._read_value()
+            if self._expect(",}") == "}":
+                return
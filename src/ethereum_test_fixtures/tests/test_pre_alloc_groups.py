@@ -0,0 +1,197 @@
+"""Test the saving and merging of the pre-allocation groups of several workers."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ethereum_test_base_types import Account, Address
+from ethereum_test_forks import Prague
+from ethereum_test_types import Alloc, CompactAlloc, Environment
+from ethereum_test_types.compact_alloc import deep_sizeof
+
+from ..pre_alloc_groups import (
+    SHARDS_FOLDER,
+    LazyPreAllocGroups,
+    PreAllocGroup,
+    PreAllocGroups,
+    split_tests,
+)
+
+
+def worker_groups(worker: int, accounts: range) -> PreAllocGroups:
+    """Return the groups filled by a worker, with one test per account."""
+    return PreAllocGroups(
+        root={
+            "0x01": PreAllocGroup(
+                test_count=len(accounts),
+                pre_account_count=len(accounts),
+                test_ids=[f"test_{worker}_{i}" for i in accounts],
+                environment=Environment(),
+                fork=Prague,
+                pre=Alloc({Address(0x1000 + i): Account(balance=i + 1) for i in accounts}),
+            )
+        }
+    )
+
+
+def test_merge_shards(tmp_path: Path):
+    """Test that the partial groups of the workers are merged into a single group file."""
+    worker_groups(0, range(0, 6)).to_shards(tmp_path, "gw0")
+    worker_groups(1, range(4, 10)).to_shards(tmp_path, "gw1")
+    shards = sorted((tmp_path / SHARDS_FOLDER).glob("*.json"))
+    assert [file.name for file in shards] == ["0x01.gw0.json", "0x01.gw1.json"]
+    # The workers do not compute the genesis of their partial groups.
+    assert "genesis" not in json.loads(shards[0].read_text())
+
+    PreAllocGroups.merge_shards(tmp_path)
+    assert not (tmp_path / SHARDS_FOLDER).exists()
+    groups = PreAllocGroups.from_folder(tmp_path)
+    group = groups["0x01"]
+    assert group.test_count == 12
+    assert group.pre_account_count == 12
+    assert len(group.test_ids) == 12
+    assert all(Address(0x1000 + i) in group.pre for i in range(10))
+
+    # The merged group is the same as a group saved by a single process.
+    expected = worker_groups(0, range(0, 10))
+    assert group.pre == expected["0x01"].pre
+    assert group.genesis == expected["0x01"].genesis
+
+
+def test_merge_shards_into_existing_group(tmp_path: Path):
+    """Test that partial groups are merged with a group already saved in the folder."""
+    worker_groups(0, range(0, 2)).to_folder(tmp_path)
+    worker_groups(1, range(2, 4)).to_shards(tmp_path, "gw1")
+    PreAllocGroups.merge_shards(tmp_path)
+    group = PreAllocGroups.from_folder(tmp_path)["0x01"]
+    assert group.test_count == 4
+    assert group.test_ids == ["test_0_0", "test_0_1", "test_1_2", "test_1_3"]
+
+
+def save_groups(folder: Path, count: int) -> None:
+    """Save several groups to the folder."""
+    for i in range(count):
+        PreAllocGroups(root={f"0x{i:02x}": worker_groups(i, range(i, i + 2))["0x01"]}).to_folder(
+            folder
+        )
+
+
+def test_lazy_groups(tmp_path: Path):
+    """Test that groups are loaded on first access and only the most recent ones are kept."""
+    save_groups(tmp_path, 4)
+    groups = LazyPreAllocGroups(tmp_path, max_loaded=2)
+    assert len(groups) == 4
+    assert "0x03" in groups and "0x04" not in groups
+    assert not groups.loaded
+    group = groups["0x00"]
+    assert groups["0x00"] is group
+    groups["0x01"]
+    groups["0x00"]
+    groups["0x02"]
+    # The least recently used group was dropped.
+    assert list(groups.loaded) == ["0x00", "0x02"]
+    assert groups["0x01"].test_ids == ["test_1_1", "test_1_2"]
+    with pytest.raises(KeyError):
+        groups["0x04"]
+
+
+def test_lazy_groups_keep_compact_pre_allocations(tmp_path: Path):
+    """Test that only the most recently used groups keep their pre-allocation as an `Alloc`."""
+    save_groups(tmp_path, 2)
+    storage = {slot: slot + 1 for slot in range(1_000)}
+    PreAllocGroup(
+        test_count=1,
+        pre_account_count=2,
+        test_ids=["test_storage"],
+        environment=Environment(),
+        fork=Prague,
+        pre=Alloc({Address(0x1000 + i): Account(storage=storage) for i in range(2)}),
+    ).to_file(tmp_path / "0x02.json")
+
+    groups = LazyPreAllocGroups(tmp_path, max_materialized=2)
+    group = groups["0x02"]
+    assert group.pre == PreAllocGroups.from_folder(tmp_path)["0x02"].pre
+    assert groups["0x02"] is group
+    _, compact = groups.loaded["0x02"]
+    assert isinstance(compact, CompactAlloc)
+    assert deep_sizeof(compact) * 3 < deep_sizeof(group.pre.root)
+
+    groups["0x00"]
+    groups["0x01"]
+    assert list(groups.materialized) == ["0x00", "0x01"]
+    assert list(groups.loaded) == ["0x02", "0x00", "0x01"]
+    # Converted again from the compact form of the group kept in memory.
+    assert groups["0x02"] is not group
+    assert groups["0x02"].pre == group.pre
+
+
+def test_lazy_groups_shared_cache(tmp_path: Path):
+    """Test that groups loaded from the shared cache are the same as from their files."""
+    folder, cache_folder = tmp_path / "pre_alloc", tmp_path / "cache"
+    folder.mkdir()
+    save_groups(folder, 2)
+    expected = PreAllocGroups.from_folder(folder)
+    first = LazyPreAllocGroups(folder, cache_folder=cache_folder)
+    assert first["0x00"].pre == expected["0x00"].pre
+    assert len(list(cache_folder.glob("0x00-*.pickle"))) == 1
+
+    second = LazyPreAllocGroups(folder, cache_folder=cache_folder)
+    group = second["0x00"]
+    assert group.pre == expected["0x00"].pre
+    assert group.genesis == expected["0x00"].genesis
+    assert group.test_ids == expected["0x00"].test_ids
+
+    # A modified group file is not read from the cache.
+    save_groups(folder, 1)
+    third = LazyPreAllocGroups(folder, cache_folder=cache_folder)
+    assert third["0x00"].test_count == 2 * expected["0x00"].test_count
+    assert len(list(cache_folder.glob("0x00-*.pickle"))) == 2
+
+
+def test_split_tests():
+    """Test that tests are packed in the order of their ids within the limits."""
+    test_accounts = {
+        "test_c": ["0x03", "0x04"],
+        "test_a": ["0x01", "0x02"],
+        "test_b": ["0x02", "0x03"],
+        "test_d": ["0x05", "0x06", "0x07", "0x08"],
+        "test_e": ["0x08"],
+    }
+    sizes = {f"0x{i:02x}": 10 for i in range(1, 9)}
+    assert split_tests(test_accounts, sizes) == [sorted(test_accounts)]
+    assert split_tests(test_accounts, sizes, max_accounts=3) == [
+        ["test_a", "test_b"],
+        ["test_c"],
+        ["test_d"],
+        ["test_e"],
+    ]
+    assert split_tests(test_accounts, sizes, max_bytes=40) == [
+        ["test_a", "test_b", "test_c"],
+        ["test_d", "test_e"],
+    ]
+
+
+def test_merge_shards_splits_large_groups(tmp_path: Path):
+    """Test that oversized groups are split the same way whatever the workers of the tests."""
+    expected_pre = worker_groups(0, range(0, 10))["0x01"].pre
+
+    for workers in [1, 3]:
+        folder = tmp_path / str(workers)
+        for worker in range(workers):
+            tests = range(worker, 10, workers)
+            worker_group = worker_groups(0, tests)["0x01"]
+            worker_group.test_accounts = {f"test_0_{i}": [Address(0x1000 + i)] for i in tests}
+            PreAllocGroups(root={"0x01": worker_group}).to_shards(folder, f"gw{worker}")
+        PreAllocGroups.merge_shards(folder, max_accounts=4)
+
+        lazy_groups = LazyPreAllocGroups(folder)
+        assert sorted(lazy_groups) == ["0x01-0", "0x01-1", "0x01-2"]
+        assert [lazy_groups[key].test_count for key in sorted(lazy_groups)] == [4, 4, 2]
+        for i in range(10):
+            key = lazy_groups.group_key("0x01", f"test_0_{i}")
+            sub_group = lazy_groups[key]
+            assert f"test_0_{i}" in sub_group.test_ids
+            assert sub_group.pre[Address(0x1000 + i)] == expected_pre[Address(0x1000 + i)]
+            assert "testAccounts" not in (folder / f"{key}.json").read_text()
+        assert lazy_groups.group_key("0x02", "test_0_0") == "0x02"
@@ -0,0 +1,118 @@
+"""Test the incremental JSON object stream reader and streamed consume test cases."""
+
+import io
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+from ..consume import TestCases
+from ..file import Fixtures
+from ..stream import JSONObjectStreamReader
+from ..transaction import FixtureResult, TransactionFixture
+
+
+class ChunkedStream(io.StringIO):
+    """A text stream that returns at most `max_read` characters per read and logs reads."""
+
+    def __init__(self, content: str, max_read: int):
+        """Initialize the stream."""
+        super().__init__(content)
+        self.max_read = max_read
+        self.read_positions: List[int] = []
+
+    def read(self, size: int | None = -1) -> str:
+        """Read at most `max_read` characters."""
+        if size is None or size < 0 or size > self.max_read:
+            size = self.max_read
+        self.read_positions.append(self.tell())
+        return super().read(size)
+
+
+OBJECTS: List[Dict[str, Any]] = [
+    {},
+    {"a": 1},
+    {"a": {"b": [1, 2, {"c": None}], "d": "}{]["}, "e": [], "f": {}},
+    {'key with "quotes" and \\ backslash': {"v": 'a \\" b \\\\ c } {'}},
+    {"number": -1.5e10, "true": True, "false": False, "null": None, "string": "s"},
+    {"unicode": "ñ ü ☃", "nested": [[[[]]]]},
+]
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("max_read", [1, 2, 3, 7, 1024])
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_stream_reader_matches_json(obj: Dict[str, Any], max_read: int, indent: int | None):
+    """Test that the members read from the stream match the decoded JSON object."""
+    stream = ChunkedStream(json.dumps(obj, indent=indent), max_read)
+    members = {
+        key: json.loads(value)
+        for key, value in JSONObjectStreamReader(stream, chunk_size=max_read)
+    }
+    assert members == obj
+    assert list(members) == list(obj)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "",
+        "[]",
+        '{"a": 1',
+        '{"a": {"b": 1}',
+        '{"a" 1}',
+        '{"a": 1 "b": 2}',
+        "{1: 2}",
+    ],
+)
+def test_stream_reader_malformed_input(content: str):
+    """Test that malformed input raises a ValueError."""
+    with pytest.raises(ValueError):
+        list(JSONObjectStreamReader(io.StringIO(content), chunk_size=2))
+
+
+def make_fixture_json(intrinsic_gas: int) -> Dict[str, Any]:
+    """Return the JSON representation of a transaction fixture."""
+    fixture = TransactionFixture(
+        transaction="0x1234",
+        result={"Paris": FixtureResult(intrinsic_gas=intrinsic_gas)},
+    )
+    fixture.fill_info(
+        "t8n-version",
+        "test_case_description",
+        fixture_source_url="fixture_source_url",
+        ref_spec=None,
+        _info_metadata={},
+    )
+    return fixture.json_dict_with_info()
+
+
+def test_test_cases_are_yielded_incrementally():
+    """Test that each test case is yielded before the rest of the stream has been read."""
+    fixtures_json = {f"test_{i}": make_fixture_json(i) for i in range(3)}
+    content = json.dumps(fixtures_json, indent=4)
+    stream = ChunkedStream(content, max_read=64)
+    second_fixture_start = content.index('"test_1"')
+
+    test_cases = TestCases.iter_stream(stream)
+    first = next(test_cases)
+    assert first.id == "test_0"
+    assert max(stream.read_positions) < second_fixture_start
+
+    remaining = list(test_cases)
+    assert [test_case.id for test_case in remaining] == ["test_1", "test_2"]
+
+
+def test_from_stream_matches_fixtures_model():
+    """Test that streamed test cases match the fixtures validated from the whole input."""
+    fixtures_json = {f"test_{i}": make_fixture_json(i) for i in range(3)}
+    content = json.dumps(fixtures_json, indent=4)
+    fixtures = Fixtures.model_validate_json(content)
+
+    test_cases = TestCases.from_stream(io.StringIO(content))
+    assert len(test_cases) == len(fixtures)
+    for test_case, (fixture_name, fixture) in zip(test_cases, fixtures.items(), strict=True):
+        assert test_case.id == fixture_name
+        assert test_case.fixture == fixture
+        assert test_case.fixture_hash == int(fixture.hash, 16)
+        assert test_case.format == fixture.__class__
@@ -1,12 +1,18 @@
 """JSON-RPC methods and helper functions for EEST consume based hive simulators."""
 
+from .async_rpc import AsyncEngineRPC, AsyncEthRPC
+from .cassette import Cassette, CassetteMissError
 from .rpc import BlockNumberType, DebugRPC, EngineRPC, EthRPC, SendTransactionExceptionError
 from .types import BlobAndProofV1, BlobAndProofV2
 
 __all__ = [
+    "AsyncEngineRPC",
+    "AsyncEthRPC",
     "BlobAndProofV1",
     "BlobAndProofV2",
     "BlockNumberType",
+    "Cassette",
+    "CassetteMissError",
     "DebugRPC",
     "EngineRPC",
     "EthRPC",
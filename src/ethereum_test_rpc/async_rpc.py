@@ -0,0 +1,219 @@
+"""
+Asyncio variants of the JSON-RPC clients.
+
+The async clients delegate each call to a blocking client, running it in a thread pool of
+`max_concurrency` workers whose connections are pooled in the session of the blocking client,
+so that responses are parsed into the same typed models and subclass behavior (e.g., the block
+production of the hive `EthRPC`) is kept. Calls awaited concurrently, e.g. with
+`asyncio.gather`, are in flight at the same time. Synchronous code can run a coroutine of the
+client to completion with `run`, and use the blocking client through `sync`.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Sequence, TypeVar
+
+from requests.adapters import HTTPAdapter
+
+from ethereum_test_base_types import Address, Bytes, Hash
+from ethereum_test_types import Transaction
+
+from .rpc import BaseRPC, BlockNumberType, EngineRPC, EthRPC
+from .types import (
+    ForkchoiceState,
+    ForkchoiceUpdateResponse,
+    GetBlobsResponse,
+    GetPayloadResponse,
+    PayloadAttributes,
+    PayloadStatus,
+    TransactionByHashResponse,
+)
+
+RPCType = TypeVar("RPCType", bound=BaseRPC)
+ResultType = TypeVar("ResultType")
+
+
+class AsyncBaseRPC(Generic[RPCType]):
+    """Base class of the async clients, which delegate calls to a blocking client."""
+
+    sync: RPCType
+    max_concurrency: int
+
+    def __init__(self, sync: RPCType, *, max_concurrency: int = 16):
+        """Wrap the blocking client, allowing up to `max_concurrency` calls in flight."""
+        self.sync = sync
+        self.max_concurrency = max_concurrency
+        # Keep the pooled connections of the session unless the pool is too small, and keep any
+        # other transport adapter (e.g., a cassette).
+        adapter = sync.session.get_adapter(sync.url)
+        if type(adapter) is HTTPAdapter and adapter._pool_maxsize < max_concurrency:  # type: ignore[attr-defined]
+            adapter = HTTPAdapter(pool_maxsize=max_concurrency)
+            self.sync.session.mount("http://", adapter)
+            self.sync.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix=self.__class__.__name__
+        )
+
+    async def call(self, function: Callable[..., ResultType], *args, **kwargs) -> ResultType:
+        """Run a method of the blocking client in the thread pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def post_request(self, method: str, *params: Any) -> Any:
+        """Send a JSON-RPC request and await its result."""
+        return await self.call(self.sync.post_request, method, *params)
+
+    async def post_batch(self, calls: Sequence[tuple[str, Sequence[Any]]]) -> List[Any]:
+        """Send a batch of `(method, params)` calls and await their results in order."""
+        return await self.call(self.sync.post_batch, calls)
+
+    def run(self, awaitable: Awaitable[ResultType]) -> ResultType:
+        """Run a coroutine of the client to completion from synchronous code."""
+
+        async def wrapper() -> ResultType:
+            return await awaitable
+
+        return asyncio.run(wrapper())
+
+    def close(self) -> None:
+        """Shut down the thread pool."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        """Return the client."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Shut down the thread pool."""
+        self.close()
+
+
+class AsyncEthRPC(AsyncBaseRPC[EthRPC]):
+    """Asyncio variant of `EthRPC`."""
+
+    async def get_block_by_number(
+        self, block_number: BlockNumberType = "latest", full_txs: bool = True
+    ) -> Any:
+        """`eth_getBlockByNumber`: Returns information about a block by block number."""
+        return await self.call(self.sync.get_block_by_number, block_number, full_txs)
+
+    async def get_balance(self, address: Address, block_number: BlockNumberType = "latest") -> int:
+        """`eth_getBalance`: Returns the balance of the account of given address."""
+        return await self.call(self.sync.get_balance, address, block_number)
+
+    async def get_balances(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[int]:
+        """`eth_getBalance`: Returns the balances of the given addresses in a single batch."""
+        return await self.call(self.sync.get_balances, addresses, block_number)
+
+    async def get_code(self, address: Address, block_number: BlockNumberType = "latest") -> Bytes:
+        """`eth_getCode`: Returns code at a given address."""
+        return await self.call(self.sync.get_code, address, block_number)
+
+    async def get_codes(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[Bytes]:
+        """`eth_getCode`: Returns the code at the given addresses in a single batch."""
+        return await self.call(self.sync.get_codes, addresses, block_number)
+
+    async def get_transaction_count(
+        self, address: Address, block_number: BlockNumberType = "latest"
+    ) -> int:
+        """`eth_getTransactionCount`: Returns the number of transactions sent from an address."""
+        return await self.call(self.sync.get_transaction_count, address, block_number)
+
+    async def get_transaction_counts(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[int]:
+        """
+        `eth_getTransactionCount`: Returns the number of transactions sent from the given
+        addresses in a single batch.
+        """
+        return await self.call(self.sync.get_transaction_counts, addresses, block_number)
+
+    async def get_transaction_by_hash(
+        self, transaction_hash: Hash
+    ) -> TransactionByHashResponse | None:
+        """`eth_getTransactionByHash`: Returns transaction details."""
+        return await self.call(self.sync.get_transaction_by_hash, transaction_hash)
+
+    async def get_transactions_by_hash(
+        self, transaction_hashes: Sequence[Hash]
+    ) -> List[TransactionByHashResponse | None]:
+        """`eth_getTransactionByHash`: Returns the details of the given transactions in a batch."""
+        return await self.call(self.sync.get_transactions_by_hash, transaction_hashes)
+
+    async def get_storage_at(
+        self, address: Address, position: Hash, block_number: BlockNumberType = "latest"
+    ) -> Hash:
+        """`eth_getStorageAt`: Returns the value from a storage position at a given address."""
+        return await self.call(self.sync.get_storage_at, address, position, block_number)
+
+    async def storage_at_keys(
+        self, account: Address, keys: List[Hash], block_number: BlockNumberType = "latest"
+    ) -> Dict[Hash, Hash]:
+        """Retrieve the storage values for the specified keys at a given address in a batch."""
+        return await self.call(self.sync.storage_at_keys, account, keys, block_number)
+
+    async def gas_price(self) -> int:
+        """`eth_gasPrice`: Returns the current gas price."""
+        return await self.call(self.sync.gas_price)
+
+    async def send_raw_transaction(self, transaction_rlp: Bytes) -> Hash:
+        """`eth_sendRawTransaction`: Send a transaction to the client."""
+        return await self.call(self.sync.send_raw_transaction, transaction_rlp)
+
+    async def send_transaction(self, transaction: Transaction) -> Hash:
+        """`eth_sendRawTransaction`: Send a transaction to the client."""
+        return await self.call(self.sync.send_transaction, transaction)
+
+    async def send_transactions(self, transactions: List[Transaction]) -> List[Hash]:
+        """Use `eth_sendRawTransaction` to send a list of transactions to the client in a batch."""
+        return await self.call(self.sync.send_transactions, transactions)
+
+    async def block_number(self) -> int:
+        """`eth_blockNumber`: Returns the number of the most recent block."""
+        return await self.call(self.sync.block_number)
+
+    async def wait_for_transaction(self, transaction: Transaction) -> TransactionByHashResponse:
+        """Wait until a transaction is included in a block."""
+        return await self.call(self.sync.wait_for_transaction, transaction)
+
+    async def wait_for_transactions(
+        self, transactions: List[Transaction]
+    ) -> List[TransactionByHashResponse]:
+        """
+        Wait until all transactions in the list are included in a block; concurrent waits share
+        the inclusion tracker of the blocking client, which polls the chain once for all of them.
+        """
+        return await self.call(self.sync.wait_for_transactions, transactions)
+
+
+class AsyncEngineRPC(AsyncBaseRPC[EngineRPC]):
+    """Asyncio variant of `EngineRPC`."""
+
+    async def new_payload(self, *params: Any, version: int) -> PayloadStatus:
+        """`engine_newPayloadVX`: Attempts to execute the given payload on an execution client."""
+        return await self.call(self.sync.new_payload, *params, version=version)
+
+    async def forkchoice_updated(
+        self,
+        forkchoice_state: ForkchoiceState,
+        payload_attributes: PayloadAttributes | None = None,
+        *,
+        version: int,
+    ) -> ForkchoiceUpdateResponse:
+        """`engine_forkchoiceUpdatedVX`: Updates the forkchoice state of the execution client."""
+        return await self.call(
+            self.sync.forkchoice_updated, forkchoice_state, payload_attributes, version=version
+        )
+
+    async def get_payload(self, payload_id: Bytes, *, version: int) -> GetPayloadResponse:
+        """`engine_getPayloadVX`: Retrieves a payload requested through a forkchoice update."""
+        return await self.call(self.sync.get_payload, payload_id, version=version)
+
+    async def get_blobs(self, versioned_hashes: List[Hash], *, version: int) -> GetBlobsResponse:
+        """`engine_getBlobsVX`: Retrieves blobs from an execution layers tx pool."""
+        return await self.call(self.sync.get_blobs, versioned_hashes, version=version)
@@ -0,0 +1,157 @@
+"""
+Record and replay the JSON-RPC traffic of the RPC clients.
+
+A `Cassette` keeps the JSON-RPC requests sent by a client, without their ids, along with the
+responses they got, and is stored as a JSON-lines file (gzip-compressed if its name ends in
+`.gz`). Mounted on the session of a client, `RecordingAdapter` captures every request sent to
+the node, and `ReplayAdapter` serves the recorded responses instead, without any network access.
+
+Identical requests are answered with their recorded responses in order, repeating the last one
+once they run out, so that a replayed run is deterministic even if it polls the node a different
+number of times. HTTP headers, which might contain credentials, are never recorded.
+"""
+
+import gzip
+import json
+import threading
+from pathlib import Path
+from typing import IO, Any, Dict, List
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from .rpc import BaseRPC
+
+
+class CassetteMissError(Exception):
+    """Raised when a replayed request was never recorded."""
+
+
+def strip_ids(payload: Any) -> Any:
+    """Return a JSON-RPC request, response, or batch of them, without their ids."""
+    if isinstance(payload, list):
+        return [strip_ids(item) for item in payload]
+    return {key: value for key, value in payload.items() if key != "id"}
+
+
+def request_key(payload: Any) -> str:
+    """Return the canonical form of a JSON-RPC request or batch, regardless of its ids."""
+    return json.dumps(strip_ids(payload), sort_keys=True, separators=(",", ":"))
+
+
+class Cassette:
+    """JSON-RPC requests of a client along with the responses they got."""
+
+    interactions: Dict[str, List[Any]]
+
+    def __init__(self) -> None:
+        """Initialize an empty cassette."""
+        self.interactions = {}
+        self.replayed: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def open(path: Path, mode: str) -> IO[str]:
+        """Open the file of a cassette, compressed if its name ends in `.gz`."""
+        if path.suffix == ".gz":
+            return gzip.open(path, "wt" if mode == "w" else "rt")
+        return open(path, mode)
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        """Load a recorded cassette."""
+        cassette = cls()
+        with cls.open(path, "r") as f:
+            for line in f:
+                interaction = json.loads(line)
+                cassette.interactions.setdefault(request_key(interaction["request"]), []).append(
+                    interaction["response"]
+                )
+        return cassette
+
+    def save(self, path: Path) -> None:
+        """Save the recorded interactions, one per line."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.open(path, "w") as f:
+            for key, responses in self.interactions.items():
+                request = json.loads(key)
+                for response in responses:
+                    f.write(
+                        json.dumps(
+                            {"request": request, "response": response}, separators=(",", ":")
+                        )
+                        + "\n"
+                    )
+
+    def record(self, request: Any, response: Any) -> None:
+        """Record the response of a request, ordering the responses of a batch as its calls."""
+        if isinstance(request, list) and isinstance(response, list):
+            responses = {item.get("id"): item for item in response}
+            response = [responses.get(call.get("id")) for call in request]
+        with self.lock:
+            self.interactions.setdefault(request_key(request), []).append(strip_ids(response))
+
+    def replay(self, request: Any) -> Any:
+        """Return the next recorded response of a request, with the ids of the request."""
+        key = request_key(request)
+        with self.lock:
+            if key not in self.interactions:
+                raise CassetteMissError(f"Request not found in the cassette: {key}")
+            responses = self.interactions[key]
+            index = self.replayed.get(key, 0)
+            self.replayed[key] = index + 1
+            response = responses[min(index, len(responses) - 1)]
+        if isinstance(request, list) and isinstance(response, list):
+            return [
+                {**item, "id": call.get("id")}
+                for call, item in zip(request, response, strict=True)
+                if item is not None
+            ]
+        if isinstance(request, dict) and isinstance(response, dict):
+            return {**response, "id": request.get("id")}
+        return response
+
+    def use(self, rpc: BaseRPC, *, replay: bool) -> None:
+        """Record the traffic of the client, or replay it from the cassette."""
+        adapter: BaseAdapter = ReplayAdapter(self) if replay else RecordingAdapter(self)
+        rpc.session.mount("http://", adapter)
+        rpc.session.mount("https://", adapter)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that records the JSON-RPC traffic sent through it to a cassette."""
+
+    def __init__(self, cassette: Cassette, *, pool_maxsize: int = 16):
+        """Initialize the adapter that records to the given cassette."""
+        super().__init__(pool_maxsize=pool_maxsize)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs) -> requests.Response:  # type: ignore[override]
+        """Send the request to the node and record its response, if successful."""
+        response = super().send(request, **kwargs)
+        if response.ok and request.body is not None:
+            self.cassette.record(json.loads(request.body), response.json())
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers the JSON-RPC requests sent through it from a cassette."""
+
+    def __init__(self, cassette: Cassette):
+        """Initialize the adapter that replays the given cassette."""
+        super().__init__()
+        self.cassette = cassette
+
+    def send(self, request, **kwargs) -> requests.Response:  # type: ignore[override]
+        """Return the recorded response of the request."""
+        assert request.body is not None, "JSON-RPC requests must have a body"
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(self.cassette.replay(json.loads(request.body))).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        """Nothing to close, no connection is ever opened."""
@@ -1,9 +1,10 @@
 """JSON-RPC methods and helper functions for EEST consume based hive simulators."""
 
+import threading
 import time
 from itertools import count
 from pprint import pprint
-from typing import Any, ClassVar, Dict, List, Literal
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, List, Literal, Sequence, Tuple
 
 import requests
 from jwt import encode
@@ -23,6 +24,9 @@ from .types import (
     TransactionByHashResponse,
 )
 
+if TYPE_CHECKING:
+    from .async_rpc import AsyncEthRPC
+
 BlockNumberType = int | Literal["latest", "earliest", "pending"]
 
 
@@ -47,10 +51,77 @@ class SendTransactionExceptionError(Exception):
         return super().__str__()
 
 
+class BatchResult:
+    """Result placeholder of a call in a JSON-RPC batch, available once the batch is sent."""
+
+    method: str
+    _response: Dict[str, Any] | None
+
+    def __init__(self, method: str):
+        """Initialize the placeholder of a call to the given method."""
+        self.method = method
+        self._response = None
+
+    def set_response(self, response: Dict[str, Any]) -> None:
+        """Set the JSON-RPC response of the call."""
+        self._response = response
+
+    def result(self) -> Any:
+        """Return the result of the call, or raise its JSON-RPC error."""
+        assert self._response is not None, f"Batch containing {self.method} has not been sent"
+        return BaseRPC.response_result(self._response)
+
+
+class RPCBatch:
+    """
+    Collects JSON-RPC calls and sends them as batch requests, in chunks of at most
+    `BaseRPC.max_batch_size` calls, when the context manager exits or `send` is called.
+    """
+
+    def __init__(self, rpc: "BaseRPC", extra_headers: Dict | None = None):
+        """Initialize an empty batch of calls to the given RPC client."""
+        self.rpc = rpc
+        self.extra_headers = extra_headers
+        self.requests: List[Dict[str, Any]] = []
+        self.results: List[BatchResult] = []
+
+    def call(self, method: str, *params: Any) -> BatchResult:
+        """Add a call to the batch and return the placeholder of its result."""
+        self.requests.append(self.rpc.build_request(method, params))
+        result = BatchResult(f"{self.rpc.namespace}_{method}")
+        self.results.append(result)
+        return result
+
+    def send(self) -> None:
+        """Send the pending calls of the batch."""
+        requests, results = self.requests, self.results
+        self.requests, self.results = [], []
+        for start in range(0, len(requests), self.rpc.max_batch_size):
+            chunk = requests[start : start + self.rpc.max_batch_size]
+            response_json = self.rpc.send_request(chunk, extra_headers=self.extra_headers)
+            if isinstance(response_json, dict):
+                # The server rejected the batch as a whole.
+                BaseRPC.response_result(response_json)
+            responses = {response.get("id"): response for response in response_json}
+            for request, result in zip(chunk, results[start:], strict=False):
+                assert request["id"] in responses, f"No response to {result.method} in batch"
+                result.set_response(responses[request["id"]])
+
+    def __enter__(self) -> "RPCBatch":
+        """Return the batch to add calls to."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Send the batch unless an exception was raised while adding calls."""
+        if exc_type is None:
+            self.send()
+
+
 class BaseRPC:
     """Represents a base RPC class for every RPC call used within EEST based hive simulators."""
 
     namespace: ClassVar[str]
+    max_batch_size: ClassVar[int] = 1000
     response_validation_context: Any | None
 
     def __init__(
@@ -66,6 +137,8 @@ class BaseRPC:
         self.request_id_counter = count(1)
         self.extra_headers = extra_headers
         self.response_validation_context = response_validation_context
+        # Keep connections to the server alive across requests.
+        self.session = requests.Session()
 
     def __init_subclass__(cls) -> None:
         """Set namespace of the RPC class to the lowercase of the class name."""
@@ -74,33 +147,70 @@ class BaseRPC:
             namespace = namespace.removesuffix("RPC")
         cls.namespace = namespace.lower()
 
-    def post_request(self, method: str, *params: Any, extra_headers: Dict | None = None) -> Any:
-        """Send JSON-RPC POST request to the client RPC server at port defined in the url."""
-        if extra_headers is None:
-            extra_headers = {}
+    def build_request(self, method: str, params: Sequence[Any]) -> Dict[str, Any]:
+        """Build the JSON-RPC request object of a method call in the namespace of the class."""
         assert self.namespace, "RPC namespace not set"
-
-        payload = {
+        return {
             "jsonrpc": "2.0",
             "method": f"{self.namespace}_{method}",
             "params": params,
             "id": next(self.request_id_counter),
         }
+
+    def send_request(
+        self, payload: Dict[str, Any] | List[Dict[str, Any]], extra_headers: Dict | None = None
+    ) -> Any:
+        """Send a JSON-RPC request or batch of requests and return the decoded response."""
+        if extra_headers is None:
+            extra_headers = {}
         base_header = {
             "Content-Type": "application/json",
         }
         headers = base_header | self.extra_headers | extra_headers
 
-        response = requests.post(self.url, json=payload, headers=headers)
+        response = self.session.post(self.url, json=payload, headers=headers)
         response.raise_for_status()
-        response_json = response.json()
+        return response.json()
 
+    @staticmethod
+    def response_result(response_json: Dict[str, Any]) -> Any:
+        """Return the result of a JSON-RPC response, or raise its error."""
         if "error" in response_json:
             raise JSONRPCError(**response_json["error"])
 
         assert "result" in response_json, "RPC response didn't contain a result field"
-        result = response_json["result"]
-        return result
+        return response_json["result"]
+
+    def post_request(self, method: str, *params: Any, extra_headers: Dict | None = None) -> Any:
+        """Send JSON-RPC POST request to the client RPC server at port defined in the url."""
+        response_json = self.send_request(
+            self.build_request(method, params), extra_headers=extra_headers
+        )
+        return self.response_result(response_json)
+
+    def batch(self, extra_headers: Dict | None = None) -> RPCBatch:
+        """
+        Return a batch that sends the calls added to it in a single request when the context
+        manager exits.
+
+        ```
+        with rpc.batch() as batch:
+            results = [batch.call("getBalance", f"{address}", "latest") for address in addresses]
+        balances = [result.result() for result in results]
+        ```
+        """
+        return RPCBatch(self, extra_headers=extra_headers)
+
+    def post_batch(
+        self, calls: Sequence[Tuple[str, Sequence[Any]]], *, extra_headers: Dict | None = None
+    ) -> List[Any]:
+        """
+        Send a batch of `(method, params)` calls and return their results in order, raising the
+        JSON-RPC error of the first failed call.
+        """
+        with self.batch(extra_headers=extra_headers) as batch:
+            results = [batch.call(method, *params) for method, params in calls]
+        return [result.result() for result in results]
 
 
 class EthRPC(BaseRPC):
@@ -128,12 +238,44 @@ class EthRPC(BaseRPC):
             url, extra_headers, response_validation_context=response_validation_context
         )
         self.transaction_wait_timeout = transaction_wait_timeout
+        self.inclusion_tracker = InclusionTracker(self)
+        self._async_rpc: "AsyncEthRPC | None" = None
+        self._async_rpc_lock = threading.Lock()
+
+    @property
+    def async_rpc(self) -> "AsyncEthRPC":
+        """Return the asyncio variant of this client, created on first use and then reused."""
+        from .async_rpc import AsyncEthRPC
+
+        with self._async_rpc_lock:
+            if self._async_rpc is None:
+                self._async_rpc = AsyncEthRPC(self)
+            return self._async_rpc
+
+    def close(self) -> None:
+        """Shut down the thread pool of the asyncio variant of this client, if it was created."""
+        with self._async_rpc_lock:
+            if self._async_rpc is not None:
+                self._async_rpc.close()
+                self._async_rpc = None
+
+    def block_number(self) -> int:
+        """`eth_blockNumber`: Returns the number of the most recent block."""
+        return int(self.post_request("blockNumber"), 16)
 
     def get_block_by_number(self, block_number: BlockNumberType = "latest", full_txs: bool = True):
         """`eth_getBlockByNumber`: Returns information about a block by block number."""
         block = hex(block_number) if isinstance(block_number, int) else block_number
         return self.post_request("getBlockByNumber", block, full_txs)
 
+    def get_blocks_by_number(
+        self, block_numbers: Sequence[int], full_txs: bool = True
+    ) -> List[Dict[str, Any] | None]:
+        """`eth_getBlockByNumber`: Returns information about the given blocks in a single batch."""
+        return self.post_batch(
+            [("getBlockByNumber", (hex(block_number), full_txs)) for block_number in block_numbers]
+        )
+
     def get_balance(self, address: Address, block_number: BlockNumberType = "latest") -> int:
         """`eth_getBalance`: Returns the balance of the account of given address."""
         block = hex(block_number) if isinstance(block_number, int) else block_number
@@ -144,6 +286,35 @@ class EthRPC(BaseRPC):
         block = hex(block_number) if isinstance(block_number, int) else block_number
         return Bytes(self.post_request("getCode", f"{address}", block))
 
+    def get_balances(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[int]:
+        """`eth_getBalance`: Returns the balances of the given addresses in a single batch."""
+        block = hex(block_number) if isinstance(block_number, int) else block_number
+        results = self.post_batch([("getBalance", (f"{address}", block)) for address in addresses])
+        return [int(result, 16) for result in results]
+
+    def get_codes(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[Bytes]:
+        """`eth_getCode`: Returns the code at the given addresses in a single batch."""
+        block = hex(block_number) if isinstance(block_number, int) else block_number
+        results = self.post_batch([("getCode", (f"{address}", block)) for address in addresses])
+        return [Bytes(result) for result in results]
+
+    def get_transaction_counts(
+        self, addresses: Sequence[Address], block_number: BlockNumberType = "latest"
+    ) -> List[int]:
+        """
+        `eth_getTransactionCount`: Returns the number of transactions sent from the given
+        addresses in a single batch.
+        """
+        block = hex(block_number) if isinstance(block_number, int) else block_number
+        results = self.post_batch(
+            [("getTransactionCount", (f"{address}", block)) for address in addresses]
+        )
+        return [int(result, 16) for result in results]
+
     def get_transaction_count(
         self, address: Address, block_number: BlockNumberType = "latest"
     ) -> int:
@@ -164,6 +335,26 @@ class EthRPC(BaseRPC):
             pprint(e.errors())
             raise e
 
+    def get_transactions_by_hash(
+        self, transaction_hashes: Sequence[Hash]
+    ) -> List[TransactionByHashResponse | None]:
+        """`eth_getTransactionByHash`: Returns the details of the given transactions in a batch."""
+        results = self.post_batch(
+            [("getTransactionByHash", (f"{tx_hash}",)) for tx_hash in transaction_hashes]
+        )
+        try:
+            return [
+                TransactionByHashResponse.model_validate(
+                    result, context=self.response_validation_context
+                )
+                if result is not None
+                else None
+                for result in results
+            ]
+        except ValidationError as e:
+            pprint(e.errors())
+            raise e
+
     def get_storage_at(
         self, address: Address, position: Hash, block_number: BlockNumberType = "latest"
     ) -> Hash:
@@ -196,71 +387,73 @@ class EthRPC(BaseRPC):
         except Exception as e:
             raise SendTransactionExceptionError(str(e), tx=transaction) from e
 
-    def send_transactions(self, transactions: List[Transaction]) -> List[Hash]:
-        """Use `eth_sendRawTransaction` to send a list of transactions to the client."""
-        return [self.send_transaction(tx) for tx in transactions]
+    def send_raw_transactions(self, transaction_rlps: Sequence[Bytes]) -> List[Hash]:
+        """`eth_sendRawTransaction`: Send a list of transactions to the client in a batch."""
+        with self.batch() as batch:
+            results = [
+                batch.call("sendRawTransaction", f"{transaction_rlp.hex()}")
+                for transaction_rlp in transaction_rlps
+            ]
+        hashes: List[Hash] = []
+        for transaction_rlp, result in zip(transaction_rlps, results, strict=True):
+            try:
+                result_hash = Hash(result.result())
+                assert result_hash is not None
+                hashes.append(result_hash)
+            except Exception as e:
+                raise SendTransactionExceptionError(str(e), tx_rlp=transaction_rlp) from e
+        return hashes
+
+    def send_transactions(
+        self, transactions: List[Transaction], *, ignore_errors: bool = False
+    ) -> List[Hash]:
+        """
+        Use `eth_sendRawTransaction` to send a list of transactions to the client in a batch.
+
+        With `ignore_errors`, the errors returned for some of the transactions, e.g. when they
+        are resubmitted and the client already knows them, are not raised.
+        """
+        with self.batch() as batch:
+            results = [
+                batch.call("sendRawTransaction", f"{transaction.rlp().hex()}")
+                for transaction in transactions
+            ]
+        if ignore_errors:
+            return [transaction.hash for transaction in transactions]
+        for transaction, result in zip(transactions, results, strict=True):
+            try:
+                result_hash = Hash(result.result())
+                assert result_hash == transaction.hash
+                assert result_hash is not None
+            except Exception as e:
+                raise SendTransactionExceptionError(str(e), tx=transaction) from e
+        return [transaction.hash for transaction in transactions]
 
     def storage_at_keys(
         self, account: Address, keys: List[Hash], block_number: BlockNumberType = "latest"
     ) -> Dict[Hash, Hash]:
         """
         Retrieve the storage values for the specified keys at a given address and block
-        number.
+        number, in a single batch.
         """
-        results: Dict[Hash, Hash] = {}
-        for key in keys:
-            storage_value = self.get_storage_at(account, key, block_number)
-            results[key] = storage_value
-        return results
+        block = hex(block_number) if isinstance(block_number, int) else block_number
+        results = self.post_batch(
+            [("getStorageAt", (f"{account}", f"{key}", block)) for key in keys]
+        )
+        return {key: Hash(result) for key, result in zip(keys, results, strict=True)}
 
     def wait_for_transaction(self, transaction: Transaction) -> TransactionByHashResponse:
-        """Use `eth_getTransactionByHash` to wait until a transaction is included in a block."""
-        tx_hash = transaction.hash
-        start_time = time.time()
-        while True:
-            tx = self.get_transaction_by_hash(tx_hash)
-            if tx is not None and tx.block_number is not None:
-                return tx
-            if (time.time() - start_time) > self.transaction_wait_timeout:
-                break
-            time.sleep(1)
-        raise Exception(
-            f"Transaction {tx_hash} ({transaction.model_dump_json()}) not included in a "
-            f"block after {self.transaction_wait_timeout} seconds"
-        )
+        """Wait until a transaction is included in a block."""
+        return self.wait_for_transactions([transaction])[0]
 
     def wait_for_transactions(
         self, transactions: List[Transaction]
     ) -> List[TransactionByHashResponse]:
         """
-        Use `eth_getTransactionByHash` to wait until all transactions in list are included in a
-        block.
+        Wait until all transactions in list are included in a block, following the new blocks of
+        the chain with the inclusion tracker instead of polling each transaction.
         """
-        tx_hashes = [tx.hash for tx in transactions]
-        responses: List[TransactionByHashResponse] = []
-        start_time = time.time()
-        while True:
-            i = 0
-            while i < len(tx_hashes):
-                tx_hash = tx_hashes[i]
-                tx = self.get_transaction_by_hash(tx_hash)
-                if tx is not None and tx.block_number is not None:
-                    responses.append(tx)
-                    tx_hashes.pop(i)
-                else:
-                    i += 1
-            if not tx_hashes:
-                return responses
-            if (time.time() - start_time) > self.transaction_wait_timeout:
-                break
-            time.sleep(1)
-        missing_txs_strings = [
-            f"{tx.hash} ({tx.model_dump_json()})" for tx in transactions if tx.hash in tx_hashes
-        ]
-        raise Exception(
-            f"Transactions {', '.join(missing_txs_strings)} not included in a block "
-            f"after {self.transaction_wait_timeout} seconds"
-        )
+        return self.inclusion_tracker.wait_for_transactions(transactions)
 
     def send_wait_transaction(self, transaction: Transaction):
         """Send transaction and waits until it is included in a block."""
@@ -273,6 +466,193 @@ class EthRPC(BaseRPC):
         return self.wait_for_transactions(transactions)
 
 
+class InclusionTracker:
+    """
+    Track the inclusion of transactions by following the new blocks of the chain.
+
+    Instead of polling `eth_getTransactionByHash` for every pending transaction, the tracker
+    polls `eth_blockNumber` and fetches the new blocks, with their transaction hashes only, in a
+    single batch, resolving all the pending waiters from the transactions of each block.
+
+    The tracker is shared by all the waits of its `EthRPC` (e.g., across the tests of a session,
+    or concurrent waits from several threads, of which only one polls at a time). It estimates
+    the block time from the block timestamps to sleep until the next block is due, then backs off
+    exponentially from `min_poll_interval` to `max_poll_interval` until the block arrives.
+
+    If the chain is reorganized and a transaction is no longer included when its details are
+    fetched, the tracker follows the chain again from the block before the one it was seen in.
+    """
+
+    eth_rpc: "EthRPC"
+    min_poll_interval: float
+    max_poll_interval: float
+    poll_interval: float
+    head: int
+    head_time: float | None
+    head_timestamp: int | None
+    block_time: float | None
+
+    def __init__(
+        self,
+        eth_rpc: "EthRPC",
+        *,
+        min_poll_interval: float = 0.1,
+        max_poll_interval: float = 2.0,
+    ):
+        """Initialize the tracker of the given client."""
+        self.eth_rpc = eth_rpc
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.poll_interval = min_poll_interval
+        self.head = -1
+        self.head_time = None
+        self.head_timestamp = None
+        self.block_time = None
+        self.waiters: Dict[Hash, int] = {}
+        self.included: Dict[Hash, int] = {}
+        self.polling = False
+        self.condition = threading.Condition()
+
+    def wait_for_transactions(
+        self, transactions: List[Transaction]
+    ) -> List[TransactionByHashResponse]:
+        """Wait until all transactions are included in a block and return their details."""
+        tx_hashes = list(dict.fromkeys(tx.hash for tx in transactions))
+        with self.condition:
+            if not self.waiters:
+                # Nobody followed the chain since the last wait, so skip the blocks produced in
+                # the meantime: the lookup below finds the transactions they include.
+                self.head = self.eth_rpc.block_number()
+                self.head_timestamp = None
+            for tx_hash in tx_hashes:
+                self.waiters[tx_hash] = self.waiters.get(tx_hash, 0) + 1
+        try:
+            responses = dict(
+                zip(tx_hashes, self.eth_rpc.get_transactions_by_hash(tx_hashes), strict=True)
+            )
+            with self.condition:
+                self.included.update(
+                    (tx_hash, int(tx.block_number))
+                    for tx_hash, tx in responses.items()
+                    if tx is not None and tx.block_number is not None
+                )
+            deadline = time.time() + self.eth_rpc.transaction_wait_timeout
+            while True:
+                self.follow_blocks(tx_hashes, deadline)
+                with self.condition:
+                    missing = [tx_hash for tx_hash in tx_hashes if tx_hash not in self.included]
+                found_in_blocks = [
+                    tx_hash
+                    for tx_hash, tx in responses.items()
+                    if tx is None or tx.block_number is None
+                ]
+                if missing or not found_in_blocks:
+                    break
+                responses.update(
+                    zip(
+                        found_in_blocks,
+                        self.eth_rpc.get_transactions_by_hash(found_in_blocks),
+                        strict=True,
+                    )
+                )
+                with self.condition:
+                    for tx_hash in found_in_blocks:
+                        response = responses[tx_hash]
+                        if response is None or response.block_number is None:
+                            # The block was reorganized out of the chain after it was fetched:
+                            # follow the chain again from the block before it.
+                            self.head = min(self.head, self.included.pop(tx_hash, 0) - 1)
+                            self.head_timestamp = None
+        finally:
+            with self.condition:
+                for tx_hash in tx_hashes:
+                    self.waiters[tx_hash] -= 1
+                    if not self.waiters[tx_hash]:
+                        del self.waiters[tx_hash]
+                        self.included.pop(tx_hash, None)
+        if missing:
+            missing_txs_strings = [
+                f"{tx.hash} ({tx.model_dump_json()})" for tx in transactions if tx.hash in missing
+            ]
+            raise Exception(
+                f"Transactions {', '.join(missing_txs_strings)} not included in a block "
+                f"after {self.eth_rpc.transaction_wait_timeout} seconds"
+            )
+        included_responses: List[TransactionByHashResponse] = []
+        for tx in transactions:
+            response = responses[tx.hash]
+            assert response is not None, f"Transaction {tx.hash} not found after its inclusion"
+            included_responses.append(response)
+        return included_responses
+
+    def follow_blocks(self, tx_hashes: List[Hash], deadline: float) -> None:
+        """Follow the new blocks until all transactions are included or the deadline passes."""
+        while True:
+            with self.condition:
+                while self.polling and not self.included.keys() >= set(tx_hashes):
+                    if not self.condition.wait(deadline - time.time()):
+                        return
+                if self.included.keys() >= set(tx_hashes) or time.time() > deadline:
+                    return
+                self.polling = True
+            try:
+                time.sleep(max(0.0, min(self.poll_delay(), deadline - time.time())))
+                self.poll()
+            finally:
+                with self.condition:
+                    self.polling = False
+                    self.condition.notify_all()
+
+    def poll_delay(self) -> float:
+        """Return the time to wait before polling the head of the chain again."""
+        if self.head_time is not None and self.block_time is not None:
+            next_block_delay = self.head_time + self.block_time - time.time()
+            if next_block_delay > self.poll_interval:
+                return min(next_block_delay, self.max_poll_interval)
+        return self.poll_interval
+
+    def poll(self) -> None:
+        """Fetch the blocks produced since the last poll and resolve their transactions."""
+        head = self.eth_rpc.block_number()
+        if head < self.head:
+            # The chain was reorganized to a shorter one: forget the inclusions in the dropped
+            # blocks, whose transactions are pending again.
+            with self.condition:
+                self.head = head
+                self.head_timestamp = None
+                self.included = {
+                    tx_hash: block_number
+                    for tx_hash, block_number in self.included.items()
+                    if block_number <= head
+                }
+            return
+        if head == self.head:
+            self.poll_interval = min(self.poll_interval * 2, self.max_poll_interval)
+            return
+        blocks = self.eth_rpc.get_blocks_by_number(range(self.head + 1, head + 1), full_txs=False)
+        block_tx_hashes = {
+            Hash(tx_hash): int(block["number"], 16)
+            for block in blocks
+            if block is not None
+            for tx_hash in block["transactions"]
+        }
+        last_block = blocks[-1]
+        if last_block is not None:
+            timestamp = int(last_block["timestamp"], 16)
+            if self.head_timestamp is not None:
+                self.block_time = (timestamp - self.head_timestamp) / (head - self.head)
+            self.head_timestamp = timestamp
+        self.head_time = time.time()
+        self.poll_interval = self.min_poll_interval
+        with self.condition:
+            self.head = head
+            self.included.update(
+                (tx_hash, block_number)
+                for tx_hash, block_number in block_tx_hashes.items()
+                if tx_hash in self.waiters
+            )
+
+
 class DebugRPC(EthRPC):
     """
     Represents an `debug_X` RPC class for every default ethereum RPC method used within EEST based
@@ -290,8 +670,10 @@ class EngineRPC(BaseRPC):
     simulators.
     """
 
-    def post_request(self, method: str, *params: Any, extra_headers: Dict | None = None) -> Any:
-        """Send JSON-RPC POST request to the client RPC server at port defined in the url."""
+    def send_request(
+        self, payload: Dict[str, Any] | List[Dict[str, Any]], extra_headers: Dict | None = None
+    ) -> Any:
+        """Send a JSON-RPC request or batch of requests authenticated with a JWT token."""
         if extra_headers is None:
             extra_headers = {}
         jwt_token = encode(
@@ -302,7 +684,7 @@ class EngineRPC(BaseRPC):
         extra_headers = {
             "Authorization": f"Bearer {jwt_token}",
         } | extra_headers
-        return super().post_request(method, *params, extra_headers=extra_headers)
+        return super().send_request(payload, extra_headers=extra_headers)
 
     def new_payload(self, *params: Any, version: int) -> PayloadStatus:
         """`engine_newPayloadVX`: Attempts to execute the given payload on an execution client."""
@@ -0,0 +1 @@
+"""Tests for the ethereum_test_rpc package."""
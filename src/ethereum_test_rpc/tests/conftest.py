@@ -0,0 +1,141 @@
+"""Local JSON-RPC server used to test the RPC clients."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Generator, List, Set
+
+import pytest
+
+from ethereum_test_base_types import Bytes, Hash, to_json
+from ethereum_test_types import Transaction
+
+REJECTED_TRANSACTION = Bytes(b"\x01\x02")
+
+
+class JSONRPCServer(ThreadingHTTPServer):
+    """A JSON-RPC server that logs the requests it receives."""
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Initialize the server on a free local port."""
+        super().__init__(("127.0.0.1", 0), JSONRPCRequestHandler)
+        self.http_requests: List[Any] = []
+        self.client_ports: Set[int] = set()
+        self.headers: List[Dict[str, str]] = []
+        self.response_delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.blocks: List[List[Hash]] = [[]]
+        self.block_timestamps: List[int] = [int(time.time())]
+        self.transactions: Dict[Hash, Dict[str, Any]] = {}
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the server."""
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def include(self, *transactions: Transaction) -> None:
+        """Mine a new block that includes the given transactions."""
+        block_number = len(self.blocks)
+        self.blocks.append([tx.hash for tx in transactions])
+        self.block_timestamps.append(int(time.time()))
+        for tx in transactions:
+            self.transactions[tx.hash] = {
+                **to_json(tx),
+                "hash": str(tx.hash),
+                "blockNumber": hex(block_number),
+            }
+
+    def reorg(self, block_number: int) -> None:
+        """Drop the blocks after the given one, returning their transactions to the pool."""
+        for block in self.blocks[block_number + 1 :]:
+            for tx_hash in block:
+                self.transactions[tx_hash]["blockNumber"] = None
+        del self.blocks[block_number + 1 :]
+        del self.block_timestamps[block_number + 1 :]
+
+    def call_result(self, method: str, params: List[Any]) -> Any:
+        """Return the result of a JSON-RPC call."""
+        if method == "eth_getBalance":
+            return hex(int(params[0], 16))
+        if method == "eth_getStorageAt":
+            return params[1]
+        if method == "eth_sendRawTransaction":
+            if params[0] == REJECTED_TRANSACTION.hex():
+                raise ValueError("rejected")
+            return str(Bytes(params[0]).keccak256())
+        if method == "eth_getTransactionByHash":
+            return self.transactions.get(Hash(params[0]))
+        if method == "eth_blockNumber":
+            return hex(len(self.blocks) - 1)
+        if method == "eth_getBlockByNumber":
+            block_number = int(params[0], 16)
+            if block_number >= len(self.blocks):
+                return None
+            return {
+                "number": hex(block_number),
+                "timestamp": hex(self.block_timestamps[block_number]),
+                "transactions": [str(tx_hash) for tx_hash in self.blocks[block_number]],
+            }
+        if method == "engine_exchangeCapabilities":
+            return params[0]
+        raise KeyError(method)
+
+
+class JSONRPCRequestHandler(BaseHTTPRequestHandler):
+    """Reply to single and batch JSON-RPC requests, in reverse order for batches."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: JSONRPCServer
+
+    def handle_call(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Reply to a single call."""
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request["id"]}
+        try:
+            response["result"] = self.server.call_result(request["method"], request["params"])
+        except (KeyError, ValueError) as e:
+            response["error"] = {"code": -1, "message": str(e)}
+        return response
+
+    def do_POST(self):  # noqa: N802
+        """Reply to a JSON-RPC request or batch of requests."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.http_requests.append(body)
+        self.server.client_ports.add(self.client_address[1])
+        self.server.headers.append(dict(self.headers))
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(self.server.response_delay)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if isinstance(body, list):
+            response: Any = [self.handle_call(call) for call in reversed(body)]
+        else:
+            response = self.handle_call(body)
+        content = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Silence the request logging."""
+        pass
+
+
+@pytest.fixture
+def server() -> Generator[JSONRPCServer, None, None]:
+    """Run the JSON-RPC server in a background thread."""
+    server = JSONRPCServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,79 @@
+"""Test the asyncio variants of the RPC clients."""
+
+import asyncio
+import time
+
+import pytest
+
+from ethereum_test_base_types import Address, Hash
+from ethereum_test_types import Transaction
+
+from ..async_rpc import AsyncEngineRPC, AsyncEthRPC
+from ..rpc import EngineRPC, EthRPC
+from .conftest import JSONRPCServer
+
+
+def test_concurrent_calls_are_in_flight_together(server: JSONRPCServer):
+    """Test that calls gathered together overlap instead of running one after the other."""
+    server.response_delay = 0.2
+    with AsyncEthRPC(EthRPC(server.url), max_concurrency=8) as eth_rpc:
+
+        async def get_balances():
+            return await asyncio.gather(*(eth_rpc.get_balance(Address(i)) for i in range(8)))
+
+        start = time.perf_counter()
+        assert eth_rpc.run(get_balances()) == list(range(8))
+        elapsed = time.perf_counter() - start
+    assert server.max_in_flight == 8
+    assert elapsed < 8 * server.response_delay / 2
+
+
+def test_max_concurrency_limits_calls_in_flight(server: JSONRPCServer):
+    """Test that no more than `max_concurrency` calls are sent at the same time."""
+    server.response_delay = 0.05
+    with AsyncEthRPC(EthRPC(server.url), max_concurrency=2) as eth_rpc:
+
+        async def get_balances():
+            return await asyncio.gather(*(eth_rpc.get_balance(Address(i)) for i in range(6)))
+
+        assert eth_rpc.run(get_balances()) == list(range(6))
+    assert server.max_in_flight == 2
+
+
+def test_batched_methods_and_sync_facade(server: JSONRPCServer):
+    """Test that bulk methods keep batching and that the blocking client remains usable."""
+    with AsyncEthRPC(EthRPC(server.url)) as eth_rpc:
+        keys = [Hash(i) for i in range(5)]
+        assert eth_rpc.run(eth_rpc.storage_at_keys(Address(1), keys)) == {k: k for k in keys}
+        assert eth_rpc.sync.get_balance(Address(3)) == 3
+    assert [len(r) if isinstance(r, list) else 1 for r in server.http_requests] == [5, 1]
+
+
+def test_wait_for_transactions_times_out(server: JSONRPCServer):
+    """Test that waiting for transactions that never get included raises after the timeout."""
+    eth_rpc = AsyncEthRPC(EthRPC(server.url, transaction_wait_timeout=0))
+    tx = Transaction(nonce=0).with_signature_and_sender()
+    with pytest.raises(Exception, match="not included in a block"):
+        eth_rpc.run(eth_rpc.wait_for_transactions([tx]))
+    eth_rpc.close()
+
+
+def test_engine_rpc_sends_the_jwt_header(server: JSONRPCServer):
+    """Test that the async engine client authenticates its requests like the blocking one."""
+    with AsyncEngineRPC(EngineRPC(server.url)) as engine_rpc:
+        capabilities = ["engine_newPayloadV4"]
+        result = engine_rpc.run(engine_rpc.post_request("exchangeCapabilities", capabilities))
+        assert result == capabilities
+    assert server.headers[0]["Authorization"].startswith("Bearer ")
+
+
+def test_async_rpc_is_reused_by_the_blocking_client(server: JSONRPCServer):
+    """Test that the blocking client creates its asyncio variant once and closes it."""
+    eth_rpc = EthRPC(server.url)
+    async_eth_rpc = eth_rpc.async_rpc
+    assert eth_rpc.async_rpc is async_eth_rpc
+    assert async_eth_rpc.run(async_eth_rpc.get_balance(Address(3))) == 3
+    eth_rpc.close()
+    assert async_eth_rpc.executor._shutdown
+    assert eth_rpc.async_rpc is not async_eth_rpc
+    eth_rpc.close()
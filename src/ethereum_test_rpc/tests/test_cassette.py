@@ -0,0 +1,67 @@
+"""Test the recording and offline replay of the JSON-RPC traffic of the RPC clients."""
+
+from pathlib import Path
+
+import pytest
+
+from ethereum_test_base_types import Address, Hash
+
+from ..async_rpc import AsyncEthRPC
+from ..cassette import Cassette, CassetteMissError, request_key
+from ..rpc import EthRPC
+from .conftest import JSONRPCServer
+
+OFFLINE_URL = "http://127.0.0.1:1"
+
+
+def record(server: JSONRPCServer) -> Cassette:
+    """Record a few single and batch requests sent to the server."""
+    cassette = Cassette()
+    eth_rpc = EthRPC(server.url)
+    cassette.use(eth_rpc, replay=False)
+    assert eth_rpc.get_balance(Address(1)) == 1
+    assert eth_rpc.block_number() == 0
+    server.blocks.append([])
+    assert eth_rpc.block_number() == 1
+    assert eth_rpc.get_balances([Address(i) for i in range(5)]) == list(range(5))
+    return cassette
+
+
+def test_request_key_ignores_ids():
+    """Test that requests differing only in their ids have the same key."""
+    call = {"jsonrpc": "2.0", "method": "eth_blockNumber", "params": []}
+    assert request_key({**call, "id": 1}) == request_key({**call, "id": 7})
+    assert request_key([{**call, "id": 1}]) == request_key([{**call, "id": 2}])
+    assert request_key({**call, "id": 1}) != request_key([{**call, "id": 1}])
+
+
+@pytest.mark.parametrize("file_name", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_replay_offline(server: JSONRPCServer, tmp_path: Path, file_name: str):
+    """Test that a saved cassette answers the same requests without the node."""
+    record(server).save(tmp_path / file_name)
+    cassette = Cassette.load(tmp_path / file_name)
+    eth_rpc = EthRPC(OFFLINE_URL)
+    cassette.use(eth_rpc, replay=True)
+    assert eth_rpc.get_balance(Address(1)) == 1
+    # Identical requests get their responses in the recorded order, then the last one again.
+    assert [eth_rpc.block_number() for _ in range(3)] == [0, 1, 1]
+    # Batch responses are matched to the calls by the ids of the replayed batch.
+    assert eth_rpc.get_balances([Address(i) for i in range(5)]) == list(range(5))
+
+
+def test_replay_miss(server: JSONRPCServer):
+    """Test that a request that was never recorded raises."""
+    cassette = record(server)
+    eth_rpc = EthRPC(OFFLINE_URL)
+    cassette.use(eth_rpc, replay=True)
+    with pytest.raises(CassetteMissError):
+        eth_rpc.storage_at_keys(Address(1), [Hash(1)])
+
+
+def test_async_client_keeps_the_cassette(server: JSONRPCServer):
+    """Test that the asynchronous client sends its requests through the cassette."""
+    cassette = record(server)
+    eth_rpc = EthRPC(OFFLINE_URL)
+    cassette.use(eth_rpc, replay=True)
+    with AsyncEthRPC(eth_rpc, max_concurrency=32) as async_eth_rpc:
+        assert async_eth_rpc.run(async_eth_rpc.get_balance(Address(1))) == 1
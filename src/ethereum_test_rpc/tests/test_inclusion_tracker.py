@@ -0,0 +1,146 @@
+"""Test the block-driven inclusion tracking of the RPC clients."""
+
+import asyncio
+import threading
+from typing import Any, List
+
+import pytest
+
+from ethereum_test_types import Transaction
+
+from ..async_rpc import AsyncEthRPC
+from ..rpc import EthRPC
+from .conftest import JSONRPCServer
+
+
+def signed_transactions(count: int) -> List[Transaction]:
+    """Return `count` signed transactions with distinct hashes."""
+    return [Transaction(nonce=nonce).with_signature_and_sender() for nonce in range(count)]
+
+
+def calls_of(server: JSONRPCServer, method: str) -> List[Any]:
+    """Return the calls to a method received by the server, including those in batches."""
+    calls = []
+    for request in server.http_requests:
+        for call in request if isinstance(request, list) else [request]:
+            if call["method"] == method:
+                calls.append(call)
+    return calls
+
+
+def include_later(server: JSONRPCServer, delay: float, *transactions: Transaction):
+    """Include the transactions in a new block after a delay."""
+    timer = threading.Timer(delay, server.include, transactions)
+    timer.start()
+    return timer
+
+
+def test_already_included_transactions_do_not_poll_blocks(server: JSONRPCServer):
+    """Test that transactions found by the initial lookup are returned without following blocks."""
+    txs = signed_transactions(3)
+    server.include(*txs)
+    responses = EthRPC(server.url).wait_for_transactions(txs)
+    assert [response.transaction_hash for response in responses] == [tx.hash for tx in txs]
+    assert not calls_of(server, "eth_getBlockByNumber")
+
+
+def test_transactions_are_resolved_from_new_blocks(server: JSONRPCServer):
+    """Test that pending transactions are resolved from the blocks, not polled one by one."""
+    txs = signed_transactions(20)
+    server.include(*txs[:5])
+    include_later(server, 0.2, *txs[5:12])
+    include_later(server, 0.4, *txs[12:])
+    responses = EthRPC(server.url).wait_for_transactions(txs)
+    assert [int(response.block_number or 0) for response in responses] == [1] * 5 + [2] * 7 + [
+        3
+    ] * 8
+    # One lookup of every transaction before following the blocks, one of those found in blocks.
+    assert len(calls_of(server, "eth_getTransactionByHash")) == 20 + 15
+    assert [int(call["params"][0], 16) for call in calls_of(server, "eth_getBlockByNumber")] == [
+        2,
+        3,
+    ]
+
+
+def test_concurrent_waits_share_the_tracker(server: JSONRPCServer):
+    """Test that concurrent waits are resolved by the same poll of the chain."""
+    txs = signed_transactions(4)
+    include_later(server, 0.3, *txs)
+    with AsyncEthRPC(EthRPC(server.url)) as eth_rpc:
+
+        async def wait():
+            return await asyncio.gather(
+                eth_rpc.wait_for_transactions(txs[:2]), eth_rpc.wait_for_transactions(txs[2:])
+            )
+
+        first, second = eth_rpc.run(wait())
+    assert [r.transaction_hash for r in first + second] == [tx.hash for tx in txs]
+    assert len(calls_of(server, "eth_getBlockByNumber")) == 1
+    assert not eth_rpc.sync.inclusion_tracker.waiters
+
+
+def test_wait_times_out(server: JSONRPCServer):
+    """Test that transactions that are never included raise after the timeout."""
+    txs = signed_transactions(2)
+    server.include(txs[0])
+    eth_rpc = EthRPC(server.url, transaction_wait_timeout=0)
+    with pytest.raises(Exception, match="not included in a block") as exc_info:
+        eth_rpc.wait_for_transactions(txs)
+    assert str(txs[1].hash) in str(exc_info.value)
+    assert str(txs[0].hash) not in str(exc_info.value)
+
+
+def test_poll_interval_backs_off(server: JSONRPCServer):
+    """Test that the poll interval doubles while no block arrives and resets on a new block."""
+    tracker = EthRPC(server.url).inclusion_tracker
+    tracker.head = 0
+    for expected_interval in [0.2, 0.4, 0.8, 1.6, 2.0, 2.0]:
+        tracker.poll()
+        assert tracker.poll_interval == expected_interval
+    server.include(*signed_transactions(1))
+    tracker.poll()
+    assert tracker.head == 1
+    assert tracker.poll_interval == tracker.min_poll_interval
+
+
+def test_shorter_chain_drops_inclusions(server: JSONRPCServer):
+    """Test that the inclusions in blocks dropped by a reorg to a shorter chain are forgotten."""
+    tx = signed_transactions(1)[0]
+    tracker = EthRPC(server.url).inclusion_tracker
+    tracker.head = 0
+    tracker.waiters[tx.hash] = 1
+    server.include(tx)
+    tracker.poll()
+    assert tracker.included == {tx.hash: 1}
+    server.reorg(0)
+    tracker.poll()
+    assert tracker.head == 0
+    assert not tracker.included
+    server.include(Transaction(nonce=1).with_signature_and_sender(), tx)
+    tracker.poll()
+    assert tracker.included == {tx.hash: 1}
+
+
+def test_transaction_reorged_out_before_its_lookup(
+    server: JSONRPCServer, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a transaction dropped by a reorg after its block was fetched is waited for."""
+    tx = signed_transactions(1)[0]
+    eth_rpc = EthRPC(server.url)
+    get_transactions_by_hash = eth_rpc.get_transactions_by_hash
+    lookups = 0
+
+    def reorg_before_second_lookup(tx_hashes):
+        nonlocal lookups
+        lookups += 1
+        if lookups == 2:
+            server.reorg(0)
+            include_later(server, 0.2, Transaction(nonce=1).with_signature_and_sender())
+            include_later(server, 0.4, tx)
+        return get_transactions_by_hash(tx_hashes)
+
+    monkeypatch.setattr(eth_rpc, "get_transactions_by_hash", reorg_before_second_lookup)
+    include_later(server, 0.2, tx)
+    (response,) = eth_rpc.wait_for_transactions([tx])
+    assert response.block_number == 2
+    assert lookups == 3
@@ -0,0 +1,74 @@
+"""Test the JSON-RPC batching and connection reuse of the RPC clients."""
+
+from typing import List, Tuple
+
+import pytest
+
+from ethereum_test_base_types import Address, Bytes, Hash
+from ethereum_test_types import Transaction
+
+from ..rpc import EngineRPC, EthRPC, SendTransactionExceptionError
+from ..types import JSONRPCError
+from .conftest import REJECTED_TRANSACTION, JSONRPCServer
+
+
+def test_requests_reuse_the_connection(server: JSONRPCServer):
+    """Test that consecutive requests are sent over the same pooled connection."""
+    eth_rpc = EthRPC(server.url)
+    for i in range(5):
+        assert eth_rpc.get_balance(Address(i)) == i
+    assert len(server.http_requests) == 5
+    assert len(server.client_ports) == 1
+
+
+def test_bulk_methods_send_a_single_batch(server: JSONRPCServer):
+    """Test that bulk methods return results in call order using a single HTTP request."""
+    eth_rpc = EthRPC(server.url)
+    assert eth_rpc.get_balances([Address(i) for i in range(10)]) == list(range(10))
+    keys = [Hash(i) for i in range(10)]
+    assert eth_rpc.storage_at_keys(Address(1), keys) == {key: key for key in keys}
+    assert len(server.http_requests) == 2
+    assert [len(request) for request in server.http_requests] == [10, 10]
+
+
+def test_batch_is_split_in_chunks(server: JSONRPCServer, monkeypatch: pytest.MonkeyPatch):
+    """Test that batches larger than the maximum batch size are split in several requests."""
+    monkeypatch.setattr(EthRPC, "max_batch_size", 4)
+    eth_rpc = EthRPC(server.url)
+    assert eth_rpc.get_balances([Address(i) for i in range(10)]) == list(range(10))
+    assert [len(request) for request in server.http_requests] == [4, 4, 2]
+
+
+def test_batch_context_manager_errors(server: JSONRPCServer):
+    """Test that each call of a batch raises its own error when its result is read."""
+    eth_rpc = EthRPC(server.url)
+    with eth_rpc.batch() as batch:
+        balance = batch.call("getBalance", f"{Address(7)}", "latest")
+        unknown = batch.call("unknownMethod")
+    assert balance.result() == "0x7"
+    with pytest.raises(JSONRPCError):
+        unknown.result()
+    with pytest.raises(JSONRPCError):
+        eth_rpc.post_batch([("getBalance", (f"{Address(7)}", "latest")), ("unknownMethod", ())])
+
+
+def test_send_transactions(server: JSONRPCServer):
+    """Test that transactions are sent in a batch and failures point to the failed tx."""
+    eth_rpc = EthRPC(server.url)
+    transactions: List[Transaction] = [
+        Transaction(nonce=i).with_signature_and_sender() for i in range(3)
+    ]
+    assert eth_rpc.send_transactions(transactions) == [tx.hash for tx in transactions]
+    assert len(server.http_requests) == 1
+
+    raw_transactions: Tuple[Bytes, ...] = (transactions[0].rlp(), REJECTED_TRANSACTION)
+    with pytest.raises(SendTransactionExceptionError) as exc_info:
+        eth_rpc.send_raw_transactions(raw_transactions)
+    assert exc_info.value.tx_rlp == REJECTED_TRANSACTION
+
+
+def test_engine_rpc_batches_are_authenticated(server: JSONRPCServer):
+    """Test that the JWT authentication header is also sent with batch requests."""
+    engine_rpc = EngineRPC(server.url)
+    assert engine_rpc.post_batch([("exchangeCapabilities", (["a"],))]) == [["a"]]
+    assert server.headers[0]["Authorization"].startswith("Bearer ")
@@ -239,6 +239,8 @@ class BaseTest(BaseModel):
             group.test_ids.append(str(test_id))
             group.test_count = len(group.test_ids)
             group.pre_account_count = len(group.pre.root)
+            if group.test_accounts is not None:
+                group.test_accounts[str(test_id)] = list(self.pre.root)
             pre_alloc_groups[pre_alloc_hash] = group
         else:
             # Create new group - use Environment instead of expensive genesis generation
@@ -249,6 +251,7 @@ class BaseTest(BaseModel):
                 fork=fork,
                 environment=self.get_genesis_environment(fork),
                 pre=self.pre,
+                test_accounts={str(test_id): list(self.pre.root)},
             )
             pre_alloc_groups[pre_alloc_hash] = group
         return pre_alloc_groups
@@ -6,6 +6,7 @@ from .block_types import (
     EnvironmentDefaults,
     Withdrawal,
 )
+from .compact_alloc import CompactAlloc
 from .helpers import (
     TestParameterGroup,
     add_kzg_version,
@@ -35,6 +36,7 @@ __all__ = (
     "Alloc",
     "AuthorizationTuple",
     "Blob",
+    "CompactAlloc",
     "ConsolidationRequest",
     "DepositRequest",
     "Environment",
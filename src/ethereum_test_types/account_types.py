@@ -1,10 +1,13 @@
 """Account-related types for Ethereum tests."""
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, List, Literal, Optional, Tuple
 
 from coincurve.keys import PrivateKey
-from ethereum_types.bytes import Bytes20
+from ethereum_rlp import rlp
+from ethereum_types.bytes import Bytes, Bytes20
 from ethereum_types.numeric import U256, Bytes32, Uint
 from pydantic import PrivateAttr
 from typing_extensions import Self
@@ -25,7 +28,18 @@ from ethereum_test_base_types.conversions import (
 )
 from ethereum_test_vm import EVMCodeType
 
-from .trie import EMPTY_TRIE_ROOT, FrontierAccount, Trie, root, trie_get, trie_set
+from .trie import (
+    EMPTY_TRIE_ROOT,
+    FrontierAccount,
+    IncrementalTrie,
+    Trie,
+    build_root,
+    encode_account,
+    root,
+    storage_roots,
+    trie_get,
+    trie_set,
+)
 from .utils import keccak256
 
 FrontierAddress = Bytes20
@@ -90,6 +104,164 @@ def state_root(state: State) -> Bytes32:
     return root(state._main_trie, get_storage_root=get_storage_root)
 
 
+class IncrementalStateRoot:
+    """
+    State root of an allocation that is updated incrementally between computations.
+
+    The accounts and storage of the allocation are compared to a snapshot of the previous
+    computation, and only the accounts and storage slots that changed since then are updated in
+    the persistent account and storage tries, whose unchanged subtrees, and unchanged storage
+    roots, are not hashed again.
+
+    The roots of the storage of the accounts not seen before, and of the account trie in the
+    first computation, are computed at once with `build_root`, and their persistent tries are
+    only built once they are modified. If at least `min_parallel_slots` storage slots of
+    accounts not seen before must be hashed and more than one worker is allowed, their storage
+    roots are computed in a pool of processes, in chunks of similar size.
+    """
+
+    min_parallel_slots: int = 50_000
+
+    def __init__(self) -> None:
+        """Initialize the state root of an empty allocation."""
+        self.trie: IncrementalTrie | None = None
+        self.storage_tries: Dict[Address, IncrementalTrie] = {}
+        self.storage_roots: Dict[Address, Bytes32] = {}
+        self.accounts: Dict[Address, Tuple[int, int, bytes, Dict]] = {}
+        self.encoded_accounts: Dict[Address, Bytes] = {}
+
+    def update_storage(self, address: Address, previous: Dict, storage: Dict) -> Bytes32:
+        """Apply the changes of the storage of an account and return its storage root."""
+        trie = self.storage_tries.get(address)
+        if trie is None:
+            # The storage root was computed at once, or the storage was empty: build the trie of
+            # the account from scratch.
+            trie = self.storage_tries[address] = IncrementalTrie()
+            previous = {}
+        for key in previous.keys() - storage.keys():
+            trie.delete(Bytes32(Hash(key)))
+        for key, value in storage.items():
+            if previous.get(key) == value and key in previous:
+                continue
+            if value == 0:
+                trie.delete(Bytes32(Hash(key)))
+            else:
+                trie.set(Bytes32(Hash(key)), rlp.encode(U256(value)))
+        if not len(trie):
+            del self.storage_tries[address]
+            return EMPTY_TRIE_ROOT
+        return trie.root()
+
+    def compute_storage_roots(
+        self, storages: Dict[Address, Dict], max_workers: int
+    ) -> Dict[Address, Bytes32]:
+        """Compute the storage roots of several accounts in a pool of worker processes."""
+        chunk_slots = max(
+            1, sum(len(storage) for storage in storages.values()) // (max_workers * 4)
+        )
+        chunks: List[List[Address]] = [[]]
+        slots = 0
+        for address, storage in storages.items():
+            if slots >= chunk_slots:
+                chunks.append([])
+                slots = 0
+            chunks[-1].append(address)
+            slots += len(storage)
+        with ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = executor.map(
+                storage_roots,
+                [
+                    [
+                        [(int(key), int(value)) for key, value in storages[address].items()]
+                        for address in chunk
+                    ]
+                    for chunk in chunks
+                ],
+            )
+            return {
+                address: storage_root
+                for chunk, chunk_roots in zip(chunks, results, strict=True)
+                for address, storage_root in zip(chunk, chunk_roots, strict=True)
+            }
+
+    def update(self, accounts: Dict[Address, Account | None], *, max_workers: int = 1) -> Hash:
+        """Apply the changes of the accounts since the last update and return the state root."""
+        if self.trie is None and self.accounts:
+            # Build the persistent account trie on the first update after the first computation.
+            self.trie = IncrementalTrie()
+            for address, encoded_account in self.encoded_accounts.items():
+                self.trie.set(address, encoded_account)
+            self.encoded_accounts.clear()
+
+        removed = self.accounts.keys() - {
+            address for address, account in accounts.items() if account is not None
+        }
+        for address in removed:
+            del self.accounts[address]
+            self.storage_tries.pop(address, None)
+            self.storage_roots.pop(address, None)
+            if self.trie is not None:
+                self.trie.delete(address)
+
+        changed: Dict[Address, Tuple[int, int, bytes, Dict]] = {}
+        for address, account in accounts.items():
+            if account is None:
+                continue
+            nonce = int(account.nonce) if account.nonce is not None else 0
+            balance = int(account.balance) if account.balance is not None else 0
+            code = bytes(account.code) if account.code is not None else b""
+            storage = account.storage.root if account.storage is not None else {}
+            if self.accounts.get(address) != (nonce, balance, code, storage):
+                changed[address] = (nonce, balance, code, storage)
+
+        new_storages = {
+            address: storage
+            for address, (_, _, _, storage) in changed.items()
+            if storage and address not in self.accounts
+        }
+        if max_workers > 1 and (
+            sum(len(storage) for storage in new_storages.values()) >= self.min_parallel_slots
+        ):
+            self.storage_roots.update(self.compute_storage_roots(new_storages, max_workers))
+        else:
+            self.storage_roots.update(
+                zip(
+                    new_storages,
+                    storage_roots(
+                        [
+                            [(int(key), int(value)) for key, value in storage.items()]
+                            for storage in new_storages.values()
+                        ]
+                    ),
+                    strict=True,
+                )
+            )
+
+        encoded_accounts: Dict[Address, Bytes] = {}
+        for address, (nonce, balance, code, storage) in changed.items():
+            previous = self.accounts.get(address)
+            previous_storage = previous[3] if previous is not None else {}
+            if address not in new_storages and (previous is None or previous_storage != storage):
+                self.storage_roots[address] = self.update_storage(
+                    address, previous_storage, storage
+                )
+            self.accounts[address] = (nonce, balance, code, dict(storage))
+            encoded_accounts[address] = encode_account(
+                FrontierAccount(nonce=Uint(nonce), balance=U256(balance), code=Bytes(code)),
+                self.storage_roots[address],
+            )
+        if self.trie is None:
+            # First computation: compute the root at once, and keep the encoded accounts to
+            # build the persistent trie if the allocation is modified afterwards.
+            self.encoded_accounts = encoded_accounts
+            return Hash(build_root(encoded_accounts))
+        for address, encoded_account in encoded_accounts.items():
+            self.trie.set(address, encoded_account)
+        return Hash(self.trie.root())
+
+
 class EOA(Address):
     """
     An Externally Owned Account (EOA) is an account controlled by a private key.
@@ -136,6 +308,7 @@ class Alloc(BaseAlloc):
     """Allocation of accounts in the state, pre and post test execution."""
 
     _eoa_fund_amount_default: int = PrivateAttr(10**21)
+    _state_root: IncrementalStateRoot | None = PrivateAttr(None)
 
     @dataclass(kw_only=True)
     class UnexpectedAccountError(Exception):
@@ -232,30 +405,17 @@ class Alloc(BaseAlloc):
         """Return list of addresses of empty accounts."""
         return [address for address, account in self.root.items() if not account]
 
-    def state_root(self) -> Hash:
-        """Return state root of the allocation."""
-        state = State()
-        for address, account in self.root.items():
-            if account is None:
-                continue
-            set_account(
-                state=state,
-                address=FrontierAddress(address),
-                account=FrontierAccount(
-                    nonce=Uint(account.nonce) if account.nonce is not None else Uint(0),
-                    balance=(U256(account.balance) if account.balance is not None else U256(0)),
-                    code=account.code if account.code is not None else b"",
-                ),
-            )
-            if account.storage is not None:
-                for key, value in account.storage.root.items():
-                    set_storage(
-                        state=state,
-                        address=FrontierAddress(address),
-                        key=Bytes32(Hash(key)),
-                        value=U256(value),
-                    )
-        return Hash(state_root(state))
+    def state_root(self, *, max_workers: int = 1) -> Hash:
+        """
+        Return state root of the allocation.
+
+        The tries are kept between calls, so that the root after modifying a few accounts of
+        the allocation only re-hashes the modified accounts and storage slots. The storage roots
+        of large allocations are computed in up to `max_workers` processes.
+        """
+        if self._state_root is None:
+            self._state_root = IncrementalStateRoot()
+        return self._state_root.update(self.root, max_workers=max_workers)
 
     def verify_post_alloc(self, got_alloc: "Alloc"):
         """
@@ -0,0 +1,344 @@
+"""
+Compact, array-backed representation of large allocations.
+
+An `Alloc` keeps every storage slot of every account as a dict entry of two boxed `HashInt`
+objects, so that most of the memory taken by large allocations, like the pre-states of the
+benchmark tests or the pre-allocation groups, is Python object overhead. `CompactAlloc` keeps
+the same accounts with:
+
+- the addresses interned, so that allocations sharing accounts share their addresses,
+- the code of the accounts deduplicated by its hash,
+- the storage of each account as two byte strings of sorted 32-byte keys and their 32-byte
+  values, looked up by binary search.
+
+`CompactAlloc` has the read API of `Alloc`, returning `Account` objects built on access, and
+is (de)serialized by pydantic to and from the same JSON as `Alloc`.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+from ethereum_rlp import rlp
+from ethereum_types.numeric import U256, Uint
+from pydantic import GetCoreSchemaHandler, SerializationInfo
+from pydantic_core import core_schema
+
+from ethereum_test_base_types import Account, Address, Hash, Storage
+from ethereum_test_base_types.conversions import FixedSizeBytesConvertible
+
+from .account_types import Alloc
+from .trie import EMPTY_TRIE_ROOT, build_root
+from .utils import keccak256
+
+SLOT_SIZE = 32
+
+_interned_addresses: Dict[bytes, Address] = {}
+
+
+def intern_address(address: FixedSizeBytesConvertible) -> Address:
+    """Return the shared `Address` object of an address."""
+    address = Address(address)
+    return _interned_addresses.setdefault(bytes(address), address)
+
+
+class CompactStorage(Mapping[int, int]):
+    """Storage of an account as sorted parallel arrays of 32-byte keys and values."""
+
+    __slots__ = ("keys_data", "values_data")
+
+    keys_data: bytes
+    values_data: bytes
+
+    def __init__(self, keys_data: bytes = b"", values_data: bytes = b""):
+        """Initialize the storage from its concatenated sorted keys and their values."""
+        assert len(keys_data) == len(values_data) and len(keys_data) % SLOT_SIZE == 0
+        self.keys_data = keys_data
+        self.values_data = values_data
+
+    @classmethod
+    def from_storage(cls, storage: Mapping) -> "CompactStorage":
+        """Return the compact representation of a storage."""
+        # Big-endian keys of the same length sort in the same order as their values.
+        slots = sorted((int(key), int(value)) for key, value in storage.items())
+        return cls(
+            b"".join(key.to_bytes(SLOT_SIZE, "big") for key, _ in slots),
+            b"".join(value.to_bytes(SLOT_SIZE, "big") for _, value in slots),
+        )
+
+    def to_storage(self) -> Storage:
+        """Return the storage as a `Storage` object."""
+        return Storage(dict(self.items()))  # type: ignore
+
+    def find(self, key: int) -> int:
+        """Return the index of a key, or -1 if it is not in the storage."""
+        key_bytes = key.to_bytes(SLOT_SIZE, "big")
+        data = self.keys_data
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if data[middle * SLOT_SIZE : (middle + 1) * SLOT_SIZE] < key_bytes:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self) and data[low * SLOT_SIZE : (low + 1) * SLOT_SIZE] == key_bytes:
+            return low
+        return -1
+
+    def __getitem__(self, key: int) -> int:
+        """Return the value of a storage key."""
+        index = self.find(int(key)) if 0 <= int(key) < 2**256 else -1
+        if index < 0:
+            raise KeyError(key)
+        return int.from_bytes(self.values_data[index * SLOT_SIZE : (index + 1) * SLOT_SIZE], "big")
+
+    def __contains__(self, key: object) -> bool:
+        """Check if a key is in the storage."""
+        return isinstance(key, int) and 0 <= key < 2**256 and self.find(key) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        """Return an iterator over the sorted keys."""
+        data = self.keys_data
+        for start in range(0, len(data), SLOT_SIZE):
+            yield int.from_bytes(data[start : start + SLOT_SIZE], "big")
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return len(self.keys_data) // SLOT_SIZE
+
+    def items(self) -> Iterator[Tuple[int, int]]:  # type: ignore[override]
+        """Return an iterator over the sorted slots."""
+        keys, values = self.keys_data, self.values_data
+        for start in range(0, len(keys), SLOT_SIZE):
+            yield (
+                int.from_bytes(keys[start : start + SLOT_SIZE], "big"),
+                int.from_bytes(values[start : start + SLOT_SIZE], "big"),
+            )
+
+    def root(self) -> bytes:
+        """Return the root of the storage trie."""
+        keys, values = self.keys_data, self.values_data
+        return build_root(
+            {
+                keys[start : start + SLOT_SIZE]: rlp.encode(
+                    U256(int.from_bytes(values[start : start + SLOT_SIZE], "big"))
+                )
+                for start in range(0, len(keys), SLOT_SIZE)
+                if any(values[start : start + SLOT_SIZE])
+            }
+        )
+
+
+class CompactAccount:
+    """Account of a `CompactAlloc`, whose code is kept in the code table of the allocation."""
+
+    __slots__ = ("nonce", "balance", "code_hash", "storage")
+
+    nonce: int
+    balance: int
+    code_hash: Hash
+    storage: CompactStorage
+
+    def __init__(self, nonce: int, balance: int, code_hash: Hash, storage: CompactStorage):
+        """Initialize the account."""
+        self.nonce = nonce
+        self.balance = balance
+        self.code_hash = code_hash
+        self.storage = storage
+
+
+class CompactAlloc(Mapping[Address, Account | None]):
+    """
+    Compact representation of an allocation of accounts, for large allocations that are mostly
+    read.
+
+    Accounts are built from the compact representation when accessed: modifying a returned
+    `Account` does not modify the allocation, which must be updated by setting the account
+    again, or converted back with `to_alloc`. The code of replaced or deleted accounts stays in
+    the code table.
+    """
+
+    accounts: Dict[Address, CompactAccount | None]
+    codes: Dict[Hash, bytes]
+
+    def __init__(self, accounts: Mapping[Address, Account | None] | None = None):
+        """Initialize the allocation from a mapping of accounts."""
+        self.accounts = {}
+        self.codes = {}
+        if accounts is not None:
+            for address, account in accounts.items():
+                self[address] = account
+
+    @classmethod
+    def from_alloc(cls, alloc: Alloc) -> "CompactAlloc":
+        """Return the compact representation of an allocation."""
+        return cls(alloc.root)
+
+    def to_alloc(self) -> Alloc:
+        """Return the allocation as an `Alloc`."""
+        return Alloc({address: self[address] for address in self.accounts})
+
+    def __getitem__(self, address: Address | FixedSizeBytesConvertible) -> Account | None:
+        """Return the account associated with an address."""
+        if not isinstance(address, Address):
+            address = Address(address)
+        account = self.accounts[address]
+        if account is None:
+            return None
+        return Account(
+            nonce=account.nonce,
+            balance=account.balance,
+            code=self.codes[account.code_hash],
+            storage=account.storage.to_storage(),
+        )
+
+    def __setitem__(self, address: Address | FixedSizeBytesConvertible, account: Account | None):
+        """Set the account associated with an address."""
+        address = intern_address(address)
+        if account is None:
+            self.accounts[address] = None
+            return
+        code = bytes(account.code) if account.code is not None else b""
+        code_hash = Hash(keccak256(code))
+        self.codes.setdefault(code_hash, code)
+        self.accounts[address] = CompactAccount(
+            nonce=int(account.nonce) if account.nonce is not None else 0,
+            balance=int(account.balance) if account.balance is not None else 0,
+            code_hash=code_hash,
+            storage=CompactStorage.from_storage(
+                account.storage.root if account.storage is not None else {}
+            ),
+        )
+
+    def __delitem__(self, address: Address | FixedSizeBytesConvertible):
+        """Delete the account associated with an address."""
+        if not isinstance(address, Address):
+            address = Address(address)
+        self.accounts.pop(address, None)
+
+    def __contains__(self, address: object) -> bool:
+        """Check if an account is in the allocation."""
+        if not isinstance(address, Address):
+            try:
+                address = Address(address)  # type: ignore[arg-type]
+            except Exception:
+                return False
+        return address in self.accounts
+
+    def __iter__(self) -> Iterator[Address]:
+        """Return an iterator over the addresses of the allocation."""
+        return iter(self.accounts)
+
+    def __len__(self) -> int:
+        """Return the number of accounts."""
+        return len(self.accounts)
+
+    def __eq__(self, other: object) -> bool:
+        """Return True if both allocations contain the same accounts."""
+        if isinstance(other, CompactAlloc):
+            other = other.to_alloc()
+        if not isinstance(other, Alloc):
+            return False
+        return self.to_alloc() == other
+
+    def code(self, address: Address | FixedSizeBytesConvertible) -> bytes:
+        """Return the code of an account without building the account."""
+        if not isinstance(address, Address):
+            address = Address(address)
+        account = self.accounts[address]
+        return self.codes[account.code_hash] if account is not None else b""
+
+    def storage(self, address: Address | FixedSizeBytesConvertible) -> CompactStorage:
+        """Return the storage of an account without building the account."""
+        if not isinstance(address, Address):
+            address = Address(address)
+        account = self.accounts[address]
+        return account.storage if account is not None else CompactStorage()
+
+    def slot_count(self) -> int:
+        """Return the number of storage slots of all the accounts."""
+        return sum(len(account.storage) for account in self.accounts.values() if account)
+
+    def empty_accounts(self) -> List[Address]:
+        """Return list of addresses of empty accounts."""
+        return [address for address in self.accounts if not self[address]]
+
+    def state_root(self) -> Hash:
+        """Return the state root of the allocation, computed from the compact representation."""
+        return Hash(
+            build_root(
+                {
+                    address: rlp.encode(
+                        (
+                            Uint(account.nonce),
+                            U256(account.balance),
+                            account.storage.root() if account.storage else EMPTY_TRIE_ROOT,
+                            account.code_hash,
+                        )
+                    )
+                    for address, account in self.accounts.items()
+                    if account is not None
+                }
+            )
+        )
+
+    @classmethod
+    def validate(cls, value: Any) -> "CompactAlloc":
+        """Validate an allocation given as a `CompactAlloc`, an `Alloc`, or its JSON form."""
+        if isinstance(value, cls):
+            return value
+        if not isinstance(value, Alloc):
+            value = Alloc.model_validate(value)
+        return cls.from_alloc(value)
+
+    def serialize(self, info: SerializationInfo) -> Any:
+        """Serialize the allocation as an `Alloc`."""
+        return self.to_alloc().model_dump(
+            mode=info.mode, by_alias=info.by_alias, exclude_none=info.exclude_none
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate and serialize the allocation as an `Alloc`."""
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.serialize, info_arg=True
+            ),
+        )
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Return the memory taken by an object and all the objects it references, in bytes."""
+    seen: set[int] = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, "__slots__", ()):
+                if slot not in ("__dict__", "__weakref__") and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return size
+
+
+def memory_per_slot(alloc: Alloc) -> Tuple[float, float]:
+    """
+    Return the memory taken per storage slot by an allocation as an `Alloc`, and as a
+    `CompactAlloc`, in bytes.
+    """
+    compact = CompactAlloc.from_alloc(alloc)
+    slots = max(1, compact.slot_count())
+    return deep_sizeof(alloc.root) / slots, deep_sizeof(compact) / slots
@@ -0,0 +1,99 @@
+"""Test the compact representation of the allocations."""
+
+import pytest
+from pydantic import BaseModel
+
+from ethereum_test_base_types import Account, Address, Storage
+
+from ..account_types import Alloc
+from ..compact_alloc import CompactAlloc, intern_address, memory_per_slot
+
+
+@pytest.fixture
+def alloc() -> Alloc:
+    """Return an allocation with shared code, large storage keys, and a removed account."""
+    return Alloc(
+        {
+            Address(i): Account(
+                nonce=i,
+                balance=10**18 * i,
+                code=b"\x60\x00" * (i % 3),
+                storage={2**256 - 1 - j: j for j in range(i)} | {j: i for j in range(i)},
+            )
+            for i in range(1, 20)
+        }
+        | {Address(100): None}
+    )
+
+
+def test_round_trip(alloc: Alloc):
+    """Test that the accounts of the compact allocation are the ones of the allocation."""
+    compact = CompactAlloc.from_alloc(alloc)
+    assert len(compact) == len(alloc.root)
+    assert list(compact) == list(alloc)
+    for address, account in alloc.items():
+        assert compact[address] == account
+    assert compact.to_alloc() == alloc
+    assert compact == alloc
+    # Accounts with the same code share it.
+    assert len(compact.codes) == 3
+
+
+def test_mapping_api(alloc: Alloc):
+    """Test the lookups and modifications of the compact allocation."""
+    compact = CompactAlloc.from_alloc(alloc)
+    assert Address(1) in compact
+    assert 1 in compact
+    assert Address(50) not in compact
+    assert compact[Address(100)] is None
+    assert compact.empty_accounts() == [Address(100)]
+
+    storage = compact.storage(5)
+    assert storage[2**256 - 1] == 0
+    assert storage[4] == 5
+    assert 5 not in storage
+    assert 2**256 not in storage
+    with pytest.raises(KeyError):
+        storage[5]
+    assert list(storage) == sorted(storage)
+
+    compact[Address(5)] = Account(balance=1, storage={1: 2})
+    del compact[Address(6)]
+    alloc[Address(5)] = Account(balance=1, storage={1: 2})
+    del alloc[Address(6)]
+    assert compact.to_alloc() == alloc
+
+
+def test_addresses_are_interned(alloc: Alloc):
+    """Test that allocations with the same accounts share their addresses."""
+    first = next(iter(CompactAlloc.from_alloc(alloc)))
+    second = next(iter(CompactAlloc.from_alloc(alloc.model_copy(deep=True))))
+    assert first is second is intern_address(Address(1))
+
+
+def test_state_root(alloc: Alloc):
+    """Test that the state root is the same as the one of the allocation."""
+    assert CompactAlloc.from_alloc(alloc).state_root() == alloc.state_root()
+
+
+def test_serialization(alloc: Alloc):
+    """Test that the compact allocation is (de)serialized as an allocation."""
+
+    class Model(BaseModel):
+        pre: CompactAlloc
+
+    json = alloc.model_dump_json(exclude_none=True)
+    model = Model.model_validate_json(f'{{"pre": {json}}}')
+    assert model.pre == alloc
+    assert model.model_dump(mode="json", exclude_none=True)["pre"] == alloc.model_dump(
+        mode="json", exclude_none=True
+    )
+    assert Model(pre=alloc).pre == Model(pre=model.pre).pre
+
+
+def test_memory_per_slot():
+    """Test that the compact allocation takes less memory per storage slot."""
+    storage = Storage({i: i + 1 for i in range(1000)})  # type: ignore
+    alloc = Alloc({Address(1): Account(storage=storage)})
+    alloc_bytes, compact_bytes = memory_per_slot(alloc)
+    assert compact_bytes < alloc_bytes / 2
@@ -1,10 +1,10 @@
 """Test suite for test spec submodules of the `ethereum_test` module."""
 
-from typing import Type
+from typing import Dict, Type
 
 import pytest
 
-from ethereum_test_base_types import Account
+from ethereum_test_base_types import Account, Address, Storage
 from ethereum_test_types import Alloc
 
 
@@ -106,3 +106,45 @@ def test_verify_post_alloc(
     else:
         with pytest.raises(expected_exception_type) as _:
             post.verify_post_alloc(alloc)
+
+
+@pytest.mark.parametrize(
+    ["expected_storage", "got_storage", "error"],
+    [
+        ({i: i for i in range(1000)}, {i: i for i in range(1, 1000)}, None),
+        ({i: i for i in range(1, 1000)}, {i: i for i in range(1000)}, None),
+        ({i: i for i in range(1000)}, {i: i for i in range(1, 999)}, "key 0x" + "0" * 61 + "3e7"),
+        (
+            {i: i for i in range(1000)},
+            {i: i for i in range(1000)} | {1: 2},
+            "want 0x1 .dec:1., got 0x2",
+        ),
+        (
+            {i: i for i in range(1000)},
+            {i: i for i in range(1000)} | {1000: 1},
+            "want 0x0 .dec:0., got 0x1",
+        ),
+    ],
+)
+def test_verify_post_alloc_storage(
+    expected_storage: Dict[int, int], got_storage: Dict[int, int], error: str | None
+):
+    """Test the storage comparison of large expected storages."""
+    address = Address(1)
+    post = Alloc({address: Account(storage=expected_storage)})
+    alloc = Alloc({address: Account(storage=got_storage)})
+    if error is None:
+        post.verify_post_alloc(alloc)
+    else:
+        with pytest.raises(Storage.KeyValueMismatchError, match=error):
+            post.verify_post_alloc(alloc)
+
+
+def test_verify_post_alloc_storage_any_value():
+    """Test that keys expected to have any value are skipped in the storage comparison."""
+    expected_storage = Storage({i: i for i in range(1, 100)})  # type: ignore
+    expected_storage.set_expect_any(100)
+    post = Alloc({Address(1): Account(storage=expected_storage)})
+    post.verify_post_alloc(Alloc({Address(1): Account(storage={i: i for i in range(1, 101)})}))
+    with pytest.raises(Storage.KeyValueMismatchError):
+        post.verify_post_alloc(Alloc({Address(1): Account(storage={i: i for i in range(1, 102)})}))
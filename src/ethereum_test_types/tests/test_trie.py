@@ -0,0 +1,138 @@
+"""Test the incremental state root of the allocations against a full trie computation."""
+
+import random
+
+import pytest
+from ethereum_rlp import rlp
+from ethereum_types.bytes import Bytes20
+from ethereum_types.numeric import U256, Bytes32, Uint
+
+from ethereum_test_base_types import Account, Address, Hash, Storage
+from ethereum_test_types import Alloc
+
+from ..account_types import IncrementalStateRoot, State, set_account, set_storage, state_root
+from ..trie import (
+    EMPTY_TRIE_ROOT,
+    FrontierAccount,
+    IncrementalTrie,
+    Trie,
+    build_root,
+    root,
+    trie_set,
+)
+
+
+def full_state_root(alloc: Alloc) -> Hash:
+    """Compute the state root of an allocation from scratch, with `patricialize`."""
+    state = State()
+    for address, account in alloc.root.items():
+        if account is None:
+            continue
+        set_account(
+            state,
+            Bytes20(address),
+            FrontierAccount(
+                nonce=Uint(account.nonce or 0),
+                balance=U256(account.balance or 0),
+                code=account.code or b"",
+            ),
+        )
+        if account.storage is not None:
+            for key, value in account.storage.root.items():
+                set_storage(state, Bytes20(address), Bytes32(Hash(key)), U256(value))
+    return Hash(state_root(state))
+
+
+def test_empty_trie():
+    """Test the root of an empty trie, and of a trie whose keys were all deleted."""
+    trie = IncrementalTrie()
+    assert trie.root() == EMPTY_TRIE_ROOT
+    trie.set(b"\x01" * 20, rlp.encode(U256(1)))
+    trie.delete(b"\x01" * 20)
+    assert trie.root() == EMPTY_TRIE_ROOT
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_trie_matches_patricialize(seed: int):
+    """Test that the root stays the same as the full computation through random updates."""
+    rng = random.Random(seed)
+    trie = IncrementalTrie()
+    reference: Trie[Bytes32, U256] = Trie(secured=True, default=U256(0))
+    keys = [Bytes32(Hash(rng.randrange(2**256))) for _ in range(64)]
+    for _ in range(300):
+        key = rng.choice(keys)
+        value = U256(rng.choice([0, rng.randrange(1, 2**256)]))
+        trie_set(reference, key, value)
+        if value == 0:
+            trie.delete(key)
+        else:
+            trie.set(key, rlp.encode(value))
+        assert trie.root() == root(reference)
+
+
+def test_alloc_state_root_after_modifications():
+    """Test that the state root of a modified allocation is the same as a full computation."""
+    alloc = Alloc(
+        {
+            Address(i): Account(
+                nonce=i, balance=10**18 * i, code=bytes([i]) * i, storage={j: j for j in range(i)}
+            )
+            for i in range(1, 20)
+        }
+    )
+    assert alloc.state_root() == full_state_root(alloc)
+
+    alloc[Address(3)] = Account(nonce=4, balance=1, code=b"\x03", storage={1: 2})
+    alloc[Address(100)] = Account(balance=1)
+    del alloc[Address(5)]
+    alloc[Address(6)] = None
+    account = alloc[Address(7)]
+    assert account is not None
+    account.storage[1] = 0
+    account.storage[100] = 100
+    account = alloc[Address(8)]
+    assert account is not None
+    account.storage = Storage()
+    assert alloc.state_root() == full_state_root(alloc)
+
+    # A copy of the allocation can be modified independently.
+    copy = alloc.model_copy(deep=True)
+    copy[Address(1)] = Account(balance=2)
+    assert copy.state_root() == full_state_root(copy)
+    assert alloc.state_root() == full_state_root(alloc)
+
+
+def test_alloc_state_root_in_worker_processes(monkeypatch: pytest.MonkeyPatch):
+    """Test that storage roots computed in worker processes give the same state root."""
+    monkeypatch.setattr(IncrementalStateRoot, "min_parallel_slots", 1)
+    alloc = Alloc(
+        {
+            Address(i): Account(balance=i, storage={j: i * j for j in range(i % 7)})
+            for i in range(1, 50)
+        }
+    )
+    assert alloc.state_root(max_workers=2) == full_state_root(alloc)
+
+    # Accounts whose storage root was computed in a worker process can be modified afterwards.
+    account = alloc[Address(6)]
+    assert account is not None
+    account.storage[1] = 0
+    account.storage[10] = 10
+    alloc[Address(100)] = Account(storage={1: 1})
+    assert alloc.state_root(max_workers=2) == full_state_root(alloc)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 16, 17, 257, 2000])
+@pytest.mark.parametrize("seed", range(3))
+def test_build_root_matches_patricialize(size: int, seed: int):
+    """Test that the bulk trie builder computes the same root as `patricialize`."""
+    rng = random.Random(seed)
+    reference: Trie[Bytes32, U256] = Trie(secured=True, default=U256(0))
+    items = {}
+    for _ in range(size):
+        key = Bytes32(Hash(rng.randrange(2**256)))
+        # Small values give leaves short enough to be inlined in their parent.
+        value = U256(rng.choice([1, rng.randrange(2**256)]))
+        trie_set(reference, key, value)
+        items[key] = rlp.encode(value)
+    assert build_root(items) == root(reference)
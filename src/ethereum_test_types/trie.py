@@ -3,6 +3,7 @@
 import copy
 from dataclasses import dataclass, field
 from typing import (
+    Any,
     Callable,
     Dict,
     Generic,
@@ -23,6 +24,23 @@ from ethereum_types.frozen import slotted_freezable
 from ethereum_types.numeric import U256, Uint
 from typing_extensions import assert_type
 
+try:
+    # The raw library allows resetting and reusing a hash state, which is not part of the public
+    # API of pycryptodome, so hashes are computed one by one if it is missing.
+    from Crypto.Hash.keccak import _raw_keccak_lib
+    from Crypto.Util._raw_api import (
+        SmartPointer,
+        VoidPointer,
+        c_size_t,
+        c_ubyte,
+        create_string_buffer,
+    )
+
+    if not hasattr(_raw_keccak_lib, "keccak_reset"):
+        _raw_keccak_lib = None
+except ImportError:
+    _raw_keccak_lib = None
+
 
 @slotted_freezable
 @dataclass
@@ -76,6 +94,7 @@ EMPTY_TRIE_ROOT = Bytes32(
 
 Node = FrontierAccount | Bytes | Uint | U256 | None
 K = TypeVar("K", bound=Bytes)
+RawKey = TypeVar("RawKey", bound=bytes)
 V = TypeVar(
     "V",
     Optional[FrontierAccount],
@@ -383,3 +402,340 @@ def patricialize(obj: Mapping[Bytes, Bytes], level: Uint) -> Optional[InternalNo
         cast(BranchSubnodes, assert_type(subnodes, Tuple[Extended, ...])),
         value,
     )
+
+
+class _Leaf:
+    """Mutable leaf node of an `IncrementalTrie`."""
+
+    __slots__ = ("path", "value", "ref")
+
+    def __init__(self, path: bytes, value: Bytes):
+        self.path = path
+        self.value = value
+        self.ref: Optional[Extended] = None
+
+
+class _Extension:
+    """Mutable extension node of an `IncrementalTrie`."""
+
+    __slots__ = ("path", "child", "ref")
+
+    def __init__(self, path: bytes, child: "_Branch"):
+        self.path = path
+        self.child = child
+        self.ref: Optional[Extended] = None
+
+
+class _Branch:
+    """Mutable branch node, without value, of an `IncrementalTrie`."""
+
+    __slots__ = ("children", "ref")
+
+    def __init__(self) -> None:
+        self.children: List[Optional[_Node]] = [None] * 16
+        self.ref: Optional[Extended] = None
+
+
+_Node = _Leaf | _Extension | _Branch
+
+
+def _node_ref(node: Optional[_Node]) -> Extended:
+    """
+    Return the reference of a node in its parent, as `encode_internal_node` does, computing it
+    only if the node, or one of its descendants, was modified since it was last computed.
+    """
+    if node is None:
+        return b""
+    if node.ref is None:
+        unencoded: Extended
+        if isinstance(node, _Leaf):
+            unencoded = (nibble_list_to_compact(Bytes(node.path), True), node.value)
+        elif isinstance(node, _Extension):
+            unencoded = (nibble_list_to_compact(Bytes(node.path), False), _node_ref(node.child))
+        else:
+            unencoded = [_node_ref(child) for child in node.children] + [b""]
+        encoded = rlp.encode(unencoded)
+        node.ref = unencoded if len(encoded) < 32 else keccak256(encoded)
+    return node.ref
+
+
+def _with_prefix(prefix: bytes, node: _Node) -> _Node:
+    """Return the node reached from a parent through the given path prefix."""
+    if not prefix:
+        return node
+    if isinstance(node, _Leaf):
+        return _Leaf(prefix + node.path, node.value)
+    if isinstance(node, _Extension):
+        return _Extension(prefix + node.path, node.child)
+    return _Extension(prefix, node)
+
+
+def _insert(node: Optional[_Node], path: bytes, value: Bytes) -> _Node:
+    """Set the value of a path below a node, returning the node that replaces it."""
+    if node is None:
+        return _Leaf(path, value)
+    node.ref = None
+    if isinstance(node, _Branch):
+        node.children[path[0]] = _insert(node.children[path[0]], path[1:], value)
+        return node
+    if isinstance(node, _Leaf) and node.path == path:
+        node.value = value
+        return node
+    prefix_length = common_prefix_length(node.path, path)
+    if isinstance(node, _Extension) and prefix_length == len(node.path):
+        node.child = _insert(node.child, path[prefix_length:], value)  # type: ignore[assignment]
+        return node
+    # The paths diverge within the node: split it at a new branch.
+    branch = _Branch()
+    branch.children[node.path[prefix_length]] = _with_prefix(
+        node.path[prefix_length + 1 :],
+        node.child if isinstance(node, _Extension) else _Leaf(b"", node.value),
+    )
+    branch.children[path[prefix_length]] = _Leaf(path[prefix_length + 1 :], value)
+    return _with_prefix(path[:prefix_length], branch)
+
+
+def _delete(node: _Node, path: bytes) -> Optional[_Node]:
+    """Delete an existing path below a node, returning the node that replaces it."""
+    if isinstance(node, _Leaf):
+        return None
+    node.ref = None
+    if isinstance(node, _Extension):
+        child = _delete(node.child, path[len(node.path) :])
+        assert child is not None, "a branch never has less than two children"
+        return _with_prefix(node.path, child)
+    node.children[path[0]] = _delete(node.children[path[0]], path[1:])  # type: ignore[arg-type]
+    remaining = [index for index, child in enumerate(node.children) if child is not None]
+    if len(remaining) > 1:
+        return node
+    # A branch with a single child is merged into it.
+    (index,) = remaining
+    return _with_prefix(bytes([index]), node.children[index])  # type: ignore[arg-type]
+
+
+class IncrementalTrie:
+    """
+    Secured Merkle Patricia trie that keeps its nodes between root computations.
+
+    The keccak of every key and the reference of every node are cached, and invalidated only
+    along the path of a modified key, so that the root after modifying a few keys of a trie
+    costs O(modifications x depth) hashes instead of re-building the whole trie with
+    `patricialize`. All keys must have the same length (e.g., addresses or storage keys).
+    """
+
+    __slots__ = ("root_node", "paths")
+
+    def __init__(self) -> None:
+        """Initialize an empty trie."""
+        self.root_node: Optional[_Node] = None
+        self.paths: Dict[bytes, bytes] = {}
+
+    def __len__(self) -> int:
+        """Return the number of keys in the trie."""
+        return len(self.paths)
+
+    def __contains__(self, key: bytes) -> bool:
+        """Return whether the key is in the trie."""
+        return key in self.paths
+
+    def set(self, key: bytes, value: Bytes) -> None:
+        """Set the encoded value of a key."""
+        assert value != b"", "empty values must be deleted instead"
+        path = self.paths.get(key)
+        if path is None:
+            path = bytes(bytes_to_nibble_list(keccak256(key)))
+            self.paths[key] = path
+        self.root_node = _insert(self.root_node, path, value)
+
+    def delete(self, key: bytes) -> None:
+        """Delete a key, if present."""
+        path = self.paths.pop(key, None)
+        if path is not None:
+            assert self.root_node is not None
+            self.root_node = _delete(self.root_node, path)
+
+    def root(self) -> Bytes32:
+        """Compute the root of the trie, re-hashing only the nodes modified since the last call."""
+        root_node = _node_ref(self.root_node)
+        if len(rlp.encode(root_node)) < 32:
+            return keccak256(rlp.encode(root_node))
+        assert isinstance(root_node, bytes)
+        return Bytes32(root_node)
+
+
+def storage_roots(storages: List[List[Tuple[int, int]]]) -> List[Bytes32]:
+    """
+    Compute the roots of several storage tries from their `(key, value)` slots, e.g. in a worker
+    process.
+    """
+    return [
+        build_root(
+            {
+                key.to_bytes(32, "big"): rlp.encode(U256(value))
+                for key, value in storage
+                if value != 0
+            }
+        )
+        for storage in storages
+    ]
+
+
+def _rlp_string(data: bytes) -> bytes:
+    """RLP-encode a byte string."""
+    length = len(data)
+    if length == 1 and data[0] < 0x80:
+        return data
+    if length < 56:
+        return bytes((0x80 + length,)) + data
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0xB7 + len(length_bytes),)) + length_bytes + data
+
+
+def _rlp_list(payload: bytes) -> bytes:
+    """RLP-encode a list from the concatenated encodings of its items."""
+    length = len(payload)
+    if length < 56:
+        return bytes((0xC0 + length,)) + payload
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0xF7 + len(length_bytes),)) + length_bytes + payload
+
+
+def _compact_path(path: str, is_leaf: bool) -> bytes:
+    """Return the hex-prefix encoding of a path of hex nibbles, as `nibble_list_to_compact`."""
+    flag = 2 if is_leaf else 0
+    if len(path) % 2:
+        return bytes.fromhex(f"{flag + 1:x}{path}")
+    return bytes.fromhex(f"{flag:x}0{path}")
+
+
+_EMPTY_CHILD = b"\x80"
+
+
+def _branch_node(children: List[bytes]) -> bytes:
+    """Encode a branch node from the references of its children and its (empty) value."""
+    return _rlp_list(b"".join(children))
+
+
+class Keccak256Hasher:
+    """
+    Compute many keccak256 hashes reusing a single hash state, which avoids most of the
+    per-hash overhead of `keccak256` when hashing the many keys and nodes of a trie.
+    """
+
+    def __init__(self) -> None:
+        """Allocate the hash state, if the raw keccak library of pycryptodome is available."""
+        self.state: Any = None
+        if _raw_keccak_lib is None:
+            return
+        state = VoidPointer()
+        if _raw_keccak_lib.keccak_init(state.address_of(), c_size_t(64), c_ubyte(24)):
+            raise ValueError("error while instantiating keccak")
+        self.state = SmartPointer(state.get(), _raw_keccak_lib.keccak_destroy)
+        self.digest = create_string_buffer(32)
+
+    def hash_all(self, buffers: Sequence[bytes]) -> List[bytes]:
+        """Return the keccak256 hash of every buffer."""
+        if self.state is None:
+            return [bytes(keccak256(buffer)) for buffer in buffers]
+        state = self.state.get()
+        digest = self.digest
+        reset = _raw_keccak_lib.keccak_reset
+        absorb = _raw_keccak_lib.keccak_absorb
+        squeeze = _raw_keccak_lib.keccak_digest
+        hashes = []
+        for buffer in buffers:
+            reset(state)
+            absorb(state, buffer, len(buffer))
+            squeeze(state, digest, 32, 1)
+            hashes.append(bytes(digest))
+        return hashes
+
+    def __call__(self, buffer: bytes) -> bytes:
+        """Return the keccak256 hash of a buffer."""
+        if self.state is None:
+            return bytes(keccak256(buffer))
+        state = self.state.get()
+        _raw_keccak_lib.keccak_reset(state)
+        _raw_keccak_lib.keccak_absorb(state, buffer, len(buffer))
+        _raw_keccak_lib.keccak_digest(state, self.digest, 32, 1)
+        return bytes(self.digest)
+
+
+def build_root(items: Mapping[RawKey, bytes]) -> Bytes32:
+    """
+    Compute the root of a secured trie from all its keys and encoded values at once.
+
+    Equivalent to `root` for keys of the same length, but much faster for large tries: the keys
+    and the leaves are hashed in batches, the trie is built in a single pass over the sorted
+    hashed keys, keeping only the branches along the path of the current key open in a stack,
+    and the nodes are encoded with a specialized RLP encoder, without building intermediate
+    mappings or nodes.
+    """
+    if not items:
+        return EMPTY_TRIE_ROOT
+    hasher = Keccak256Hasher()
+    hashed = sorted(
+        zip(
+            [int.from_bytes(key, "big") for key in hasher.hash_all(list(items.keys()))],
+            items.values(),
+            strict=True,
+        )
+    )
+    keys = [f"{key:064x}" for key, _ in hashed]
+    # Length in nibbles of the common prefix of each key with the next one, -1 after the last.
+    next_prefix_lengths = [
+        (256 - (a ^ b).bit_length()) // 4
+        for (a, _), (b, _) in zip(hashed, hashed[1:], strict=False)
+    ] + [-1]
+    # Each key hangs from the branch where it diverges from its closest neighbor.
+    depths = [
+        max(previous_length, next_length)
+        for previous_length, next_length in zip(
+            [-1] + next_prefix_lengths, next_prefix_lengths, strict=False
+        )
+    ]
+    leaves = [
+        _rlp_list(_rlp_string(_compact_path(key[depth + 1 :], True)) + _rlp_string(value))
+        for key, (_, value), depth in zip(keys, hashed, depths, strict=True)
+    ]
+    if len(leaves) == 1:
+        return Bytes32(hasher(leaves[0]))
+    hashed_leaves = iter(hasher.hash_all([leaf for leaf in leaves if len(leaf) >= 32]))
+    leaf_references = [
+        leaf if len(leaf) < 32 else b"\xa0" + next(hashed_leaves) for leaf in leaves
+    ]
+
+    def reference(encoded: bytes) -> bytes:
+        return encoded if len(encoded) < 32 else b"\xa0" + hasher(encoded)
+
+    # Open branches, as (depth, references of the children and the value), deepest last.
+    stack: List[Tuple[int, List[bytes]]] = []
+    for key, depth, leaf_reference, next_prefix_length in zip(
+        keys, depths, leaf_references, next_prefix_lengths, strict=True
+    ):
+        if not stack or stack[-1][0] < depth:
+            stack.append((depth, [_EMPTY_CHILD] * 17))
+        stack[-1][1][int(key[depth], 16)] = leaf_reference
+        # Close the branches that no later key goes through.
+        while stack[-1][0] > next_prefix_length:
+            branch_depth, children = stack.pop()
+            branch_node = _branch_node(children)
+            if not stack and next_prefix_length < 0:
+                # The root is the last open branch, possibly below an extension.
+                if branch_depth > 0:
+                    branch_node = _rlp_list(
+                        _rlp_string(_compact_path(key[:branch_depth], False))
+                        + reference(branch_node)
+                    )
+                return Bytes32(hasher(branch_node))
+            if not stack or stack[-1][0] < next_prefix_length:
+                stack.append((next_prefix_length, [_EMPTY_CHILD] * 17))
+            parent_depth = stack[-1][0]
+            branch = reference(branch_node)
+            extension = key[parent_depth + 1 : branch_depth]
+            if extension:
+                branch = reference(
+                    _rlp_list(_rlp_string(_compact_path(extension, False)) + branch)
+                )
+            stack[-1][1][int(key[parent_depth], 16)] = branch
+    raise AssertionError("the root branch was never closed")
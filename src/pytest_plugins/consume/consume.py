@@ -2,24 +2,28 @@
 
 import re
 import sys
-import tarfile
 from dataclasses import dataclass
-from io import BytesIO
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 from urllib.parse import urlparse
 
 import platformdirs
 import pytest
-import requests
 import rich
+from filelock import FileLock
 
 from cli.gen_index import generate_fixtures_index
 from ethereum_test_fixtures import BaseFixture
-from ethereum_test_fixtures.consume import IndexFile, TestCases
+from ethereum_test_fixtures.consume import IndexFile, TestCaseIndexFile, TestCases
 from ethereum_test_forks import get_forks, get_relative_fork_markers, get_transition_forks
 from ethereum_test_tools.utility.versioning import get_current_commit_hash_or_tag
 
+from .download_cache import (
+    EXTRACTED_MEMBERS_FILE,
+    DownloadCache,
+    SelectiveExtraction,
+    TestCaseFilter,
+)
 from .releases import ReleaseTag, get_release_page_url, get_release_url, is_release_url, is_url
 
 CACHED_DOWNLOADS_DIRECTORY = (
@@ -44,13 +48,29 @@ def default_html_report_file_path() -> str:
 
 
 class FixtureDownloader:
-    """Handles downloading and extracting fixture archives."""
+    """
+    Handles downloading and extracting fixture archives.
+
+    Archives are kept in a content-addressed download cache; if a test case filter is given,
+    only the JSON fixture files required by the selected test cases are extracted.
+    """
 
-    def __init__(self, url: str, base_directory: Path):  # noqa: D107
+    def __init__(
+        self,
+        url: str,
+        base_directory: Path,
+        test_case_filter: TestCaseFilter | None = None,
+    ):
+        """Initialize the downloader for the given URL and cache directory."""
         self.url = url
         self.base_directory = base_directory
+        self.test_case_filter = test_case_filter
         self.parsed_url = urlparse(url)
         self.archive_name = self.strip_archive_extension(Path(self.parsed_url.path).name)
+        self.download_url = self.parsed_url._replace(fragment="").geturl()
+        self.expected_sha256 = self.parse_expected_sha256(self.parsed_url.fragment)
+        self.download_cache = DownloadCache(base_directory / ".archives")
+        self.extraction: SelectiveExtraction | None = None
 
     @property
     def extract_to(self) -> Path:
@@ -62,11 +82,18 @@ class FixtureDownloader:
         return self.base_directory / "other" / self.archive_name
 
     def download_and_extract(self) -> Tuple[bool, Path]:
-        """Download the URL and extract it locally if it hasn't already been downloaded."""
-        if self.extract_to.exists():
-            return True, self.detect_extracted_directory()
+        """
+        Download the URL and extract it locally if it hasn't already been downloaded.
 
-        return False, self.fetch_and_extract()
+        A previous partial extraction is completed with the files required by the currently
+        selected test cases, re-using the cached archive.
+        """
+        self.extract_to.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.extract_to.with_suffix(".lock")):
+            partially_extracted = (self.extract_to / EXTRACTED_MEMBERS_FILE).exists()
+            if self.extract_to.exists() and not partially_extracted:
+                return True, self.detect_extracted_directory()
+            return partially_extracted, self.fetch_and_extract()
 
     def extract_github_repo(self) -> str:
         """Extract <username>/<repo> from GitHub URLs, otherwise return 'other'."""
@@ -82,17 +109,25 @@ class FixtureDownloader:
         """Remove .tar.gz or .tgz extensions from filename."""
         return filename.removesuffix(".tar.gz").removesuffix(".tgz")
 
-    def fetch_and_extract(self) -> Path:
-        """Download and extract an archive from the given URL."""
-        self.extract_to.mkdir(parents=True, exist_ok=False)
-        response = requests.get(self.url)
-        response.raise_for_status()
-
-        with tarfile.open(fileobj=BytesIO(response.content), mode="r:gz") as tar:
-            tar.extractall(path=self.extract_to, filter="data")
+    @staticmethod
+    def parse_expected_sha256(fragment: str) -> str | None:
+        """Return the expected archive checksum from a `#sha256=<hex>` URL fragment, if any."""
+        if fragment.startswith("sha256="):
+            return fragment.removeprefix("sha256=")
+        return None
 
+    def fetch_and_extract(self) -> Path:
+        """Download (or re-use the cached) archive from the given URL and extract it."""
+        _, archive_path = self.download_cache.fetch(self.download_url, self.expected_sha256)
+        self.extraction = SelectiveExtraction(archive_path, self.extract_to)
+        self.extraction.extract(self.test_case_filter)
         return self.detect_extracted_directory()
 
+    def ensure_extracted(self, json_path: Path) -> None:
+        """Make sure the fixture file is available if the archive was partially extracted."""
+        if self.extraction is not None:
+            self.extraction.ensure_extracted(json_path)
+
     def detect_extracted_directory(self) -> Path:
         """
         Detect a single top-level dir within the extracted archive, otherwise return extract_to.
@@ -112,24 +147,29 @@ class FixturesSource:
     is_local: bool = True
     is_stdin: bool = False
     was_cached: bool = False
+    downloader: FixtureDownloader | None = None
 
     @classmethod
-    def from_input(cls, input_source: str) -> "FixturesSource":
+    def from_input(
+        cls, input_source: str, test_case_filter: TestCaseFilter | None = None
+    ) -> "FixturesSource":
         """Determine the fixture source type and return an instance."""
         if input_source == "stdin":
             return cls(input_option=input_source, path=Path(), is_local=False, is_stdin=True)
         if is_release_url(input_source):
-            return cls.from_release_url(input_source)
+            return cls.from_release_url(input_source, test_case_filter=test_case_filter)
         if is_url(input_source):
-            return cls.from_url(input_source)
+            return cls.from_url(input_source, test_case_filter=test_case_filter)
         if ReleaseTag.is_release_string(input_source):
-            return cls.from_release_spec(input_source)
+            return cls.from_release_spec(input_source, test_case_filter=test_case_filter)
         return cls.validate_local_path(Path(input_source))
 
     @classmethod
-    def from_release_url(cls, url: str) -> "FixturesSource":
+    def from_release_url(
+        cls, url: str, test_case_filter: TestCaseFilter | None = None
+    ) -> "FixturesSource":
         """Create a fixture source from a supported github repo release URL."""
-        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY)
+        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY, test_case_filter)
         was_cached, path = downloader.download_and_extract()
 
         return cls(
@@ -139,12 +179,15 @@ class FixturesSource:
             release_page="",
             is_local=False,
             was_cached=was_cached,
+            downloader=downloader,
         )
 
     @classmethod
-    def from_url(cls, url: str) -> "FixturesSource":
+    def from_url(
+        cls, url: str, test_case_filter: TestCaseFilter | None = None
+    ) -> "FixturesSource":
         """Create a fixture source from a direct URL."""
-        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY)
+        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY, test_case_filter)
         was_cached, path = downloader.download_and_extract()
         return cls(
             input_option=url,
@@ -153,14 +196,17 @@ class FixturesSource:
             release_page="",
             is_local=False,
             was_cached=was_cached,
+            downloader=downloader,
         )
 
     @classmethod
-    def from_release_spec(cls, spec: str) -> "FixturesSource":
+    def from_release_spec(
+        cls, spec: str, test_case_filter: TestCaseFilter | None = None
+    ) -> "FixturesSource":
         """Create a fixture source from a release spec (e.g., develop@latest)."""
         url = get_release_url(spec)
         release_page = get_release_page_url(url)
-        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY)
+        downloader = FixtureDownloader(url, CACHED_DOWNLOADS_DIRECTORY, test_case_filter)
         was_cached, path = downloader.download_and_extract()
         return cls(
             input_option=spec,
@@ -169,8 +215,18 @@ class FixturesSource:
             release_page=release_page,
             is_local=False,
             was_cached=was_cached,
+            downloader=downloader,
         )
 
+    def fixture_file_path(self, json_path: Path) -> Path:
+        """
+        Return the path of a fixture file listed in the index, extracting it from the cached
+        archive first if the source was only partially extracted.
+        """
+        if self.downloader is not None:
+            self.downloader.ensure_extracted(json_path)
+        return self.path / json_path
+
     @staticmethod
     def validate_local_path(path: Path) -> "FixturesSource":
         """Validate that a local fixture path exists and contains JSON files."""
@@ -181,6 +237,84 @@ class FixturesSource:
         return FixturesSource(input_option=str(path), path=path)
 
 
+KeywordMatcher = Callable[[str], bool]
+
+
+def compile_keyword_expression(keyword_expression: str) -> KeywordMatcher:
+    """
+    Compile the subset of pytest's `-k` expressions made of keywords, `and`, `or`, `not` and
+    parentheses into a function returning whether the expression matches a lowercase text, in
+    which each keyword matches if it is contained.
+
+    Raises a `ValueError` if the expression is not in this subset.
+    """
+    tokens = re.findall(r"\(|\)|[^\s()]+", keyword_expression)
+    position = 0
+
+    def next_token_is(token: str) -> bool:
+        nonlocal position
+        if position < len(tokens) and tokens[position] == token:
+            position += 1
+            return True
+        return False
+
+    def parse_or() -> KeywordMatcher:
+        operands = [parse_and()]
+        while next_token_is("or"):
+            operands.append(parse_and())
+        return operands[0] if len(operands) == 1 else lambda text: any(m(text) for m in operands)
+
+    def parse_and() -> KeywordMatcher:
+        operands = [parse_not()]
+        while next_token_is("and"):
+            operands.append(parse_not())
+        return operands[0] if len(operands) == 1 else lambda text: all(m(text) for m in operands)
+
+    def parse_not() -> KeywordMatcher:
+        nonlocal position
+        if next_token_is("not"):
+            operand = parse_not()
+            return lambda text: not operand(text)
+        if next_token_is("("):
+            matcher = parse_or()
+            if not next_token_is(")"):
+                raise ValueError(f"Missing closing parenthesis in '{keyword_expression}'")
+            return matcher
+        if position == len(tokens) or tokens[position] in ("and", "or", ")"):
+            raise ValueError(f"Expected a keyword in '{keyword_expression}'")
+        keyword = tokens[position].lower()
+        position += 1
+        return lambda text: keyword in text
+
+    matcher = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[position]}' in '{keyword_expression}'")
+    return matcher
+
+
+def keyword_test_case_filter(keyword_expression: str) -> TestCaseFilter | None:
+    """
+    Return a filter that approximates the `-k` expression on the test case ID, fork and fixture
+    format, or `None` if no expression is given or it can't be parsed.
+
+    The filter is only used to select which fixture files to extract from a downloaded archive;
+    files of test cases it misses are extracted on demand.
+    """
+    keyword_expression = keyword_expression.strip()
+    if not keyword_expression:
+        return None
+    try:
+        matcher = compile_keyword_expression(keyword_expression)
+    except ValueError:
+        return None
+
+    def test_case_filter(test_case: TestCaseIndexFile) -> bool:
+        names = [test_case.id, str(test_case.fork), test_case.format.format_name]
+        return matcher(" ".join(names).lower())
+
+    return test_case_filter
+
+
 class SimLimitBehavior:
     """Represents options derived from the `--sim.limit` argument."""
 
@@ -307,7 +441,10 @@ def pytest_configure(config):  # noqa: D103
         # NOTE: Setting `type=FixturesSource.from_input` in pytest_addoption() causes the option to
         # be evaluated twice which breaks the result of `was_cached`; the work-around is to call it
         # manually here.
-        config.fixtures_source = FixturesSource.from_input(config.option.fixtures_source)
+        config.fixtures_source = FixturesSource.from_input(
+            config.option.fixtures_source,
+            test_case_filter=keyword_test_case_filter(getattr(config.option, "keyword", "")),
+        )
     config.fixture_source_flags = ["--input", config.fixtures_source.input_option]
 
     if "cache" in sys.argv and not config.fixtures_source:
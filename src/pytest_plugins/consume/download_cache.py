@@ -0,0 +1,329 @@
+"""
+A content-addressed, resumable download cache and selective extraction helpers for fixture
+release archives.
+
+Archives are stored under their SHA-256 digest in `blobs/sha256/`; a small reference file in
+`refs/` maps each downloaded URL to the digest of its content. Interrupted downloads are kept in
+`partial/` and are resumed via an HTTP `Range` request on the next attempt.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Callable, Iterable, Set, Tuple
+
+import requests
+from filelock import FileLock
+
+from ethereum_test_fixtures.consume import IndexFile, TestCaseIndexFile
+
+INDEX_FILE_MEMBER_SUFFIX = ".meta/index.json"
+EXTRACTED_MEMBERS_FILE = ".extracted_members.json"
+
+TestCaseFilter = Callable[[TestCaseIndexFile], bool]
+
+
+class ChecksumMismatchError(Exception):
+    """Raised when the content of a downloaded archive does not match its expected digest."""
+
+    def __init__(self, url: str, expected: str, got: str):
+        """Initialize the exception."""
+        super().__init__(
+            f"Checksum mismatch for '{url}': expected sha256 {expected}, got sha256 {got}"
+        )
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> "hashlib._Hash":
+    """Return a SHA-256 hash object fed with the full content of the file."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h
+
+
+class DownloadCache:
+    """A content-addressed cache of downloaded files, with resumable downloads."""
+
+    def __init__(self, base_directory: Path, chunk_size: int = 1 << 20, max_attempts: int = 3):
+        """Initialize the cache in the given directory."""
+        self.base_directory = base_directory
+        self.blobs_directory = base_directory / "blobs" / "sha256"
+        self.refs_directory = base_directory / "refs"
+        self.partial_directory = base_directory / "partial"
+        self.chunk_size = chunk_size
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        """Return the key used to store per-URL state (references and partial downloads)."""
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the path of the blob with the given SHA-256 hex digest."""
+        return self.blobs_directory / digest
+
+    def ref_path(self, url: str) -> Path:
+        """Return the path of the reference file for the given URL."""
+        return self.refs_directory / f"{self.url_key(url)}.json"
+
+    def partial_path(self, url: str) -> Path:
+        """Return the path of the partial download file for the given URL."""
+        return self.partial_directory / f"{self.url_key(url)}.part"
+
+    def lookup(self, url: str, expected_sha256: str | None = None) -> Path | None:
+        """
+        Return the path to the cached blob for the URL, or `None` if it is not cached.
+
+        The blob's content is only verified against its content address if its size or
+        modification time differ from the ones recorded in the reference file; corrupted blobs
+        are removed and treated as a cache miss.
+        """
+        ref_path = self.ref_path(url)
+        if not ref_path.exists():
+            return None
+        ref = json.loads(ref_path.read_text())
+        digest = ref["sha256"]
+        if expected_sha256 is not None and digest != expected_sha256.lower():
+            return None
+        blob_path = self.blob_path(digest)
+        if not blob_path.exists():
+            return None
+        stat = blob_path.stat()
+        if stat.st_size == ref.get("size") and stat.st_mtime_ns == ref.get("mtime_ns"):
+            return blob_path
+        if file_sha256(blob_path, self.chunk_size).hexdigest() != digest:
+            blob_path.unlink()
+            return None
+        self.write_ref(url, blob_path)
+        return blob_path
+
+    def write_ref(self, url: str, blob_path: Path) -> None:
+        """Write the reference file mapping the URL to the blob, with its size and mtime."""
+        stat = blob_path.stat()
+        self.refs_directory.mkdir(parents=True, exist_ok=True)
+        self.ref_path(url).write_text(
+            json.dumps(
+                {
+                    "url": url,
+                    "sha256": blob_path.name,
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                }
+            )
+        )
+
+    def fetch(self, url: str, expected_sha256: str | None = None) -> Tuple[bool, Path]:
+        """
+        Return the path of the content-addressed blob for the URL, downloading it if required.
+
+        Returns a tuple of whether the blob was already cached and its path. Raises a
+        `ChecksumMismatchError` if `expected_sha256` is given and the downloaded content does
+        not match it.
+        """
+        self.base_directory.mkdir(parents=True, exist_ok=True)
+        with FileLock(self.base_directory / f"{self.url_key(url)}.lock"):
+            cached = self.lookup(url, expected_sha256)
+            if cached is not None:
+                return True, cached
+            return False, self._download(url, expected_sha256)
+
+    def _download(self, url: str, expected_sha256: str | None) -> Path:
+        """Download the URL, resuming from a previous partial download if present."""
+        self.partial_directory.mkdir(parents=True, exist_ok=True)
+        partial_path = self.partial_path(url)
+        last_error: Exception | None = None
+        for _ in range(self.max_attempts):
+            try:
+                self._download_to_partial(url, partial_path)
+                break
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                # Keep the partial file; the next attempt resumes from where this one stopped.
+                last_error = e
+        else:
+            assert last_error is not None
+            raise last_error
+
+        digest = file_sha256(partial_path, self.chunk_size).hexdigest()
+        if expected_sha256 is not None and digest != expected_sha256.lower():
+            partial_path.unlink()
+            raise ChecksumMismatchError(url, expected_sha256.lower(), digest)
+
+        self.blobs_directory.mkdir(parents=True, exist_ok=True)
+        blob_path = self.blob_path(digest)
+        os.replace(partial_path, blob_path)
+        self.write_ref(url, blob_path)
+        return blob_path
+
+    def _download_to_partial(self, url: str, partial_path: Path) -> None:
+        """Stream the URL into the partial file, requesting only the missing byte range."""
+        offset = partial_path.stat().st_size if partial_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with requests.get(url, headers=headers, stream=True, timeout=60) as response:
+            if offset and response.status_code == 416:
+                # The server cannot satisfy the range; the partial file is stale, start over.
+                partial_path.unlink()
+                self._download_to_partial(url, partial_path)
+                return
+            response.raise_for_status()
+            mode = "ab" if offset and response.status_code == 206 else "wb"
+            with open(partial_path, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+
+
+def find_index_member(archive_path: Path) -> tarfile.TarInfo | None:
+    """Return the archive member of the fixtures' `.meta/index.json` file, if any."""
+    with tarfile.open(archive_path, mode="r:gz") as tar:
+        for member in tar:
+            if member.isfile() and (
+                member.name == INDEX_FILE_MEMBER_SUFFIX
+                or member.name.endswith("/" + INDEX_FILE_MEMBER_SUFFIX)
+            ):
+                return member
+    return None
+
+
+def member_prefix(index_member_name: str) -> str:
+    """Return the path prefix of the fixtures root directory within the archive."""
+    return index_member_name.removesuffix(INDEX_FILE_MEMBER_SUFFIX)
+
+
+def extract_members(
+    archive_path: Path,
+    destination: Path,
+    member_names: Set[str] | None = None,
+    *,
+    skip_existing: bool = False,
+) -> Set[str]:
+    """
+    Extract the named members (or all if `member_names` is `None`) in a single archive pass.
+
+    Files are written to a temporary file and then moved into place, so that other processes
+    reading the destination never see a partially written file; with `skip_existing`, the files
+    already in the destination are not extracted again.
+
+    Returns the set of member names that were extracted.
+    """
+    extracted: Set[str] = set()
+    with tarfile.open(archive_path, mode="r:gz") as tar:
+        for member in tar:
+            if member_names is not None and member.name not in member_names:
+                continue
+            if not member.isfile():
+                tar.extract(member, path=destination, filter="data")
+            else:
+                member = tarfile.data_filter(member, str(destination))
+                target = destination / member.name
+                if not (skip_existing and target.exists()):
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    source = tar.extractfile(member)
+                    assert source is not None
+                    with tempfile.NamedTemporaryFile(dir=target.parent, delete=False) as f:
+                        shutil.copyfileobj(source, f)
+                    if member.mode is not None:
+                        os.chmod(f.name, member.mode)
+                    os.replace(f.name, target)
+            extracted.add(member.name)
+    return extracted
+
+
+def selected_member_names(
+    index: IndexFile, prefix: str, test_case_filter: TestCaseFilter
+) -> Set[str]:
+    """Return the archive member names of the JSON files required by the selected test cases."""
+    return {
+        prefix + PurePosixPath(test_case.json_path).as_posix()
+        for test_case in index.test_cases
+        if test_case_filter(test_case)
+    }
+
+
+class SelectiveExtraction:
+    """
+    Track which members of an archive have been extracted into a directory.
+
+    The state is kept in a small JSON file in the extraction directory; its absence means the
+    archive was extracted in full.
+    """
+
+    def __init__(self, archive_path: Path, extract_to: Path):
+        """Initialize the extraction state for an archive and its extraction directory."""
+        self.archive_path = archive_path
+        self.extract_to = extract_to
+        self.state_file = extract_to / EXTRACTED_MEMBERS_FILE
+
+    @property
+    def is_partial(self) -> bool:
+        """Return whether the archive has only been partially extracted."""
+        return self.state_file.exists()
+
+    def _read_state(self) -> Tuple[str, Set[str]]:
+        state = json.loads(self.state_file.read_text())
+        return state["prefix"], set(state["members"])
+
+    def _write_state(self, prefix: str, members: Iterable[str]) -> None:
+        self.state_file.write_text(json.dumps({"prefix": prefix, "members": sorted(members)}))
+
+    def extract(self, test_case_filter: TestCaseFilter | None) -> None:
+        """
+        Extract the archive, only extracting the JSON files of the selected test cases if a
+        filter is given and the archive contains an index file.
+
+        The index of a partially extracted archive is read from the extraction directory, so
+        that completing the extraction takes at most one pass over the archive.
+        """
+        self.extract_to.mkdir(parents=True, exist_ok=True)
+        index_member_name: str | None = None
+        already_extracted: Set[str] = set()
+        if test_case_filter is not None and self.is_partial:
+            prefix, already_extracted = self._read_state()
+            index_member_name = prefix + INDEX_FILE_MEMBER_SUFFIX
+        elif test_case_filter is not None:
+            index_member = find_index_member(self.archive_path)
+            if index_member is not None:
+                index_member_name = index_member.name
+                already_extracted = extract_members(
+                    self.archive_path, self.extract_to, {index_member_name}
+                )
+        if test_case_filter is None or index_member_name is None:
+            extract_members(self.archive_path, self.extract_to, skip_existing=True)
+            self.state_file.unlink(missing_ok=True)
+            return
+
+        prefix = member_prefix(index_member_name)
+        index = IndexFile.model_validate_json((self.extract_to / index_member_name).read_text())
+        missing = selected_member_names(index, prefix, test_case_filter) - already_extracted
+        extracted = (
+            extract_members(self.archive_path, self.extract_to, missing, skip_existing=True)
+            if missing
+            else set()
+        )
+        self._write_state(prefix, already_extracted | extracted | {index_member_name})
+
+    def ensure_extracted(self, json_path: Path) -> None:
+        """
+        Make sure the fixture file is present; on a miss, extract all the remaining members so
+        that a poorly selective filter costs at most one extra pass over the archive.
+
+        The files are moved into place once fully written, so the files already present can be
+        read while another process completes the extraction.
+        """
+        if not self.is_partial:
+            return
+        prefix, _ = self._read_state()
+        if (self.extract_to / (prefix + PurePosixPath(json_path).as_posix())).exists():
+            return
+        with FileLock(self.extract_to.with_suffix(".lock")):
+            if not self.is_partial:
+                return
+            extract_members(self.archive_path, self.extract_to, skip_existing=True)
+            self.state_file.unlink()
@@ -4,23 +4,15 @@ from pathlib import Path
 from typing import Dict, Literal
 
 import pytest
-from hive.client import Client
 
 from ethereum_test_fixtures import (
     BaseFixture,
 )
 from ethereum_test_fixtures.consume import TestCaseIndexFile, TestCaseStream
 from ethereum_test_fixtures.file import Fixtures
-from ethereum_test_rpc import EthRPC
 from pytest_plugins.consume.consume import FixturesSource
 
 
-@pytest.fixture(scope="function")
-def eth_rpc(client: Client) -> EthRPC:
-    """Initialize ethereum RPC client for the execution client under test."""
-    return EthRPC(f"http://{client.ip}:8545")
-
-
 @pytest.fixture(scope="function")
 def check_live_port(test_suite_name: str) -> Literal[8545, 8551]:
     """Port used by hive to check for liveness of the client."""
@@ -77,7 +69,7 @@ def fixture(
         fixture = test_case.fixture
     else:
         assert isinstance(test_case, TestCaseIndexFile), "Expected an index file test case"
-        fixtures_file_path = fixtures_source.path / test_case.json_path
+        fixtures_file_path = fixtures_source.fixture_file_path(test_case.json_path)
         fixtures: Fixtures = fixture_file_loader[fixtures_file_path]
         fixture = fixtures[test_case.id]
     assert isinstance(fixture, test_case.format), (
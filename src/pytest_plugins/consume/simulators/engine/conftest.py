@@ -21,6 +21,7 @@ pytest_plugins = (
     "pytest_plugins.consume.simulators.test_case_description",
     "pytest_plugins.consume.simulators.timing_data",
     "pytest_plugins.consume.simulators.exceptions",
+    "pytest_plugins.consume.simulators.forkchoice",
 )
 
 
@@ -0,0 +1 @@
+"""Consume Engine API simulator that runs against a local stand-in instead of hive clients."""
@@ -0,0 +1,70 @@
+"""
+Pytest fixtures for the `consume engine-stand-in` simulator.
+
+Executes the Engine API simulator against a local stand-in server instead of hive clients, so
+that the framework overhead of consuming each payload can be measured and optimized.
+"""
+
+from typing import Generator
+
+import pytest
+
+from ethereum_test_exceptions import ExceptionMapper
+from ethereum_test_fixtures import BlockchainEngineFixture
+from ethereum_test_rpc import EngineRPC, EthRPC
+
+from ..helpers.engine_stand_in import StandInClientType, StandInRPC, engine_stand_in_process
+from ..helpers.timing import TimingData
+
+pytest_plugins = (
+    "pytest_plugins.consume.simulators.base",
+    "pytest_plugins.consume.simulators.timing_data",
+    "pytest_plugins.consume.simulators.exceptions",
+    "pytest_plugins.consume.simulators.forkchoice",
+)
+
+
+def pytest_configure(config):
+    """Set the supported fixture formats and the stand-in as the only client type."""
+    config._supported_fixture_formats = [BlockchainEngineFixture.format_name]
+    # `client_type` is parametrized from `hive_execution_clients` by the consume plugin.
+    config.hive_execution_clients = [StandInClientType()]
+
+
+@pytest.fixture(scope="session")
+def engine_stand_in_url() -> Generator[str, None, None]:
+    """Start the stand-in server in a separate process for the whole session."""
+    with engine_stand_in_process() as url:
+        yield url
+
+
+@pytest.fixture(scope="function")
+def client(
+    engine_stand_in_url: str,
+    fixture: BlockchainEngineFixture,
+    total_timing_data: TimingData,
+) -> StandInRPC:
+    """Load the fixture into the stand-in, which takes the place of starting a client."""
+    client = StandInRPC(engine_stand_in_url)
+    with total_timing_data.time("Start client"):
+        client.load_fixture(fixture)
+    return client
+
+
+@pytest.fixture(scope="function")
+def eth_rpc(client: StandInRPC) -> EthRPC:
+    """Initialize ethereum RPC client for the stand-in."""
+    return EthRPC(client.url)
+
+
+@pytest.fixture(scope="function")
+def engine_rpc(client: StandInRPC, client_exception_mapper: ExceptionMapper | None) -> EngineRPC:
+    """Initialize engine RPC client for the stand-in."""
+    if client_exception_mapper:
+        return EngineRPC(
+            client.url,
+            response_validation_context={
+                "exception_mapper": client_exception_mapper,
+            },
+        )
+    return EngineRPC(client.url)
@@ -0,0 +1,27 @@
+"""Pytest plugin that defines the forkchoice update options of the Engine API simulators."""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    """Engine simulator specific consume command line options."""
+    consume_group = parser.getgroup(
+        "consume", "Arguments related to consuming fixtures via a client"
+    )
+    consume_group.addoption(
+        "--deferred-forkchoice",
+        action="store_true",
+        dest="deferred_forkchoice",
+        default=False,
+        help=(
+            "Send a single forkchoice update for each run of consecutive valid payloads instead "
+            "of one after every valid payload. The update is sent to the last valid head before "
+            "any invalid payload and after the last payload."
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
+def deferred_forkchoice(request: pytest.FixtureRequest) -> bool:
+    """Return whether forkchoice updates of consecutive valid payloads are deferred."""
+    return request.config.getoption("deferred_forkchoice")
@@ -0,0 +1,314 @@
+"""
+A local stand-in for the Engine API and `eth` JSON-RPC endpoints of an execution client.
+
+The stand-in doesn't execute blocks: it recomputes the block hash of every payload it receives,
+looks the payload up in the loaded fixture and replies with the outcome the fixture expects
+(`VALID`, `INVALID` with the expected exception, or the expected JSON-RPC error code). This allows
+profiling the framework overhead of `consume engine` without hive or client containers.
+"""
+
+import json
+import multiprocessing
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing.connection import Connection
+from typing import Any, ClassVar, Dict, Iterator, List, Sequence
+
+import ethereum_rlp as eth_rlp
+from ethereum_types.numeric import Uint
+from trie import HexaryTrie
+
+from ethereum_test_base_types import Bytes, Hash, to_json
+from ethereum_test_exceptions import (
+    BlockException,
+    EngineAPIError,
+    ExceptionBase,
+    ExceptionMapper,
+    TransactionException,
+)
+from ethereum_test_fixtures import BlockchainEngineFixture
+from ethereum_test_fixtures.blockchain import (
+    FixtureEngineNewPayload,
+    FixtureExecutionPayload,
+    FixtureHeader,
+)
+from ethereum_test_rpc.rpc import BaseRPC
+from ethereum_test_rpc.types import ForkchoiceState, JSONRPCError, PayloadStatusEnum
+from ethereum_test_types import Requests, Withdrawal
+
+STAND_IN_CLIENT_NAME = "eest-stand-in"
+
+_NEW_PAYLOAD_PATTERN = re.compile(r"engine_newPayloadV\d+")
+_FORKCHOICE_UPDATED_PATTERN = re.compile(r"engine_forkchoiceUpdatedV\d+")
+
+
+@dataclass(kw_only=True, frozen=True)
+class StandInClientType:
+    """The client type used to parametrize tests that run against the stand-in."""
+
+    name: str = STAND_IN_CLIENT_NAME
+    version: str = "local"
+
+
+class StandInExceptionMapper(ExceptionMapper):
+    """
+    Map the validation errors returned by the stand-in, which contain the string
+    representation of the exceptions expected by the fixture.
+    """
+
+    mapping_substring: ClassVar[Dict[ExceptionBase, str]] = {}
+    mapping_regex: ClassVar[Dict[ExceptionBase, str]] = {
+        exception: rf"\b{re.escape(str(exception))}\b"
+        for exception in [*BlockException, *TransactionException]
+    }
+
+
+def payload_block_hash(params: Sequence[Any]) -> Hash:
+    """Compute the block hash of the header described by `engine_newPayloadVX` parameters."""
+    payload = FixtureExecutionPayload.model_validate(params[0])
+    transactions_trie = HexaryTrie(db={})
+    for i, transaction in enumerate(payload.transactions):
+        transactions_trie.set(eth_rlp.encode(Uint(i)), bytes(transaction))
+    header = FixtureHeader(
+        parent_hash=payload.parent_hash,
+        fee_recipient=payload.fee_recipient,
+        state_root=payload.state_root,
+        transactions_trie=transactions_trie.root_hash,
+        receipts_root=payload.receipts_root,
+        logs_bloom=payload.logs_bloom,
+        number=payload.number,
+        gas_limit=payload.gas_limit,
+        gas_used=payload.gas_used,
+        timestamp=payload.timestamp,
+        extra_data=payload.extra_data,
+        prev_randao=payload.prev_randao,
+        base_fee_per_gas=payload.base_fee_per_gas,
+        withdrawals_root=(
+            Withdrawal.list_root(payload.withdrawals) if payload.withdrawals is not None else None
+        ),
+        blob_gas_used=payload.blob_gas_used,
+        excess_blob_gas=payload.excess_blob_gas,
+        parent_beacon_block_root=Hash(params[2]) if len(params) > 2 else None,
+        requests_hash=(
+            Hash(bytes(Requests(requests_lists=[Bytes(r) for r in params[3]])))
+            if len(params) > 3
+            else None
+        ),
+    )
+    return header.block_hash
+
+
+def payload_status(
+    status: PayloadStatusEnum,
+    latest_valid_hash: Hash | None = None,
+    validation_error: str | None = None,
+) -> Dict[str, Any]:
+    """Return the JSON representation of a payload status."""
+    return {
+        "status": status.value,
+        "latestValidHash": str(latest_valid_hash) if latest_valid_hash is not None else None,
+        "validationError": validation_error,
+    }
+
+
+class EngineStandIn:
+    """
+    Chain state of the stand-in and handler of its JSON-RPC methods.
+
+    Only the blocks of the loaded fixture are known: the genesis block and the valid payloads
+    that have been received so far.
+    """
+
+    fixture: BlockchainEngineFixture | None
+    expected_payloads: Dict[Hash, FixtureEngineNewPayload]
+    blocks: Dict[Hash, Dict[str, Any]]
+    head: Hash
+
+    def __init__(self) -> None:
+        """Initialize the stand-in without a fixture."""
+        self.fixture = None
+        self.expected_payloads = {}
+        self.blocks = {}
+        self.head = Hash(0)
+
+    def load_fixture(self, fixture: BlockchainEngineFixture) -> None:
+        """Reset the chain to the genesis of the fixture and expect its payloads."""
+        self.fixture = fixture
+        self.expected_payloads = {
+            payload.params[0].block_hash: payload for payload in fixture.payloads
+        }
+        genesis_hash = fixture.genesis.block_hash
+        self.blocks = {genesis_hash: to_json(fixture.genesis)}
+        self.head = genesis_hash
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a single JSON-RPC request and return its response."""
+        response: Dict[str, Any] = {"jsonrpc": "2.0", "id": request.get("id")}
+        try:
+            response["result"] = self.call(request["method"], request.get("params") or [])
+        except JSONRPCError as e:
+            response["error"] = {"code": e.code, "message": e.message}
+        except Exception as e:
+            response["error"] = {"code": EngineAPIError.InternalError.value, "message": str(e)}
+        return response
+
+    def call(self, method: str, params: List[Any]) -> Any:
+        """Dispatch a JSON-RPC method call."""
+        if method == "standin_loadFixture":
+            self.load_fixture(BlockchainEngineFixture.model_validate(params[0]))
+            return True
+        if self.fixture is None:
+            raise JSONRPCError(EngineAPIError.ServerError, "No fixture loaded in the stand-in")
+        if _NEW_PAYLOAD_PATTERN.fullmatch(method):
+            return self.new_payload(params)
+        if _FORKCHOICE_UPDATED_PATTERN.fullmatch(method):
+            return self.forkchoice_updated(params)
+        if method == "eth_getBlockByNumber":
+            return self.get_block_by_number(params[0])
+        raise JSONRPCError(EngineAPIError.MethodNotFound, f"Method not found: {method}")
+
+    def new_payload(self, params: List[Any]) -> Dict[str, Any]:
+        """Validate the block hash of the payload and reply the status expected by the fixture."""
+        block = dict(params[0])
+        block_hash = Hash(block.pop("blockHash"))
+        computed_block_hash = payload_block_hash(params)
+        if computed_block_hash != block_hash:
+            return payload_status(
+                PayloadStatusEnum.INVALID,
+                validation_error=(
+                    f"Invalid block hash: got {block_hash}, computed {computed_block_hash}"
+                ),
+            )
+        expected = self.expected_payloads.get(block_hash)
+        if expected is None:
+            return payload_status(
+                PayloadStatusEnum.INVALID,
+                validation_error=f"Payload {block_hash} is not part of the loaded fixture",
+            )
+        if expected.error_code is not None:
+            raise JSONRPCError(expected.error_code, f"Expected error: {expected.error_code.name}")
+        parent_hash = Hash(block["parentHash"])
+        if parent_hash not in self.blocks:
+            return payload_status(PayloadStatusEnum.SYNCING)
+        if expected.validation_error is not None:
+            exceptions = (
+                expected.validation_error
+                if isinstance(expected.validation_error, list)
+                else [expected.validation_error]
+            )
+            return payload_status(
+                PayloadStatusEnum.INVALID,
+                latest_valid_hash=parent_hash,
+                validation_error=", ".join(str(exception) for exception in exceptions),
+            )
+        block["hash"] = str(block_hash)
+        block["number"] = block.pop("blockNumber")
+        self.blocks[block_hash] = block
+        return payload_status(PayloadStatusEnum.VALID, latest_valid_hash=block_hash)
+
+    def forkchoice_updated(self, params: List[Any]) -> Dict[str, Any]:
+        """Set the head of the chain if the block is known; payload building is unsupported."""
+        head = ForkchoiceState.model_validate(params[0]).head_block_hash
+        if head not in self.blocks:
+            return {"payloadStatus": payload_status(PayloadStatusEnum.SYNCING), "payloadId": None}
+        self.head = head
+        return {
+            "payloadStatus": payload_status(PayloadStatusEnum.VALID, latest_valid_hash=head),
+            "payloadId": None,
+        }
+
+    def get_block_by_number(self, block_number: str) -> Dict[str, Any] | None:
+        """Return a block of the canonical chain, walking back from the head."""
+        if block_number in ("latest", "pending", "safe", "finalized"):
+            return self.blocks[self.head]
+        number = 0 if block_number == "earliest" else int(block_number, 16)
+        block: Dict[str, Any] | None = self.blocks[self.head]
+        while block is not None and int(block["number"], 16) > number:
+            block = self.blocks.get(Hash(block["parentHash"]))
+        if block is None or int(block["number"], 16) != number:
+            return None
+        return block
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Handle JSON-RPC requests, including batches, sent to the stand-in server."""
+
+    # Keep connections alive so that RPC clients reuse them, without delaying small responses.
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "EngineStandInServer"
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Reply to a JSON-RPC request or batch of requests."""
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            if isinstance(body, list):
+                response: Any = [self.server.stand_in.handle_request(r) for r in body]
+            else:
+                response = self.server.stand_in.handle_request(body)
+        content = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Silence the request logging."""
+        pass
+
+
+class EngineStandInServer(ThreadingHTTPServer):
+    """HTTP server that serves the Engine API and `eth` methods of the stand-in on one port."""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        """Bind the server; the default port `0` binds to any free port."""
+        super().__init__((host, port), _RequestHandler)
+        self.host = host
+        self.stand_in = EngineStandIn()
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the server."""
+        return f"http://{self.host}:{self.server_port}"
+
+
+class StandInRPC(BaseRPC):
+    """Represents the `standin_X` RPC class used to control the stand-in server."""
+
+    def load_fixture(self, fixture: BlockchainEngineFixture) -> None:
+        """`standin_loadFixture`: Reset the stand-in chain to the given fixture."""
+        self.post_request("loadFixture", to_json(fixture))
+
+
+def serve_engine_stand_in(connection: Connection) -> None:
+    """Run a stand-in server forever, sending its URL through the connection once bound."""
+    server = EngineStandInServer()
+    connection.send(server.url)
+    connection.close()
+    server.serve_forever()
+
+
+@contextmanager
+def engine_stand_in_process() -> Iterator[str]:
+    """
+    Run a stand-in server in a separate process and yield its URL.
+
+    The separate process keeps the stand-in from competing with the test for the GIL, so that
+    the measured timings reflect the framework overhead.
+    """
+    context = multiprocessing.get_context("spawn")
+    parent_connection, child_connection = context.Pipe()
+    process = context.Process(target=serve_engine_stand_in, args=(child_connection,), daemon=True)
+    process.start()
+    try:
+        yield parent_connection.recv()
+    finally:
+        process.terminate()
+        process.join()
@@ -14,6 +14,8 @@ from ethereum_clis.clis.reth import RethExceptionMapper
 from ethereum_test_exceptions import ExceptionMapper
 from ethereum_test_fixtures.blockchain import FixtureHeader
 
+from .engine_stand_in import STAND_IN_CLIENT_NAME, StandInExceptionMapper
+
 
 class GenesisBlockMismatchExceptionError(Exception):
     """Definers a mismatch exception between the client and fixture genesis blockhash."""
@@ -72,4 +74,5 @@ EXCEPTION_MAPPERS: Dict[str, ExceptionMapper] = {
     "nimbus": NimbusExceptionMapper(),
     "ethereumjs": EthereumJSExceptionMapper(),
     "ethrex": EthrexExceptionMapper(),
+    STAND_IN_CLIENT_NAME: StandInExceptionMapper(),
 }
@@ -0,0 +1,255 @@
+"""
+A persistent, cross-run database of consume test timings.
+
+Timings are stored in a local SQLite database per run, client, client version, test case and
+phase, so that latency percentiles can be summarized across runs and a candidate run can be
+compared against a baseline run to detect performance regressions.
+"""
+
+import datetime
+import math
+import re
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Literal, Tuple
+
+from pytest_plugins.shared.helpers import percentile
+
+from .timing import TimingData
+
+NEW_PAYLOAD_PHASE_PATTERN = "engine_newPayloadV%"
+
+SummaryGrouping = Literal["client", "eip"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT UNIQUE NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    client TEXT NOT NULL,
+    client_version TEXT NOT NULL,
+    test_id TEXT NOT NULL,
+    eip INTEGER,
+    phase TEXT NOT NULL,
+    path TEXT NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timings_run_phase ON timings (run_id, phase);
+"""
+
+_EIP_PATTERN = re.compile(r"eip(\d+)")
+
+
+def eip_from_test_id(test_id: str) -> int | None:
+    """Return the EIP number a test belongs to, based on its module path, if any."""
+    match = _EIP_PATTERN.search(test_id.split("::")[0])
+    return int(match.group(1)) if match else None
+
+
+def flatten_timing_data(
+    timing_data: TimingData, parent_path: str = ""
+) -> Iterator[Tuple[str, str, float]]:
+    """Yield the phase name, full path and duration of every finished timing in the tree."""
+    path = f"{parent_path}/{timing_data.name}" if parent_path else timing_data.name
+    if timing_data.start_time is not None and timing_data.end_time is not None:
+        yield timing_data.name, path, timing_data.end_time - timing_data.start_time
+    for timing in timing_data.timings:
+        yield from flatten_timing_data(timing, path)
+
+
+@dataclass(kw_only=True, frozen=True)
+class TimingRun:
+    """A consume run recorded in the timing database."""
+
+    id: int
+    label: str
+    created_at: str
+    test_count: int
+
+
+@dataclass(kw_only=True, frozen=True)
+class PercentileSummary:
+    """Latency percentiles of a phase for a group of tests (seconds)."""
+
+    group: str
+    count: int
+    p50: float
+    p95: float
+    p99: float
+
+
+@dataclass(kw_only=True, frozen=True)
+class TimingRegression:
+    """A test whose mean phase latency worsened versus the baseline run (seconds)."""
+
+    client: str
+    test_id: str
+    baseline: float
+    candidate: float
+
+    @property
+    def ratio(self) -> float:
+        """Return the candidate latency relative to the baseline latency."""
+        return self.candidate / self.baseline if self.baseline else math.inf
+
+
+class TimingDatabase:
+    """Store and query consume test timings across runs."""
+
+    def __init__(self, path: Path):
+        """Open (or create) the timing database at the given path."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def start_run(self, label: str | None = None) -> int:
+        """Return the ID of the run with the given label, creating it if it doesn't exist."""
+        created_at = datetime.datetime.now().isoformat()
+        label = label or created_at
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO runs (label, created_at) VALUES (?, ?)",
+                (label, created_at),
+            )
+        return self.run_id(label)
+
+    def run_id(self, label: str) -> int:
+        """Return the ID of the run with the given label."""
+        row = self.connection.execute("SELECT id FROM runs WHERE label = ?", (label,)).fetchone()
+        if row is None:
+            raise ValueError(f"No run labelled '{label}' in {self.path}")
+        return row[0]
+
+    def latest_run_ids(self, count: int) -> List[int]:
+        """Return the IDs of the most recent runs, most recent first."""
+        rows = self.connection.execute(
+            "SELECT id FROM runs ORDER BY id DESC LIMIT ?", (count,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def runs(self) -> List[TimingRun]:
+        """Return all recorded runs."""
+        rows = self.connection.execute(
+            """
+            SELECT runs.id, runs.label, runs.created_at, COUNT(DISTINCT timings.test_id)
+            FROM runs LEFT JOIN timings ON timings.run_id = runs.id
+            GROUP BY runs.id ORDER BY runs.id
+            """
+        ).fetchall()
+        return [
+            TimingRun(id=row[0], label=row[1], created_at=row[2], test_count=row[3])
+            for row in rows
+        ]
+
+    def record(
+        self,
+        *,
+        run_id: int,
+        client: str,
+        client_version: str,
+        test_id: str,
+        timing_data: TimingData,
+    ) -> None:
+        """Record every phase of a test's timing data."""
+        eip = eip_from_test_id(test_id)
+        with self.connection:
+            self.connection.executemany(
+                """
+                INSERT INTO timings
+                    (run_id, client, client_version, test_id, eip, phase, path, duration)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (run_id, client, client_version, test_id, eip, phase, path, duration)
+                    for phase, path, duration in flatten_timing_data(timing_data)
+                ],
+            )
+
+    def summary(
+        self,
+        run_id: int,
+        group_by: SummaryGrouping = "client",
+        phase_pattern: str = NEW_PAYLOAD_PHASE_PATTERN,
+    ) -> List[PercentileSummary]:
+        """Return the p50/p95/p99 latencies of matching phases, per client or per EIP."""
+        if group_by == "client":
+            group_column = "client || ' ' || client_version"
+        else:
+            group_column = "COALESCE('EIP-' || eip, 'no EIP')"
+        rows = self.connection.execute(
+            f"""
+            SELECT {group_column}, duration FROM timings
+            WHERE run_id = ? AND phase LIKE ?
+            """,
+            (run_id, phase_pattern),
+        ).fetchall()
+        durations: Dict[str, List[float]] = defaultdict(list)
+        for group, duration in rows:
+            durations[group].append(duration)
+        summaries = []
+        for group in sorted(durations):
+            values = sorted(durations[group])
+            summaries.append(
+                PercentileSummary(
+                    group=group,
+                    count=len(values),
+                    p50=percentile(values, 50),
+                    p95=percentile(values, 95),
+                    p99=percentile(values, 99),
+                )
+            )
+        return summaries
+
+    def mean_latencies(
+        self, run_id: int, phase_pattern: str = NEW_PAYLOAD_PHASE_PATTERN
+    ) -> Dict[Tuple[str, str], float]:
+        """Return the mean latency of matching phases per (client, test ID)."""
+        rows = self.connection.execute(
+            """
+            SELECT client, test_id, AVG(duration) FROM timings
+            WHERE run_id = ? AND phase LIKE ?
+            GROUP BY client, test_id
+            """,
+            (run_id, phase_pattern),
+        ).fetchall()
+        return {(client, test_id): mean for client, test_id, mean in rows}
+
+    def regressions(
+        self,
+        *,
+        baseline_run_id: int,
+        candidate_run_id: int,
+        threshold: float,
+        min_delta: float = 0.0,
+        phase_pattern: str = NEW_PAYLOAD_PHASE_PATTERN,
+    ) -> List[TimingRegression]:
+        """
+        Return the tests whose mean phase latency in the candidate run exceeds the baseline
+        by more than the relative `threshold` (e.g. 0.2 for 20%) and by at least `min_delta`
+        seconds, worst first. Only tests present in both runs are compared.
+        """
+        baseline = self.mean_latencies(baseline_run_id, phase_pattern)
+        candidate = self.mean_latencies(candidate_run_id, phase_pattern)
+        regressions = [
+            TimingRegression(
+                client=client,
+                test_id=test_id,
+                baseline=baseline[(client, test_id)],
+                candidate=latency,
+            )
+            for (client, test_id), latency in candidate.items()
+            if (client, test_id) in baseline
+            and latency > baseline[(client, test_id)] * (1 + threshold)
+            and latency - baseline[(client, test_id)] >= min_delta
+        ]
+        return sorted(regressions, key=lambda regression: regression.ratio, reverse=True)
@@ -6,9 +6,11 @@ Each `engine_newPayloadVX` is verified against the appropriate VALID/INVALID res
 """
 
 import time
+from typing import List
 
 from ethereum_test_exceptions import UndefinedException
 from ethereum_test_fixtures import BlockchainEngineFixture
+from ethereum_test_fixtures.blockchain import FixtureEngineNewPayload
 from ethereum_test_rpc import EngineRPC, EthRPC
 from ethereum_test_rpc.types import ForkchoiceState, JSONRPCError, PayloadStatusEnum
 from pytest_plugins.consume.simulators.helpers.exceptions import GenesisBlockMismatchExceptionError
@@ -28,18 +30,111 @@ class LoggedError(Exception):
         logger.fail(str(self))
 
 
+def send_forkchoice_update(
+    engine_rpc: EngineRPC, payload: FixtureEngineNewPayload, timing_data: TimingData, name: str
+) -> None:
+    """Send a forkchoice update to the block of the payload and verify it's VALID."""
+    with timing_data.time(name):
+        version = payload.forkchoice_updated_version
+        logger.info(f"Sending engine_forkchoiceUpdatedV{version}...")
+        forkchoice_response = engine_rpc.forkchoice_updated(
+            forkchoice_state=ForkchoiceState(
+                head_block_hash=payload.params[0].block_hash,
+            ),
+            payload_attributes=None,
+            version=version,
+        )
+        status = forkchoice_response.payload_status.status
+        logger.info(f"Forkchoice update response: {status}")
+        if forkchoice_response.payload_status.status != PayloadStatusEnum.VALID:
+            raise LoggedError(
+                f"unexpected status: want {PayloadStatusEnum.VALID},"
+                f" got {forkchoice_response.payload_status.status}"
+            )
+
+
+def send_new_payload(
+    engine_rpc: EngineRPC,
+    payload: FixtureEngineNewPayload,
+    payload_timing: TimingData,
+    strict_exception_matching: bool,
+) -> None:
+    """Send the payload and verify the response is the one expected by the fixture."""
+    with payload_timing.time(f"engine_newPayloadV{payload.new_payload_version}"):
+        logger.info(f"Sending engine_newPayloadV{payload.new_payload_version}...")
+        try:
+            payload_response = engine_rpc.new_payload(
+                *payload.params,
+                version=payload.new_payload_version,
+            )
+            logger.info(f"Payload response status: {payload_response.status}")
+            expected_validity = (
+                PayloadStatusEnum.VALID if payload.valid() else PayloadStatusEnum.INVALID
+            )
+            if payload_response.status != expected_validity:
+                raise LoggedError(
+                    f"unexpected status: want {expected_validity}, got {payload_response.status}"
+                )
+            if payload.error_code is not None:
+                raise LoggedError(
+                    f"Client failed to raise expected Engine API error code: {payload.error_code}"
+                )
+            elif payload_response.status == PayloadStatusEnum.INVALID:
+                if payload_response.validation_error is None:
+                    raise LoggedError(
+                        "Client returned INVALID but no validation error was provided."
+                    )
+                if isinstance(payload_response.validation_error, UndefinedException):
+                    message = (
+                        "Undefined exception message: "
+                        f'expected exception: "{payload.validation_error}", '
+                        f'returned exception: "{payload_response.validation_error}" '
+                        f'(mapper: "{payload_response.validation_error.mapper_name}")'
+                    )
+                    if strict_exception_matching:
+                        raise LoggedError(message)
+                    else:
+                        logger.warning(message)
+                else:
+                    if payload.validation_error not in payload_response.validation_error:
+                        message = (
+                            "Client returned unexpected validation error: "
+                            f'got: "{payload_response.validation_error}" '
+                            f'expected: "{payload.validation_error}"'
+                        )
+                        if strict_exception_matching:
+                            raise LoggedError(message)
+                        else:
+                            logger.warning(message)
+
+        except JSONRPCError as e:
+            logger.info(f"JSONRPC error encountered: {e.code} - {e.message}")
+            if payload.error_code is None:
+                raise LoggedError(f"Unexpected error: {e.code} - {e.message}") from e
+            if e.code != payload.error_code:
+                raise LoggedError(
+                    f"Unexpected error code: {e.code}, expected: {payload.error_code}"
+                ) from e
+
+
 def test_blockchain_via_engine(
     timing_data: TimingData,
     eth_rpc: EthRPC,
     engine_rpc: EngineRPC,
     fixture: BlockchainEngineFixture,
     strict_exception_matching: bool,
+    deferred_forkchoice: bool,
 ):
     """
     1. Check the client genesis block hash matches `fixture.genesis.block_hash`.
     2. Execute the test case fixture blocks against the client under test using the
     `engine_newPayloadVX` method from the Engine API.
     3. For valid payloads a forkchoice update is performed to finalize the chain.
+
+    If `--deferred-forkchoice` is set, the forkchoice update of consecutive valid payloads that
+    extend each other is sent once, to the last of them, before the next payload that doesn't
+    extend the chain (e.g., an invalid payload), after the last payload, or when a payload
+    fails.
     """
     # Send a initial forkchoice update
     with timing_data.time("Initial forkchoice update"):
@@ -84,91 +179,56 @@ def test_blockchain_via_engine(
 
     with timing_data.time("Payloads execution") as total_payload_timing:
         logger.info(f"Starting execution of {len(fixture.payloads)} payloads...")
-        for i, payload in enumerate(fixture.payloads):
-            logger.info(f"Processing payload {i + 1}/{len(fixture.payloads)}...")
-            with total_payload_timing.time(f"Payload {i + 1}") as payload_timing:
-                with payload_timing.time(f"engine_newPayloadV{payload.new_payload_version}"):
-                    logger.info(f"Sending engine_newPayloadV{payload.new_payload_version}...")
-                    try:
-                        payload_response = engine_rpc.new_payload(
-                            *payload.params,
-                            version=payload.new_payload_version,
-                        )
-                        logger.info(f"Payload response status: {payload_response.status}")
-                        expected_validity = (
-                            PayloadStatusEnum.VALID
-                            if payload.valid()
-                            else PayloadStatusEnum.INVALID
-                        )
-                        if payload_response.status != expected_validity:
-                            raise LoggedError(
-                                f"unexpected status: want {expected_validity},"
-                                f" got {payload_response.status}"
-                            )
-                        if payload.error_code is not None:
-                            raise LoggedError(
-                                f"Client failed to raise expected Engine API error code: "
-                                f"{payload.error_code}"
-                            )
-                        elif payload_response.status == PayloadStatusEnum.INVALID:
-                            if payload_response.validation_error is None:
-                                raise LoggedError(
-                                    "Client returned INVALID but no validation error was provided."
-                                )
-                            if isinstance(payload_response.validation_error, UndefinedException):
-                                message = (
-                                    "Undefined exception message: "
-                                    f'expected exception: "{payload.validation_error}", '
-                                    f'returned exception: "{payload_response.validation_error}" '
-                                    f'(mapper: "{payload_response.validation_error.mapper_name}")'
-                                )
-                                if strict_exception_matching:
-                                    raise LoggedError(message)
-                                else:
-                                    logger.warning(message)
-                            else:
-                                if (
-                                    payload.validation_error
-                                    not in payload_response.validation_error
-                                ):
-                                    message = (
-                                        "Client returned unexpected validation error: "
-                                        f'got: "{payload_response.validation_error}" '
-                                        f'expected: "{payload.validation_error}"'
-                                    )
-                                    if strict_exception_matching:
-                                        raise LoggedError(message)
-                                    else:
-                                        logger.warning(message)
-
-                    except JSONRPCError as e:
-                        logger.info(f"JSONRPC error encountered: {e.code} - {e.message}")
-                        if payload.error_code is None:
-                            raise LoggedError(f"Unexpected error: {e.code} - {e.message}") from e
-                        if e.code != payload.error_code:
-                            raise LoggedError(
-                                f"Unexpected error code: {e.code}, expected: {payload.error_code}"
-                            ) from e
-
-                if payload.valid():
-                    with payload_timing.time(
-                        f"engine_forkchoiceUpdatedV{payload.forkchoice_updated_version}"
-                    ):
-                        # Send a forkchoice update to the engine
-                        version = payload.forkchoice_updated_version
-                        logger.info(f"Sending engine_forkchoiceUpdatedV{version}...")
-                        forkchoice_response = engine_rpc.forkchoice_updated(
-                            forkchoice_state=ForkchoiceState(
-                                head_block_hash=payload.params[0].block_hash,
-                            ),
-                            payload_attributes=None,
-                            version=payload.forkchoice_updated_version,
-                        )
-                        status = forkchoice_response.payload_status.status
-                        logger.info(f"Forkchoice update response: {status}")
-                        if forkchoice_response.payload_status.status != PayloadStatusEnum.VALID:
-                            raise LoggedError(
-                                f"unexpected status: want {PayloadStatusEnum.VALID},"
-                                f" got {forkchoice_response.payload_status.status}"
+        # Valid payloads whose forkchoice update has been deferred, in chain order.
+        deferred_payloads: List[FixtureEngineNewPayload] = []
+
+        def flush_deferred_forkchoice() -> None:
+            if not deferred_payloads:
+                return
+            send_forkchoice_update(
+                engine_rpc,
+                deferred_payloads[-1],
+                total_payload_timing,
+                f"engine_forkchoiceUpdatedV{deferred_payloads[-1].forkchoice_updated_version} "
+                f"(deferred, {len(deferred_payloads)} payloads)",
+            )
+            deferred_payloads.clear()
+
+        try:
+            for i, payload in enumerate(fixture.payloads):
+                logger.info(f"Processing payload {i + 1}/{len(fixture.payloads)}...")
+                extends_deferred_head = (
+                    payload.valid()
+                    and payload.error_code is None
+                    and (
+                        not deferred_payloads
+                        or payload.params[0].parent_hash
+                        == deferred_payloads[-1].params[0].block_hash
+                    )
+                )
+                if not extends_deferred_head:
+                    flush_deferred_forkchoice()
+                with total_payload_timing.time(f"Payload {i + 1}") as payload_timing:
+                    send_new_payload(
+                        engine_rpc, payload, payload_timing, strict_exception_matching
+                    )
+                    if payload.valid():
+                        if deferred_forkchoice and extends_deferred_head:
+                            deferred_payloads.append(payload)
+                        else:
+                            send_forkchoice_update(
+                                engine_rpc,
+                                payload,
+                                payload_timing,
+                                f"engine_forkchoiceUpdatedV{payload.forkchoice_updated_version}",
                             )
+        except Exception:
+            # Also flushed when a payload fails, so that the client is left at the same head as
+            # in strict mode, without replacing the error of the payload if the update fails.
+            try:
+                flush_deferred_forkchoice()
+            except Exception as e:
+                logger.warning(f"Deferred forkchoice update failed after a payload failure: {e}")
+            raise
+        flush_deferred_forkchoice()
         logger.info("All payloads processed successfully.")
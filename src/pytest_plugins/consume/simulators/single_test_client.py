@@ -12,6 +12,7 @@ from hive.testing import HiveTest
 from ethereum_test_base_types import Number, to_json
 from ethereum_test_fixtures import BlockchainFixtureCommon
 from ethereum_test_fixtures.blockchain import FixtureHeader
+from ethereum_test_rpc import EthRPC
 from pytest_plugins.consume.simulators.helpers.ruleset import (
     ruleset,  # TODO: generate dynamically
 )
@@ -86,3 +87,9 @@ def client(
     with total_timing_data.time("Stop client"):
         client.stop()
     logger.info(f"Client ({client_type.name}) stopped!")
+
+
+@pytest.fixture(scope="function")
+def eth_rpc(client: Client) -> EthRPC:
+    """Initialize ethereum RPC client for the execution client under test."""
+    return EthRPC(f"http://{client.ip}:8545")
@@ -1,12 +1,17 @@
 """Pytest plugin that helps measure and log timing data in Hive simulators."""
 
+import datetime
+from pathlib import Path
 from typing import Generator
 
 import pytest
 import rich
-from hive.client import Client
+from hive.client import Client, ClientType
+
+from ethereum_test_fixtures.consume import TestCaseIndexFile, TestCaseStream
 
 from .helpers.timing import TimingData
+from .helpers.timing_database import TimingDatabase
 
 
 def pytest_addoption(parser):
@@ -21,15 +26,88 @@ def pytest_addoption(parser):
         default=False,
         help="Log the timing data for each test case execution.",
     )
+    consume_group.addoption(
+        "--timing-database",
+        action="store",
+        dest="timing_database",
+        type=Path,
+        default=None,
+        help=(
+            "Record the timing data of each test case execution in the specified SQLite "
+            "database, so that it can be compared across runs (see `consume_timing`)."
+        ),
+    )
+    consume_group.addoption(
+        "--timing-run-label",
+        action="store",
+        dest="timing_run_label",
+        default=None,
+        help=(
+            "Label of the run in the timing database, e.g. the client release being tested. "
+            "Defaults to the session start time."
+        ),
+    )
+
+
+def pytest_configure(config):
+    """
+    Set the label of the run in the timing database, chosen once by the controller so that all
+    the xdist workers of the session record their timings in the same run.
+    """
+    if hasattr(config, "workerinput"):
+        config.timing_run_label = config.workerinput["timing_run_label"]
+    else:
+        config.timing_run_label = (
+            config.getoption("timing_run_label") or datetime.datetime.now().isoformat()
+        )
+
+
+def pytest_configure_node(node):
+    """Pass the label of the run in the timing database to the worker (xdist hook)."""
+    node.workerinput["timing_run_label"] = node.config.timing_run_label
+
+
+@pytest.fixture(scope="session")
+def timing_database(request) -> Generator[TimingDatabase | None, None, None]:
+    """Open the timing database if `--timing-database` is set."""
+    database_path = request.config.getoption("timing_database")
+    if database_path is None:
+        yield None
+        return
+    timing_database = TimingDatabase(database_path)
+    yield timing_database
+    timing_database.close()
+
+
+@pytest.fixture(scope="session")
+def timing_run_id(request, timing_database: TimingDatabase | None) -> int | None:
+    """Return the ID of the current run in the timing database."""
+    if timing_database is None:
+        return None
+    return timing_database.start_run(request.config.timing_run_label)
 
 
 @pytest.fixture(scope="function", autouse=True)
-def total_timing_data(request) -> Generator[TimingData, None, None]:
+def total_timing_data(
+    request,
+    timing_database: TimingDatabase | None,
+    timing_run_id: int | None,
+    client_type: ClientType,
+    test_case: TestCaseIndexFile | TestCaseStream,
+) -> Generator[TimingData, None, None]:
     """Record timing data for various stages of executing test case."""
     with TimingData("Total (seconds)") as total_timing_data:
         yield total_timing_data
     if request.config.getoption("timing_data"):
         rich.print(f"\n{total_timing_data.formatted()}")
+    if timing_database is not None and timing_run_id is not None:
+        timing_database.record(
+            run_id=timing_run_id,
+            client=client_type.name,
+            client_version=client_type.version,
+            test_id=test_case.id,
+            timing_data=total_timing_data,
+        )
     if hasattr(request.node, "rep_call"):  # make available for test reports
         request.node.rep_call.timings = total_timing_data
 
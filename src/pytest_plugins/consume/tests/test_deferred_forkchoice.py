@@ -0,0 +1,126 @@
+"""Test that deferred forkchoice updates give the same results as strict forkchoice updates."""
+
+import threading
+from typing import Any, Dict, Generator, List
+
+import pytest
+
+from ethereum_test_base_types import Hash
+from ethereum_test_fixtures import BlockchainEngineFixture
+from ethereum_test_rpc import EngineRPC, EthRPC
+from ethereum_test_rpc.types import ForkchoiceState, PayloadStatusEnum
+
+from ..simulators.helpers.engine_stand_in import (
+    EngineStandInServer,
+    StandInExceptionMapper,
+    StandInRPC,
+    payload_status,
+)
+from ..simulators.helpers.timing import TimingData
+from ..simulators.hive_tests import test_via_engine
+from .test_engine_stand_in import load_fixture
+
+
+def tampered_fixture() -> BlockchainEngineFixture:
+    """Return a fixture whose second payload has a block hash that doesn't match its header."""
+    fixture = load_fixture("blockchain_shanghai_invalid_filled_engine.json")
+    payload = fixture.payloads[1]
+    payload.params = (
+        payload.params[0].model_copy(update={"block_hash": Hash(1)}),
+        *payload.params[1:],
+    )
+    return fixture
+
+
+FIXTURES = [
+    load_fixture("blockchain_shanghai_invalid_filled_engine.json"),
+    load_fixture("chainid_cancun_blockchain_test_engine_tx_type_0.json"),
+    tampered_fixture(),
+]
+
+
+@pytest.fixture
+def server() -> Generator[EngineStandInServer, None, None]:
+    """Run the stand-in server in a background thread."""
+    server = EngineStandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def consume(
+    server: EngineStandInServer, fixture: BlockchainEngineFixture, deferred_forkchoice: bool
+) -> tuple[str | None, str, List[str]]:
+    """
+    Consume the fixture with the engine simulator test and return its error, if any, the hash
+    of the canonical head and the names of the timed steps of the payloads execution.
+    """
+    StandInRPC(server.url).load_fixture(fixture)
+    eth_rpc = EthRPC(server.url)
+    engine_rpc = EngineRPC(
+        server.url, response_validation_context={"exception_mapper": StandInExceptionMapper()}
+    )
+    timing_data = TimingData("Total")
+    error: str | None = None
+    try:
+        test_via_engine.test_blockchain_via_engine(
+            timing_data=timing_data,
+            eth_rpc=eth_rpc,
+            engine_rpc=engine_rpc,
+            fixture=fixture,
+            strict_exception_matching=True,
+            deferred_forkchoice=deferred_forkchoice,
+        )
+    except test_via_engine.LoggedError as e:
+        error = str(e)
+    payloads_timing = next(t for t in timing_data.timings if t.name == "Payloads execution")
+    return (
+        error,
+        eth_rpc.get_block_by_number("latest")["hash"],
+        [timing.name for timing in payloads_timing.timings],
+    )
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=["invalid_block", "valid_blocks", "tampered"])
+def test_deferred_forkchoice_outcomes(
+    server: EngineStandInServer, fixture: BlockchainEngineFixture
+):
+    """Test that both modes give the same result and canonical head for each fixture."""
+    strict_error, strict_head, _ = consume(server, fixture, deferred_forkchoice=False)
+    deferred_error, deferred_head, deferred_steps = consume(
+        server, fixture, deferred_forkchoice=True
+    )
+    assert deferred_error == strict_error
+    assert deferred_head == strict_head
+    if len(fixture.payloads) > 1 and strict_error is None:
+        # The forkchoice updates of the valid payloads were deferred.
+        assert any("deferred" in step for step in deferred_steps)
+
+
+def test_tampered_fixture_fails(server: EngineStandInServer):
+    """Test that the tampered fixture is a failing case in deferred mode."""
+    error, _, _ = consume(server, tampered_fixture(), deferred_forkchoice=True)
+    assert error is not None and "unexpected status" in error
+
+
+def test_failed_flush_keeps_payload_error(server: EngineStandInServer):
+    """
+    Test that a deferred forkchoice update failing after a payload failure doesn't replace the
+    error of the payload.
+    """
+    fixture = tampered_fixture()
+    genesis_hash = fixture.genesis.block_hash
+    forkchoice_updated = server.stand_in.forkchoice_updated
+
+    def syncing_forkchoice_updated(params: List[Any]) -> Dict[str, Any]:
+        if ForkchoiceState.model_validate(params[0]).head_block_hash == genesis_hash:
+            return forkchoice_updated(params)
+        return {"payloadStatus": payload_status(PayloadStatusEnum.SYNCING), "payloadId": None}
+
+    server.stand_in.forkchoice_updated = syncing_forkchoice_updated  # type: ignore[method-assign]
+    error, _, _ = consume(server, fixture, deferred_forkchoice=True)
+    assert error == (
+        f"unexpected status: want {PayloadStatusEnum.VALID}, got {PayloadStatusEnum.INVALID}"
+    )
@@ -0,0 +1,288 @@
+"""Test the content-addressed download cache and selective archive extraction."""
+
+import datetime
+import hashlib
+import io
+import os
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Generator, List
+
+import pytest
+
+from ethereum_test_fixtures import BlockchainFixture, StateFixture
+from ethereum_test_fixtures.consume import IndexFile, TestCaseIndexFile
+from ethereum_test_forks import Cancun, Prague
+
+from .. import download_cache
+from ..consume import FixtureDownloader, keyword_test_case_filter
+from ..download_cache import EXTRACTED_MEMBERS_FILE, ChecksumMismatchError, DownloadCache
+
+
+class ArchiveServer(ThreadingHTTPServer):
+    """A local HTTP stand-in serving in-memory files, with `Range` request support."""
+
+    files: Dict[str, bytes]
+    requests: List[Dict[str, str | None]]
+    truncate_next_response_at: int | None
+
+
+class ArchiveRequestHandler(BaseHTTPRequestHandler):
+    """Serve the files registered on the server."""
+
+    server: ArchiveServer
+
+    def do_GET(self):  # noqa: N802
+        """Serve the full file, or the requested byte range."""
+        range_header = self.headers.get("Range")
+        self.server.requests.append({"path": self.path, "range": range_header})
+        content = self.server.files.get(self.path)
+        if content is None:
+            self.send_error(404)
+            return
+        start = 0
+        if range_header is not None:
+            start = int(range_header.removeprefix("bytes=").removesuffix("-"))
+            if start >= len(content):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+        else:
+            self.send_response(200)
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        truncate_at = self.server.truncate_next_response_at
+        if truncate_at is not None:
+            # Simulate a dropped connection mid-download.
+            self.server.truncate_next_response_at = None
+            self.wfile.write(body[:truncate_at])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        """Silence the request logging."""
+        pass
+
+
+@pytest.fixture
+def archive_server() -> Generator[ArchiveServer, None, None]:
+    """Start a local HTTP server in a background thread."""
+    server = ArchiveServer(("127.0.0.1", 0), ArchiveRequestHandler)
+    server.files = {}
+    server.requests = []
+    server.truncate_next_response_at = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def server_url(server: ArchiveServer, path: str) -> str:
+    """Return the URL of a path on the local server."""
+    host, port = server.server_address[:2]
+    return f"http://{host!s}:{port}{path}"
+
+
+TEST_CASES = [
+    TestCaseIndexFile(
+        id="tests/prague/test_a.py::test_a[fork_Prague-state_test]",
+        fixture_hash=None,
+        fork=Prague,
+        format=StateFixture,
+        json_path=Path("state_tests/prague/test_a.json"),
+    ),
+    TestCaseIndexFile(
+        id="tests/cancun/test_b.py::test_b[fork_Cancun-blockchain_test]",
+        fixture_hash=None,
+        fork=Cancun,
+        format=BlockchainFixture,
+        json_path=Path("blockchain_tests/cancun/test_b.json"),
+    ),
+]
+
+
+def make_fixtures_archive() -> bytes:
+    """Create a fixtures release archive with an index file and two fixture files."""
+    index = IndexFile(
+        root_hash=None,
+        created_at=datetime.datetime.now(),
+        test_count=len(TEST_CASES),
+        test_cases=TEST_CASES,
+    )
+    files = {"fixtures/.meta/index.json": index.model_dump_json().encode()}
+    for test_case in TEST_CASES:
+        files[f"fixtures/{test_case.json_path.as_posix()}"] = b"{}"
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def test_download_is_content_addressed_and_cached(tmp_path: Path, archive_server: ArchiveServer):
+    """Test that a downloaded file is stored under its digest and not re-downloaded."""
+    content = b"x" * 10_000
+    archive_server.files["/fixtures.tar.gz"] = content
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    cache = DownloadCache(tmp_path, chunk_size=1024)
+
+    was_cached, path = cache.fetch(url)
+    assert not was_cached
+    assert path.name == hashlib.sha256(content).hexdigest()
+    assert path.read_bytes() == content
+
+    was_cached, path = cache.fetch(url)
+    assert was_cached
+    assert len(archive_server.requests) == 1
+
+
+def test_checksum_mismatch(tmp_path: Path, archive_server: ArchiveServer):
+    """Test that a download not matching the expected checksum is rejected and not cached."""
+    archive_server.files["/fixtures.tar.gz"] = b"unexpected content"
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    cache = DownloadCache(tmp_path)
+
+    with pytest.raises(ChecksumMismatchError):
+        cache.fetch(url, expected_sha256="00" * 32)
+    assert cache.lookup(url) is None
+    assert not cache.partial_path(url).exists()
+
+
+def test_corrupted_blob_is_downloaded_again(tmp_path: Path, archive_server: ArchiveServer):
+    """Test that a cached blob whose content doesn't match its address is discarded."""
+    archive_server.files["/fixtures.tar.gz"] = b"content"
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    cache = DownloadCache(tmp_path)
+    _, path = cache.fetch(url)
+    path.write_bytes(b"corrupted")
+
+    was_cached, path = cache.fetch(url)
+    assert not was_cached
+    assert path.read_bytes() == b"content"
+
+
+def test_cached_blob_is_only_hashed_when_modified(
+    tmp_path: Path, archive_server: ArchiveServer, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a cached blob is only hashed again if its size or mtime changed."""
+    archive_server.files["/fixtures.tar.gz"] = b"content"
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    cache = DownloadCache(tmp_path)
+    _, path = cache.fetch(url)
+
+    hashed: List[Path] = []
+    file_sha256 = download_cache.file_sha256
+
+    def counting_file_sha256(path: Path, chunk_size: int = 1 << 20):
+        hashed.append(path)
+        return file_sha256(path, chunk_size)
+
+    monkeypatch.setattr(download_cache, "file_sha256", counting_file_sha256)
+    assert cache.lookup(url) == path
+    assert hashed == []
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.lookup(url) == path
+    assert hashed == [path]
+    # The new mtime of the verified blob is recorded.
+    assert cache.lookup(url) == path
+    assert hashed == [path]
+
+
+def test_interrupted_download_is_resumed(tmp_path: Path, archive_server: ArchiveServer):
+    """Test that a dropped connection is resumed with a range request."""
+    content = bytes(range(256)) * 64
+    archive_server.files["/fixtures.tar.gz"] = content
+    archive_server.truncate_next_response_at = 5_000
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    cache = DownloadCache(tmp_path, chunk_size=1024)
+
+    _, path = cache.fetch(url, expected_sha256=hashlib.sha256(content).hexdigest())
+    assert path.read_bytes() == content
+    assert archive_server.requests[0]["range"] is None
+    resumed_range = archive_server.requests[-1]["range"]
+    assert resumed_range is not None and resumed_range != "bytes=0-"
+
+
+def test_selective_extraction(tmp_path: Path, archive_server: ArchiveServer):
+    """Test that only the fixture files of the selected test cases are extracted."""
+    archive_server.files["/fixtures.tar.gz"] = make_fixtures_archive()
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    downloader = FixtureDownloader(url, tmp_path, keyword_test_case_filter("Prague"))
+
+    was_cached, path = downloader.download_and_extract()
+    assert not was_cached
+    assert path == tmp_path / "other" / "fixtures" / "fixtures"
+    assert (path / ".meta" / "index.json").exists()
+    assert (path / TEST_CASES[0].json_path).exists()
+    assert not (path / TEST_CASES[1].json_path).exists()
+
+    # A test case missed by the filter is extracted on demand.
+    downloader.ensure_extracted(TEST_CASES[1].json_path)
+    assert (path / TEST_CASES[1].json_path).exists()
+    assert not (downloader.extract_to / EXTRACTED_MEMBERS_FILE).exists()
+
+    was_cached, _ = FixtureDownloader(url, tmp_path).download_and_extract()
+    assert was_cached
+    assert len(archive_server.requests) == 1
+
+
+def test_partial_extraction_is_completed_from_cache(
+    tmp_path: Path, archive_server: ArchiveServer, monkeypatch: pytest.MonkeyPatch
+):
+    """
+    Test that a new selection extracts the missing files without downloading again, reading the
+    index already extracted and leaving the files already extracted in place.
+    """
+    archive_server.files["/fixtures.tar.gz"] = make_fixtures_archive()
+    url = server_url(archive_server, "/fixtures.tar.gz")
+    _, path = FixtureDownloader(
+        url, tmp_path, keyword_test_case_filter("Prague")
+    ).download_and_extract()
+    extracted_inode = (path / TEST_CASES[0].json_path).stat().st_ino
+
+    def find_index_member(archive_path: Path):
+        raise AssertionError("the index of a partial extraction is read from disk")
+
+    monkeypatch.setattr(download_cache, "find_index_member", find_index_member)
+    was_cached, path = FixtureDownloader(
+        url, tmp_path, keyword_test_case_filter("blockchain_test")
+    ).download_and_extract()
+    assert was_cached
+    assert all((path / test_case.json_path).exists() for test_case in TEST_CASES)
+    assert (path / TEST_CASES[0].json_path).stat().st_ino == extracted_inode
+    assert len(archive_server.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "keyword,expected_selection",
+    [
+        ("", None),
+        ("Prague", [True, False]),
+        ("not Prague", [False, True]),
+        ("test_a or test_b", [True, True]),
+        ("state_test and Cancun", [False, False]),
+        ("not (test_a and Prague) and blockchain_test", [False, True]),
+        ("test_a and", None),
+        ("(test_a or test_b", None),
+        ("test_a(key=1)", None),
+    ],
+)
+def test_keyword_test_case_filter(keyword: str, expected_selection: List[bool] | None):
+    """Test the approximation of the `-k` expression on index file test cases."""
+    test_case_filter = keyword_test_case_filter(keyword)
+    if expected_selection is None:
+        assert test_case_filter is None
+        return
+    assert test_case_filter is not None
+    assert [test_case_filter(test_case) for test_case in TEST_CASES] == expected_selection
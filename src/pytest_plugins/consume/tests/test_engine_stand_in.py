@@ -0,0 +1,161 @@
+"""Test the local Engine API stand-in used to consume fixtures without hive."""
+
+import json
+import threading
+from pathlib import Path
+from typing import Generator
+
+import pytest
+import requests
+
+from ethereum_test_base_types import Address, Hash, to_json
+from ethereum_test_exceptions import TransactionException, UndefinedException
+from ethereum_test_fixtures import BlockchainEngineFixture
+from ethereum_test_rpc import EngineRPC, EthRPC
+from ethereum_test_rpc.types import ForkchoiceState, JSONRPCError, PayloadStatusEnum
+
+from ..simulators.helpers.engine_stand_in import (
+    EngineStandInServer,
+    StandInExceptionMapper,
+    StandInRPC,
+    engine_stand_in_process,
+    payload_block_hash,
+)
+
+FIXTURES_PATH = Path(__file__).parents[3] / "ethereum_test_specs" / "tests" / "fixtures"
+
+
+def load_fixture(file_name: str) -> BlockchainEngineFixture:
+    """Load the first engine fixture of a filled fixtures file."""
+    fixtures = json.loads((FIXTURES_PATH / file_name).read_text())
+    return BlockchainEngineFixture.model_validate(next(iter(fixtures.values())))
+
+
+@pytest.fixture
+def fixture() -> BlockchainEngineFixture:
+    """Return a Shanghai fixture with both valid and invalid payloads."""
+    return load_fixture("blockchain_shanghai_invalid_filled_engine.json")
+
+
+@pytest.fixture
+def server() -> Generator[EngineStandInServer, None, None]:
+    """Run the stand-in server in a background thread."""
+    server = EngineStandInServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def engine_rpc(server: EngineStandInServer, fixture: BlockchainEngineFixture) -> EngineRPC:
+    """Load the fixture and return an engine RPC client that maps stand-in exceptions."""
+    StandInRPC(server.url).load_fixture(fixture)
+    return EngineRPC(
+        server.url,
+        response_validation_context={"exception_mapper": StandInExceptionMapper()},
+    )
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    [
+        "blockchain_shanghai_invalid_filled_engine.json",
+        "chainid_cancun_blockchain_test_engine_tx_type_0.json",
+    ],
+)
+def test_payload_block_hash(file_name: str):
+    """Test that the block hash recomputed from the payload parameters matches the fixture."""
+    for payload in load_fixture(file_name).payloads:
+        assert payload_block_hash(to_json(payload)["params"]) == payload.params[0].block_hash
+
+
+def test_payloads_get_the_expected_statuses(
+    engine_rpc: EngineRPC, fixture: BlockchainEngineFixture
+):
+    """Test that every payload gets the status and exception expected by the fixture."""
+    for payload in fixture.payloads:
+        response = engine_rpc.new_payload(*payload.params, version=payload.new_payload_version)
+        if payload.valid():
+            assert response.status == PayloadStatusEnum.VALID
+            assert response.latest_valid_hash == payload.params[0].block_hash
+            engine_rpc.forkchoice_updated(
+                ForkchoiceState(head_block_hash=payload.params[0].block_hash),
+                version=payload.forkchoice_updated_version,
+            )
+        else:
+            assert response.status == PayloadStatusEnum.INVALID
+            assert response.validation_error is not None
+            assert payload.validation_error is not None
+            assert not isinstance(response.validation_error, UndefinedException)
+            assert payload.validation_error in response.validation_error
+
+
+def test_get_block_by_number(
+    server: EngineStandInServer, engine_rpc: EngineRPC, fixture: BlockchainEngineFixture
+):
+    """Test that the genesis and the canonical head blocks are returned."""
+    eth_rpc = EthRPC(server.url)
+    assert eth_rpc.get_block_by_number(0)["hash"] == str(fixture.genesis.block_hash)
+    assert eth_rpc.get_block_by_number(1) is None
+
+    payload = fixture.payloads[0]
+    engine_rpc.new_payload(*payload.params, version=payload.new_payload_version)
+    engine_rpc.forkchoice_updated(
+        ForkchoiceState(head_block_hash=payload.params[0].block_hash),
+        version=payload.forkchoice_updated_version,
+    )
+    assert eth_rpc.get_block_by_number("latest")["hash"] == str(payload.params[0].block_hash)
+    assert eth_rpc.get_block_by_number(0)["hash"] == str(fixture.genesis.block_hash)
+
+
+def test_invalid_block_hash_and_unknown_parent(
+    engine_rpc: EngineRPC, fixture: BlockchainEngineFixture
+):
+    """Test that tampered payloads are rejected and unknown parents report syncing."""
+    payload = fixture.payloads[0]
+    tampered = payload.params[0].model_copy(update={"block_hash": Hash(1)})
+    response = engine_rpc.new_payload(tampered, version=payload.new_payload_version)
+    assert response.status == PayloadStatusEnum.INVALID
+    assert isinstance(response.validation_error, UndefinedException)
+    assert "Invalid block hash" in str(response.validation_error)
+
+    child = fixture.payloads[1]
+    response = engine_rpc.new_payload(*child.params, version=child.new_payload_version)
+    assert response.status == PayloadStatusEnum.SYNCING
+
+    forkchoice_response = engine_rpc.forkchoice_updated(
+        ForkchoiceState(head_block_hash=Hash(1)), version=payload.forkchoice_updated_version
+    )
+    assert forkchoice_response.payload_status.status == PayloadStatusEnum.SYNCING
+
+
+def test_unknown_method_and_batch_requests(server: EngineStandInServer, engine_rpc: EngineRPC):
+    """Test the JSON-RPC error of unknown methods and the responses to batch requests."""
+    with pytest.raises(JSONRPCError) as exc_info:
+        EthRPC(server.url).get_balance(Address(0))
+    assert exc_info.value.code == -32601
+
+    batch = [
+        {"jsonrpc": "2.0", "method": "eth_getBlockByNumber", "params": ["0x0", False], "id": 1},
+        {"jsonrpc": "2.0", "method": "eth_getBalance", "params": [], "id": 2},
+    ]
+    responses = requests.post(server.url, json=batch).json()
+    assert [r["id"] for r in responses] == [1, 2]
+    assert "result" in responses[0] and "error" in responses[1]
+
+
+def test_exception_mapper_matches_whole_exception_names():
+    """Test that an exception doesn't match another exception whose name it prefixes."""
+    mapper = StandInExceptionMapper()
+    exception = TransactionException.INSUFFICIENT_ACCOUNT_FUNDS
+    assert mapper.message_to_exception(str(exception)) == [exception]
+
+
+def test_engine_stand_in_process(fixture: BlockchainEngineFixture):
+    """Test that the stand-in serves requests from a separate process."""
+    with engine_stand_in_process() as url:
+        StandInRPC(url).load_fixture(fixture)
+        genesis = EthRPC(url).get_block_by_number(0)
+        assert genesis["hash"] == str(fixture.genesis.block_hash)
@@ -0,0 +1,67 @@
+"""Test the recording of consume timings in the timing database."""
+
+import textwrap
+from pathlib import Path
+
+from pytest import Pytester
+
+from ..simulators.helpers.timing_database import TimingDatabase
+
+
+def test_xdist_workers_record_a_single_run(pytester: Pytester, tmp_path: Path):
+    """Test that all the xdist workers of a session record their timings in the same run."""
+    pytester.makeconftest(
+        textwrap.dedent(
+            """
+            import os
+            from types import SimpleNamespace
+
+            import pytest
+
+            pytest_plugins = ("pytest_plugins.consume.simulators.timing_data",)
+
+
+            @pytest.fixture
+            def client_type():
+                return SimpleNamespace(name="client", version="1.0.0")
+
+
+            @pytest.fixture
+            def client():
+                return None
+
+
+            @pytest.fixture
+            def test_case(request):
+                worker = os.environ["PYTEST_XDIST_WORKER"]
+                return SimpleNamespace(id=f"{request.node.nodeid}@{worker}")
+            """
+        )
+    )
+    pytester.makepyfile(
+        test_timings=textwrap.dedent(
+            """
+            import time
+
+            import pytest
+
+
+            @pytest.mark.parametrize("i", range(8))
+            def test_case_execution(i):
+                time.sleep(0.05)
+            """
+        )
+    )
+    database_path = tmp_path / "timings.sqlite"
+    result = pytester.runpytest("-n", "2", "--timing-database", str(database_path))
+    result.assert_outcomes(passed=8)
+
+    database = TimingDatabase(database_path)
+    runs = database.runs()
+    test_ids = [
+        row[0] for row in database.connection.execute("SELECT DISTINCT test_id FROM timings")
+    ]
+    database.close()
+    assert len(runs) == 1
+    assert runs[0].test_count == 8
+    assert {test_id.split("@")[1] for test_id in test_ids} == {"gw0", "gw1"}
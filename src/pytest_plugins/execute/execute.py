@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Type
+from typing import Any, Callable, Dict, Generator, List, Type
 
 import pytest
 from pytest_metadata.plugin import metadata_key  # type: ignore
@@ -245,6 +245,22 @@ def collector(
     yield collector
 
 
+@pytest.fixture(scope="function")
+def run_execute(
+    eth_rpc: EthRPC,
+    engine_rpc: EngineRPC | None,
+) -> Callable[[BaseExecute, Fork], None]:
+    """
+    Return the function that runs the execute format of the test against the client, once its
+    pre-allocation is in place.
+    """
+
+    def run(execute: BaseExecute, fork: Fork) -> None:
+        execute.execute(fork=fork, eth_rpc=eth_rpc, engine_rpc=engine_rpc)
+
+    return run
+
+
 def base_test_parametrizer(cls: Type[BaseTest]):
     """
     Generate pytest.fixture for a given BaseTest subclass.
@@ -264,6 +280,7 @@ def base_test_parametrizer(cls: Type[BaseTest]):
         eth_rpc: EthRPC,
         engine_rpc: EngineRPC | None,
         collector: Collector,
+        run_execute: Callable[[BaseExecute, Fork], None],
     ):
         """
         Fixture used to instantiate an auto-fillable BaseTest object from within
@@ -297,8 +314,12 @@ def base_test_parametrizer(cls: Type[BaseTest]):
 
                 # wait for pre-requisite transactions to be included in blocks
                 pre.wait_for_transactions()
-                for deployed_contract, expected_code in pre._deployed_contracts:
-                    actual_code = eth_rpc.get_code(deployed_contract)
+                deployed_codes = eth_rpc.get_codes(
+                    [deployed_contract for deployed_contract, _ in pre._deployed_contracts]
+                )
+                for (deployed_contract, expected_code), actual_code in zip(
+                    pre._deployed_contracts, deployed_codes, strict=True
+                ):
                     if actual_code != expected_code:
                         raise Exception(
                             f"Deployed test contract didn't match expected code at address "
@@ -311,7 +332,7 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                 )
 
                 execute = self.execute(fork=fork, execute_format=execute_format)
-                execute.execute(fork=fork, eth_rpc=eth_rpc, engine_rpc=engine_rpc)
+                run_execute(execute, fork)
                 collector.collect(request.node.nodeid, execute)
 
         return BaseTestWrapper
@@ -0,0 +1,143 @@
+"""Pytest plugin to generate load on a live node by replaying the transactions of the tests."""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict
+
+import pytest
+
+from ethereum_test_execution import BaseExecute, TransactionPost
+from ethereum_test_forks import Fork
+from ethereum_test_rpc import EthRPC
+
+from .load_generator import LoadGenerator
+
+
+def pytest_addoption(parser):
+    """Add command-line options to pytest."""
+    load_group = parser.getgroup("load", "Arguments defining the load generation")
+    load_group.addoption(
+        "--load-duration",
+        action="store",
+        dest="load_duration",
+        type=float,
+        default=60.0,
+        help="Time in seconds during which the transactions of each test are replayed.",
+    )
+    load_group.addoption(
+        "--load-tx-rate",
+        action="store",
+        dest="load_tx_rate",
+        type=float,
+        default=None,
+        help=(
+            "Target number of transactions sent per second. "
+            "Default=None (as fast as the node accepts them)"
+        ),
+    )
+    load_group.addoption(
+        "--load-gas-rate",
+        action="store",
+        dest="load_gas_rate",
+        type=float,
+        default=None,
+        help=(
+            "Target gas sent per second, by the gas limit of the transactions. "
+            "Cannot be combined with `--load-tx-rate`."
+        ),
+    )
+    load_group.addoption(
+        "--load-inclusion-timeout",
+        action="store",
+        dest="load_inclusion_timeout",
+        type=float,
+        default=60.0,
+        help=(
+            "Maximum time in seconds to wait for the inclusion of the transactions still pending "
+            "once the load duration passes."
+        ),
+    )
+    load_group.addoption(
+        "--load-report",
+        action="store",
+        dest="load_report",
+        type=Path,
+        default=None,
+        help="Path of a JSON file to write the load metrics of every test to.",
+    )
+
+
+def pytest_configure(config):
+    """Check that at most one target rate is given."""
+    if config.getoption("load_tx_rate") is not None and (
+        config.getoption("load_gas_rate") is not None
+    ):
+        pytest.exit(
+            "Only one of `--load-tx-rate` and `--load-gas-rate` can be specified.",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
+
+
+@pytest.fixture(scope="session")
+def load_generator(
+    request: pytest.FixtureRequest, eth_rpc: EthRPC, chain_id: int
+) -> LoadGenerator:
+    """Return the load generator that replays the transactions of the tests."""
+    return LoadGenerator(
+        eth_rpc,
+        chain_id=chain_id,
+        duration=request.config.getoption("load_duration"),
+        transactions_per_second=request.config.getoption("load_tx_rate"),
+        gas_per_second=request.config.getoption("load_gas_rate"),
+        inclusion_timeout=request.config.getoption("load_inclusion_timeout"),
+    )
+
+
+@pytest.fixture(scope="function")
+def run_execute(
+    request: pytest.FixtureRequest, load_generator: LoadGenerator
+) -> Callable[[BaseExecute, Fork], None]:
+    """
+    Return the function that replays the transactions of the test as load, instead of executing
+    them once and verifying the post-state.
+    """
+
+    def run(execute: BaseExecute, fork: Fork) -> None:
+        if not isinstance(execute, TransactionPost):
+            pytest.skip(f"{execute.format_name} tests can't be replayed as load")
+        report = load_generator.run(execute.blocks)
+        request.node.user_properties.append(("load_report", report.summary()))
+
+    return run
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Print the load metrics of every test and write them to the load report, if requested."""
+    load_reports: Dict[str, Dict] = {}
+    for report in terminalreporter.stats.get("passed", []):
+        user_properties = dict(report.user_properties)
+        if "load_report" in user_properties:
+            load_reports[report.nodeid] = user_properties["load_report"]
+    if not load_reports:
+        return
+
+    terminalreporter.section("Load generation")
+    for nodeid, metrics in load_reports.items():
+        latencies = ", ".join(
+            f"{percentile}={metrics[f'latency_{percentile}']:.2f}s"
+            if metrics[f"latency_{percentile}"] is not None
+            else f"{percentile}=n/a"
+            for percentile in ["p50", "p90", "p99"]
+        )
+        terminalreporter.write_line(
+            f"{nodeid}: {metrics['mgas_per_second']:.2f} Mgas/s, "
+            f"{metrics['included']}/{metrics['sent'] + metrics['send_errors']} included, "
+            f"error rate {metrics['error_rate']:.2%}, latency {latencies}"
+            + (", stopped early: senders out of funds" if metrics["out_of_funds"] else "")
+        )
+
+    if load_report_path := config.getoption("load_report"):
+        load_report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(load_report_path, "w") as f:
+            json.dump(load_reports, f, indent=4)
+        terminalreporter.write_line(f"Load report written to {load_report_path}")
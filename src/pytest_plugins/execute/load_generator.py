@@ -0,0 +1,334 @@
+"""Load generator that replays the transactions of a test against a live node."""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from ethereum_test_base_types import Address, Hash
+from ethereum_test_rpc import EthRPC
+from ethereum_test_tools import Transaction
+
+from ..shared.helpers import percentile
+
+
+@dataclass(kw_only=True)
+class LoadReport:
+    """Results of a load generation run."""
+
+    sent: int = 0
+    send_errors: int = 0
+    included: int = 0
+    gas_used: int = 0
+    duration: float = 0.0
+    out_of_funds: bool = False
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def attempted(self) -> int:
+        """Return the number of transactions that the generator tried to send."""
+        return self.sent + self.send_errors
+
+    @property
+    def error_rate(self) -> float:
+        """Return the fraction of transactions that were rejected or never included."""
+        if not self.attempted:
+            return 0.0
+        return (self.attempted - self.included) / self.attempted
+
+    @property
+    def mgas_per_second(self) -> float:
+        """Return the gas used by the included transactions per second, in Mgas."""
+        if self.duration <= 0:
+            return 0.0
+        return self.gas_used / self.duration / 10**6
+
+    def latency_percentile(self, q: float) -> float | None:
+        """Return the q-th percentile (0-100) of the inclusion latencies."""
+        if not self.latencies:
+            return None
+        return percentile(sorted(self.latencies), q)
+
+    def summary(self) -> Dict[str, float | int | None]:
+        """Return the metrics of the run."""
+        return {
+            "sent": self.sent,
+            "send_errors": self.send_errors,
+            "included": self.included,
+            "error_rate": self.error_rate,
+            "duration": self.duration,
+            "out_of_funds": self.out_of_funds,
+            "mgas_per_second": self.mgas_per_second,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p90": self.latency_percentile(90),
+            "latency_p99": self.latency_percentile(99),
+        }
+
+
+class BlockFollower:
+    """
+    Follow the new blocks of the chain in a background thread, recording when each of the
+    tracked transactions is seen included and the gas it used, from its receipt.
+    """
+
+    eth_rpc: EthRPC
+    poll_interval: float
+    head: int
+    included: Dict[Hash, float]
+    gas_used: int
+
+    def __init__(self, eth_rpc: EthRPC, *, poll_interval: float = 0.1):
+        """Initialize the follower from the current head of the chain."""
+        self.eth_rpc = eth_rpc
+        self.poll_interval = poll_interval
+        self.head = eth_rpc.block_number()
+        self.tracked: set[Hash] = set()
+        self.included = {}
+        self.gas_used = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.follow, daemon=True)
+
+    def track(self, tx_hashes: List[Hash]) -> None:
+        """Track the inclusion of the given transactions."""
+        with self.lock:
+            self.tracked.update(tx_hashes)
+
+    def pending(self) -> int:
+        """Return the number of tracked transactions not yet seen included."""
+        with self.lock:
+            return len(self.tracked) - len(self.included)
+
+    def poll(self) -> None:
+        """Fetch the blocks produced since the last poll and record the tracked transactions."""
+        head = self.eth_rpc.block_number()
+        if head <= self.head:
+            return
+        blocks = self.eth_rpc.get_blocks_by_number(range(self.head + 1, head + 1), full_txs=False)
+        now = time.monotonic()
+        with self.lock:
+            tracked = [
+                tx_hash
+                for block in blocks
+                if block is not None
+                for tx_hash in map(Hash, block["transactions"])
+                if tx_hash in self.tracked
+            ]
+        # The blocks also include the transactions of other senders, so only the gas used by the
+        # tracked transactions is counted.
+        receipts = (
+            self.eth_rpc.post_batch(
+                [("getTransactionReceipt", (f"{tx_hash}",)) for tx_hash in tracked]
+            )
+            if tracked
+            else []
+        )
+        with self.lock:
+            self.gas_used += sum(
+                int(receipt["gasUsed"], 16) for receipt in receipts if receipt is not None
+            )
+            self.included.update(dict.fromkeys(tracked, now))
+        self.head = head
+
+    def follow(self) -> None:
+        """Poll the chain until stopped, retrying on the next interval if a poll fails."""
+        while not self.stopped.wait(self.poll_interval):
+            try:
+                self.poll()
+            except Exception:
+                continue
+
+    def start(self) -> None:
+        """Start following the chain."""
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop following the chain."""
+        self.stopped.set()
+        self.thread.join()
+
+
+class LoadGenerator:
+    """
+    Replay the transactions of a test in a loop for `duration` seconds, re-signing each one for
+    the target chain with the next nonce of its sender.
+
+    Transactions are sent in batches, paced to `transactions_per_second` or to
+    `gas_per_second` (by their gas limit), or as fast as the node accepts them if neither is set.
+    Once the duration passes, the generator waits up to `inclusion_timeout` seconds for the
+    transactions still pending and reports the achieved throughput, the inclusion latency of
+    the transactions, and the fraction of them that were rejected or never included.
+
+    The senders are only funded for a single execution of the test, so the generator keeps the
+    balance of each sender minus the maximum cost of its accepted transactions, and stops
+    sending before the duration passes once a sender can no longer pay for its next transaction.
+    """
+
+    eth_rpc: EthRPC
+    chain_id: int
+    duration: float
+    transactions_per_second: float | None
+    gas_per_second: float | None
+    inclusion_timeout: float
+    tick: float
+
+    def __init__(
+        self,
+        eth_rpc: EthRPC,
+        *,
+        chain_id: int,
+        duration: float,
+        transactions_per_second: float | None = None,
+        gas_per_second: float | None = None,
+        inclusion_timeout: float = 60.0,
+        tick: float = 0.05,
+    ):
+        """Initialize the load generator of the node."""
+        assert transactions_per_second is None or gas_per_second is None, (
+            "only one of transactions_per_second or gas_per_second can be set"
+        )
+        self.eth_rpc = eth_rpc
+        self.chain_id = chain_id
+        self.duration = duration
+        self.transactions_per_second = transactions_per_second
+        self.gas_per_second = gas_per_second
+        self.inclusion_timeout = inclusion_timeout
+        self.tick = tick
+
+    def cost(self, transaction: Transaction) -> float:
+        """Return the share of the rate budget that the transaction consumes."""
+        if self.gas_per_second is not None:
+            return int(transaction.gas_limit)
+        return 1
+
+    @staticmethod
+    def max_cost(transaction: Transaction) -> int:
+        """Return the maximum amount of wei that the transaction can cost its sender."""
+        if transaction.max_fee_per_gas is not None:
+            gas_price = int(transaction.max_fee_per_gas)
+        else:
+            assert transaction.gas_price is not None
+            gas_price = int(transaction.gas_price)
+        return int(transaction.gas_limit) * gas_price + int(transaction.value)
+
+    def rate(self) -> float | None:
+        """Return the rate budget per second, or `None` if the load is not paced."""
+        if self.gas_per_second is not None:
+            return self.gas_per_second
+        return self.transactions_per_second
+
+    def send(
+        self,
+        transactions: List[Transaction],
+        nonces: Dict[Address, int],
+        balances: Dict[Address, int],
+        report: LoadReport,
+    ) -> Dict[Hash, float]:
+        """
+        Re-sign the transactions and send them in a batch, returning the send time of the
+        transactions that the node accepted.
+        """
+        signed_transactions = []
+        senders = []
+        for transaction in transactions:
+            assert transaction.sender is not None
+            sender = Address(transaction.sender)
+            signed_transactions.append(
+                transaction.copy(
+                    nonce=nonces[sender], chain_id=self.chain_id
+                ).with_signature_and_sender()
+            )
+            senders.append(sender)
+            nonces[sender] += 1
+        with self.eth_rpc.batch() as batch:
+            results = [
+                batch.call("sendRawTransaction", f"{transaction.rlp().hex()}")
+                for transaction in signed_transactions
+            ]
+        now = time.monotonic()
+        sent: Dict[Hash, float] = {}
+        for transaction, sender, result in zip(signed_transactions, senders, results, strict=True):
+            try:
+                result.result()
+            except Exception:
+                report.send_errors += 1
+                # Reuse the nonce of the rejected transaction, or the node never includes the
+                # later transactions of the sender.
+                nonces[sender] = min(nonces[sender], int(transaction.nonce))
+                balances[sender] += self.max_cost(transaction)
+                continue
+            sent[transaction.hash] = now
+        return sent
+
+    def run(self, blocks: List[List[Transaction]]) -> LoadReport:
+        """Replay the transactions of the blocks and return the report of the run."""
+        transactions = [
+            transaction
+            for block in blocks
+            for transaction in block
+            if transaction.error is None and transaction.ty != 3
+        ]
+        assert transactions, "no transactions to replay"
+        senders = list(dict.fromkeys(Address(tx.sender) for tx in transactions if tx.sender))
+        nonces = dict(
+            zip(
+                senders,
+                self.eth_rpc.get_transaction_counts(senders, "pending"),
+                strict=True,
+            )
+        )
+        balances = dict(zip(senders, self.eth_rpc.get_balances(senders, "pending"), strict=True))
+        report = LoadReport()
+        sent_times: Dict[Hash, float] = {}
+        follower = BlockFollower(self.eth_rpc)
+        follower.start()
+        rate = self.rate()
+        replay = itertools.cycle(transactions)
+        next_transaction = next(replay)
+        budget = 0.0
+        start = time.monotonic()
+        try:
+            while (now := time.monotonic()) - start < self.duration:
+                due: List[Transaction] = []
+                # Without a rate, send one replay of the transactions per batch.
+                while (
+                    len(due) < len(transactions)
+                    if rate is None
+                    else budget <= (now - start) * rate
+                ):
+                    assert next_transaction.sender is not None
+                    sender = Address(next_transaction.sender)
+                    cost = self.max_cost(next_transaction)
+                    if balances[sender] < cost:
+                        report.out_of_funds = True
+                        break
+                    balances[sender] -= cost
+                    due.append(next_transaction)
+                    budget += self.cost(next_transaction)
+                    next_transaction = next(replay)
+                if due:
+                    sent = self.send(due, nonces, balances, report)
+                    # A transaction re-sent after a rejection keeps its first send time.
+                    for tx_hash, sent_time in sent.items():
+                        sent_times.setdefault(tx_hash, sent_time)
+                    follower.track(list(sent))
+                if report.out_of_funds:
+                    break
+                if rate is not None:
+                    time.sleep(self.tick)
+            deadline = time.monotonic() + self.inclusion_timeout
+            while follower.pending() and time.monotonic() < deadline:
+                time.sleep(self.tick)
+        finally:
+            follower.stop()
+        report.sent = len(sent_times)
+        report.included = len(follower.included)
+        report.gas_used = follower.gas_used
+        report.latencies = [
+            included_time - sent_times[tx_hash]
+            for tx_hash, included_time in follower.included.items()
+        ]
+        last_inclusion = max(follower.included.values(), default=time.monotonic())
+        report.duration = last_inclusion - start
+        return report
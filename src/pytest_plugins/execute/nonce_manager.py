@@ -0,0 +1,102 @@
+"""Local nonce manager that pipelines the transactions of a sender account."""
+
+from typing import Dict, List
+
+from ethereum_test_base_types import Number
+from ethereum_test_rpc import EthRPC
+from ethereum_test_rpc.types import TransactionByHashResponse
+from ethereum_test_tools import EOA, Transaction
+
+
+class NonceManager:
+    """
+    Track the nonces of a sender account locally, so that its transactions can be signed ahead
+    of time and submitted back-to-back in a single batch, instead of one round-trip each.
+
+    Queued transactions are only sent when `wait_for_transactions` (or `submit`) is called. Before
+    waiting for their inclusion, and whenever the wait times out, the `pending` nonce of the
+    sender is compared against the outstanding transactions: transactions at or above a nonce gap
+    were dropped by the client and are resubmitted, up to `max_resubmissions` times.
+    """
+
+    eth_rpc: EthRPC
+    sender: EOA
+    max_resubmissions: int
+    queued: List[Transaction]
+    outstanding: Dict[int, Transaction]
+
+    def __init__(self, eth_rpc: EthRPC, sender: EOA, *, max_resubmissions: int = 3):
+        """Initialize the nonce manager of the sender, whose nonce is tracked locally."""
+        self.eth_rpc = eth_rpc
+        self.sender = sender
+        self.max_resubmissions = max_resubmissions
+        self.queued = []
+        self.outstanding = {}
+
+    def sign(self, transaction: Transaction) -> Transaction:
+        """Sign a transaction of the sender with its next nonce and queue it for submission."""
+        assert transaction.sender == self.sender, "transaction is not sent by the managed sender"
+        signed_transaction = transaction.with_signature_and_sender()
+        self.queued.append(signed_transaction)
+        return signed_transaction
+
+    def submit(self) -> None:
+        """Send all the queued transactions in a single batch."""
+        if not self.queued:
+            return
+        queued, self.queued = self.queued, []
+        self.eth_rpc.send_transactions(queued)
+        self.outstanding.update((int(tx.nonce), tx) for tx in queued)
+
+    def dropped_transactions(self) -> List[Transaction]:
+        """
+        Return the outstanding transactions that are neither included nor in the transaction
+        pool of the client, i.e., the ones at or above the first nonce gap.
+        """
+        if not self.outstanding:
+            return []
+        pending_nonce = self.eth_rpc.get_transaction_count(self.sender, "pending")
+        return [tx for nonce, tx in sorted(self.outstanding.items()) if nonce >= pending_nonce]
+
+    def resubmit(self, transactions: List[Transaction]) -> None:
+        """
+        Send the given transactions again in a single batch, ignoring the errors of the ones that
+        the client still knows about.
+
+        The transactions are sent with `send_transactions`, so that the RPC clients that track
+        the sent transactions (e.g. to build blocks in `execute hive`) register them again.
+        """
+        if not transactions:
+            return
+        self.eth_rpc.send_transactions(transactions, ignore_errors=True)
+
+    def wait_for_transactions(self) -> List[TransactionByHashResponse]:
+        """
+        Submit the queued transactions and wait once for all the outstanding transactions to be
+        included, resubmitting the dropped ones.
+        """
+        self.submit()
+        transactions = [self.outstanding[nonce] for nonce in sorted(self.outstanding)]
+        resubmissions = 0
+        dropped = self.dropped_transactions()
+        while True:
+            self.resubmit(dropped)
+            try:
+                responses = self.eth_rpc.wait_for_transactions(transactions)
+            except Exception:
+                dropped = self.dropped_transactions()
+                if not dropped or resubmissions >= self.max_resubmissions:
+                    raise
+                resubmissions += 1
+                continue
+            self.outstanding.clear()
+            return responses
+
+    def reset(self) -> None:
+        """
+        Discard the queued and outstanding transactions and resynchronize the local nonce with
+        the `pending` nonce of the client, e.g. after a test aborted before submitting.
+        """
+        self.queued.clear()
+        self.outstanding.clear()
+        self.sender.nonce = Number(self.eth_rpc.get_transaction_count(self.sender, "pending"))
@@ -30,6 +30,8 @@ from ethereum_test_tools import Opcodes as Op
 from ethereum_test_types.eof.v1 import Container
 from ethereum_test_vm import Bytecode, EVMCodeType, Opcodes
 
+from .nonce_manager import NonceManager
+
 MAX_BYTECODE_SIZE = 24576
 
 MAX_INITCODE_SIZE = MAX_BYTECODE_SIZE * 2
@@ -92,6 +94,7 @@ class Alloc(BaseAlloc):
 
     _fork: Fork = PrivateAttr()
     _sender: EOA = PrivateAttr()
+    _nonce_manager: NonceManager = PrivateAttr()
     _eth_rpc: EthRPC = PrivateAttr()
     _txs: List[Transaction] = PrivateAttr(default_factory=list)
     _deployed_contracts: List[Tuple[Address, Bytes]] = PrivateAttr(default_factory=list)
@@ -104,6 +107,7 @@ class Alloc(BaseAlloc):
         *args,
         fork: Fork,
         sender: EOA,
+        nonce_manager: NonceManager,
         eth_rpc: EthRPC,
         eoa_iterator: Iterator[EOA],
         chain_id: int,
@@ -115,6 +119,7 @@ class Alloc(BaseAlloc):
         super().__init__(*args, **kwargs)
         self._fork = fork
         self._sender = sender
+        self._nonce_manager = nonce_manager
         self._eth_rpc = eth_rpc
         self._eoa_iterator = eoa_iterator
         self._evm_code_type = evm_code_type
@@ -195,14 +200,15 @@ class Alloc(BaseAlloc):
         deploy_gas_limit = min(deploy_gas_limit * 2, 30_000_000)
         print(f"Deploying contract with gas limit: {deploy_gas_limit}")
 
-        deploy_tx = Transaction(
-            sender=self._sender,
-            to=None,
-            data=initcode,
-            value=balance,
-            gas_limit=deploy_gas_limit,
-        ).with_signature_and_sender()
-        self._eth_rpc.send_transaction(deploy_tx)
+        deploy_tx = self._nonce_manager.sign(
+            Transaction(
+                sender=self._sender,
+                to=None,
+                data=initcode,
+                value=balance,
+                gas_limit=deploy_gas_limit,
+            )
+        )
         self._txs.append(deploy_tx)
 
         contract_address = deploy_tx.created_contract
@@ -246,69 +252,75 @@ class Alloc(BaseAlloc):
                         sum(Op.SSTORE(key, value) for key, value in storage.root.items()) + Op.STOP
                     )
                 )
-                set_storage_tx = Transaction(
-                    sender=self._sender,
-                    to=eoa,
-                    authorization_list=[
-                        AuthorizationTuple(
-                            chain_id=self._chain_id,
-                            address=sstore_address,
-                            nonce=eoa.nonce,
-                            signer=eoa,
-                        ),
-                    ],
-                    gas_limit=100_000,
-                ).with_signature_and_sender()
+                set_storage_tx = self._nonce_manager.sign(
+                    Transaction(
+                        sender=self._sender,
+                        to=eoa,
+                        authorization_list=[
+                            AuthorizationTuple(
+                                chain_id=self._chain_id,
+                                address=sstore_address,
+                                nonce=eoa.nonce,
+                                signer=eoa,
+                            ),
+                        ],
+                        gas_limit=100_000,
+                    )
+                )
                 eoa.nonce = Number(eoa.nonce + 1)
-                self._eth_rpc.send_transaction(set_storage_tx)
                 self._txs.append(set_storage_tx)
 
             if delegation is not None:
                 if not isinstance(delegation, Address) and delegation == "Self":
                     delegation = eoa
                 # TODO: This tx has side-effects on the EOA state because of the delegation
-                fund_tx = Transaction(
-                    sender=self._sender,
-                    to=eoa,
-                    value=amount,
-                    authorization_list=[
-                        AuthorizationTuple(
-                            chain_id=self._chain_id,
-                            address=delegation,
-                            nonce=eoa.nonce,
-                            signer=eoa,
-                        ),
-                    ],
-                    gas_limit=100_000,
-                ).with_signature_and_sender()
+                fund_tx = self._nonce_manager.sign(
+                    Transaction(
+                        sender=self._sender,
+                        to=eoa,
+                        value=amount,
+                        authorization_list=[
+                            AuthorizationTuple(
+                                chain_id=self._chain_id,
+                                address=delegation,
+                                nonce=eoa.nonce,
+                                signer=eoa,
+                            ),
+                        ],
+                        gas_limit=100_000,
+                    )
+                )
                 eoa.nonce = Number(eoa.nonce + 1)
             else:
-                fund_tx = Transaction(
-                    sender=self._sender,
-                    to=eoa,
-                    value=amount,
-                    authorization_list=[
-                        AuthorizationTuple(
-                            chain_id=self._chain_id,
-                            address=0,  # Reset delegation to an address without code
-                            nonce=eoa.nonce,
-                            signer=eoa,
-                        ),
-                    ],
-                    gas_limit=100_000,
-                ).with_signature_and_sender()
+                fund_tx = self._nonce_manager.sign(
+                    Transaction(
+                        sender=self._sender,
+                        to=eoa,
+                        value=amount,
+                        authorization_list=[
+                            AuthorizationTuple(
+                                chain_id=self._chain_id,
+                                address=0,  # Reset delegation to an address without code
+                                nonce=eoa.nonce,
+                                signer=eoa,
+                            ),
+                        ],
+                        gas_limit=100_000,
+                    )
+                )
                 eoa.nonce = Number(eoa.nonce + 1)
 
         else:
             if Number(amount) > 0:
-                fund_tx = Transaction(
-                    sender=self._sender,
-                    to=eoa,
-                    value=amount,
-                ).with_signature_and_sender()
+                fund_tx = self._nonce_manager.sign(
+                    Transaction(
+                        sender=self._sender,
+                        to=eoa,
+                        value=amount,
+                    )
+                )
 
         if fund_tx is not None:
-            self._eth_rpc.send_transaction(fund_tx)
             self._txs.append(fund_tx)
         super().__setitem__(
             eoa,
@@ -327,12 +339,13 @@ class Alloc(BaseAlloc):
         If the address is already present in the pre-alloc the amount will be
         added to its existing balance.
         """
-        fund_tx = Transaction(
-            sender=self._sender,
-            to=address,
-            value=amount,
-        ).with_signature_and_sender()
-        self._eth_rpc.send_transaction(fund_tx)
+        fund_tx = self._nonce_manager.sign(
+            Transaction(
+                sender=self._sender,
+                to=address,
+                value=amount,
+            )
+        )
         self._txs.append(fund_tx)
         if address in self:
             account = self[address]
@@ -372,8 +385,11 @@ class Alloc(BaseAlloc):
         return Address(eoa)
 
     def wait_for_transactions(self) -> List[TransactionByHashResponse]:
-        """Wait for all transactions to be included in blocks."""
-        return self._eth_rpc.wait_for_transactions(self._txs)
+        """
+        Submit all the pre-allocation transactions back-to-back and wait for them to be included
+        in blocks.
+        """
+        return self._nonce_manager.wait_for_transactions()
 
 
 @pytest.fixture(autouse=True)
@@ -396,6 +412,7 @@ def eoa_fund_amount_default(request: pytest.FixtureRequest) -> int:
 def pre(
     fork: Fork,
     sender_key: EOA,
+    sender_nonce_manager: NonceManager,
     eoa_iterator: Iterator[EOA],
     eth_rpc: EthRPC,
     evm_code_type: EVMCodeType,
@@ -411,6 +428,7 @@ def pre(
     pre = Alloc(
         fork=fork,
         sender=sender_key,
+        nonce_manager=sender_nonce_manager,
         eth_rpc=eth_rpc,
         eoa_iterator=eoa_iterator,
         evm_code_type=evm_code_type,
@@ -421,11 +439,18 @@ def pre(
     # Yield the pre-alloc for usage during the test
     yield pre
 
+    # Discard the transactions of a test that failed before they were included
+    if sender_nonce_manager.queued or sender_nonce_manager.outstanding:
+        sender_nonce_manager.reset()
+
     # Refund all EOAs (regardless of whether the test passed or failed)
     refund_txs = []
-    for eoa in pre._funded_eoa:
-        remaining_balance = eth_rpc.get_balance(eoa)
-        eoa.nonce = Number(eth_rpc.get_transaction_count(eoa))
+    remaining_balances = eth_rpc.get_balances(pre._funded_eoa)
+    nonces = eth_rpc.get_transaction_counts(pre._funded_eoa)
+    for eoa, remaining_balance, nonce in zip(
+        pre._funded_eoa, remaining_balances, nonces, strict=True
+    ):
+        eoa.nonce = Number(nonce)
         refund_gas_limit = 21_000
         tx_cost = refund_gas_limit * default_gas_price
         if remaining_balance < tx_cost:
@@ -0,0 +1,492 @@
+"""
+Block production of `execute hive`, coordinated across the xdist workers of a session.
+
+A single coordinator process, listening on a unix socket in the session temporary folder, keeps
+the hashes of the transactions that the workers sent and are still pending. It builds a block
+through the Engine API as soon as `transactions_per_block` transactions are pending, or when the
+oldest pending transaction has waited for `max_block_delay` seconds, and then notifies the
+workers waiting for the transactions included in it.
+
+The coordinator is stopped by the last worker at the end of the session, and also stops by
+itself once the main process of the session exits, e.g. if the workers are killed.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable, Collection, Dict, List, Sequence, Set, Tuple
+
+from ethereum_test_base_types import Address, Bytes, Hash, HexNumber
+from ethereum_test_forks import Fork, get_fork_by_name
+from ethereum_test_rpc import EngineRPC, EthRPC
+from ethereum_test_rpc.types import (
+    ForkchoiceState,
+    GetPayloadResponse,
+    PayloadAttributes,
+    PayloadStatusEnum,
+)
+from ethereum_test_types.trie import keccak256
+
+SESSION_CHECK_INTERVAL = 1.0
+
+
+@dataclass
+class BlockBuildLatency:
+    """Latency of the building of a block through the Engine API."""
+
+    block_number: int
+    transaction_count: int
+    get_payload_calls: int
+    get_payload_wait: float
+    build_time: float
+
+
+class BlockBuilder:
+    """
+    Build blocks on top of the head of the client through the Engine API.
+
+    After requesting a payload, `engine_getPayload` is polled with an exponential backoff,
+    starting at `get_payload_initial_interval`, until the payload includes all the expected
+    transactions, until two consecutive polls return the same non-empty transactions, or until
+    `get_payload_wait_time` seconds have passed.
+    """
+
+    eth_rpc: EthRPC
+    engine_rpc: EngineRPC
+    fork: Fork
+    get_payload_wait_time: float
+    get_payload_initial_interval: float
+
+    def __init__(
+        self,
+        *,
+        eth_rpc: EthRPC,
+        engine_rpc: EngineRPC,
+        fork: Fork,
+        get_payload_wait_time: float,
+        get_payload_initial_interval: float = 0.05,
+    ):
+        """Initialize the block builder of the client."""
+        self.eth_rpc = eth_rpc
+        self.engine_rpc = engine_rpc
+        self.fork = fork
+        self.get_payload_wait_time = get_payload_wait_time
+        self.get_payload_initial_interval = get_payload_initial_interval
+
+    def wait_for_payload(
+        self, payload_id: Bytes, expected_tx_hashes: Collection[Hash]
+    ) -> Tuple[GetPayloadResponse, int]:
+        """
+        Poll the payload until it includes all the expected transactions, the client stops
+        adding transactions to it, or the maximum wait time passes, and return it along with the
+        number of `engine_getPayload` calls.
+        """
+        get_payload_version = self.fork.engine_get_payload_version()
+        assert get_payload_version is not None, "Fork does not support engine get_payload"
+        deadline = time.monotonic() + self.get_payload_wait_time
+        interval = self.get_payload_initial_interval
+        calls = 0
+        previous_transactions = None
+        while True:
+            time.sleep(max(min(interval, deadline - time.monotonic()), 0))
+            payload = self.engine_rpc.get_payload(payload_id, version=get_payload_version)
+            calls += 1
+            transactions = list(payload.execution_payload.transactions)
+            included = {Hash(keccak256(tx)) for tx in transactions}
+            if (
+                included.issuperset(expected_tx_hashes)
+                or (transactions and transactions == previous_transactions)
+                or time.monotonic() >= deadline
+            ):
+                return payload, calls
+            previous_transactions = transactions
+            interval *= 2
+
+    def build_block(
+        self, expected_tx_hashes: Collection[Hash] = ()
+    ) -> Tuple[List[Hash], BlockBuildLatency]:
+        """
+        Build a block, expected to include the given transactions, and return the hashes of the
+        transactions it includes along with the latency of its building.
+        """
+        start = time.monotonic()
+        # Get the head block hash
+        head_block = self.eth_rpc.get_block_by_number("latest")
+        forkchoice_state = ForkchoiceState(
+            head_block_hash=head_block["hash"],
+        )
+        parent_beacon_block_root = Hash(0) if self.fork.header_beacon_root_required(0, 0) else None
+        payload_attributes = PayloadAttributes(
+            timestamp=HexNumber(head_block["timestamp"]) + 1,
+            prev_randao=Hash(0),
+            suggested_fee_recipient=Address(0),
+            withdrawals=[] if self.fork.header_withdrawals_required() else None,
+            parent_beacon_block_root=parent_beacon_block_root,
+            target_blobs_per_block=(
+                self.fork.target_blobs_per_block(0, 0)
+                if self.fork.engine_payload_attribute_target_blobs_per_block(0, 0)
+                else None
+            ),
+            max_blobs_per_block=(
+                self.fork.max_blobs_per_block(0, 0)
+                if self.fork.engine_payload_attribute_max_blobs_per_block(0, 0)
+                else None
+            ),
+        )
+        forkchoice_updated_version = self.fork.engine_forkchoice_updated_version()
+        assert forkchoice_updated_version is not None, (
+            "Fork does not support engine forkchoice_updated"
+        )
+        response = self.engine_rpc.forkchoice_updated(
+            forkchoice_state,
+            payload_attributes,
+            version=forkchoice_updated_version,
+        )
+        assert response.payload_status.status == PayloadStatusEnum.VALID, "Payload was invalid"
+        assert response.payload_id is not None, "payload_id was not returned by the client"
+        get_payload_start = time.monotonic()
+        new_payload, get_payload_calls = self.wait_for_payload(
+            response.payload_id, expected_tx_hashes
+        )
+        get_payload_wait = time.monotonic() - get_payload_start
+        new_payload_args: List[Any] = [new_payload.execution_payload]
+        if new_payload.blobs_bundle is not None:
+            new_payload_args.append(new_payload.blobs_bundle.blob_versioned_hashes())
+        if parent_beacon_block_root is not None:
+            new_payload_args.append(parent_beacon_block_root)
+        if new_payload.execution_requests is not None:
+            new_payload_args.append(new_payload.execution_requests)
+        new_payload_version = self.fork.engine_new_payload_version()
+        assert new_payload_version is not None, "Fork does not support engine new_payload"
+        new_payload_response = self.engine_rpc.new_payload(
+            *new_payload_args, version=new_payload_version
+        )
+        assert new_payload_response.status == PayloadStatusEnum.VALID, "Payload was invalid"
+
+        new_forkchoice_state = ForkchoiceState(
+            head_block_hash=new_payload.execution_payload.block_hash,
+        )
+        response = self.engine_rpc.forkchoice_updated(
+            new_forkchoice_state,
+            None,
+            version=forkchoice_updated_version,
+        )
+        assert response.payload_status.status == PayloadStatusEnum.VALID, "Payload was invalid"
+        latency = BlockBuildLatency(
+            block_number=int(new_payload.execution_payload.number),
+            transaction_count=len(new_payload.execution_payload.transactions),
+            get_payload_calls=get_payload_calls,
+            get_payload_wait=get_payload_wait,
+            build_time=time.monotonic() - start,
+        )
+        return [Hash(keccak256(tx)) for tx in new_payload.execution_payload.transactions], latency
+
+
+class BlockProductionCoordinator:
+    """
+    Keep the pending transactions of all the workers and build blocks when enough transactions
+    are pending or the oldest one has waited long enough.
+    """
+
+    build_block: Callable[[Collection[Hash]], Tuple[List[Hash], BlockBuildLatency]]
+    transactions_per_block: int
+    max_block_delay: float
+    pending: Dict[Hash, float]
+    latencies: List[BlockBuildLatency]
+    stalled: bool
+    error: str | None
+
+    def __init__(
+        self,
+        build_block: Callable[[Collection[Hash]], Tuple[List[Hash], BlockBuildLatency]],
+        *,
+        transactions_per_block: int,
+        max_block_delay: float = 1.0,
+    ):
+        """
+        Initialize the coordinator with the function that builds a block expected to include
+        the given transactions.
+        """
+        self.build_block = build_block
+        self.transactions_per_block = transactions_per_block
+        self.max_block_delay = max_block_delay
+        self.pending = {}
+        self.latencies = []
+        self.stalled = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+
+    def register(self, tx_hashes: Sequence[Hash]) -> None:
+        """Add the hashes of sent transactions to the pending transactions."""
+        now = time.monotonic()
+        with self.condition:
+            for tx_hash in tx_hashes:
+                self.pending.setdefault(tx_hash, now)
+            self.stalled = False
+            self.condition.notify_all()
+
+    def wait(self, tx_hashes: Sequence[Hash], timeout: float) -> List[Hash]:
+        """
+        Wait until none of the transactions is pending and return the ones that are still
+        pending after the timeout, which stop being pending.
+        """
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while True:
+                if self.error is not None:
+                    raise Exception(f"Block production failed: {self.error}")
+                missing = [tx_hash for tx_hash in tx_hashes if tx_hash in self.pending]
+                remaining = deadline - time.monotonic()
+                if not missing or remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            for tx_hash in missing:
+                del self.pending[tx_hash]
+            return missing
+
+    def block_due(self) -> float | None:
+        """Return the time until the next block is due, or `None` if nothing is pending."""
+        if not self.pending:
+            return None
+        if len(self.pending) >= self.transactions_per_block and not self.stalled:
+            return 0.0
+        return min(self.pending.values()) + self.max_block_delay - time.monotonic()
+
+    def produce_blocks(self) -> None:
+        """Build blocks whenever they are due, until the coordinator is stopped."""
+        while not self.stopped.is_set():
+            with self.condition:
+                due = self.block_due()
+                if due is None or due > 0:
+                    self.condition.wait(due)
+                    continue
+                # The oldest pending transactions that fit in the block.
+                expected = list(self.pending)[: self.transactions_per_block]
+            try:
+                included, latency = self.build_block(expected)
+            except Exception as e:
+                with self.condition:
+                    self.error = str(e)
+                    self.condition.notify_all()
+                return
+            with self.condition:
+                self.latencies.append(latency)
+                pending_count = len(self.pending)
+                for tx_hash in included:
+                    self.pending.pop(tx_hash, None)
+                # Transactions left out of the block wait for another full delay, even if enough
+                # of them are pending, unless new transactions arrive.
+                self.stalled = len(self.pending) == pending_count
+                now = time.monotonic()
+                self.pending = dict.fromkeys(self.pending, now)
+                self.condition.notify_all()
+
+    def stop(self) -> None:
+        """Stop producing blocks."""
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+
+    def handle_request(self, connection: Connection, request: str, *args: Any) -> None:
+        """Reply to a request of a worker."""
+        with connection:
+            try:
+                if request == "ping":
+                    connection.send(("ok", None))
+                elif request == "register":
+                    self.register(args[0])
+                    connection.send(("ok", None))
+                elif request == "wait":
+                    connection.send(("ok", self.wait(args[0], args[1])))
+                elif request == "latencies":
+                    # Sent as dictionaries: the coordinator runs as `__main__`, so the workers
+                    # could not unpickle instances of its classes.
+                    with self.condition:
+                        connection.send(("ok", [asdict(latency) for latency in self.latencies]))
+                else:
+                    connection.send(("error", f"Unknown request: {request}"))
+            except Exception as e:
+                connection.send(("error", str(e)))
+
+    def watch_session(self, socket_path: Path, session_pid: int) -> None:
+        """Stop the coordinator once the main process of the session exits."""
+        while not self.stopped.wait(SESSION_CHECK_INTERVAL):
+            if not process_alive(session_pid):
+                try:
+                    BlockProductionClient(socket_path).stop()
+                except OSError:
+                    pass
+                return
+
+    def serve(self, socket_path: Path, *, session_pid: int | None = None) -> None:
+        """
+        Serve the requests of the workers on the unix socket until a worker stops it, or until
+        the process `session_pid` exits.
+        """
+        # Left behind by a coordinator that did not exit cleanly, it would make the bind fail.
+        socket_path.unlink(missing_ok=True)
+        producer = threading.Thread(target=self.produce_blocks, daemon=True)
+        producer.start()
+        if session_pid is not None:
+            threading.Thread(
+                target=self.watch_session, args=(socket_path, session_pid), daemon=True
+            ).start()
+        with Listener(str(socket_path), family="AF_UNIX") as listener:
+            while True:
+                connection = listener.accept()
+                request, *args = connection.recv()
+                if request == "stop":
+                    self.stop()
+                    with connection:
+                        connection.send(("ok", None))
+                    break
+                threading.Thread(
+                    target=self.handle_request, args=(connection, request, *args), daemon=True
+                ).start()
+        producer.join()
+
+
+class BlockProductionClient:
+    """Client of the block production coordinator, used by each worker."""
+
+    socket_path: Path
+
+    def __init__(self, socket_path: Path):
+        """Initialize the client of the coordinator listening on the given socket."""
+        self.socket_path = socket_path
+
+    def request(self, *message: Any) -> Any:
+        """Send a request to the coordinator and return its reply."""
+        with Client(str(self.socket_path), family="AF_UNIX") as connection:
+            connection.send(message)
+            status, result = connection.recv()
+        if status != "ok":
+            raise Exception(f"Block production coordinator error: {result}")
+        return result
+
+    def alive(self) -> bool:
+        """Return whether a coordinator is listening on the socket."""
+        try:
+            self.request("ping")
+        except OSError:
+            return False
+        return True
+
+    def register(self, tx_hashes: Sequence[Hash]) -> None:
+        """Register the hashes of sent transactions as pending."""
+        self.request("register", list(tx_hashes))
+
+    def wait(self, tx_hashes: Sequence[Hash], timeout: float) -> Set[Hash]:
+        """Wait until the transactions are included and return the ones that were not."""
+        return set(self.request("wait", list(tx_hashes), timeout))
+
+    def latencies(self) -> List[BlockBuildLatency]:
+        """Return the latency of every block built so far."""
+        return [BlockBuildLatency(**latency) for latency in self.request("latencies")]
+
+    def stop(self) -> None:
+        """Stop the coordinator."""
+        self.request("stop")
+
+
+def process_alive(pid: int) -> bool:
+    """Return whether the process with the given id is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def start_block_production_coordinator(
+    *,
+    socket_path: Path,
+    eth_rpc_url: str,
+    engine_rpc_url: str,
+    fork: Fork,
+    transactions_per_block: int,
+    max_block_delay: float,
+    get_payload_wait_time: float,
+    session_pid: int,
+    startup_timeout: float = 30.0,
+) -> BlockProductionClient:
+    """
+    Start the coordinator in a separate process, detached from the worker that starts it so that
+    it outlives it, and return a client once it listens on the socket.
+
+    The coordinator exits once the process `session_pid` exits.
+    """
+    socket_path.unlink(missing_ok=True)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            __name__,
+            str(socket_path),
+            "--eth-rpc",
+            eth_rpc_url,
+            "--engine-rpc",
+            engine_rpc_url,
+            "--fork",
+            fork.name(),
+            "--transactions-per-block",
+            str(transactions_per_block),
+            "--max-block-delay",
+            str(max_block_delay),
+            "--get-payload-wait-time",
+            str(get_payload_wait_time),
+            "--session-pid",
+            str(session_pid),
+        ],
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + startup_timeout
+    while not socket_path.exists():
+        if process.poll() is not None:
+            raise Exception("The block production coordinator exited during startup")
+        if time.monotonic() > deadline:
+            process.kill()
+            raise Exception("The block production coordinator did not start in time")
+        time.sleep(0.05)
+    return BlockProductionClient(socket_path)
+
+
+def main() -> None:
+    """Run the block production coordinator of a client until it is stopped."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("socket_path", type=Path)
+    parser.add_argument("--eth-rpc", required=True)
+    parser.add_argument("--engine-rpc", required=True)
+    parser.add_argument("--fork", required=True)
+    parser.add_argument("--transactions-per-block", type=int, required=True)
+    parser.add_argument("--max-block-delay", type=float, required=True)
+    parser.add_argument("--get-payload-wait-time", type=float, required=True)
+    parser.add_argument("--session-pid", type=int, required=True)
+    args = parser.parse_args()
+    fork = get_fork_by_name(args.fork)
+    assert fork is not None, f"Unknown fork: {args.fork}"
+    builder = BlockBuilder(
+        eth_rpc=EthRPC(args.eth_rpc),
+        engine_rpc=EngineRPC(args.engine_rpc),
+        fork=fork,
+        get_payload_wait_time=args.get_payload_wait_time,
+    )
+    coordinator = BlockProductionCoordinator(
+        builder.build_block,
+        transactions_per_block=args.transactions_per_block,
+        max_block_delay=args.max_block_delay,
+    )
+    coordinator.serve(args.socket_path, session_pid=args.session_pid)
+
+
+if __name__ == "__main__":
+    main()
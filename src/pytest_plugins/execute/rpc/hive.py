@@ -7,7 +7,7 @@ import time
 from dataclasses import asdict, replace
 from pathlib import Path
 from random import randint
-from typing import Any, Dict, Generator, List, Mapping, Tuple, cast
+from typing import Dict, Generator, List, Mapping, Tuple, cast
 
 import pytest
 from filelock import FileLock
@@ -15,15 +15,15 @@ from hive.client import Client, ClientType
 from hive.simulation import Simulation
 from hive.testing import HiveTest, HiveTestResult, HiveTestSuite
 from pydantic import RootModel
+from pytest_metadata.plugin import metadata_key  # type: ignore
 
-from ethereum_test_base_types import EmptyOmmersRoot, EmptyTrieRoot, HexNumber, to_json
+from ethereum_test_base_types import EmptyOmmersRoot, EmptyTrieRoot, to_json
 from ethereum_test_fixtures.blockchain import FixtureHeader
 from ethereum_test_forks import Fork, get_forks
 from ethereum_test_rpc import EngineRPC
 from ethereum_test_rpc import EthRPC as BaseEthRPC
 from ethereum_test_rpc.types import (
     ForkchoiceState,
-    PayloadAttributes,
     PayloadStatusEnum,
     TransactionByHashResponse,
 )
@@ -38,38 +38,9 @@ from ethereum_test_tools import (
     Withdrawal,
 )
 from ethereum_test_types import Requests
-from ethereum_test_types.trie import keccak256
 from pytest_plugins.consume.simulators.helpers.ruleset import ruleset
 
-
-class HashList(RootModel[List[Hash]]):
-    """Hash list class."""
-
-    root: List[Hash]
-
-    def append(self, item: Hash):
-        """Append an item to the list."""
-        self.root.append(item)
-
-    def clear(self):
-        """Clear the list."""
-        self.root.clear()
-
-    def remove(self, item: Hash):
-        """Remove an item from the list."""
-        self.root.remove(item)
-
-    def __contains__(self, item: Hash):
-        """Check if an item is in the list."""
-        return item in self.root
-
-    def __len__(self):
-        """Get the length of the list."""
-        return len(self.root)
-
-    def __iter__(self):
-        """Iterate over the list."""
-        return iter(self.root)
+from .block_production import BlockProductionClient, start_block_production_coordinator
 
 
 class AddressList(RootModel[List[Address]]):
@@ -133,7 +104,22 @@ def pytest_addoption(parser):
         dest="get_payload_wait_time",
         type=float,
         default=0.3,
-        help=("Time to wait after sending a forkchoice_updated before getting the payload."),
+        help=(
+            "Maximum time to wait after sending a forkchoice_updated for the payload to include "
+            "the pending transactions. The payload is polled with an exponential backoff until "
+            "it does."
+        ),
+    )
+    hive_rpc_group.addoption(
+        "--max-block-delay",
+        action="store",
+        dest="max_block_delay",
+        type=float,
+        default=1.0,
+        help=(
+            "Maximum time in seconds a sent transaction waits before the next block is produced, "
+            "even if fewer than `--transactions-per-block` transactions are pending."
+        ),
     )
     hive_rpc_group.addoption(
         "--sender-key-initial-balance",
@@ -160,6 +146,16 @@ def pytest_addoption(parser):
 def pytest_configure(config):  # noqa: D103
     config.test_suite_scope = "session"
     config.engine_rpc_supported = True
+    # The block production coordinator exits once the main process of the session exits.
+    if hasattr(config, "workerinput"):
+        config.session_pid = config.workerinput["session_pid"]
+    else:
+        config.session_pid = os.getpid()
+
+
+def pytest_configure_node(node):
+    """Pass the id of the main process of the session to the worker (xdist hook)."""
+    node.workerinput["session_pid"] = node.config.session_pid
 
 
 @pytest.fixture(scope="session")
@@ -446,96 +442,88 @@ def client(
             users_file.unlink()
 
 
-class PendingTxHashes:
-    """
-    A class to manage the pending transaction hashes in a multi-process environment.
+@pytest.fixture(scope="session")
+def max_block_delay(request: pytest.FixtureRequest) -> float:
+    """Get the maximum time a sent transaction waits before a block is produced."""
+    return request.config.getoption("max_block_delay")
+
 
-    It uses a lock file to ensure that only one process can access the pending hashes file at a
-    time.
+@pytest.fixture(scope="session")
+def block_production(
+    request: pytest.FixtureRequest,
+    client: Client,
+    base_fork: Fork,
+    transactions_per_block: int,
+    max_block_delay: float,
+    session_temp_folder: Path,
+) -> Generator[BlockProductionClient, None, None]:
+    """
+    Start the block production coordinator of the client, shared by all the workers, and return
+    a client to it.
     """
+    base_name = "block_production"
+    socket_path = session_temp_folder / f"{base_name}.sock"
+    base_lock_file = session_temp_folder / f"{base_name}.lock"
+    with FileLock(base_lock_file):
+        block_production = BlockProductionClient(socket_path)
+        if not socket_path.exists() or not block_production.alive():
+            block_production = start_block_production_coordinator(
+                socket_path=socket_path,
+                eth_rpc_url=f"http://{client.ip}:8545",
+                engine_rpc_url=f"http://{client.ip}:8551",
+                fork=base_fork,
+                transactions_per_block=transactions_per_block,
+                max_block_delay=max_block_delay,
+                get_payload_wait_time=request.config.getoption("get_payload_wait_time"),
+                session_pid=request.config.session_pid,  # type: ignore[attr-defined]
+            )
 
-    pending_hashes_file: Path
-    pending_hashes_lock: Path
-    pending_tx_hashes: HashList | None
-    lock: FileLock | None
-
-    def __init__(self, temp_folder: Path):
-        """Initialize the pending transaction hashes manager."""
-        self.pending_hashes_file = temp_folder / "pending_tx_hashes"
-        self.pending_hashes_lock = temp_folder / "pending_tx_hashes.lock"
-        self.pending_tx_hashes = None
-        self.lock = None
-
-    def __enter__(self):
-        """Lock the pending hashes file and load it."""
-        assert self.lock is None, "Lock already acquired"
-        self.lock = FileLock(self.pending_hashes_lock, timeout=-1)
-        self.lock.acquire()
-        assert self.pending_tx_hashes is None, "Pending transaction hashes already loaded"
-        if self.pending_hashes_file.exists():
-            with open(self.pending_hashes_file, "r") as f:
-                self.pending_tx_hashes = HashList.model_validate_json(f.read())
+    users_file_name = f"{base_name}_users"
+    users_file = session_temp_folder / users_file_name
+    users_lock_file = session_temp_folder / f"{users_file_name}.lock"
+    with FileLock(users_lock_file):
+        if users_file.exists():
+            with open(users_file, "r") as f:
+                users = json.load(f)
         else:
-            self.pending_tx_hashes = HashList([])
-        return self
-
-    def __exit__(self, exc_type, exc_value, traceback):
-        """Flush the pending hashes to the file and release the lock."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        with open(self.pending_hashes_file, "w") as f:
-            f.write(self.pending_tx_hashes.model_dump_json())
-        self.lock.release()
-        self.lock = None
-        self.pending_tx_hashes = None
-
-    def append(self, tx_hash: Hash):
-        """Add a transaction hash to the pending list."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        self.pending_tx_hashes.append(tx_hash)
+            users = 0
+        users += 1
+        with open(users_file, "w") as f:
+            json.dump(users, f)
 
-    def clear(self):
-        """Remove a transaction hash from the pending list."""
-        assert self.lock is not None, "Lock not acquired"
-        self.pending_tx_hashes.clear()
-
-    def remove(self, tx_hash: Hash):
-        """Remove a transaction hash from the pending list."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        self.pending_tx_hashes.remove(tx_hash)
-
-    def __contains__(self, tx_hash: Hash):
-        """Check if a transaction hash is in the pending list."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        return tx_hash in self.pending_tx_hashes
+    yield block_production
 
-    def __len__(self):
-        """Get the number of pending transaction hashes."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        return len(self.pending_tx_hashes)
-
-    def __iter__(self):
-        """Iterate over the pending transaction hashes."""
-        assert self.lock is not None, "Lock not acquired"
-        assert self.pending_tx_hashes is not None, "Pending transaction hashes not loaded"
-        return iter(self.pending_tx_hashes)
+    with FileLock(users_lock_file):
+        with open(users_file, "r") as f:
+            users = json.load(f)
+        users -= 1
+        with open(users_file, "w") as f:
+            json.dump(users, f)
+        if users == 0:
+            try:
+                latencies = block_production.latencies()
+                if latencies:
+                    build_times = [latency.build_time for latency in latencies]
+                    request.config.stash[metadata_key]["Block production"] = (
+                        f"Blocks={len(latencies)}, "
+                        f"Mean build time={sum(build_times) / len(build_times):.3f}s, "
+                        f"Max build time={max(build_times):.3f}s"
+                    )
+            finally:
+                block_production.stop()
+                socket_path.unlink(missing_ok=True)
+                users_file.unlink()
 
 
 class EthRPC(BaseEthRPC):
     """
-    Ethereum RPC client for the hive simulator which automatically sends Engine API requests to
-    generate blocks after a certain number of transactions have been sent.
+    Ethereum RPC client for the hive simulator which registers the sent transactions with the
+    block production coordinator, which sends the Engine API requests that generate the blocks.
     """
 
     fork: Fork
     engine_rpc: EngineRPC
-    transactions_per_block: int
-    get_payload_wait_time: float
-    pending_tx_hashes: PendingTxHashes
+    block_production: BlockProductionClient
 
     def __init__(
         self,
@@ -544,9 +532,8 @@ class EthRPC(BaseEthRPC):
         fork: Fork,
         engine_rpc: EngineRPC,
         base_genesis_header: FixtureHeader,
-        transactions_per_block: int,
+        block_production: BlockProductionClient,
         session_temp_folder: Path,
-        get_payload_wait_time: float,
         initial_forkchoice_update_retries: int = 5,
         transaction_wait_timeout: int = 60,
     ):
@@ -557,9 +544,7 @@ class EthRPC(BaseEthRPC):
         )
         self.fork = fork
         self.engine_rpc = engine_rpc
-        self.transactions_per_block = transactions_per_block
-        self.pending_tx_hashes = PendingTxHashes(session_temp_folder)
-        self.get_payload_wait_time = get_payload_wait_time
+        self.block_production = block_production
 
         # Send initial forkchoice updated only if we are the first worker
         base_name = "eth_rpc_forkchoice_updated"
@@ -594,93 +579,26 @@ class EthRPC(BaseEthRPC):
                 base_error_file.unlink()  # Success
                 base_file.touch()
 
-    def generate_block(self: "EthRPC"):
-        """Generate a block using the Engine API."""
-        # Get the head block hash
-        head_block = self.get_block_by_number("latest")
-
-        forkchoice_state = ForkchoiceState(
-            head_block_hash=head_block["hash"],
-        )
-        parent_beacon_block_root = Hash(0) if self.fork.header_beacon_root_required(0, 0) else None
-        payload_attributes = PayloadAttributes(
-            timestamp=HexNumber(head_block["timestamp"]) + 1,
-            prev_randao=Hash(0),
-            suggested_fee_recipient=Address(0),
-            withdrawals=[] if self.fork.header_withdrawals_required() else None,
-            parent_beacon_block_root=parent_beacon_block_root,
-            target_blobs_per_block=(
-                self.fork.target_blobs_per_block(0, 0)
-                if self.fork.engine_payload_attribute_target_blobs_per_block(0, 0)
-                else None
-            ),
-            max_blobs_per_block=(
-                self.fork.max_blobs_per_block(0, 0)
-                if self.fork.engine_payload_attribute_max_blobs_per_block(0, 0)
-                else None
-            ),
-        )
-        forkchoice_updated_version = self.fork.engine_forkchoice_updated_version()
-        assert forkchoice_updated_version is not None, (
-            "Fork does not support engine forkchoice_updated"
-        )
-        response = self.engine_rpc.forkchoice_updated(
-            forkchoice_state,
-            payload_attributes,
-            version=forkchoice_updated_version,
-        )
-        assert response.payload_status.status == PayloadStatusEnum.VALID, "Payload was invalid"
-        assert response.payload_id is not None, "payload_id was not returned by the client"
-        time.sleep(self.get_payload_wait_time)
-        get_payload_version = self.fork.engine_get_payload_version()
-        assert get_payload_version is not None, "Fork does not support engine get_payload"
-        new_payload = self.engine_rpc.get_payload(
-            response.payload_id,
-            version=get_payload_version,
-        )
-        new_payload_args: List[Any] = [new_payload.execution_payload]
-        if new_payload.blobs_bundle is not None:
-            new_payload_args.append(new_payload.blobs_bundle.blob_versioned_hashes())
-        if parent_beacon_block_root is not None:
-            new_payload_args.append(parent_beacon_block_root)
-        if new_payload.execution_requests is not None:
-            new_payload_args.append(new_payload.execution_requests)
-        new_payload_version = self.fork.engine_new_payload_version()
-        assert new_payload_version is not None, "Fork does not support engine new_payload"
-        new_payload_response = self.engine_rpc.new_payload(
-            *new_payload_args, version=new_payload_version
-        )
-        assert new_payload_response.status == PayloadStatusEnum.VALID, "Payload was invalid"
-
-        new_forkchoice_state = ForkchoiceState(
-            head_block_hash=new_payload.execution_payload.block_hash,
-        )
-        response = self.engine_rpc.forkchoice_updated(
-            new_forkchoice_state,
-            None,
-            version=forkchoice_updated_version,
-        )
-        assert response.payload_status.status == PayloadStatusEnum.VALID, "Payload was invalid"
-        for tx in new_payload.execution_payload.transactions:
-            tx_hash = Hash(keccak256(tx))
-            if tx_hash in self.pending_tx_hashes:
-                self.pending_tx_hashes.remove(tx_hash)
-
     def send_transaction(self, transaction: Transaction) -> Hash:
         """`eth_sendRawTransaction`: Send a transaction to the client."""
         returned_hash = super().send_transaction(transaction)
-        with self.pending_tx_hashes:
-            self.pending_tx_hashes.append(transaction.hash)
-            if len(self.pending_tx_hashes) >= self.transactions_per_block:
-                self.generate_block()
+        self.block_production.register([transaction.hash])
         return returned_hash
 
+    def send_transactions(
+        self, transactions: List[Transaction], *, ignore_errors: bool = False
+    ) -> List[Hash]:
+        """`eth_sendRawTransaction`: Send a list of transactions to the client in a batch."""
+        returned_hashes = super().send_transactions(transactions, ignore_errors=ignore_errors)
+        self.block_production.register([transaction.hash for transaction in transactions])
+        return returned_hashes
+
     def wait_for_transaction(self, transaction: Transaction) -> TransactionByHashResponse:
         """
         Wait for a specific transaction to be included in a block.
 
-        Waits for a specific transaction to be included in a block by polling
-        `eth_getTransactionByHash` until it is confirmed or a timeout occurs.
+        Waits until the block production coordinator includes the transaction in a block, or a
+        timeout occurs.
 
         Args:
             transaction: The transaction to track.
@@ -697,9 +615,9 @@ class EthRPC(BaseEthRPC):
         """
         Wait for all transactions in the provided list to be included in a block.
 
-        Waits for all transactions in the provided list to be included in a block
-        by polling `eth_getTransactionByHash` until they are confirmed or a
-        timeout occurs.
+        Waits until the block production coordinator includes all the transactions in blocks, or
+        a timeout occurs, and then fetches their details with `eth_getTransactionByHash` in a
+        single batch.
 
         Args:
             transactions: A list of transactions to track.
@@ -713,36 +631,22 @@ class EthRPC(BaseEthRPC):
 
         """
         tx_hashes = [tx.hash for tx in transactions]
+        missing = self.block_production.wait(tx_hashes, self.transaction_wait_timeout)
         responses: List[TransactionByHashResponse] = []
         pending_responses: Dict[Hash, TransactionByHashResponse] = {}
-
-        start_time = time.time()
-        pending_transactions_handler = PendingTransactionHandler(self)
-        while True:
-            tx_id = 0
-            pending_responses = {}
-            while tx_id < len(tx_hashes):
-                tx_hash = tx_hashes[tx_id]
-                tx = self.get_transaction_by_hash(tx_hash)
-                assert tx is not None, f"Transaction {tx_hash} not found"
-                if tx.block_number is not None:
-                    responses.append(tx)
-                    tx_hashes.pop(tx_id)
-                else:
-                    pending_responses[tx_hash] = tx
-                    tx_id += 1
-
-            if not tx_hashes:
-                return responses
-
-            pending_transactions_handler.handle()
-
-            if (time.time() - start_time) > self.transaction_wait_timeout:
-                break
-            time.sleep(0.1)
+        for tx_hash, tx in zip(tx_hashes, self.get_transactions_by_hash(tx_hashes), strict=True):
+            assert tx is not None, f"Transaction {tx_hash} not found"
+            if tx.block_number is not None and tx_hash not in missing:
+                responses.append(tx)
+            else:
+                pending_responses[tx_hash] = tx
+        if not pending_responses:
+            return responses
 
         missing_txs_strings = [
-            f"{tx.hash} ({tx.model_dump_json()})" for tx in transactions if tx.hash in tx_hashes
+            f"{tx.hash} ({tx.model_dump_json()})"
+            for tx in transactions
+            if tx.hash in pending_responses
         ]
 
         pending_tx_responses_string = "\n".join(
@@ -755,53 +659,6 @@ class EthRPC(BaseEthRPC):
         )
 
 
-class PendingTransactionHandler:
-    """
-    Manages block generation based on the number of pending transactions or a block generation
-    interval.
-
-    Attributes:
-        block_generation_interval: The number of iterations after which a block
-            is generated if no new transactions are added (default: 10).
-
-    """
-
-    eth_rpc: EthRPC
-    block_generation_interval: int
-    last_pending_tx_hashes_count: int | None = None
-    i: int = 0
-
-    def __init__(self, eth_rpc: EthRPC, block_generation_interval: int = 10):
-        """Initialize the pending transaction handler."""
-        self.eth_rpc = eth_rpc
-        self.block_generation_interval = block_generation_interval
-
-    def handle(self):
-        """
-        Handle pending transactions and generate blocks if necessary.
-
-        If the number of pending transactions reaches the limit, a block is generated.
-
-        If no new transactions have been added to the pending list and the block
-        generation interval has been reached, a block is generated to avoid potential
-        deadlock.
-        """
-        with self.eth_rpc.pending_tx_hashes:
-            if len(self.eth_rpc.pending_tx_hashes) >= self.eth_rpc.transactions_per_block:
-                self.eth_rpc.generate_block()
-            else:
-                if (
-                    self.last_pending_tx_hashes_count is not None
-                    and len(self.eth_rpc.pending_tx_hashes) == self.last_pending_tx_hashes_count
-                    and self.i % self.block_generation_interval == 0
-                ):
-                    # If no new transactions have been added to the pending list,
-                    # generate a block to avoid potential deadlock.
-                    self.eth_rpc.generate_block()
-            self.last_pending_tx_hashes_count = len(self.eth_rpc.pending_tx_hashes)
-            self.i += 1
-
-
 @pytest.fixture(scope="session")
 def transactions_per_block(request) -> int:  # noqa: D103
     if transactions_per_block := request.config.getoption("transactions_per_block"):
@@ -833,19 +690,19 @@ def eth_rpc(
     engine_rpc: EngineRPC,
     base_genesis_header: FixtureHeader,
     base_fork: Fork,
-    transactions_per_block: int,
+    block_production: BlockProductionClient,
     session_temp_folder: Path,
-) -> EthRPC:
+) -> Generator[EthRPC, None, None]:
     """Initialize ethereum RPC client for the execution client under test."""
-    get_payload_wait_time = request.config.getoption("get_payload_wait_time")
     tx_wait_timeout = request.config.getoption("tx_wait_timeout")
-    return EthRPC(
+    eth_rpc = EthRPC(
         client=client,
         fork=base_fork,
         engine_rpc=engine_rpc,
         base_genesis_header=base_genesis_header,
-        transactions_per_block=transactions_per_block,
+        block_production=block_production,
         session_temp_folder=session_temp_folder,
-        get_payload_wait_time=get_payload_wait_time,
         transaction_wait_timeout=tx_wait_timeout,
     )
+    yield eth_rpc
+    eth_rpc.close()
@@ -1,8 +1,11 @@
 """Pytest plugin to run the execute in remote-rpc-mode."""
 
+from pathlib import Path
+from typing import Generator
+
 import pytest
 
-from ethereum_test_rpc import EngineRPC, EthRPC
+from ethereum_test_rpc import Cassette, EngineRPC, EthRPC
 from ethereum_test_types import TransactionDefaults
 
 
@@ -33,6 +36,49 @@ def pytest_addoption(parser):
         default=60,
         help="Maximum time in seconds to wait for a transaction to be included in a block",
     )
+    remote_rpc_group.addoption(
+        "--rpc-record",
+        action="store",
+        dest="rpc_record",
+        type=Path,
+        default=None,
+        help=(
+            "Record the JSON-RPC traffic with the execution client to the given file "
+            "(gzip-compressed if it ends in `.gz`). Cannot be used with xdist."
+        ),
+    )
+    remote_rpc_group.addoption(
+        "--rpc-replay",
+        action="store",
+        dest="rpc_replay",
+        type=Path,
+        default=None,
+        help=(
+            "Replay the JSON-RPC traffic recorded with `--rpc-record` instead of sending it to "
+            "the execution client. The run must use the same tests and `--eoa-start` as the "
+            "recording. Cannot be used with xdist."
+        ),
+    )
+
+
+def pytest_configure(config):
+    """
+    Check that the RPC traffic is not recorded and replayed at the same time, nor split across
+    xdist workers, which are not assigned the same tests on every run.
+    """
+    record = config.getoption("rpc_record") is not None
+    replay = config.getoption("rpc_replay") is not None
+    if record and replay:
+        pytest.exit(
+            "Only one of `--rpc-record` and `--rpc-replay` can be specified.",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
+    numprocesses = config.getoption("numprocesses", default=None)
+    if (record or replay) and isinstance(numprocesses, int) and numprocesses > 0:
+        pytest.exit(
+            "`--rpc-record` and `--rpc-replay` cannot be used with xdist (`-n`).",
+            returncode=pytest.ExitCode.USAGE_ERROR,
+        )
 
 
 @pytest.fixture(scope="session")
@@ -56,8 +102,30 @@ def chain_id(request) -> int:
     return chain_id
 
 
+@pytest.fixture(scope="session")
+def rpc_cassette(request) -> Generator[Cassette | None, None, None]:
+    """
+    Return the cassette that records or replays the JSON-RPC traffic, if requested, saving the
+    recording once the session ends.
+    """
+    if (replay_path := request.config.getoption("rpc_replay")) is not None:
+        yield Cassette.load(replay_path)
+    elif (record_path := request.config.getoption("rpc_record")) is not None:
+        cassette = Cassette()
+        yield cassette
+        cassette.save(record_path)
+    else:
+        yield None
+
+
 @pytest.fixture(autouse=True, scope="session")
-def eth_rpc(request, rpc_endpoint: str) -> EthRPC:
+def eth_rpc(
+    request, rpc_endpoint: str, rpc_cassette: Cassette | None
+) -> Generator[EthRPC, None, None]:
     """Initialize ethereum RPC client for the execution client under test."""
     tx_wait_timeout = request.config.getoption("tx_wait_timeout")
-    return EthRPC(rpc_endpoint, transaction_wait_timeout=tx_wait_timeout)
+    eth_rpc = EthRPC(rpc_endpoint, transaction_wait_timeout=tx_wait_timeout)
+    if rpc_cassette is not None:
+        rpc_cassette.use(eth_rpc, replay=request.config.getoption("rpc_replay") is not None)
+    yield eth_rpc
+    eth_rpc.close()
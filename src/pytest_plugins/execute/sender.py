@@ -1,7 +1,7 @@
 """Sender mutex class that allows sending transactions one at a time."""
 
 from pathlib import Path
-from typing import Generator, Iterator
+from typing import Generator, Iterator, List
 
 import pytest
 from filelock import FileLock
@@ -11,6 +11,8 @@ from ethereum_test_base_types import Number, Wei
 from ethereum_test_rpc import EthRPC
 from ethereum_test_tools import EOA, Transaction
 
+from .nonce_manager import NonceManager
+
 
 def pytest_addoption(parser):
     """Add command-line options to pytest."""
@@ -47,6 +49,39 @@ def pytest_addoption(parser):
         help=("Gas limit set for the funding transactions of each worker's sender key."),
     )
 
+    sender_group.addoption(
+        "--sender-key-count",
+        action="store",
+        dest="sender_key_count",
+        type=int,
+        default=1,
+        help=(
+            "Number of sender keys of each worker, funded from the seed account in a single "
+            "batch. Tests are allocated to the sender keys in turn. Default=1"
+        ),
+    )
+
+
+class SenderPool:
+    """
+    Pool of the sender keys of a worker, each with its own nonce manager, from which every test
+    is allocated a sender key in turn.
+    """
+
+    nonce_managers: List[NonceManager]
+
+    def __init__(self, eth_rpc: EthRPC, senders: List[EOA]):
+        """Initialize the pool with a nonce manager per sender key."""
+        assert senders, "the sender pool requires at least one sender key"
+        self.nonce_managers = [NonceManager(eth_rpc, sender) for sender in senders]
+        self._allocations = 0
+
+    def allocate(self) -> NonceManager:
+        """Return the nonce manager of the sender key allocated to the next test."""
+        nonce_manager = self.nonce_managers[self._allocations % len(self.nonce_managers)]
+        self._allocations += 1
+        return nonce_manager
+
 
 @pytest.fixture(scope="session")
 def sender_funding_transactions_gas_price(
@@ -66,6 +101,14 @@ def sender_fund_refund_gas_limit(request: pytest.FixtureRequest) -> int:
     return request.config.option.sender_fund_refund_gas_limit
 
 
+@pytest.fixture(scope="session")
+def sender_key_count(request: pytest.FixtureRequest) -> int:
+    """Get the number of sender keys of each worker."""
+    sender_key_count = request.config.option.sender_key_count
+    assert sender_key_count > 0, "The number of sender keys must be greater than 0"
+    return sender_key_count
+
+
 @pytest.fixture(scope="session")
 def seed_account_sweep_amount(request: pytest.FixtureRequest) -> int | None:
     """Get the seed account sweep amount."""
@@ -78,6 +121,7 @@ def sender_key_initial_balance(
     eth_rpc: EthRPC,
     session_temp_folder: Path,
     worker_count: int,
+    sender_key_count: int,
     sender_funding_transactions_gas_price: int,
     sender_fund_refund_gas_limit: int,
     seed_account_sweep_amount: int | None,
@@ -86,7 +130,8 @@ def sender_key_initial_balance(
     Calculate the initial balance of each sender key.
 
     The way to do this is to fetch the seed sender balance and divide it by the number of
-    workers. This way we can ensure that each sender key has the same initial balance.
+    workers, and then by the number of sender keys of each worker. This way we can ensure that
+    each sender key has the same initial balance.
 
     We also only do this once per session, because if we try to fetch the balance again, it
     could be that another worker has already sent a transaction and the balance is different.
@@ -106,10 +151,12 @@ def sender_key_initial_balance(
         else:
             if seed_account_sweep_amount is None:
                 seed_account_sweep_amount = eth_rpc.get_balance(seed_sender)
-            seed_sender_balance_per_worker = seed_account_sweep_amount // worker_count
-            assert seed_sender_balance_per_worker > 100, "Seed sender balance too low"
+            seed_sender_balance_per_key = seed_account_sweep_amount // (
+                worker_count * sender_key_count
+            )
+            assert seed_sender_balance_per_key > 100, "Seed sender balance too low"
             # Subtract the cost of the transaction that is going to be sent to the seed sender
-            sender_key_initial_balance = seed_sender_balance_per_worker - (
+            sender_key_initial_balance = seed_sender_balance_per_key - (
                 sender_fund_refund_gas_limit * sender_funding_transactions_gas_price
             )
 
@@ -119,21 +166,22 @@ def sender_key_initial_balance(
 
 
 @pytest.fixture(scope="session")
-def sender_key(
+def sender_keys(
     request: pytest.FixtureRequest,
     seed_sender: EOA,
     sender_key_initial_balance: int,
+    sender_key_count: int,
     eoa_iterator: Iterator[EOA],
     eth_rpc: EthRPC,
     session_temp_folder: Path,
     sender_funding_transactions_gas_price: int,
     sender_fund_refund_gas_limit: int,
-) -> Generator[EOA, None, None]:
+) -> Generator[List[EOA], None, None]:
     """
-    Get the sender keys for all tests.
+    Get the sender keys of the worker, funded from the seed sender in a single batch.
 
     The seed sender is going to be shared among different processes, so we need to lock it
-    before we produce each funding transaction.
+    before we produce the funding transactions.
     """
     # For the seed sender we do need to keep track of the nonce because it is shared among
     # different processes, and there might not be a new block produced between the transactions.
@@ -142,34 +190,33 @@ def sender_key(
     seed_sender_nonce_file = session_temp_folder / seed_sender_nonce_file_name
     seed_sender_lock_file = session_temp_folder / seed_sender_lock_file_name
 
-    sender = next(eoa_iterator)
+    senders = [next(eoa_iterator) for _ in range(sender_key_count)]
 
-    # prepare funding transaction
+    # prepare funding transactions
     with FileLock(seed_sender_lock_file):
         if seed_sender_nonce_file.exists():
             with seed_sender_nonce_file.open("r") as f:
                 seed_sender.nonce = Number(f.read())
-        fund_tx = Transaction(
-            sender=seed_sender,
-            to=sender,
-            gas_limit=sender_fund_refund_gas_limit,
-            gas_price=sender_funding_transactions_gas_price,
-            value=sender_key_initial_balance,
-        ).with_signature_and_sender()
-        eth_rpc.send_transaction(fund_tx)
+        fund_txs = [
+            Transaction(
+                sender=seed_sender,
+                to=sender,
+                gas_limit=sender_fund_refund_gas_limit,
+                gas_price=sender_funding_transactions_gas_price,
+                value=sender_key_initial_balance,
+            ).with_signature_and_sender()
+            for sender in senders
+        ]
+        eth_rpc.send_transactions(fund_txs)
         with seed_sender_nonce_file.open("w") as f:
             f.write(str(seed_sender.nonce))
-    eth_rpc.wait_for_transaction(fund_tx)
+    eth_rpc.wait_for_transactions(fund_txs)
 
-    yield sender
+    yield senders
 
     # refund seed sender
-    remaining_balance = eth_rpc.get_balance(sender)
-    sender.nonce = Number(eth_rpc.get_transaction_count(sender))
-    used_balance = sender_key_initial_balance - remaining_balance
-    request.config.stash[metadata_key]["Senders"][str(sender)] = (
-        f"Used balance={used_balance / 10**18:.18f}"
-    )
+    remaining_balances = eth_rpc.get_balances(senders)
+    nonces = eth_rpc.get_transaction_counts(senders)
 
     refund_gas_limit = sender_fund_refund_gas_limit
     # double the gas price to ensure the transaction is included and overwrites any other
@@ -177,21 +224,47 @@ def sender_key(
     refund_gas_price = sender_funding_transactions_gas_price * 2
     tx_cost = refund_gas_limit * refund_gas_price
 
-    if (remaining_balance - 1) < tx_cost:
-        return
+    refund_txs = []
+    for sender, remaining_balance, nonce in zip(senders, remaining_balances, nonces, strict=True):
+        used_balance = sender_key_initial_balance - remaining_balance
+        request.config.stash[metadata_key]["Senders"][str(sender)] = (
+            f"Used balance={used_balance / 10**18:.18f}"
+        )
+        if (remaining_balance - 1) < tx_cost:
+            continue
+
+        # Update the nonce of the sender in case one of the pre-alloc transactions failed
+        sender.nonce = Number(nonce)
+
+        refund_txs.append(
+            Transaction(
+                sender=sender,
+                to=seed_sender,
+                gas_limit=refund_gas_limit,
+                gas_price=refund_gas_price,
+                value=remaining_balance - tx_cost - 1,
+            ).with_signature_and_sender()
+        )
+
+    eth_rpc.send_wait_transactions(refund_txs)
+
+
+@pytest.fixture(scope="session")
+def sender_pool(sender_keys: List[EOA], eth_rpc: EthRPC) -> SenderPool:
+    """Get the pool of sender keys from which each test is allocated a sender key."""
+    return SenderPool(eth_rpc, sender_keys)
+
 
-    # Update the nonce of the sender in case one of the pre-alloc transactions failed
-    sender.nonce = Number(eth_rpc.get_transaction_count(sender))
+@pytest.fixture(scope="function")
+def sender_nonce_manager(sender_pool: SenderPool) -> NonceManager:
+    """Get the nonce manager of the sender key allocated to the test."""
+    return sender_pool.allocate()
 
-    refund_tx = Transaction(
-        sender=sender,
-        to=seed_sender,
-        gas_limit=refund_gas_limit,
-        gas_price=refund_gas_price,
-        value=remaining_balance - tx_cost - 1,
-    ).with_signature_and_sender()
 
-    eth_rpc.send_wait_transaction(refund_tx)
+@pytest.fixture(scope="function")
+def sender_key(sender_nonce_manager: NonceManager) -> EOA:
+    """Get the sender key allocated to the test."""
+    return sender_nonce_manager.sender
 
 
 def pytest_sessionstart(session):
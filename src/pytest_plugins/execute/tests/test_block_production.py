@@ -0,0 +1,291 @@
+"""Test the coordination of the block production of `execute hive` across workers."""
+
+import os
+import re
+import socket
+import subprocess
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Collection, Dict, Generator, List, Set, Tuple
+
+import pytest
+
+from ethereum_test_base_types import Bytes, Hash, to_json
+from ethereum_test_forks import Cancun, Prague
+from ethereum_test_types.trie import keccak256
+
+from ...consume.simulators.helpers.engine_stand_in import EngineStandIn, EngineStandInServer
+from ...consume.tests.test_engine_stand_in import load_fixture
+from ..rpc.block_production import (
+    BlockBuilder,
+    BlockBuildLatency,
+    BlockProductionClient,
+    BlockProductionCoordinator,
+    start_block_production_coordinator,
+)
+
+
+class FakeChain:
+    """Chain whose blocks include every pending transaction, except the excluded ones."""
+
+    def __init__(self):
+        """Initialize the chain without blocks."""
+        self.pending: List[Hash] = []
+        self.excluded: Set[Hash] = set()
+        self.blocks: List[List[Hash]] = []
+        self.expected: List[List[Hash]] = []
+
+    def build_block(self, expected: Collection[Hash]) -> Tuple[List[Hash], BlockBuildLatency]:
+        """Include the pending transactions in a new block."""
+        self.expected.append(list(expected))
+        included = [tx_hash for tx_hash in self.pending if tx_hash not in self.excluded]
+        self.pending = [tx_hash for tx_hash in self.pending if tx_hash in self.excluded]
+        self.blocks.append(included)
+        return included, BlockBuildLatency(
+            block_number=len(self.blocks),
+            transaction_count=len(included),
+            get_payload_calls=1,
+            get_payload_wait=0.0,
+            build_time=0.0,
+        )
+
+
+@pytest.fixture
+def chain() -> FakeChain:
+    """Return the chain on which the blocks are built."""
+    return FakeChain()
+
+
+@pytest.fixture
+def coordinator(
+    chain: FakeChain, tmp_path: Path
+) -> Generator[Tuple[BlockProductionCoordinator, BlockProductionClient], None, None]:
+    """Serve a coordinator that builds blocks of two transactions on a unix socket."""
+    socket_path = tmp_path / "block_production.sock"
+    coordinator = BlockProductionCoordinator(
+        chain.build_block, transactions_per_block=2, max_block_delay=0.3
+    )
+    server = threading.Thread(target=coordinator.serve, args=(socket_path,), daemon=True)
+    server.start()
+    while not socket_path.exists():
+        time.sleep(0.01)
+    client = BlockProductionClient(socket_path)
+    yield coordinator, client
+    if not coordinator.stopped.is_set():
+        client.stop()
+    server.join(timeout=5)
+    assert not server.is_alive()
+
+
+def send(chain: FakeChain, client: BlockProductionClient, *tx_hashes: Hash) -> None:
+    """Send transactions to the chain and register them with the coordinator."""
+    chain.pending.extend(tx_hashes)
+    client.register(tx_hashes)
+
+
+def test_block_built_when_enough_transactions_are_pending(chain: FakeChain, coordinator):
+    """Test that a block is built as soon as `transactions_per_block` transactions are pending."""
+    _, client = coordinator
+    send(chain, client, Hash(1))
+    send(chain, client, Hash(2))
+    start = time.monotonic()
+    assert client.wait([Hash(1), Hash(2)], timeout=5) == set()
+    assert time.monotonic() - start < 0.3
+    assert chain.blocks == [[Hash(1), Hash(2)]]
+    assert [latency.transaction_count for latency in client.latencies()] == [2]
+
+
+def test_expected_transactions_fit_in_one_block(chain: FakeChain, coordinator):
+    """Test that a block is only expected to include `transactions_per_block` transactions."""
+    _, client = coordinator
+    send(chain, client, Hash(1), Hash(2), Hash(3))
+    assert client.wait([Hash(1), Hash(2), Hash(3)], timeout=5) == set()
+    assert chain.expected == [[Hash(1), Hash(2)]]
+
+
+def test_block_built_after_max_block_delay(chain: FakeChain, coordinator):
+    """Test that a single pending transaction is included after the maximum block delay."""
+    _, client = coordinator
+    start = time.monotonic()
+    send(chain, client, Hash(1))
+    assert client.wait([Hash(1)], timeout=5) == set()
+    assert time.monotonic() - start >= 0.3
+    assert chain.blocks == [[Hash(1)]]
+
+
+def test_wait_returns_transactions_never_included(chain: FakeChain, coordinator):
+    """Test that the transactions not included before the timeout are returned."""
+    coordinator, client = coordinator
+    chain.excluded.add(Hash(2))
+    send(chain, client, Hash(1), Hash(2))
+    assert client.wait([Hash(1), Hash(2)], timeout=1) == {Hash(2)}
+    # The excluded transaction doesn't trigger a block per loop of the coordinator.
+    assert len(chain.blocks) <= 4
+    assert not coordinator.pending
+
+
+def test_build_errors_are_reported_to_the_workers(chain: FakeChain, coordinator):
+    """Test that the workers waiting for transactions see the errors of the block building."""
+    coordinator, client = coordinator
+
+    def build_block(expected: Collection[Hash]) -> Tuple[List[Hash], BlockBuildLatency]:
+        raise Exception("payload was invalid")
+
+    coordinator.build_block = build_block
+    send(chain, client, Hash(1), Hash(2))
+    with pytest.raises(Exception, match="payload was invalid"):
+        client.wait([Hash(1), Hash(2)], timeout=5)
+
+
+def test_stop(coordinator):
+    """Test that stopping the coordinator stops producing blocks and serving requests."""
+    coordinator, client = coordinator
+    client.stop()
+    assert coordinator.stopped.is_set()
+    with pytest.raises(OSError):
+        client.register([Hash(1)])
+
+
+def test_coordinator_stops_when_the_session_exits(chain: FakeChain, tmp_path: Path):
+    """Test that the coordinator stops by itself once the main process of the session exits."""
+    socket_path = tmp_path / "block_production.sock"
+    # Left behind by a coordinator that was killed.
+    with socket.socket(socket.AF_UNIX) as stale_socket:
+        stale_socket.bind(str(socket_path))
+    assert not BlockProductionClient(socket_path).alive()
+    session = subprocess.Popen(["sleep", "60"])
+    coordinator = BlockProductionCoordinator(chain.build_block, transactions_per_block=2)
+    server = threading.Thread(
+        target=coordinator.serve, args=(socket_path,), kwargs={"session_pid": session.pid}
+    )
+    server.start()
+    client = BlockProductionClient(socket_path)
+    while not client.alive():
+        time.sleep(0.01)
+    session.kill()
+    session.wait()
+    server.join(timeout=5)
+    assert not server.is_alive()
+    assert coordinator.stopped.is_set()
+
+
+class FakeEngineRPC:
+    """Engine RPC whose payload includes one more transaction on every `engine_getPayload`."""
+
+    def __init__(self, transactions: List[bytes]):
+        """Initialize the engine with the transactions of the transaction pool."""
+        self.transactions = transactions
+        self.get_payload_calls = 0
+
+    def get_payload(self, payload_id: Bytes, *, version: int):
+        """Return the payload built so far."""
+        self.get_payload_calls += 1
+        return SimpleNamespace(
+            execution_payload=SimpleNamespace(
+                transactions=self.transactions[: self.get_payload_calls]
+            )
+        )
+
+
+def payload_builder(engine_rpc: FakeEngineRPC, get_payload_wait_time: float) -> BlockBuilder:
+    """Return a block builder that polls the payloads of the fake engine."""
+    return BlockBuilder(
+        eth_rpc=None,  # type: ignore[arg-type]
+        engine_rpc=engine_rpc,  # type: ignore[arg-type]
+        fork=Prague,
+        get_payload_wait_time=get_payload_wait_time,
+        get_payload_initial_interval=0.01,
+    )
+
+
+def test_payload_polled_until_expected_transactions_are_included():
+    """Test that the payload is returned as soon as it includes the expected transactions."""
+    transactions = [bytes([i]) for i in range(3)]
+    engine_rpc = FakeEngineRPC(transactions)
+    start = time.monotonic()
+    payload, calls = payload_builder(engine_rpc, 5).wait_for_payload(
+        Bytes(b"\x01"), [Hash(keccak256(tx)) for tx in transactions]
+    )
+    # 0.01s, 0.02s and 0.04s of backoff, far from the maximum wait time.
+    assert time.monotonic() - start < 1
+    assert calls == 3
+    assert payload.execution_payload.transactions == transactions
+
+
+def test_payload_returned_once_it_stops_changing():
+    """Test that the payload is returned once two polls include the same transactions."""
+    engine_rpc = FakeEngineRPC([b"\x00"])
+    start = time.monotonic()
+    payload, calls = payload_builder(engine_rpc, 5).wait_for_payload(Bytes(b"\x01"), [Hash(1)])
+    assert time.monotonic() - start < 1
+    assert calls == 2
+    assert payload.execution_payload.transactions == [b"\x00"]
+
+
+def test_payload_returned_after_max_wait_time():
+    """Test that an empty payload is returned after the maximum wait."""
+    engine_rpc = FakeEngineRPC([])
+    start = time.monotonic()
+    payload, _ = payload_builder(engine_rpc, 0.2).wait_for_payload(Bytes(b"\x01"), [Hash(1)])
+    assert 0.2 <= time.monotonic() - start < 1
+    assert payload.execution_payload.transactions == []
+
+
+class BlockBuildingStandIn(EngineStandIn):
+    """Engine stand-in that builds the first payload of the loaded fixture on request."""
+
+    def call(self, method: str, params: List[Any]) -> Any:
+        """Reply to `engine_getPayloadVX` with the first payload of the fixture."""
+        if re.fullmatch(r"engine_getPayloadV\d+", method):
+            assert self.fixture is not None
+            return {
+                "executionPayload": to_json(self.fixture.payloads[0].params[0]),
+                "blobsBundle": {"commitments": [], "proofs": [], "blobs": []},
+            }
+        return super().call(method, params)
+
+    def forkchoice_updated(self, params: List[Any]) -> Dict[str, Any]:
+        """Return a payload ID when payload attributes are given."""
+        response = super().forkchoice_updated(params)
+        if len(params) > 1 and params[1] is not None:
+            response["payloadId"] = "0x0000000000000001"
+        return response
+
+
+def test_coordinator_process(tmp_path: Path):
+    """Test the coordinator started in its own process, as by `execute hive`."""
+    fixture = load_fixture("chainid_cancun_blockchain_test_engine_tx_type_0.json")
+    server = EngineStandInServer()
+    server.stand_in = BlockBuildingStandIn()
+    server.stand_in.load_fixture(fixture)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    socket_path = tmp_path / "block_production.sock"
+    try:
+        client = start_block_production_coordinator(
+            socket_path=socket_path,
+            eth_rpc_url=server.url,
+            engine_rpc_url=server.url,
+            fork=Cancun,
+            transactions_per_block=1,
+            max_block_delay=0.1,
+            get_payload_wait_time=1.0,
+            session_pid=os.getpid(),
+        )
+        try:
+            tx_hashes = [Hash(keccak256(tx)) for tx in fixture.payloads[0].params[0].transactions]
+            client.register(tx_hashes)
+            assert client.wait(tx_hashes, timeout=10) == set()
+            latencies = client.latencies()
+        finally:
+            client.stop()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert [(latency.block_number, latency.transaction_count) for latency in latencies] == [
+        (1, len(tx_hashes))
+    ]
+    with pytest.raises(OSError):
+        client.register([Hash(1)])
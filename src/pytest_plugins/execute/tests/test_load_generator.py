@@ -0,0 +1,177 @@
+"""Test the load generator that replays the transactions of a test against a live node."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Set
+
+import pytest
+
+from ethereum_test_base_types import Bytes, Hash
+from ethereum_test_tools import EOA, Transaction
+from ethereum_test_types.trie import keccak256
+
+from ..load_generator import LoadGenerator, LoadReport
+
+CHAIN_ID = 7
+PENDING_NONCE = 5
+
+
+class FakeEthRPC:
+    """Client double that includes all the received transactions in a block on every poll."""
+
+    def __init__(self) -> None:
+        """Initialize a chain without blocks."""
+        self.sent: List[str] = []
+        self.reject_calls: Set[int] = set()
+        self.pool: List[Hash] = []
+        self.blocks: List[List[Hash]] = []
+        self.balance = 10**18
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def batch(self):
+        """Accept the raw transactions, except the rejected calls."""
+        sent = self.sent
+        reject_calls = self.reject_calls
+        pool = self.pool
+        lock = self.lock
+
+        class Result:
+            def __init__(self, rejected: bool):
+                self.rejected = rejected
+
+            def result(self):
+                if self.rejected:
+                    raise Exception("nonce too low")
+
+        class Batch:
+            def call(self, method: str, rlp: str) -> Result:
+                sent.append(rlp)
+                rejected = len(sent) in reject_calls
+                if not rejected:
+                    with lock:
+                        pool.append(Hash(keccak256(Bytes(rlp))))
+                return Result(rejected)
+
+        yield Batch()
+
+    def get_transaction_counts(self, addresses, block_number="latest") -> List[int]:
+        """Return the same pending nonce for every sender."""
+        assert block_number == "pending"
+        return [PENDING_NONCE] * len(addresses)
+
+    def get_balances(self, addresses, block_number="latest") -> List[int]:
+        """Return the same balance for every sender."""
+        assert block_number == "pending"
+        return [self.balance] * len(addresses)
+
+    def block_number(self) -> int:
+        """Include the pooled transactions in a new block, if any, and return the head."""
+        with self.lock:
+            if self.pool:
+                self.blocks.append(self.pool[:])
+                self.pool.clear()
+            return len(self.blocks)
+
+    def get_blocks_by_number(self, numbers, full_txs: bool = True) -> List[Dict]:
+        """Return the transaction hashes of the blocks."""
+        assert not full_txs
+        return [
+            {
+                "transactions": [str(tx_hash) for tx_hash in self.blocks[number - 1]],
+                # The blocks also include the transactions of other senders.
+                "gasUsed": hex(1_000_000 + 21_000 * len(self.blocks[number - 1])),
+            }
+            for number in numbers
+        ]
+
+    def post_batch(self, calls) -> List[Dict]:
+        """Return the receipts of the transactions."""
+        assert all(method == "getTransactionReceipt" for method, _ in calls)
+        return [{"gasUsed": hex(21_000)} for _ in calls]
+
+
+@pytest.fixture
+def eth_rpc() -> FakeEthRPC:
+    """Return the client double."""
+    return FakeEthRPC()
+
+
+@pytest.fixture
+def transactions() -> List[Transaction]:
+    """Return two unsigned transfers of the same sender, as in the blocks of a test."""
+    sender = EOA(key=1)
+    return [Transaction(sender=sender, to=EOA(key=2), gas_limit=100_000) for _ in range(2)]
+
+
+def resigned(transaction: Transaction, nonce: int) -> str:
+    """Return the raw transaction that the generator sends for a replay with the given nonce."""
+    return transaction.copy(nonce=nonce, chain_id=CHAIN_ID).with_signature_and_sender().rlp().hex()
+
+
+def generator(eth_rpc: FakeEthRPC, **kwargs) -> LoadGenerator:
+    """Return a load generator of the client double."""
+    kwargs.setdefault("inclusion_timeout", 5)
+    return LoadGenerator(eth_rpc, chain_id=CHAIN_ID, tick=0.01, **kwargs)  # type: ignore[arg-type]
+
+
+def test_replayed_transactions_are_resigned_with_the_next_nonces(
+    eth_rpc: FakeEthRPC, transactions: List[Transaction]
+):
+    """Test that every replay re-signs the transactions for the chain with the next nonces."""
+    report = generator(eth_rpc, duration=0.05).run([transactions])
+    assert eth_rpc.sent[:4] == [
+        resigned(transactions[0], PENDING_NONCE),
+        resigned(transactions[1], PENDING_NONCE + 1),
+        resigned(transactions[0], PENDING_NONCE + 2),
+        resigned(transactions[1], PENDING_NONCE + 3),
+    ]
+    assert report.sent == len(eth_rpc.sent)
+    assert report.included == report.sent
+    assert report.error_rate == 0
+    assert len(report.latencies) == report.included
+    assert report.gas_used == 21_000 * report.included
+    assert report.mgas_per_second > 0
+
+
+def test_transaction_rate(eth_rpc: FakeEthRPC, transactions: List[Transaction]):
+    """Test that the transactions are paced to the target rate."""
+    report = generator(eth_rpc, duration=0.5, transactions_per_second=40).run([transactions])
+    assert 15 <= report.sent <= 25
+
+
+def test_gas_rate(eth_rpc: FakeEthRPC, transactions: List[Transaction]):
+    """Test that the transactions are paced to the target gas rate, by their gas limit."""
+    report = generator(eth_rpc, duration=0.5, gas_per_second=2_000_000).run([transactions])
+    assert 7 <= report.sent <= 13
+
+
+def test_rejected_transaction_nonce_is_reused(
+    eth_rpc: FakeEthRPC, transactions: List[Transaction]
+):
+    """Test that the nonce of a rejected transaction is used by the next replay."""
+    eth_rpc.reject_calls.add(1)
+    report = generator(eth_rpc, duration=0.05).run([transactions])
+    assert eth_rpc.sent[2] == resigned(transactions[0], PENDING_NONCE)
+    assert report.send_errors == 1
+    assert report.error_rate == 1 / report.attempted
+
+
+def test_generator_stops_when_senders_run_out_of_funds(
+    eth_rpc: FakeEthRPC, transactions: List[Transaction]
+):
+    """Test that no transaction is sent once its sender can no longer pay for it."""
+    # Enough for five transactions of 100,000 gas at the default gas price of 10 wei.
+    eth_rpc.balance = 5_000_000
+    report = generator(eth_rpc, duration=5).run([transactions])
+    assert report.sent == 5
+    assert report.out_of_funds
+    assert report.duration < 5
+
+
+def test_latency_percentiles():
+    """Test the inclusion latency percentiles of the report."""
+    report = LoadReport(latencies=[float(latency) for latency in range(100, 0, -1)])
+    assert report.latency_percentile(50) == 50.5
+    assert report.latency_percentile(99) == pytest.approx(99.01)
+    assert LoadReport().latency_percentile(50) is None
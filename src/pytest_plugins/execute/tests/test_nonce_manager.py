@@ -0,0 +1,118 @@
+"""Test the nonce manager that pipelines the pre-allocation transactions."""
+
+from typing import Dict, List
+
+import pytest
+
+from ethereum_test_base_types import Hash
+from ethereum_test_tools import EOA, Transaction
+
+from ..nonce_manager import NonceManager
+
+
+class FakeEthRPC:
+    """Client double whose transaction pool can drop transactions."""
+
+    def __init__(self) -> None:
+        """Initialize an empty transaction pool."""
+        self.pool: Dict[int, Transaction] = {}
+        self.included_nonce = 0
+        self.sent_batches: List[List[int]] = []
+        self.waits = 0
+        self.drop_nonces: set[int] = set()
+
+    def send_transactions(
+        self, transactions: List[Transaction], *, ignore_errors: bool = False
+    ) -> List[Hash]:
+        """Add the transactions to the pool, dropping the ones marked as such."""
+        self.sent_batches.append([int(tx.nonce) for tx in transactions])
+        for tx in transactions:
+            if int(tx.nonce) in self.pool and not ignore_errors:
+                raise Exception("already known")
+            if int(tx.nonce) in self.drop_nonces:
+                self.drop_nonces.remove(int(tx.nonce))
+            else:
+                self.pool[int(tx.nonce)] = tx
+        return [tx.hash for tx in transactions]
+
+    def get_transaction_count(self, address, block_number="latest") -> int:
+        """Return the next nonce after the contiguous pooled transactions."""
+        nonce = self.included_nonce
+        while nonce in self.pool:
+            nonce += 1
+        return nonce
+
+    def wait_for_transactions(self, transactions: List[Transaction]):
+        """Include the pooled transactions, failing if any of the transactions is missing."""
+        self.waits += 1
+        missing = [tx for tx in transactions if int(tx.nonce) not in self.pool]
+        if missing:
+            raise Exception("not included in a block")
+        self.included_nonce = max(self.pool) + 1
+        return [tx.hash for tx in transactions]
+
+
+@pytest.fixture
+def eth_rpc() -> FakeEthRPC:
+    """Return the client double."""
+    return FakeEthRPC()
+
+
+@pytest.fixture
+def nonce_manager(eth_rpc: FakeEthRPC) -> NonceManager:
+    """Return the nonce manager of a fresh sender."""
+    return NonceManager(eth_rpc, EOA(key=1))  # type: ignore[arg-type]
+
+
+def sign_transactions(nonce_manager: NonceManager, count: int) -> List[Transaction]:
+    """Sign `count` transfers of the managed sender."""
+    return [nonce_manager.sign(Transaction(sender=nonce_manager.sender)) for _ in range(count)]
+
+
+def test_transactions_are_submitted_in_one_batch(eth_rpc: FakeEthRPC, nonce_manager: NonceManager):
+    """Test that signed transactions get consecutive nonces and are sent back-to-back."""
+    transactions = sign_transactions(nonce_manager, 5)
+    assert [int(tx.nonce) for tx in transactions] == list(range(5))
+    assert not eth_rpc.sent_batches
+    assert nonce_manager.wait_for_transactions() == [tx.hash for tx in transactions]
+    assert eth_rpc.sent_batches == [list(range(5))]
+    assert eth_rpc.waits == 1
+    assert not nonce_manager.outstanding
+
+    sign_transactions(nonce_manager, 2)
+    nonce_manager.wait_for_transactions()
+    assert eth_rpc.sent_batches[-1] == [5, 6]
+
+
+def test_dropped_transactions_are_resubmitted(eth_rpc: FakeEthRPC, nonce_manager: NonceManager):
+    """Test that the transactions from the first nonce gap onwards are resubmitted."""
+    eth_rpc.drop_nonces = {2}
+    transactions = sign_transactions(nonce_manager, 4)
+    assert nonce_manager.wait_for_transactions() == [tx.hash for tx in transactions]
+    assert eth_rpc.sent_batches == [[0, 1, 2, 3], [2, 3]]
+    assert eth_rpc.waits == 1
+
+
+def test_wait_fails_without_dropped_transactions(
+    eth_rpc: FakeEthRPC, nonce_manager: NonceManager, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that a timeout is raised when the transactions are pending but never included."""
+    sign_transactions(nonce_manager, 2)
+
+    def never_included(transactions):
+        raise Exception("not included in a block")
+
+    monkeypatch.setattr(eth_rpc, "wait_for_transactions", never_included)
+    with pytest.raises(Exception, match="not included"):
+        nonce_manager.wait_for_transactions()
+    assert len(eth_rpc.sent_batches) == 1
+
+
+def test_reset_resynchronizes_the_nonce(eth_rpc: FakeEthRPC, nonce_manager: NonceManager):
+    """Test that queued transactions of an aborted test don't leave a nonce gap."""
+    sign_transactions(nonce_manager, 3)
+    nonce_manager.reset()
+    assert not nonce_manager.queued
+    assert nonce_manager.sender.nonce == 0
+    transactions = sign_transactions(nonce_manager, 1)
+    assert int(transactions[0].nonce) == 0
@@ -0,0 +1,13 @@
+"""Test the allocation of the sender keys of a worker to the tests."""
+
+from ethereum_test_tools import EOA
+
+from ..sender import SenderPool
+
+
+def test_round_robin_allocation():
+    """Test that the tests are allocated to the sender keys in turn."""
+    # The allocation never reaches the client.
+    pool = SenderPool(None, [EOA(key=i) for i in range(1, 4)])  # type: ignore[arg-type]
+    allocated = [pool.nonce_managers.index(pool.allocate()) for _ in range(7)]
+    assert allocated == [0, 1, 2, 0, 1, 2, 0]
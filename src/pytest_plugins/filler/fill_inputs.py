@@ -0,0 +1,180 @@
+"""
+Recording of the inputs used to fill the Engine X fixtures of the tests.
+
+With `--record-fill-inputs`, phase 1 (`--generate-pre-alloc-groups`) saves, in the metadata
+folder of the output, everything that phase 2 needs to generate the fixture of each test: the
+test specification, its fork, the hash of its pre-allocation group and the information added to
+the fixture. Phase 2, with `--replay-fill-inputs`, then generates the fixtures from these records
+group by group, without collecting the tests or running their functions again. The tests skipped
+in phase 1 are recorded too, to be reported as skipped by phase 2.
+
+Each process writes its records to its own file as a sequence of pickles, read back one record
+at a time.
+"""
+
+import copyreg
+import io
+import pickle
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, FrozenSet, Iterator, Tuple, Type
+
+import pytest
+
+from ethereum_test_base_types import ReferenceSpec
+from ethereum_test_fixtures import TestInfo
+from ethereum_test_forks import Fork, get_forks, get_transition_forks
+from ethereum_test_forks.base_fork import BaseForkMeta
+from ethereum_test_specs import BaseTest
+
+FILL_INPUTS_FOLDER = "fill_inputs"
+
+
+def fork_by_name(name: str) -> Fork:
+    """Return the fork, or transition fork, with the given name."""
+    for fork in [*get_forks(), *get_transition_forks()]:
+        if fork.name() == name:
+            return fork
+    raise ValueError(f"Unknown fork: {name}")
+
+
+def reduce_fork(fork: BaseForkMeta) -> Tuple[Callable[[str], Fork], Tuple[str]]:
+    """Reduce a fork to its name, as transition forks are not importable classes."""
+    return fork_by_name, (fork.name(),)
+
+
+class FillInputPickler(pickle.Pickler):
+    """Pickler saving the forks by name."""
+
+    dispatch_table = {**copyreg.dispatch_table, BaseForkMeta: reduce_fork}
+
+
+@dataclass(frozen=True)
+class RecordedNode:
+    """The parts of the pytest node of a test used by its specification to fill it."""
+
+    nodeid: str
+    marker_names: FrozenSet[str]
+
+    def get_closest_marker(self, name: str) -> str | None:
+        """Return the name of the marker if the test has it, None otherwise."""
+        return name if name in self.marker_names else None
+
+
+@dataclass(frozen=True)
+class RecordedRequest:
+    """Stands for the pytest request of a test when its fixture is filled from its record."""
+
+    node: RecordedNode
+
+
+@dataclass(kw_only=True)
+class FillInput:
+    """Inputs used to generate the Engine X fixture of a test in phase 2."""
+
+    test_info: TestInfo
+    node: RecordedNode
+    spec: BaseTest
+    fork: Fork
+    pre_alloc_hash: str
+    test_case_description: str
+    fixture_source_url: str
+    reference_spec: ReferenceSpec | None
+
+    @classmethod
+    def from_request(
+        cls,
+        request: pytest.FixtureRequest,
+        *,
+        test_info: TestInfo,
+        spec: BaseTest,
+        spec_type: Type[BaseTest],
+        fork: Fork,
+        pre_alloc_hash: str,
+        test_case_description: str,
+        fixture_source_url: str,
+        reference_spec: ReferenceSpec | None,
+    ) -> "FillInput":
+        """
+        Record the inputs of a test from its specification, rebuilt as an instance of the
+        specification type without its pre-allocation, replaced by the one of its group in phase
+        2.
+        """
+        return cls(
+            test_info=test_info,
+            node=RecordedNode(
+                nodeid=request.node.nodeid,
+                marker_names=frozenset(marker.name for marker in request.node.iter_markers()),
+            ),
+            spec=spec_type.model_construct(
+                _fields_set=spec.model_fields_set - {"pre"},
+                **{name: value for name, value in spec if name != "pre"},
+            ),
+            fork=fork,
+            pre_alloc_hash=pre_alloc_hash,
+            test_case_description=test_case_description,
+            fixture_source_url=fixture_source_url,
+            reference_spec=reference_spec,
+        )
+
+    def get_spec(self) -> BaseTest:
+        """Return the specification of the test, with its pytest request replaced by the record."""
+        self.spec._request = RecordedRequest(node=self.node)  # type: ignore[assignment]
+        return self.spec
+
+
+@dataclass(kw_only=True)
+class SkippedFillInput:
+    """A test skipped in phase 1, reported as skipped by phase 2 without filling its fixture."""
+
+    test_info: TestInfo
+    reason: str
+
+
+class FillInputRecorder:
+    """Appends the inputs of the tests filled by a process to the file of the process."""
+
+    file: IO[bytes] | None
+
+    def __init__(self, folder: Path, worker_id: str):
+        """Initialize the recorder; the file is created with the first record."""
+        self.path = folder / f"{worker_id}.pickle"
+        self.file = None
+
+    def record(self, fill_input: FillInput | SkippedFillInput) -> None:
+        """Append the inputs of a test to the file."""
+        data = io.BytesIO()
+        try:
+            FillInputPickler(data, protocol=pickle.HIGHEST_PROTOCOL).dump(fill_input)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise TypeError(
+                f"The inputs of {fill_input.test_info.id} cannot be recorded ({e}), fill the "
+                "tests without --replay-fill-inputs."
+            ) from e
+        if self.file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, "ab")
+        self.file.write(data.getbuffer())
+
+    def close(self) -> None:
+        """Close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def load_fill_inputs(folder: Path) -> Iterator[FillInput | SkippedFillInput]:
+    """Return an iterator over the inputs recorded by all the processes."""
+    for path in sorted(folder.glob("*.pickle")):
+        with open(path, "rb") as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    break
+
+
+def remove_fill_inputs(folder: Path) -> None:
+    """Remove the recorded inputs."""
+    shutil.rmtree(folder, ignore_errors=True)
@@ -7,15 +7,21 @@ writes the generated fixtures to file.
 """
 
 import configparser
+import contextlib
 import datetime
+import multiprocessing.util
 import os
+import traceback
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.reduction import ForkingPickler
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Type
+from typing import Any, Dict, Generator, Iterator, List, Literal, Tuple, Type
 
 import pytest
 import xdist
 from _pytest.compat import NotSetType
+from _pytest.outcomes import Skipped
 from _pytest.terminal import TerminalReporter
 from pytest_metadata.plugin import metadata_key  # type: ignore
 
@@ -30,11 +36,13 @@ from ethereum_test_fixtures import (
     FixtureCollector,
     FixtureConsumer,
     LabeledFixtureFormat,
+    LazyPreAllocGroups,
     PreAllocGroup,
     PreAllocGroups,
     TestInfo,
 )
 from ethereum_test_forks import Fork, get_transition_fork_predecessor, get_transition_forks
+from ethereum_test_forks.base_fork import BaseForkMeta
 from ethereum_test_specs import BaseTest
 from ethereum_test_tools.utility.versioning import (
     generate_github_url,
@@ -48,9 +56,36 @@ from ..shared.helpers import (
     labeled_format_parameter_set,
 )
 from ..spec_version_checker.spec_version_checker import get_ref_spec_from_module
+from .fill_inputs import (
+    FillInput,
+    FillInputRecorder,
+    SkippedFillInput,
+    load_fill_inputs,
+    reduce_fork,
+    remove_fill_inputs,
+)
 from .fixture_output import FixtureOutput
 
 
+def account_changed(genesis_account: Account | None, post_account: Account | None) -> bool:
+    """
+    Return True if the account is not the same after the test execution.
+
+    The fields are compared from the cheapest to the most expensive one, so that the storage of
+    an account is only compared if its nonce, balance and code did not change.
+    """
+    if genesis_account is post_account:
+        return False
+    if genesis_account is None or post_account is None:
+        return True
+    return (
+        genesis_account.nonce != post_account.nonce
+        or genesis_account.balance != post_account.balance
+        or genesis_account.code != post_account.code
+        or genesis_account.storage.root != post_account.storage.root
+    )
+
+
 def calculate_post_state_diff(post_state: Alloc, genesis_state: Alloc) -> Alloc:
     """
     Calculate the state difference between post_state and genesis_state.
@@ -64,6 +99,12 @@ def calculate_post_state_diff(post_state: Alloc, genesis_state: Alloc) -> Alloc:
     - Were created during test execution (new accounts)
     - Were deleted during test execution (represented as None)
 
+    The transition tool returns the whole post-state, so the accounts it touched are found in a
+    single pass over the post-state, looking up each account in the genesis state once and
+    comparing the fields of both accounts (see `account_changed`) instead of the account models.
+    The genesis state is only searched for deleted accounts if some of its accounts were not
+    found in the post-state.
+
     Args:
         post_state: Final state after test execution
         genesis_state: Genesis pre-allocation state
@@ -73,29 +114,35 @@ def calculate_post_state_diff(post_state: Alloc, genesis_state: Alloc) -> Alloc:
 
     """
     diff: Dict[Address, Account | None] = {}
+    genesis_accounts = genesis_state.root
+    post_accounts = post_state.root
+
+    found = 0
+    for address, post_account in post_accounts.items():
+        genesis_account = genesis_accounts.get(address)
+        if genesis_account is not None:
+            found += 1
+        if account_changed(genesis_account, post_account):
+            diff[address] = post_account
 
-    # Find all addresses that exist in either state
-    all_addresses = set(post_state.root.keys()) | set(genesis_state.root.keys())
-
-    for address in all_addresses:
-        genesis_account = genesis_state.root.get(address)
-        post_account = post_state.root.get(address)
-
-        # Account was deleted (exists in genesis but not in post)
-        if genesis_account is not None and post_account is None:
-            diff[address] = None
+    if found < len(genesis_accounts):
+        # Some accounts of the genesis state are missing from the post-state.
+        for address, genesis_account in genesis_accounts.items():
+            if genesis_account is not None and address not in post_accounts:
+                diff[address] = None
 
-        # Account was created (doesn't exist in genesis but exists in post)
-        elif genesis_account is None and post_account is not None:
-            diff[address] = post_account
+    return Alloc(diff)
 
-        # Account was modified (exists in both but different)
-        elif genesis_account != post_account:
-            diff[address] = post_account
 
-        # Account unchanged - don't include in diff
+def set_pre_alloc_group(fixture: BaseFixture, pre_alloc_hash: str, group: PreAllocGroup) -> None:
+    """Set the pre-allocation group of an Engine X fixture and the diff of its post-state."""
+    fixture.pre_hash = pre_alloc_hash  # type: ignore[attr-defined]
 
-    return Alloc(diff)
+    # Calculate state diff for efficiency
+    if isinstance(fixture, BlockchainEngineXFixture) and fixture.post_state is not None:
+        fixture.post_state_diff = calculate_post_state_diff(fixture.post_state, group.pre)
+        # Only the diff is saved, release the full post-state of the fixture.
+        fixture.post_state = None
 
 
 def default_output_directory() -> str:
@@ -255,6 +302,72 @@ def pytest_addoption(parser: pytest.Parser):
         default=False,
         help="Fill tests using existing pre-allocation groups (phase 2 only).",
     )
+    test_group.addoption(
+        "--max-pre-alloc-group-accounts",
+        action="store",
+        dest="max_pre_alloc_group_accounts",
+        type=int,
+        default=None,
+        help=(
+            "Split the pre-allocation groups with more accounts into sub-groups at the end of "
+            "phase 1, assigning the tests deterministically by their ids."
+        ),
+    )
+    test_group.addoption(
+        "--max-pre-alloc-group-bytes",
+        action="store",
+        dest="max_pre_alloc_group_bytes",
+        type=int,
+        default=None,
+        help=(
+            "Split the pre-allocation groups whose accounts take more bytes of JSON into "
+            "sub-groups at the end of phase 1, assigning the tests deterministically by their ids."
+        ),
+    )
+    test_group.addoption(
+        "--max-loaded-pre-alloc-groups",
+        action="store",
+        dest="max_loaded_pre_alloc_groups",
+        type=int,
+        default=16,
+        help=(
+            "Maximum number of pre-allocation groups kept in memory, in compact form, by each "
+            "process in phase 2, the least recently used ones being loaded again when needed "
+            "(default: 16)."
+        ),
+    )
+    test_group.addoption(
+        "--pre-alloc-groups-cache",
+        action="store",
+        dest="pre_alloc_groups_cache",
+        type=Path,
+        default=None,
+        help=(
+            "Folder where the pre-allocation groups are cached in a pre-serialized form in "
+            "phase 2, so that the xdist workers load them faster than their JSON files. Each "
+            "worker still keeps its own copy of the groups it loaded."
+        ),
+    )
+    test_group.addoption(
+        "--record-fill-inputs",
+        action="store_true",
+        dest="record_fill_inputs",
+        default=False,
+        help=(
+            "Record the inputs used to fill the fixture of each test in phase 1, so that phase 2 "
+            "can fill them with --replay-fill-inputs."
+        ),
+    )
+    test_group.addoption(
+        "--replay-fill-inputs",
+        action="store_true",
+        dest="replay_fill_inputs",
+        default=False,
+        help=(
+            "Fill the fixtures of phase 2 from the inputs recorded in phase 1, group by group, "
+            "without collecting or running the tests again."
+        ),
+    )
 
     debug_group = parser.getgroup("debug", "Arguments defining debug behavior")
     debug_group.addoption(
@@ -288,13 +401,21 @@ def pytest_sessionstart(session: pytest.Session):
     # Initialize empty pre-allocation groups container for phase 1
     if session.config.getoption("generate_pre_alloc_groups"):
         session.config.pre_alloc_groups = PreAllocGroups(root={})  # type: ignore[attr-defined]
+        if session.config.getoption("record_fill_inputs"):
+            session.config.fill_input_recorder = FillInputRecorder(  # type: ignore[attr-defined]
+                session.config.fixture_output.fill_inputs_folder_path,  # type: ignore[attr-defined]
+                getattr(session.config, "workerinput", {}).get("workerid", "master"),
+            )
 
     # Load the pre-allocation groups for phase 2
     if session.config.getoption("use_pre_alloc_groups"):
         pre_alloc_groups_folder = session.config.fixture_output.pre_alloc_groups_folder_path  # type: ignore[attr-defined]
         if pre_alloc_groups_folder.exists():
-            session.config.pre_alloc_groups = PreAllocGroups.from_folder(  # type: ignore[attr-defined]
-                pre_alloc_groups_folder
+            # Each group is loaded when a test first needs it.
+            session.config.pre_alloc_groups = LazyPreAllocGroups(  # type: ignore[attr-defined]
+                pre_alloc_groups_folder,
+                max_loaded=session.config.getoption("max_loaded_pre_alloc_groups"),
+                cache_folder=session.config.getoption("pre_alloc_groups_cache"),
             )
         else:
             pytest.exit(
@@ -302,6 +423,13 @@ def pytest_sessionstart(session: pytest.Session):
                 "Run phase 1 with --generate-pre-alloc-groups first.",
                 returncode=pytest.ExitCode.USAGE_ERROR,
             )
+        fill_inputs_folder = session.config.fixture_output.fill_inputs_folder_path  # type: ignore[attr-defined]
+        if session.config.getoption("replay_fill_inputs") and not fill_inputs_folder.exists():
+            pytest.exit(
+                f"Recorded fill inputs not found: {fill_inputs_folder}. "
+                "Run phase 1 with --generate-pre-alloc-groups --record-fill-inputs first.",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -336,6 +464,32 @@ def pytest_configure(config):
     except ValueError as e:
         pytest.exit(str(e), returncode=pytest.ExitCode.USAGE_ERROR)
 
+    if config.getoption("record_fill_inputs"):
+        if not config.getoption("generate_pre_alloc_groups"):
+            pytest.exit(
+                "--record-fill-inputs requires --generate-pre-alloc-groups.",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
+        if not hasattr(config, "workerinput"):
+            remove_fill_inputs(config.fixture_output.fill_inputs_folder_path)
+
+    if config.getoption("replay_fill_inputs"):
+        if not config.getoption("use_pre_alloc_groups"):
+            pytest.exit(
+                "--replay-fill-inputs requires --use-pre-alloc-groups.",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
+        if config.getoption("verify_fixtures") or config.getoption("verify_fixtures_bin"):
+            pytest.exit(
+                "--replay-fill-inputs does not support the verification of the fixtures.",
+                returncode=pytest.ExitCode.USAGE_ERROR,
+            )
+        # The recorded inputs are distributed to the processes by this process, so the xdist
+        # workers, which would only collect the tests, are not started.
+        config.replay_processes = config.getoption("numprocesses") or 1
+        config.option.dist = "no"
+        config.option.tx = []
+
     if (
         not config.getoption("disable_html")
         and config.getoption("htmlpath") is None
@@ -536,6 +690,21 @@ def pytest_runtest_makereport(item, call):
             else:
                 report.user_properties.append(("evm_dump_dir", "N/A"))  # not yet for EOF
 
+    # The tests skipped in phase 1 are reported as skipped when phase 2 replays the inputs.
+    if (
+        report.skipped
+        and not hasattr(report, "wasxfail")
+        and hasattr(item.config, "fill_input_recorder")
+    ):
+        reason = (
+            report.longrepr[2].removeprefix("Skipped: ")
+            if isinstance(report.longrepr, tuple)
+            else str(report.longrepr)
+        )
+        item.config.fill_input_recorder.record(
+            SkippedFillInput(test_info=node_to_test_info(item), reason=reason)
+        )
+
 
 def pytest_html_report_title(report):
     """Set the HTML report title (pytest-html plugin)."""
@@ -897,6 +1066,20 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                     self.update_pre_alloc_groups(
                         request.config.pre_alloc_groups, fork, request.node.nodeid
                     )
+                    if request.config.getoption("record_fill_inputs"):
+                        request.config.fill_input_recorder.record(
+                            FillInput.from_request(
+                                request,
+                                test_info=node_to_test_info(request.node),
+                                spec=self,
+                                spec_type=cls,
+                                fork=fork,
+                                pre_alloc_hash=self.compute_pre_alloc_group_hash(fork=fork),
+                                test_case_description=test_case_description,
+                                fixture_source_url=fixture_source_url,
+                                reference_spec=reference_spec,
+                            )
+                        )
                     return  # Skip fixture generation in phase 1
 
                 # Phase 2: Use pre-allocation groups (only for BlockchainEngineXFixture)
@@ -904,7 +1087,9 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                 if fixture_format is BlockchainEngineXFixture and request.config.getoption(
                     "use_pre_alloc_groups"
                 ):
-                    pre_alloc_hash = self.compute_pre_alloc_group_hash(fork=fork)
+                    pre_alloc_hash = request.config.pre_alloc_groups.group_key(
+                        self.compute_pre_alloc_group_hash(fork=fork), request.node.nodeid
+                    )
                     if pre_alloc_hash not in request.config.pre_alloc_groups:
                         pre_alloc_path = (
                             request.config.fixture_output.pre_alloc_groups_folder_path
@@ -932,14 +1117,9 @@ def base_test_parametrizer(cls: Type[BaseTest]):
                     and request.config.getoption("use_pre_alloc_groups")
                     and pre_alloc_hash is not None
                 ):
-                    fixture.pre_hash = pre_alloc_hash
-
-                    # Calculate state diff for efficiency
-                    if hasattr(fixture, "post_state") and fixture.post_state is not None:
-                        group = request.config.pre_alloc_groups[pre_alloc_hash]
-                        fixture.post_state_diff = calculate_post_state_diff(
-                            fixture.post_state, group.pre
-                        )
+                    set_pre_alloc_group(
+                        fixture, pre_alloc_hash, request.config.pre_alloc_groups[pre_alloc_hash]
+                    )
 
                 fixture.fill_info(
                     t8n.version(),
@@ -1080,6 +1260,221 @@ def pytest_collection_modifyitems(
                 )
 
 
+REPLAY_BATCH_SIZE = 64
+"""Maximum number of tests of a pre-allocation group filled at once by a replaying process."""
+
+REPLAY_DUMP_SIZE = 1000
+"""Number of fixtures kept in memory by the replaying session before writing them to file."""
+
+_replay_tools: Tuple[TransitionTool, LazyPreAllocGroups] | None = None
+
+
+def init_replay_process(
+    evm_bin: Path | None,
+    trace: bool,
+    pre_alloc_groups_folder: Path,
+    max_loaded: int,
+    cache_folder: Path | None,
+) -> TransitionTool:
+    """Create the transition tool and the pre-allocation groups used to fill recorded inputs."""
+    global _replay_tools
+    if evm_bin is None:
+        assert TransitionTool.default_tool is not None, "No default transition tool found"
+        t8n = TransitionTool.default_tool(trace=trace)
+    else:
+        t8n = TransitionTool.from_binary_path(binary_path=evm_bin, trace=trace)
+    _replay_tools = (
+        t8n,
+        LazyPreAllocGroups(
+            pre_alloc_groups_folder, max_loaded=max_loaded, cache_folder=cache_folder
+        ),
+    )
+    return t8n
+
+
+def init_replay_worker(*args: Any) -> None:
+    """Initialize a process of the pool filling recorded inputs."""
+    t8n = init_replay_process(*args)
+    # The processes of the pool don't run the `atexit` handlers, only the finalizers.
+    multiprocessing.util.Finalize(t8n, t8n.shutdown, exitpriority=0)
+
+
+def fill_recorded_inputs(
+    pre_alloc_hash: str, fill_inputs: List[FillInput]
+) -> List[BaseFixture | Skipped | str]:
+    """
+    Fill the Engine X fixtures of recorded tests of the same pre-allocation group, returning for
+    each test its fixture, the exception skipping it, or the traceback of its failure.
+    """
+    assert _replay_tools is not None, "The replaying process is not initialized"
+    t8n, pre_alloc_groups = _replay_tools
+    group = pre_alloc_groups[pre_alloc_hash]
+    results: List[BaseFixture | Skipped | str] = []
+    with warnings.catch_warnings():
+        # The warnings are not captured by pytest outside of the tests.
+        warnings.simplefilter("ignore")
+        for fill_input in fill_inputs:
+            try:
+                spec = fill_input.get_spec()
+                spec.pre = group.pre  # type: ignore[attr-defined]
+                fixture = spec.generate(
+                    t8n=t8n, fork=fill_input.fork, fixture_format=BlockchainEngineXFixture
+                )
+                set_pre_alloc_group(fixture, pre_alloc_hash, group)
+                fixture.fill_info(
+                    t8n.version(),
+                    fill_input.test_case_description,
+                    fixture_source_url=fill_input.fixture_source_url,
+                    ref_spec=fill_input.reference_spec,
+                    _info_metadata=t8n._info_metadata or {},
+                )
+                results.append(fixture)
+            except Skipped as e:
+                results.append(e)
+            except Exception:
+                results.append(traceback.format_exc())
+    return results
+
+
+def report_recorded_test(
+    session: pytest.Session,
+    fill_input: FillInput | SkippedFillInput,
+    result: BaseFixture | Skipped | str,
+    fixture_path: Path | None,
+) -> None:
+    """Report the outcome of a recorded test as if it had been run by pytest."""
+    nodeid = fill_input.test_info.id
+    location = (nodeid.split("::")[0], None, fill_input.test_info.name)
+    outcome: Literal["passed", "failed", "skipped"] = "passed"
+    longrepr: Tuple[str, int, str] | str | None = None
+    user_properties: List[Tuple[str, object]] = []
+    if isinstance(result, Skipped):
+        outcome, longrepr = "skipped", (location[0], 0, f"Skipped: {result.msg}")
+    elif isinstance(result, str):
+        outcome, longrepr = "failed", result
+    elif fixture_path is not None:
+        user_properties = [
+            ("fixture_path_absolute", str(fixture_path.absolute())),
+            (
+                "fixture_path_relative",
+                str(fixture_path.relative_to(session.config.fixture_output.directory)),  # type: ignore[attr-defined]
+            ),
+        ]
+    hook = session.config.hook
+    hook.pytest_runtest_logstart(nodeid=nodeid, location=location)
+    for when in ("setup", "call", "teardown"):
+        hook.pytest_runtest_logreport(
+            report=pytest.TestReport(
+                nodeid,
+                location,
+                keywords={},
+                outcome=outcome if when == "call" else "passed",
+                longrepr=longrepr if when == "call" else None,
+                when=when,  # type: ignore[arg-type]
+                user_properties=user_properties if when == "call" else None,
+            )
+        )
+    hook.pytest_runtest_logfinish(nodeid=nodeid, location=location)
+
+
+def replay_fill_inputs(session: pytest.Session) -> None:
+    """
+    Fill the Engine X fixtures of the tests recorded in phase 1, in batches of tests of the same
+    pre-allocation group, distributed to a pool of processes if several are requested with `-n`.
+    """
+    config = session.config
+    fixture_output: FixtureOutput = config.fixture_output  # type: ignore[attr-defined]
+    pre_alloc_groups: LazyPreAllocGroups = config.pre_alloc_groups  # type: ignore[attr-defined]
+    inputs_by_group: Dict[str, List[FillInput]] = {}
+    skipped: List[SkippedFillInput] = []
+    for fill_input in load_fill_inputs(fixture_output.fill_inputs_folder_path):
+        if isinstance(fill_input, SkippedFillInput):
+            skipped.append(fill_input)
+            continue
+        pre_alloc_hash = pre_alloc_groups.group_key(
+            fill_input.pre_alloc_hash, fill_input.test_info.id
+        )
+        inputs_by_group.setdefault(pre_alloc_hash, []).append(fill_input)
+    batches = [
+        (pre_alloc_hash, fill_inputs[start : start + REPLAY_BATCH_SIZE])
+        for pre_alloc_hash, fill_inputs in sorted(inputs_by_group.items())
+        for start in range(0, len(fill_inputs), REPLAY_BATCH_SIZE)
+    ]
+    session.testscollected = len(skipped) + sum(
+        len(fill_inputs) for fill_inputs in inputs_by_group.values()
+    )
+    for skipped_input in skipped:
+        report_recorded_test(session, skipped_input, Skipped(skipped_input.reason), None)
+
+    def new_collector() -> FixtureCollector:
+        return FixtureCollector(
+            output_dir=fixture_output.directory,
+            flat_output=fixture_output.flat_output,
+            fill_static_tests=config.getoption("fill_static_tests_enabled"),
+            single_fixture_per_file=fixture_output.single_fixture_per_file,
+            filler_path=config.getoption("filler_path"),
+            base_dump_dir=None,
+        )
+
+    init_args = (
+        config.getoption("evm_bin"),
+        config.getoption("evm_collect_traces"),
+        fixture_output.pre_alloc_groups_folder_path,
+        config.getoption("max_loaded_pre_alloc_groups"),
+        config.getoption("pre_alloc_groups_cache"),
+    )
+    processes: int = config.replay_processes  # type: ignore[attr-defined]
+    # The forks of the inputs and fixtures are sent to the pool by name.
+    ForkingPickler.register(BaseForkMeta, reduce_fork)
+    with contextlib.ExitStack() as stack:
+        if processes > 1:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(processes, initializer=init_replay_worker, initargs=init_args)
+            )
+            results: Iterator[List[BaseFixture | Skipped | str]] = executor.map(
+                fill_recorded_inputs,
+                [pre_alloc_hash for pre_alloc_hash, _ in batches],
+                [fill_inputs for _, fill_inputs in batches],
+            )
+        else:
+            stack.callback(init_replay_process(*init_args).shutdown)
+            results = (
+                fill_recorded_inputs(pre_alloc_hash, fill_inputs)
+                for pre_alloc_hash, fill_inputs in batches
+            )
+        collector = new_collector()
+        collected = 0
+        for (_, fill_inputs), batch_results in zip(batches, results, strict=True):
+            for fill_input, result in zip(fill_inputs, batch_results, strict=True):
+                fixture_path = None
+                if isinstance(result, BaseFixture):
+                    fixture_path = collector.add_fixture(fill_input.test_info, result)
+                    collected += 1
+                report_recorded_test(session, fill_input, result, fixture_path)
+            if collected >= REPLAY_DUMP_SIZE:
+                collector.dump_fixtures()
+                collector, collected = new_collector(), 0
+        collector.dump_fixtures()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection(session: pytest.Session) -> bool | None:
+    """Skip the collection of the tests when filling the fixtures from recorded inputs."""
+    if not session.config.getoption("replay_fill_inputs"):
+        return None
+    session.items = []
+    return True
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session: pytest.Session) -> bool | None:
+    """Fill the fixtures from the recorded inputs instead of running the tests."""
+    if not session.config.getoption("replay_fill_inputs"):
+        return None
+    replay_fill_inputs(session)
+    return True
+
+
 def pytest_sessionfinish(session: pytest.Session, exitstatus: int):
     """
     Perform session finish tasks.
@@ -1091,12 +1486,27 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus: int):
     """
     # Save pre-allocation groups after phase 1
     fixture_output = session.config.fixture_output  # type: ignore[attr-defined]
+    if hasattr(session.config, "fill_input_recorder"):
+        session.config.fill_input_recorder.close()
     if session.config.getoption("generate_pre_alloc_groups") and hasattr(
         session.config, "pre_alloc_groups"
     ):
         pre_alloc_groups_folder = fixture_output.pre_alloc_groups_folder_path
         pre_alloc_groups_folder.mkdir(parents=True, exist_ok=True)
-        session.config.pre_alloc_groups.to_folder(pre_alloc_groups_folder)
+        if xdist.is_xdist_worker(session):
+            # Each worker writes its own partial groups, merged by the master once all the
+            # workers are done.
+            session.config.pre_alloc_groups.to_shards(
+                pre_alloc_groups_folder,
+                session.config.workerinput["workerid"],  # type: ignore[attr-defined]
+            )
+        else:
+            session.config.pre_alloc_groups.to_shards(pre_alloc_groups_folder, "master")
+            PreAllocGroups.merge_shards(
+                pre_alloc_groups_folder,
+                max_accounts=session.config.getoption("max_pre_alloc_group_accounts"),
+                max_bytes=session.config.getoption("max_pre_alloc_group_bytes"),
+            )
         return
 
     if xdist.is_xdist_worker(session):
@@ -1109,6 +1519,10 @@ def pytest_sessionfinish(session: pytest.Session, exitstatus: int):
     for file in fixture_output.directory.rglob("*.lock"):
         file.unlink()
 
+    # Remove the recorded inputs once all their fixtures have been filled.
+    if session.config.getoption("replay_fill_inputs") and exitstatus == pytest.ExitCode.OK:
+        remove_fill_inputs(fixture_output.fill_inputs_folder_path)
+
     # Generate index file for all produced fixtures.
     if session.config.getoption("generate_index") and not session.config.getoption(
         "generate_pre_alloc_groups"
@@ -9,6 +9,8 @@ from pydantic import BaseModel, Field
 
 from ethereum_test_fixtures.blockchain import BlockchainEngineXFixture
 
+from .fill_inputs import FILL_INPUTS_FOLDER
+
 
 class FixtureOutput(BaseModel):
     """Represents the output destination for generated test fixtures."""
@@ -67,6 +69,11 @@ class FixtureOutput(BaseModel):
         engine_x_dir = BlockchainEngineXFixture.output_base_dir_name()
         return self.directory / engine_x_dir / "pre_alloc"
 
+    @property
+    def fill_inputs_folder_path(self) -> Path:
+        """Return the path of the inputs recorded in phase 1 to fill the fixtures of phase 2."""
+        return self.metadata_dir / FILL_INPUTS_FOLDER
+
     @staticmethod
     def strip_tarball_suffix(path: Path) -> Path:
         """Strip the '.tar.gz' suffix from the output path."""
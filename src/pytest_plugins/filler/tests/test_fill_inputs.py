@@ -0,0 +1,194 @@
+"""Test the recording of the inputs used to fill the fixtures of the tests."""
+
+import json
+import shutil
+import textwrap
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from pytest import Pytester
+
+from ethereum_test_base_types import Account, Address
+from ethereum_test_fixtures import TestInfo as FixtureTestInfo
+from ethereum_test_forks import ShanghaiToCancunAtTime15k
+from ethereum_test_specs import StateTest
+from ethereum_test_types import EOA, Alloc, Environment, Transaction
+
+from ..fill_inputs import FillInput, FillInputRecorder, SkippedFillInput, load_fill_inputs
+
+
+def mock_request(nodeid: str, marker_names: list[str]) -> Mock:
+    """Return a mock of the pytest request of a test with the given markers."""
+    markers = []
+    for name in marker_names:
+        marker = Mock()
+        marker.name = name
+        markers.append(marker)
+    request = Mock()
+    request.node.nodeid = nodeid
+    request.node.iter_markers.return_value = markers
+    return request
+
+
+def record(recorder: FillInputRecorder, nodeid: str, marker_names: list[str], **kwargs) -> None:
+    """Record the inputs of a state test."""
+    sender, contract = EOA(key=1), Address(0x1000)
+    pre = Alloc({sender: Account(balance=10**18), contract: Account(code=b"\x00")})
+    spec = StateTest(
+        env=Environment(),
+        pre=pre,
+        post={contract: Account(nonce=1)},
+        tx=Transaction(sender=sender, to=contract, gas_limit=100_000),
+    )
+    recorder.record(
+        FillInput.from_request(
+            mock_request(nodeid, marker_names),
+            test_info=FixtureTestInfo(
+                name=nodeid.split("::")[1],
+                id=nodeid,
+                original_name="test_example",
+                module_path=Path("tests/test_module.py"),
+            ),
+            spec=spec,
+            spec_type=StateTest,
+            fork=ShanghaiToCancunAtTime15k,
+            pre_alloc_hash="0x01",
+            test_case_description="Example test.",
+            fixture_source_url="https://example.com",
+            **({"reference_spec": None} | kwargs),
+        )
+    )
+
+
+def test_record_fill_inputs(tmp_path: Path):
+    """Test that the inputs recorded by several processes are loaded back."""
+    for worker, marker_names in [("gw0", []), ("gw1", ["slow", "exception_test"])]:
+        recorder = FillInputRecorder(tmp_path, worker)
+        record(recorder, f"tests/test_module.py::test_example[{worker}]", marker_names)
+        recorder.close()
+
+    first, second = load_fill_inputs(tmp_path)
+    assert isinstance(first, FillInput) and isinstance(second, FillInput)
+    # Transition forks are recorded by name.
+    assert first.fork is ShanghaiToCancunAtTime15k
+    assert first.test_info.id == "tests/test_module.py::test_example[gw0]"
+    spec = first.get_spec()
+    assert isinstance(spec, StateTest)
+    # The pre-allocation of the test is replaced by the one of its group.
+    assert "pre" not in spec.model_fields_set
+    assert spec.tx.gas_limit == 100_000
+    assert spec.node_id() == "tests/test_module.py::test_example[gw0]"
+    assert not spec.is_tx_gas_heavy_test()
+    assert spec.is_exception_test() is False
+
+    spec = second.get_spec()
+    assert spec.node_id() == "tests/test_module.py::test_example[gw1]"
+    assert spec.is_tx_gas_heavy_test()
+    assert spec.is_exception_test() is True
+
+
+def test_record_unpicklable_fill_inputs(tmp_path: Path):
+    """Test that inputs that cannot be recorded are reported without corrupting the file."""
+
+    class LocalReferenceSpec:
+        pass
+
+    recorder = FillInputRecorder(tmp_path, "master")
+    with pytest.raises(TypeError, match="cannot be recorded"):
+        record(recorder, "tests/test_module.py::test_a", [], reference_spec=LocalReferenceSpec())
+    record(recorder, "tests/test_module.py::test_b", [])
+    recorder.close()
+    assert [fill_input.test_info.id for fill_input in load_fill_inputs(tmp_path)] == [
+        "tests/test_module.py::test_b"
+    ]
+
+
+def test_record_skipped_tests(tmp_path: Path):
+    """Test that the tests skipped in phase 1 are loaded back with their reason."""
+    recorder = FillInputRecorder(tmp_path, "master")
+    record(recorder, "tests/test_module.py::test_a", [])
+    recorder.record(
+        SkippedFillInput(
+            test_info=FixtureTestInfo(
+                name="test_b",
+                id="tests/test_module.py::test_b",
+                original_name="test_b",
+                module_path=Path("tests/test_module.py"),
+            ),
+            reason="not applicable",
+        )
+    )
+    recorder.close()
+    filled, skipped = load_fill_inputs(tmp_path)
+    assert isinstance(filled, FillInput)
+    assert skipped == SkippedFillInput(test_info=skipped.test_info, reason="not applicable")
+    assert skipped.test_info.id == "tests/test_module.py::test_b"
+
+
+test_module_engine_x = textwrap.dedent(
+    """\
+    import pytest
+
+    from ethereum_test_tools import Account, Environment, Transaction
+
+
+    @pytest.mark.valid_at("Cancun")
+    @pytest.mark.parametrize("value", [1, 2])
+    def test_transfer(state_test, pre, value):
+        receiver = pre.fund_eoa(amount=0)
+        tx = Transaction(sender=pre.fund_eoa(), to=receiver, value=value)
+        state_test(env=Environment(), pre=pre, post={receiver: Account(balance=value)}, tx=tx)
+
+
+    @pytest.mark.valid_at("Cancun")
+    def test_wrong_post(state_test, pre):
+        receiver = pre.fund_eoa(amount=0)
+        tx = Transaction(sender=pre.fund_eoa(), to=receiver, value=1)
+        state_test(env=Environment(), pre=pre, post={receiver: Account(balance=2)}, tx=tx)
+
+
+    @pytest.mark.valid_at("Cancun")
+    def test_skipped(state_test, pre):
+        pytest.skip("not applicable")
+    """
+)
+
+
+def fixture_files(output_dir: Path) -> dict[Path, object]:
+    """Return the content of the fixture files of the output, by path relative to the output."""
+    return {
+        path.relative_to(output_dir): json.loads(path.read_text())
+        for path in output_dir.rglob("*.json")
+        if ".meta" not in path.parts
+    }
+
+
+def test_replay_fill_inputs(pytester: Pytester):
+    """
+    Test that phase 2 fills the same Engine X fixtures, and reports the same outcomes, from the
+    inputs recorded in phase 1 as by running the tests again.
+    """
+    tests_dir = pytester.mkdir("tests")
+    (tests_dir / "cancun").mkdir()
+    (tests_dir / "cancun" / "test_module_engine_x.py").write_text(test_module_engine_x)
+    pytester.copy_example(name="pytest.ini")
+
+    phase1 = pytester.runpytest(
+        "--generate-pre-alloc-groups", "--record-fill-inputs", "--output=run", "--no-html"
+    )
+    # The post-state is only verified when the fixtures are filled in phase 2.
+    phase1.assert_outcomes(passed=3, skipped=1)
+    shutil.copytree(pytester.path / "run", pytester.path / "replayed")
+
+    outcomes = {"passed": 2, "failed": 1, "skipped": 1}
+    pytester.runpytest("--use-pre-alloc-groups", "--output=run", "--no-html").assert_outcomes(
+        **outcomes
+    )
+    pytester.runpytest(
+        "--use-pre-alloc-groups", "--replay-fill-inputs", "--output=replayed", "--no-html"
+    ).assert_outcomes(**outcomes)
+
+    fixtures = fixture_files(pytester.path / "run")
+    assert len(fixtures) > 1
+    assert fixture_files(pytester.path / "replayed") == fixtures
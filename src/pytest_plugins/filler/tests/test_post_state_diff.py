@@ -0,0 +1,42 @@
+"""Test the post-state diff of the Engine X fixtures."""
+
+from ethereum_test_base_types import Account, Address, Alloc
+
+from ..filler import calculate_post_state_diff
+
+
+def genesis_state() -> Alloc:
+    """Return a genesis state with accounts with storage and code."""
+    return Alloc(
+        {
+            Address(i): Account(nonce=i, balance=i, code=bytes([i]), storage={1: i})
+            for i in range(1, 6)
+        }
+        | {Address(6): None}
+    )
+
+
+def test_post_state_diff():
+    """Test that only the modified, created and deleted accounts are in the diff."""
+    post_state = genesis_state()
+    post_state.root[Address(1)] = Account(nonce=1, balance=1, code=b"\x01", storage={1: 2})
+    post_state.root[Address(2)] = Account(nonce=2, balance=3, code=b"\x02", storage={1: 2})
+    post_state.root[Address(3)] = None
+    del post_state.root[Address(4)]
+    del post_state.root[Address(6)]
+    post_state.root[Address(7)] = Account(balance=7)
+    post_state.root[Address(8)] = None
+
+    diff = calculate_post_state_diff(post_state, genesis_state())
+    assert diff.root == {
+        Address(1): post_state.root[Address(1)],
+        Address(2): post_state.root[Address(2)],
+        Address(3): None,
+        Address(4): None,
+        Address(7): post_state.root[Address(7)],
+    }
+
+
+def test_post_state_diff_unchanged():
+    """Test that accounts equal to the ones of the genesis state are not in the diff."""
+    assert calculate_post_state_diff(genesis_state(), genesis_state()).root == {}
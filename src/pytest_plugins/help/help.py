@@ -54,6 +54,13 @@ def pytest_addoption(parser):
         default=False,
         help="Show help options specific to the execute's command recover and exit.",
     )
+    help_group.addoption(
+        "--execute-load-help",
+        action="store_true",
+        dest="show_execute_load_help",
+        default=False,
+        help="Show help options specific to the execute's command load and exit.",
+    )
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -124,6 +131,19 @@ def pytest_configure(config):
                 "remote seed sender",
             ],
         )
+    elif config.getoption("show_execute_load_help"):
+        show_specific_help(
+            config,
+            "pytest-execute-load.ini",
+            [
+                "execute",
+                "load generation",
+                "remote RPC configuration",
+                "pre-allocation behavior during test execution",
+                "sender key fixtures",
+                "remote seed sender",
+            ],
+        )
 
 
 def show_specific_help(config, expected_ini, substrings):
@@ -1,6 +1,7 @@
 """Helpers for pytest plugins."""
 
-from typing import Any, Dict, Tuple, Type
+import math
+from typing import Any, Dict, Sequence, Tuple, Type
 
 import pytest
 from _pytest.mark.structures import ParameterSet
@@ -74,3 +75,12 @@ def get_spec_format_for_item(
         if spec_type.pytest_parameter_name() in params:
             return spec_type, params[spec_type.pytest_parameter_name()]
     raise ValueError("No spec type format found in the test item.")
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile (0-100) of sorted values using linear interpolation."""
+    assert sorted_values, "Cannot calculate the percentile of an empty sequence"
+    rank = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)